@@ -896,6 +896,42 @@ class DocAnalyserApp(SettingsMixin, LocalAIMixin, DocumentFetchingMixin, OCRProc
                     print(f"⚠️ Could not apply curated models: {e}")
 
         self.root.after(delay + 6000, lambda: check_all_updates_async(callback=_on_remote_updates))
+
+        # Background scheduler for subscriptions with scheduling enabled
+        self._start_subscription_scheduler()
+
+        # Keep disk caches within their budgets (see cache_manager.py)
+        try:
+            import cache_manager
+            cache_manager.start_background_eviction(
+                self.config.get("cache_budgets_mb"), self.config.get("cache_max_age_days"))
+        except Exception as e:
+            print(f"⚠️ Cache eviction not started: {e}")
+
+        # Bulk imports that were scheduled or interrupted last session
+        self.root.after(delay + 8000, self._resume_pending_imports)
+
+    def _start_subscription_scheduler(self):
+        """Start the in-process subscription scheduler (see subscription_scheduler.py)."""
+        try:
+            from subscription_scheduler import SubscriptionScheduler
+            self.subscription_scheduler = SubscriptionScheduler(
+                lambda: self.config,
+                status_cb=lambda msg: print(f"🗓️ {msg}"),
+            )
+            self.subscription_scheduler.start()
+        except Exception as e:
+            self.subscription_scheduler = None
+            print(f"⚠️ Could not start subscription scheduler: {e}")
+
+    def _resume_pending_imports(self):
+        """Reopen Add Sources if the import ledger has unfinished work (see ingest_jobs.py)."""
+        try:
+            import ingest_jobs
+            if ingest_jobs.unfinished_batches():
+                self.open_add_sources()  # the dialog restores or offers to resume it
+        except Exception as e:
+            print(f"⚠️ Could not check for unfinished imports: {e}")
     
 
     def _show_local_ai_banner(self):
@@ -1271,7 +1307,16 @@ class DocAnalyserApp(SettingsMixin, LocalAIMixin, DocumentFetchingMixin, OCRProc
 
     def build_threaded_messages(self, new_prompt: str) -> list:
         """
-        MVP: Build message list including conversation history and attachments
+        Build message list: system instructions, source document and
+        attachments, conversation history, then the new prompt.
+
+        The document and attachments are placed in the system message,
+        ahead of everything that changes from turn to turn, so every
+        follow-up shares an identical prefix with the previous call. The
+        system message is flagged "cache": True — ai_handler turns that
+        into an Anthropic cache_control breakpoint, and OpenAI-compatible
+        providers cache identical prefixes automatically — so follow-ups on
+        a long document pay the cached-input rate instead of the full one.
 
         Args:
             new_prompt: The new question/prompt from user
@@ -1279,88 +1324,50 @@ class DocAnalyserApp(SettingsMixin, LocalAIMixin, DocumentFetchingMixin, OCRProc
         Returns:
             List of messages for AI provider
         """
-        messages = []
+        system_content = ("You are a helpful AI assistant analyzing documents. "
+                          "Maintain context from previous messages in this conversation.")
 
-        # 1. System message
-        messages.append({
-            "role": "system",
-            "content": "You are a helpful AI assistant analyzing documents. "
-                       "Maintain context from previous messages in this conversation."
-        })
-        
         # 🆕 NEW: Build attachment text if any files are attached
         attachment_text = ""
         if hasattr(self, 'attachment_manager') and self.attachment_manager.get_attachment_count() > 0:
             attachment_text = "\n\n" + self.attachment_manager.build_attachment_text()
-        
+
         # 🆕 NEW: Check if we have a main document loaded
-        has_main_document = (hasattr(self, 'current_document_text') and 
-                            self.current_document_text and 
+        has_main_document = (hasattr(self, 'current_document_text') and
+                            self.current_document_text and
                             self.current_document_text.strip())
 
-        # Check if we need to re-include document (e.g., returning to saved thread later)
-        needs_document_refresh = getattr(self, 'thread_needs_document_refresh', False)
-        
-        # 2. If this is the FIRST message OR we're resuming a saved thread, include the full document
-        if len(self.current_thread) == 0:
-            # Brand new conversation - include document
-            if has_main_document:
-                content = f"{new_prompt}\n\n--- DOCUMENT ---\n{self.current_document_text}"
-            else:
-                # No main document - just the prompt (attachments will be added below)
-                content = new_prompt
-            
-            if attachment_text:
-                content += attachment_text
-            messages.append({
-                "role": "user",
-                "content": content
-            })
-        elif needs_document_refresh and has_main_document:
-            # Resuming a saved conversation - re-include document for context
-            print("\ud83d\udd04 Re-including document context for resumed conversation")
-            
-            # Add previous conversation history
-            for msg in self.current_thread:
-                messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"]
-                })
-            
-            # Add new prompt WITH document (AI needs it again since this is a new session)
-            content = f"{new_prompt}\n\n--- DOCUMENT (for context) ---\n{self.current_document_text}"
-            if attachment_text:
-                content += attachment_text
-            messages.append({
-                "role": "user",
-                "content": content
-            })
-            
-            # Clear the flag - document has been re-sent
+        # 1. System message + stable context prefix (document, attachments).
+        # Each API call is stateless and the thread only stores the prompts
+        # (e.g. chunking stores only the prompt), so the document is always
+        # sent — this also covers resuming a saved thread.
+        if has_main_document:
+            system_content += f"\n\n--- SOURCE DOCUMENT ---\n{self.current_document_text}"
+        if attachment_text:
+            system_content += attachment_text
+
+        system_message = {"role": "system", "content": system_content}
+        if has_main_document or attachment_text:
+            system_message["cache"] = True
+        messages = [system_message]
+
+        if getattr(self, 'thread_needs_document_refresh', False):
+            # Resumed saved conversation — document context is in the prefix
             self.thread_needs_document_refresh = False
-            print("   \u2705 Document context re-sent, flag cleared")
-        else:
-            # 3. Add previous conversation history
-            for msg in self.current_thread:
-                messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"]
-                })
 
-            # 4. Add new prompt WITH source document for context
-            # Each API call is stateless, and the initial prompt in the thread
-            # may not contain the document (e.g. chunking stores only the prompt).
-            # Always re-include the document so the AI can reference it.
-            content = new_prompt
-            if has_main_document:
-                content += f"\n\n--- SOURCE DOCUMENT (for reference) ---\n{self.current_document_text}"
-            if attachment_text:
-                content += attachment_text
+        # 2. Previous conversation history (append-only, so it stays cacheable)
+        for msg in self.current_thread:
             messages.append({
-                "role": "user",
-                "content": content
+                "role": msg["role"],
+                "content": msg["content"]
             })
 
+        # 3. New prompt
+        messages.append({
+            "role": "user",
+            "content": new_prompt
+        })
+
         return messages
 
     def set_status(self, msg: str, include_thread_status: bool = False):
@@ -1727,6 +1734,7 @@ class DocAnalyserApp(SettingsMixin, LocalAIMixin, DocumentFetchingMixin, OCRProc
             menu.add_command(label="Show First-Run Wizard...", command=self._reset_and_show_wizard)
             menu.add_separator()
             menu.add_command(label="AI Costs Log...", command=self.show_costs)
+            menu.add_command(label="Performance Log...", command=self.show_performance_log)
             menu.add_separator()
             menu.add_command(label="Tip: Press F1 over buttons for help", state="disabled")
             menu.tk_popup(event.x_root, event.y_root)
@@ -3774,7 +3782,7 @@ class DocAnalyserApp(SettingsMixin, LocalAIMixin, DocumentFetchingMixin, OCRProc
             model_count = len([m for m in available_models if not m.startswith("(")])
             if model_count > 0:
                 current_chunk_size = self.config.get("chunk_size", "medium")
-                chunk_label = {"tiny": "Tiny", "small": "Small", "medium": "Medium", "large": "Large"}.get(current_chunk_size, current_chunk_size)
+                chunk_label = {"tiny": "Tiny", "small": "Small", "medium": "Medium", "large": "Large", "auto": "Auto"}.get(current_chunk_size, current_chunk_size)
                 # Gated on _startup_complete — see __init__ for rationale.
                 if getattr(self, '_startup_complete', False):
                     self.set_status(f"💻 Ollama ready - {model_count} model(s) available | Chunk: {chunk_label}")
@@ -5240,6 +5248,11 @@ class DocAnalyserApp(SettingsMixin, LocalAIMixin, DocumentFetchingMixin, OCRProc
         thread.start()
     
 if __name__ == "__main__":
+    # PDF extraction uses a process pool; frozen builds must hand its
+    # worker processes off here instead of starting another app instance.
+    import multiprocessing
+    multiprocessing.freeze_support()
+
     # ── URL handler mode ──────────────────────────────────────────────────────
     # When the installer registers docanalyser:// as a URL scheme, Windows
     # calls:  DocAnalyser.exe --url-handler docanalyser://play?t=15.5&audio=...
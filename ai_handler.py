@@ -6,9 +6,12 @@ Handles API calls to different AI providers (OpenAI, Anthropic, xAI, DeepSeek)
 import os
 import json
 import datetime
+import threading
 from pathlib import Path
 from typing import List, Dict, Tuple
 
+from performance_timer import timed
+
 # --- SQLite feature flag (Stage A) ---
 # Set to False to revert to cost_log.txt file-based logging
 USE_SQLITE_COSTS = True
@@ -74,6 +77,10 @@ last_call_info = {
 # Running session total
 session_cost = 0.0
 
+# Guards last_call_info / session_cost — tree_reduce calls the AI from
+# several threads at once
+_cost_lock = threading.Lock()
+
 
 def _load_pricing() -> dict:
     """Load pricing data from pricing.json. Cached after first load."""
@@ -100,23 +107,37 @@ def reload_pricing():
     return _load_pricing()
 
 
-def _calculate_cost(provider: str, model: str, input_tokens: int, output_tokens: int) -> float:
+# Prompt-cache pricing as a fraction of the model's input price. Used when
+# a model in pricing.json has no explicit "cached_input" / "cache_write"
+# rate. Keys are matched against the lower-cased provider name.
+_CACHE_READ_RATES = {
+    "anthropic": 0.10,
+    "openai":    0.50,
+    "xai":       0.25,
+    "deepseek":  0.10,
+    "gemini":    0.25,
+}
+_CACHE_WRITE_RATES = {
+    "anthropic": 1.25,   # 5-minute cache writes
+}
+
+
+def _cache_rate(rates: dict, provider_lower: str, default: float) -> float:
+    for key, rate in rates.items():
+        if key in provider_lower:
+            return rate
+    return default
+
+
+def _price_tokens(provider: str, model: str, input_tokens: int, output_tokens: int,
+                  cached_tokens: int = 0, cache_write_tokens: int = 0) -> float:
     """
-    Calculate cost for any provider/model using pricing.json.
-    
-    Args:
-        provider: Provider name as used in pricing.json (e.g. "OpenAI (ChatGPT)")
-                  Also accepts short names like "OpenAI", "Anthropic", etc.
-        model: Model name (e.g. "gpt-4o", "claude-sonnet-4")
-        input_tokens: Number of input/prompt tokens
-        output_tokens: Number of output/completion tokens
-    
-    Returns:
-        Cost in dollars
+    Price a token count for any provider/model using pricing.json.
+    No side effects (see _calculate_cost for the per-call version).
     """
-    global last_call_info, session_cost
-    
     pricing = _load_pricing()
+    cached_tokens = cached_tokens or 0
+    cache_write_tokens = cache_write_tokens or 0
     
     # Find the provider — support both full names and short names
     provider_data = None
@@ -128,11 +149,8 @@ def _calculate_cost(provider: str, model: str, input_tokens: int, output_tokens:
     
     if not provider_data:
         # Unknown provider — assume moderate pricing as fallback
-        cost = (input_tokens / 1_000_000) * 1.00 + (output_tokens / 1_000_000) * 3.00
-        last_call_info = {"cost": cost, "input_tokens": input_tokens, 
-                         "output_tokens": output_tokens, "model": model, "provider": provider}
-        session_cost += cost
-        return cost
+        total_input = input_tokens + cached_tokens + cache_write_tokens
+        return (total_input / 1_000_000) * 1.00 + (output_tokens / 1_000_000) * 3.00
     
     # Find matching model pricing (substring match, longest match wins)
     model_lower = model.lower()
@@ -155,19 +173,59 @@ def _calculate_cost(provider: str, model: str, input_tokens: int, output_tokens:
         model_pricing = list(models.values())[0] if models else {"input": 1.00, "output": 3.00}
     
     # Calculate
-    input_cost = (input_tokens / 1_000_000) * model_pricing["input"]
+    input_price = model_pricing["input"]
+    cached_price = model_pricing.get(
+        "cached_input", input_price * _cache_rate(_CACHE_READ_RATES, provider_lower, 1.0))
+    write_price = model_pricing.get(
+        "cache_write", input_price * _cache_rate(_CACHE_WRITE_RATES, provider_lower, 1.0))
+    input_cost = (input_tokens / 1_000_000) * input_price
+    input_cost += (cached_tokens / 1_000_000) * cached_price
+    input_cost += (cache_write_tokens / 1_000_000) * write_price
     output_cost = (output_tokens / 1_000_000) * model_pricing["output"]
-    cost = input_cost + output_cost
+    return input_cost + output_cost
+
+
+def estimate_cost(provider: str, model: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimated cost in dollars for a planned call (does not touch session totals)."""
+    return _price_tokens(provider, model, input_tokens, output_tokens)
+
+
+def _calculate_cost(provider: str, model: str, input_tokens: int, output_tokens: int,
+                    cached_tokens: int = 0, cache_write_tokens: int = 0) -> float:
+    """
+    Calculate cost for any provider/model using pricing.json.
+    
+    Args:
+        provider: Provider name as used in pricing.json (e.g. "OpenAI (ChatGPT)")
+                  Also accepts short names like "OpenAI", "Anthropic", etc.
+        model: Model name (e.g. "gpt-4o", "claude-sonnet-4")
+        input_tokens: Number of uncached input/prompt tokens (full input rate)
+        output_tokens: Number of output/completion tokens
+        cached_tokens: Input tokens served from the provider's prompt cache
+        cache_write_tokens: Input tokens written to the prompt cache (Anthropic)
+    
+    Returns:
+        Cost in dollars
+    """
+    global last_call_info, session_cost
+    
+    cached_tokens = cached_tokens or 0
+    cache_write_tokens = cache_write_tokens or 0
+    cost = _price_tokens(provider, model, input_tokens, output_tokens,
+                         cached_tokens, cache_write_tokens)
     
     # Update last call info for status bar display
-    last_call_info = {
-        "cost": cost,
-        "input_tokens": input_tokens,
-        "output_tokens": output_tokens,
-        "model": model,
-        "provider": provider,
-    }
-    session_cost += cost
+    with _cost_lock:
+        last_call_info = {
+            "cost": cost,
+            "input_tokens": input_tokens + cached_tokens + cache_write_tokens,
+            "output_tokens": output_tokens,
+            "model": model,
+            "provider": provider,
+            "cached_tokens": cached_tokens,
+            "cache_write_tokens": cache_write_tokens,
+        }
+        session_cost += cost
     
     return cost
 
@@ -203,41 +261,68 @@ def call_ai_provider(provider: str, model: str, messages: List[Dict], api_key: s
         except Exception:
             pass  # model_labels unavailable — use model as-is
 
-        if provider == "OpenAI (ChatGPT)":
-            return _call_openai(model, messages, api_key, document_title, prompt_name)
+        # Only the Anthropic path understands the "cache" hint that
+        # build_threaded_messages puts on the stable prefix; other providers
+        # cache identical prefixes automatically and may reject unknown keys.
+        if provider != "Anthropic (Claude)":
+            messages = _strip_cache_hints(messages)
 
-        elif provider == "Anthropic (Claude)":
-            return _call_anthropic(model, messages, api_key, document_title, prompt_name)
+        with timed(f"ai_call:{provider}"):
+            if provider == "OpenAI (ChatGPT)":
+                return _call_openai(model, messages, api_key, document_title, prompt_name)
 
-        elif provider == "Google (Gemini)":
-            return _call_gemini(model, messages, api_key, document_title, prompt_name)
+            elif provider == "Anthropic (Claude)":
+                return _call_anthropic(model, messages, api_key, document_title, prompt_name)
 
-        elif provider == "xAI (Grok)":
-            return _call_xai(model, messages, api_key, document_title, prompt_name)
+            elif provider == "Google (Gemini)":
+                return _call_gemini(model, messages, api_key, document_title, prompt_name)
 
-        elif provider == "DeepSeek":
-            return _call_deepseek(model, messages, api_key, document_title, prompt_name)
+            elif provider == "xAI (Grok)":
+                return _call_xai(model, messages, api_key, document_title, prompt_name)
 
-        elif provider == "Ollama (Local)":
-            # Ollama uses local server, no API key needed
-            return _call_ollama(model, messages, document_title, prompt_name)
+            elif provider == "DeepSeek":
+                return _call_deepseek(model, messages, api_key, document_title, prompt_name)
 
-        elif _is_web_only_provider(provider):
-            # Web-only providers — no API available
-            return False, (
-                f"{provider} does not have an API and cannot be used via DocAnalyser directly.\n\n"
-                f"To use {provider}, select it in the AI Provider dropdown, then click "
-                "Run \u2192 Via Web. DocAnalyser will copy your prompt to the clipboard "
-                f"and open {provider}'s website so you can paste and run it there."
-            )
+            elif provider == "Ollama (Local)":
+                # Ollama uses local server, no API key needed
+                return _call_ollama(model, messages, document_title, prompt_name)
 
-        else:
-            return False, f"Unknown provider: {provider}"
+            elif _is_web_only_provider(provider):
+                # Web-only providers — no API available
+                return False, (
+                    f"{provider} does not have an API and cannot be used via DocAnalyser directly.\n\n"
+                    f"To use {provider}, select it in the AI Provider dropdown, then click "
+                    "Run \u2192 Via Web. DocAnalyser will copy your prompt to the clipboard "
+                    f"and open {provider}'s website so you can paste and run it there."
+                )
+
+            else:
+                return False, f"Unknown provider: {provider}"
 
     except Exception as e:
         return False, f"{provider} error: {str(e)}"
 
 
+def _strip_cache_hints(messages: List[Dict]) -> List[Dict]:
+    """Drop the provider-neutral "cache" flag from messages."""
+    if not any("cache" in msg for msg in messages):
+        return messages
+    return [{k: v for k, v in msg.items() if k != "cache"} for msg in messages]
+
+
+def _openai_usage_tokens(usage) -> Tuple[int, int, int]:
+    """
+    Split OpenAI-compatible usage into (uncached_input, cached_input, output).
+    prompt_tokens includes cached tokens; OpenAI/xAI report them in
+    prompt_tokens_details.cached_tokens, DeepSeek as prompt_cache_hit_tokens.
+    """
+    cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+    if cached is None:
+        cached = getattr(usage, "prompt_cache_hit_tokens", None)
+    cached = min(cached or 0, usage.prompt_tokens)
+    return usage.prompt_tokens - cached, cached, usage.completion_tokens
+
+
 def _is_web_only_provider(provider: str) -> bool:
     """Return True if this provider is web-only (no API). Derived from PROVIDER_REGISTRY."""
     try:
@@ -260,9 +345,10 @@ def _call_openai(model: str, messages: List[Dict], api_key: str,
             temperature=0.7
         )
 
-        # Extract usage and calculate cost
-        usage = response.usage
-        cost = _calculate_cost("OpenAI (ChatGPT)", model, usage.prompt_tokens, usage.completion_tokens)
+        # Extract usage (including prompt-cache hits) and calculate cost
+        input_tokens, cached_tokens, output_tokens = _openai_usage_tokens(response.usage)
+        cost = _calculate_cost("OpenAI (ChatGPT)", model, input_tokens, output_tokens,
+                               cached_tokens=cached_tokens)
 
         # Log the cost with document info
         _log_cost("OpenAI", model, cost, document_title, prompt_name)
@@ -314,6 +400,42 @@ def _create_anthropic_message(client, **kwargs):
         raise
 
 
+def _anthropic_messages_with_cache(messages: List[Dict]):
+    """
+    Convert messages to Anthropic's (system, messages) form.
+
+    Anthropic requires the system message separate. If it carries the
+    "cache" hint (stable document/attachment prefix, see
+    Main.build_threaded_messages) it is sent as a content block with a
+    cache_control breakpoint, and a second breakpoint is placed on the
+    last history message so earlier turns are read from cache as well.
+    """
+    system_message = ""
+    cache_prefix = False
+    converted_messages = []
+    for msg in messages:
+        if msg["role"] == "system":
+            system_message = msg["content"]
+            cache_prefix = bool(msg.get("cache"))
+        else:
+            converted_messages.append({"role": msg["role"], "content": msg["content"]})
+
+    if not (cache_prefix and system_message):
+        return system_message, converted_messages
+
+    breakpoint = {"type": "ephemeral"}
+    system_blocks = [{"type": "text", "text": system_message, "cache_control": breakpoint}]
+    if len(converted_messages) >= 2:
+        last_history = converted_messages[-2]
+        if isinstance(last_history["content"], str) and last_history["content"].strip():
+            converted_messages[-2] = {
+                "role": last_history["role"],
+                "content": [{"type": "text", "text": last_history["content"],
+                             "cache_control": breakpoint}],
+            }
+    return system_blocks, converted_messages
+
+
 def _call_anthropic(model: str, messages: List[Dict], api_key: str,
                     document_title: str = None, prompt_name: str = None) -> Tuple[bool, str]:
     """Call Anthropic Claude API"""
@@ -325,14 +447,7 @@ def _call_anthropic(model: str, messages: List[Dict], api_key: str,
     try:
         client = Anthropic(api_key=api_key)
 
-        # Convert messages format - Anthropic requires system message separate
-        system_message = ""
-        converted_messages = []
-        for msg in messages:
-            if msg["role"] == "system":
-                system_message = msg["content"]
-            else:
-                converted_messages.append(msg)
+        system_message, converted_messages = _anthropic_messages_with_cache(messages)
 
         response = _create_anthropic_message(
             client,
@@ -343,9 +458,13 @@ def _call_anthropic(model: str, messages: List[Dict], api_key: str,
             temperature=0.7,
         )
 
-        # Extract usage and calculate cost
+        # Extract usage (input_tokens excludes cache reads/writes) and calculate cost
         usage = response.usage
-        cost = _calculate_cost("Anthropic (Claude)", model, usage.input_tokens, usage.output_tokens)
+        cost = _calculate_cost(
+            "Anthropic (Claude)", model, usage.input_tokens, usage.output_tokens,
+            cached_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+            cache_write_tokens=getattr(usage, "cache_creation_input_tokens", 0) or 0,
+        )
 
         # Log the cost with document info
         _log_cost("Anthropic", model, cost, document_title, prompt_name)
@@ -396,7 +515,10 @@ def _call_gemini(model: str, messages: List[Dict], api_key: str,
         try:
             input_tokens = response.usage_metadata.prompt_token_count
             output_tokens = response.usage_metadata.candidates_token_count
-            cost = _calculate_cost("Google (Gemini)", model, input_tokens, output_tokens)
+            # Implicit prefix caching: cached tokens are included in prompt_token_count
+            cached_tokens = getattr(response.usage_metadata, "cached_content_token_count", 0) or 0
+            cost = _calculate_cost("Google (Gemini)", model, input_tokens - cached_tokens,
+                                   output_tokens, cached_tokens=cached_tokens)
             # Log the cost with document info
             _log_cost("Google Gemini", model, cost, document_title, prompt_name)
         except:
@@ -425,9 +547,10 @@ def _call_xai(model: str, messages: List[Dict], api_key: str,
             temperature=0.7
         )
 
-        # Extract usage and calculate cost
-        usage = response.usage
-        cost = _calculate_cost("xAI (Grok)", model, usage.prompt_tokens, usage.completion_tokens)
+        # Extract usage (including prompt-cache hits) and calculate cost
+        input_tokens, cached_tokens, output_tokens = _openai_usage_tokens(response.usage)
+        cost = _calculate_cost("xAI (Grok)", model, input_tokens, output_tokens,
+                               cached_tokens=cached_tokens)
 
         # Log the cost with document info
         _log_cost("xAI", model, cost, document_title, prompt_name)
@@ -456,9 +579,10 @@ def _call_deepseek(model: str, messages: List[Dict], api_key: str,
             temperature=0.7
         )
 
-        # Extract usage and calculate cost
-        usage = response.usage
-        cost = _calculate_cost("DeepSeek", model, usage.prompt_tokens, usage.completion_tokens)
+        # Extract usage (including prompt-cache hits) and calculate cost
+        input_tokens, cached_tokens, output_tokens = _openai_usage_tokens(response.usage)
+        cost = _calculate_cost("DeepSeek", model, input_tokens, output_tokens,
+                               cached_tokens=cached_tokens)
 
         # Log the cost with document info
         _log_cost("DeepSeek", model, cost, document_title, prompt_name)
@@ -1029,20 +1153,21 @@ def call_vision_ai(provider: str, model: str, image_path: str, api_key: str,
     
     # Route to appropriate provider
     try:
-        if provider == "OpenAI (ChatGPT)":
-            return _call_openai_vision(model, image_data, media_type, prompt, api_key, document_title, max_tokens)
+        with timed(f"vision_call:{provider}"):
+            if provider == "OpenAI (ChatGPT)":
+                return _call_openai_vision(model, image_data, media_type, prompt, api_key, document_title, max_tokens)
         
-        elif provider == "Anthropic (Claude)":
-            return _call_anthropic_vision(model, image_data, media_type, prompt, api_key, document_title, max_tokens)
+            elif provider == "Anthropic (Claude)":
+                return _call_anthropic_vision(model, image_data, media_type, prompt, api_key, document_title, max_tokens)
         
-        elif provider == "Google (Gemini)":
-            return _call_gemini_vision(model, image_path, prompt, api_key, document_title, max_tokens)
+            elif provider == "Google (Gemini)":
+                return _call_gemini_vision(model, image_path, prompt, api_key, document_title, max_tokens)
         
-        elif provider == "xAI (Grok)":
-            return _call_xai_vision(model, image_data, media_type, prompt, api_key, document_title, max_tokens)
+            elif provider == "xAI (Grok)":
+                return _call_xai_vision(model, image_data, media_type, prompt, api_key, document_title, max_tokens)
         
-        else:
-            return False, f"Provider '{provider}' does not support vision or is not configured for vision AI."
+            else:
+                return False, f"Provider '{provider}' does not support vision or is not configured for vision AI."
     
     except Exception as e:
         return False, f"Vision AI error: {str(e)}"
@@ -1702,6 +1827,210 @@ def ocr_with_google_cloud_vision(
         return False, f"Unexpected error: {str(e)}"
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Tree-reduce consolidation — combines many chunk results level by level
+# ─────────────────────────────────────────────────────────────────────────────
+
+TREE_REDUCE_OUTPUT_ESTIMATE = 1000   # Expected tokens per chunk result (for 'auto')
+
+
+def _reduce_cache_key(provider: str, model: str, prompt_text: str, *parts: str) -> str:
+    """Content hash identifying one map or reduce call."""
+    import hashlib
+    h = hashlib.sha256()
+    for part in (provider, model, prompt_text) + parts:
+        h.update(part.encode("utf-8", "surrogatepass"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _reduce_cache_get(key: str):
+    """Cached result text for key, or None."""
+    import cache_manager
+    from config import REDUCE_CACHE_DIR
+    path = os.path.join(REDUCE_CACHE_DIR, key + ".json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            result = json.load(f).get("result")
+    except (OSError, ValueError):
+        return None
+    cache_manager.touch(path, kind="reduce")
+    return result
+
+
+def _reduce_cache_put(key: str, result: str):
+    """Store result text for key (written atomically)."""
+    import cache_manager
+    from config import REDUCE_CACHE_DIR
+    path = os.path.join(REDUCE_CACHE_DIR, key + ".json")
+    try:
+        cache_manager.atomic_write_json(
+            path, {"result": result, "saved": datetime.datetime.now().isoformat()},
+            kind="reduce", key=key)
+    except OSError as e:
+        print(f"⚠️ Could not save reduce cache: {e}")
+
+
+def _group_for_reduce(sections: list, budget: int, provider: str, model: str) -> list:
+    """
+    Split [(label, text), ...] into consecutive groups whose combined text
+    fits budget tokens.  Groups always pair at least two sections so every
+    level makes progress, even when that overshoots the budget.
+    """
+    from token_counter import count_tokens
+
+    groups, current, current_size = [], [], 0
+    for label, text in sections:
+        n = count_tokens(text, provider, model) + 10
+        if len(current) >= 2 and current_size + n > budget:
+            groups.append(current)
+            current, current_size = [], 0
+        current.append((label, text))
+        current_size += n
+    if current:
+        # Fold a trailing single section into the previous group when possible
+        if len(current) == 1 and groups and len(groups[-1]) > 1:
+            groups[-1] = groups[-1] + current
+        else:
+            groups.append(current)
+    return groups
+
+
+def _section_range(group: list) -> str:
+    """'Sections 3–7' style label spanning a group of labelled sections."""
+    first = group[0][0].replace("Sections ", "").replace("Section ", "")
+    last = group[-1][0].replace("Sections ", "").replace("Section ", "")
+    first, last = first.split("–")[0], last.split("–")[-1]
+    return f"Section {first}" if first == last else f"Sections {first}–{last}"
+
+
+def _combine_sections(sections: list) -> str:
+    return "\n\n---\n\n".join(f"{label}:\n{text}" for label, text in sections)
+
+
+def tree_reduce(
+    results: list,
+    prompt_text: str,
+    provider: str,
+    model: str,
+    call,
+    budget: int,
+    workers: int = 4,
+    status_callback=None,
+) -> Tuple[bool, list]:
+    """
+    Reduce chunk results until their combined text fits in one call.
+
+    Consecutive results are grouped to fit budget tokens, and each group is
+    condensed by one AI call.  All groups at a level run concurrently on
+    `workers` threads, and the condensed outputs are reduced again until they
+    fit.  Each reduction is cached by its inputs (see _reduce_cache_key), so
+    a rerun with the same prompt skips levels it has already done.
+
+    Args:
+        results:  Chunk result texts, in document order
+        call:     callable(user_content, label) -> (ok, text)
+        budget:   Token budget for one reduce call's combined sections
+
+    Returns:
+        (success, [(label, text), ...]) — the sections for the final
+        consolidation call, or (False, error message)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from token_counter import count_tokens
+
+    def _status(msg: str):
+        if status_callback:
+            status_callback(msg)
+
+    sections = [(f"Section {i + 1}", r) for i, r in enumerate(results)]
+    level = 0
+    while len(sections) > 1 and \
+            sum(count_tokens(t, provider, model) + 10 for _, t in sections) > budget:
+        groups = _group_for_reduce(sections, budget, provider, model)
+        if len(groups) == 1:
+            break  # The final consolidation call takes these directly
+        level += 1
+        _status(f"  Reduce level {level}: {len(sections)} sections → {len(groups)} group(s)…")
+
+        def _reduce(group):
+            span = _section_range(group)
+            combined = _combine_sections(group)
+            key = _reduce_cache_key(provider, model, prompt_text, "reduce", combined)
+            cached = _reduce_cache_get(key)
+            if cached is not None:
+                return True, cached
+            ok, resp = call(
+                f"{prompt_text}\n\n"
+                f"Here are the key points extracted from consecutive sections of one "
+                f"document ({span}). Combine them into a single set of key points for "
+                f"this part of the document, keeping every significant detail, "
+                f"quotation and timestamp:\n\n{combined}",
+                span,
+            )
+            if ok:
+                _reduce_cache_put(key, resp)
+            return ok, resp
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            outcomes = list(pool.map(_reduce, groups))
+        for group, (ok, resp) in zip(groups, outcomes):
+            if not ok:
+                return False, f"Failed reducing {_section_range(group)}: {resp}"
+        sections = [(_section_range(g), resp) for g, (_, resp) in zip(groups, outcomes)]
+    return True, sections
+
+
+def reduce_chunk_results(
+    results: list,
+    prompt_text: str,
+    provider: str,
+    model: str,
+    call,
+    consolidation: str = "auto",
+    workers: int = 4,
+    use_tree: bool = False,
+    status_callback=None,
+) -> Tuple[bool, str]:
+    """
+    Prepare chunk results for the final consolidation call.
+
+    'flat' combines every result as is.  Otherwise the results go through
+    tree_reduce when use_tree is set, consolidation is 'tree', or the flat
+    text would not fit the model's budget.  Ollama always reduces on one
+    thread.
+
+    Args:
+        results:  Chunk result texts, in document order
+        call:     callable(user_content, label) -> (ok, text), used for
+                  each reduce call (may run on several threads)
+
+    Returns:
+        (success, combined section text) or (False, error message)
+    """
+    from utils import auto_chunk_budget
+    from token_counter import count_tokens
+
+    sections = [(f"Section {i + 1}", r) for i, r in enumerate(results)]
+    if consolidation != "flat":
+        budget = auto_chunk_budget(provider, model, prompt_text)
+        flat_tokens = sum(count_tokens(r, provider, model) + 10 for r in results)
+        if use_tree or consolidation == "tree" or flat_tokens > budget:
+            ok, sections = tree_reduce(
+                results, prompt_text, provider, model,
+                call=call,
+                budget=budget,
+                workers=1 if "ollama" in provider.lower() else workers,
+                status_callback=status_callback,
+            )
+            if not ok:
+                return False, sections
+
+    if status_callback:
+        status_callback(f"  Consolidating {len(sections)} section result(s)…")
+    return True, _combine_sections(sections)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Standalone chunked processing — shared by viewer_thread and subscription_manager
 # ─────────────────────────────────────────────────────────────────────────────
@@ -1719,10 +2048,18 @@ def process_entries_chunked(
     prompt_name: str = "Prompt",
     status_callback=None,
     inter_chunk_delay: int = 12,
+    consolidation: str = "auto",
+    reduce_workers: int = 4,
 ) -> Tuple[bool, str]:
     """
     Chunk a list of entries, call the AI on each chunk, then consolidate.
 
+    Consolidation is either 'flat' (every chunk result in one final prompt)
+    or 'tree' (results reduced in token-budgeted groups first, see
+    tree_reduce).  'auto' uses the tree when the flat prompt would not fit
+    the model's context.  In tree mode chunk results are cached too, so a
+    rerun with the same prompt resumes where the last one stopped.
+
     This is the canonical implementation shared by the main UI
     (viewer_thread.process_prompt_with_chunking) and the subscription
     processor (subscription_manager._run_ai_and_save).  Any fix here
@@ -1732,7 +2069,7 @@ def process_entries_chunked(
         entries:              DocAnalyser entry dicts with at least a 'text' field.
         prompt_text:          The user's prompt.
         provider / model / api_key: AI provider credentials.
-        chunk_size_setting:   'tiny' | 'small' | 'medium' | 'large'
+        chunk_size_setting:   'tiny' | 'small' | 'medium' | 'large' | 'auto'
         include_timestamps:   Pass True for timestamped content (YouTube etc.).
         timestamp_interval:   Passed through to entries_to_text.
         doc_title:            Used in cost-log labels.
@@ -1740,6 +2077,8 @@ def process_entries_chunked(
         status_callback:      Optional callable(str) for progress messages.
         inter_chunk_delay:    Seconds to wait between chunk API calls (default 12,
                               matching the main UI).
+        consolidation:        'auto' | 'flat' | 'tree'
+        reduce_workers:       Concurrent AI calls per tree-reduce level.
 
     Returns:
         (success: bool, result_text: str)
@@ -1753,7 +2092,8 @@ def process_entries_chunked(
 
     # ── Chunk ─────────────────────────────────────────────────────────────────
     try:
-        chunks = chunk_entries(entries, chunk_size_setting)
+        chunks = chunk_entries(entries, chunk_size_setting, provider=provider,
+                               model=model, prompt_text=prompt_text)
     except Exception as exc:
         _status(f"  Chunking error ({exc}) — falling back to single block.")
         chunks = [entries]
@@ -1798,6 +2138,14 @@ def process_entries_chunked(
         return _call(f"{prompt_text}\n\n{chunk_text}", doc_title)
 
     # ── Multiple chunks ───────────────────────────────────────────────────────
+    from utils import auto_chunk_budget
+
+    reduce_budget = auto_chunk_budget(provider, model, prompt_text)
+    use_tree = consolidation == "tree" or (
+        consolidation == "auto"
+        and total * TREE_REDUCE_OUTPUT_ESTIMATE > reduce_budget
+    )
+
     results = []
     for i, chunk in enumerate(chunks, 1):
         chunk_text = entries_to_text(
@@ -1805,6 +2153,14 @@ def process_entries_chunked(
             include_timestamps=include_timestamps,
             timestamp_interval=timestamp_interval,
         )
+        key = None
+        if use_tree:
+            key = _reduce_cache_key(provider, model, prompt_text, "chunk", chunk_text)
+            cached = _reduce_cache_get(key)
+            if cached is not None:
+                _status(f"  Chunk {i}/{total} reused from cache.")
+                results.append(cached)
+                continue
         _status(f"  Processing chunk {i}/{total}…")
         ok, resp = _call(
             f"{prompt_text}\n\n{chunk_text}",
@@ -1812,16 +2168,25 @@ def process_entries_chunked(
         )
         if not ok:
             return False, f"Failed on chunk {i}/{total}: {resp}"
+        if key:
+            _reduce_cache_put(key, resp)
         results.append(resp)
         if i < total:
             _status(f"  Waiting {inter_chunk_delay}s before next chunk…")
             time.sleep(inter_chunk_delay)
 
     # ── Consolidation ─────────────────────────────────────────────────────────
-    _status(f"  Consolidating {total} chunk results…")
-    combined = "\n\n---\n\n".join(
-        [f"Section {i + 1}:\n{r}" for i, r in enumerate(results)]
+    ok, combined = reduce_chunk_results(
+        results, prompt_text, provider, model,
+        call=lambda content, span: _call(content, f"{doc_title} ({span})"),
+        consolidation=consolidation,
+        workers=reduce_workers,
+        use_tree=use_tree,
+        status_callback=status_callback,
     )
+    if not ok:
+        return False, combined
+
     consolidation_prompt = (
         f"{prompt_text}\n\n"
         f"Here are the key points extracted from each section of the document:\n\n"
@@ -15,6 +15,8 @@ Usage:
 import os
 from typing import List, Dict, Optional
 
+from token_counter import count_tokens
+
 
 # Local AI provider names that have limited context windows
 LOCAL_AI_PROVIDERS = [
@@ -148,7 +150,7 @@ class AttachmentManager:
             return {'error': f"No text content in document: {doc_title}"}
         
         word_count = len(doc_text.split())
-        token_estimate = int(word_count * 1.3)
+        token_estimate = count_tokens(doc_text)
         
         attachment = {
             'doc_id': doc_id,
@@ -187,7 +189,7 @@ class AttachmentManager:
             return {'error': f"No text content: {title}"}
         
         word_count = len(text.split())
-        token_estimate = int(word_count * 1.3)
+        token_estimate = count_tokens(text)
         
         attachment = {
             'path': source,
@@ -236,7 +238,7 @@ class AttachmentManager:
                 return {'error': f"No text content found in {filename}"}
             
             word_count = len(text.split())
-            token_estimate = int(word_count * 1.3)
+            token_estimate = count_tokens(text)
             
             attachment = {
                 'path': filepath,
@@ -284,19 +286,10 @@ class AttachmentManager:
                 return f.read()
     
     def _extract_pdf(self, filepath: str) -> str:
-        """Extract text from PDF"""
-        try:
-            import PyPDF2
-            text_parts = []
-            with open(filepath, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
-            return '\n\n'.join(text_parts)
-        except ImportError:
-            raise ImportError("PyPDF2 not installed. Install with: pip install PyPDF2")
+        """Extract text from PDF (page-parallel, cached per page - see pdf_text)"""
+        from pdf_text import extract_pdf_pages
+        text_parts = [t for t in extract_pdf_pages(filepath, engine="pypdf2") if t]
+        return '\n\n'.join(text_parts)
     
     def _extract_docx(self, filepath: str) -> str:
         """Extract text from DOCX"""
@@ -375,9 +368,15 @@ class AttachmentManager:
         """Get number of attachments"""
         return len(self.attachments)
     
-    def get_total_tokens(self) -> int:
-        """Get estimated total tokens for all attachments"""
-        return sum(att['token_estimate'] for att in self.attachments)
+    def get_total_tokens(self, provider: str = None, model: str = None) -> int:
+        """
+        Get total tokens for all attachments. With a provider/model the
+        counts use that model's tokenizer (cached per attachment text).
+        """
+        if provider is None and model is None:
+            return sum(att['token_estimate'] for att in self.attachments)
+        return sum(count_tokens(att.get('text', ''), provider, model)
+                   for att in self.attachments)
     
     def get_total_words(self) -> int:
         """Get total word count for all attachments"""
@@ -29,6 +29,9 @@ import warnings
 from pathlib import Path
 from typing import Optional, Callable, Dict, List
 import logging
+import cache_manager
+from transcript_cache import (encode_transcript, TranscriptCacheReader,
+                              FILE_EXTENSION as TRANSCRIPT_CACHE_EXT)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -148,6 +151,23 @@ def get_cache_dir() -> str:
     return AUDIO_CACHE_DIR
 
 
+_file_hashes: Dict[tuple, str] = {}   # (path, size, mtime) -> md5 of contents
+
+
+def _audio_file_hash(audio_path: str) -> str:
+    """MD5 of the file contents, read in blocks and memoised per (path, size, mtime)."""
+    st = os.stat(audio_path)
+    stamp = (os.path.abspath(audio_path), st.st_size, st.st_mtime_ns)
+    digest = _file_hashes.get(stamp)
+    if digest is None:
+        h = hashlib.md5()
+        with open(audio_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = _file_hashes[stamp] = h.hexdigest()
+    return digest
+
+
 def get_cache_key(audio_path: str, engine: str, model: str, language: str,
                   use_vad: bool, use_diarization: bool = False) -> str:
     """
@@ -170,24 +190,54 @@ def get_cache_key(audio_path: str, engine: str, model: str, language: str,
     Returns:
         str: Cache key hash
     """
-    file_hash = hashlib.md5(open(audio_path, 'rb').read()).hexdigest()
+    file_hash = _audio_file_hash(audio_path)
     # Include VAD and diarization state in cache key
     cache_string = f"{file_hash}_{engine}_{model}_{language}_{use_vad}_{use_diarization}"
     return hashlib.md5(cache_string.encode()).hexdigest()
 
 
+def open_cached_transcription(cache_key: str) -> Optional[TranscriptCacheReader]:
+    """
+    Lazy reader for a cached transcription (see transcript_cache), or None.
+    Validity is checked from the file header alone; segments are decoded on
+    demand, e.g. reader.segments(0, 20) for a preview.
+    """
+    cache_path = os.path.join(get_cache_dir(), f"{cache_key}{TRANSCRIPT_CACHE_EXT}")
+    if not os.path.exists(cache_path):
+        return None
+    reader = TranscriptCacheReader(cache_path)
+    if not reader.valid:
+        logger.warning(f"⚠️ Unusable cache entry ({reader.error}), re-transcribing")
+        return None
+    cache_manager.touch(cache_path, kind="audio")
+    return reader
+
+
 def get_cached_transcription(cache_key: str) -> Optional[dict]:
     """
     Retrieve cached transcription with validation.
 
     FIX: Added validation to prevent loading incomplete/incorrect transcriptions.
 
+    Reads the compact binary cache; a legacy JSON entry is still accepted
+    and converted to the binary format on first use.
+
     Args:
         cache_key: Cache key hash
 
     Returns:
         dict or None: Cached transcription if valid, None otherwise
     """
+    reader = open_cached_transcription(cache_key)
+    if reader is not None:
+        try:
+            result = reader.to_result()
+            logger.info(f"✅ Using cached transcription ({reader.count} segments)")
+            return result
+        except Exception as e:
+            logger.warning(f"⚠️ Cache read error, re-transcribing: {e}")
+            return None
+
     cache_path = os.path.join(get_cache_dir(), f"{cache_key}.json")
     if os.path.exists(cache_path):
         try:
@@ -208,6 +258,15 @@ def get_cached_transcription(cache_key: str) -> Optional[dict]:
                 return None
 
             logger.info(f"✅ Using cached transcription ({len(result['segments'])} segments)")
+
+            # Migrate the legacy JSON entry to the binary format
+            save_to_cache(cache_key, result)
+            if os.path.exists(os.path.join(get_cache_dir(), f"{cache_key}{TRANSCRIPT_CACHE_EXT}")):
+                try:
+                    os.remove(cache_path)
+                    cache_manager.forget(cache_path)
+                except OSError:
+                    pass
             return result
 
         except (json.JSONDecodeError, UnicodeDecodeError) as e:
@@ -218,11 +277,11 @@ def get_cached_transcription(cache_key: str) -> Optional[dict]:
 
 
 def save_to_cache(cache_key: str, result: dict):
-    """Save transcription result to cache"""
-    cache_path = os.path.join(get_cache_dir(), f"{cache_key}.json")
+    """Save transcription result to cache (compact binary format)"""
+    cache_path = os.path.join(get_cache_dir(), f"{cache_key}{TRANSCRIPT_CACHE_EXT}")
     try:
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        data = encode_transcript({k: v for k, v in result.items() if k != "cached"})
+        cache_manager.atomic_write(cache_path, data, kind="audio", key=cache_key)
         logger.info(f"💾 Saved to cache: {cache_path}")
     except Exception as e:
         logger.warning(f"⚠️ Failed to save cache: {e}")
@@ -234,8 +293,9 @@ def clear_audio_cache():
     if os.path.exists(cache_dir):
         count = 0
         for file in os.listdir(cache_dir):
-            if file.endswith('.json'):
+            if file.endswith(('.json', TRANSCRIPT_CACHE_EXT)):
                 os.remove(os.path.join(cache_dir, file))
+                cache_manager.forget(os.path.join(cache_dir, file))
                 count += 1
         logger.info(f"🗑️ Cleared {count} cached transcriptions")
 
@@ -917,11 +977,11 @@ def transcribe_audio_file(
     language = options.get('language', None)  # None enables auto-detection
     use_vad = options.get('enable_vad', True)
     model_size = options.get('model_size', 'base')
+    timer = None
 
     try:
 
         # Create performance timer
-        timer = None
         if PERFORMANCE_TIMING_AVAILABLE:
             timer = PerformanceTimer(f"Audio Transcription: {os.path.basename(filepath)}")
             timer.set_metadata("file_path", filepath)
@@ -955,13 +1015,8 @@ def transcribe_audio_file(
                 
                 # Save performance log
                 try:
-                    from config import PERFORMANCE_LOGS_DIR
-                    import datetime
-                    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                    safe_filename = os.path.basename(filepath).replace(" ", "_")
-                    filename = f"perf_{timestamp}_{safe_filename}.log"
-                    log_path = os.path.join(PERFORMANCE_LOGS_DIR, filename)
-                    timer.save_log(log_path)
+                    from performance_timer import build_log_path
+                    log_path = timer.save_log(build_log_path("perf", os.path.basename(filepath)))
                     
                     # Display summary in progress callback
                     summary = timer.generate_summary()
@@ -1020,13 +1075,8 @@ def transcribe_audio_file(
                 if timer:
                     timer.complete_operation()
                     try:
-                        from config import PERFORMANCE_LOGS_DIR
-                        import datetime
-                        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                        safe_filename = os.path.basename(filepath).replace(" ", "_")
-                        filename = f"perf_{timestamp}_{safe_filename}.log"
-                        log_path = os.path.join(PERFORMANCE_LOGS_DIR, filename)
-                        timer.save_log(log_path)
+                        from performance_timer import build_log_path
+                        log_path = timer.save_log(build_log_path("perf", os.path.basename(filepath)))
                         summary = timer.generate_summary()
                         if progress_callback:
                             progress_callback(f"✅ Complete | {summary}")
@@ -1236,6 +1286,11 @@ def transcribe_audio_file(
         import traceback
         traceback.print_exc()
         return False, str(e), ""
+    finally:
+        # Cloud engines never call complete_operation(); make sure the timer
+        # doesn't stay active on this thread after we return.
+        if timer:
+            timer.deactivate()
 
 
 """
@@ -0,0 +1,502 @@
+"""
+cache_manager.py - One index, budget and eviction policy for every disk cache.
+
+Each cache in the app registers a *kind* (OCR results, transcriptions, PDF
+page text, AI reductions, podcast media, player transcodes, ...).  Files are
+tracked in a small SQLite index (path, kind, key, size, last access) kept
+next to the data, and each kind has a byte budget and optional maximum age.
+A background thread evicts least-recently-used files of any kind that is
+over budget, so caches on shared workstations stop growing without bound.
+
+Writers use atomic_write() / atomic_write_json() (temp file + os.replace,
+so a crash never leaves a half-written cache entry) and readers call touch()
+on a hit.  Files that appear in a kind's directory without going through the
+manager (older caches, other code) are picked up by rescan().
+
+Kinds marked evictable=False (processed outputs and audio kept for the
+transcript player, which library documents refer to) are indexed for size
+reporting only and never deleted by eviction.  Kinds marked
+clearable=False (podcast downloads, player conversions) are budgeted but
+left alone by a full clear() ("Clear Cache Now").
+
+Usage:
+    import cache_manager
+    cache_manager.atomic_write_json(path, data, kind="ocr")
+    cache_manager.touch(path)
+    cache_manager.get_usage()            # {kind: {'bytes', 'count', 'budget'}}
+    cache_manager.start_background_eviction(config.get("cache_budgets_mb"))
+
+Author: DocAnalyser Development Team
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import (DATA_DIR, OCR_CACHE_DIR, AUDIO_CACHE_DIR, REDUCE_CACHE_DIR,
+                    PDF_TEXT_CACHE_DIR, PODCAST_MEDIA_DIR, PLAYBACK_CACHE_DIR,
+                    MEDIA_INDEX_CACHE_DIR, DIGEST_CACHE_DIR, HTTP_CACHE_DIR)
+from transcript_cache import FILE_EXTENSION as TRANSCRIPT_CACHE_EXT
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+CACHE_INDEX_PATH = os.path.join(DATA_DIR, "cache_index.db")
+EVICTION_INTERVAL_S = 30 * 60        # Background eviction period
+STARTUP_EVICTION_DELAY_S = 60        # Let the app finish starting first
+
+# Never treat these as finished cache entries
+_TRANSIENT_SUFFIXES = (".tmp", ".part", ".state.json")
+
+
+class CacheKind:
+    """A registered cache: where it lives, what counts, and its limits."""
+
+    def __init__(self, name: str, label: str, directory: Optional[str] = None,
+                 budget_mb: int = 0, max_age_days: int = 0, evictable: bool = True,
+                 clearable: bool = True,
+                 match: Optional[Callable[[str], bool]] = None,
+                 on_evict: Optional[Callable[[str], None]] = None):
+        self.name = name
+        self.label = label
+        self.directory = directory
+        self.budget_mb = budget_mb          # 0 = no size limit
+        self.max_age_days = max_age_days    # 0 = no age limit
+        self.evictable = evictable
+        self.clearable = clearable          # Included when clear() is given no kinds
+        self.match = match or (lambda filename: True)
+        self.on_evict = on_evict            # Extra cleanup after a file is removed
+
+    @property
+    def budget_bytes(self) -> int:
+        return int(self.budget_mb) * 1024 * 1024
+
+
+def _is_transcript_cache(filename: str) -> bool:
+    """Transcription cache entries ('.dtc', legacy '.json') in AUDIO_CACHE_DIR."""
+    return filename.endswith((TRANSCRIPT_CACHE_EXT, ".json"))
+
+
+def _remove_sidecar(path: str):
+    """Podcast media keeps a '<file>.json' sidecar; remove it with the file."""
+    try:
+        os.remove(path + ".json")
+    except OSError:
+        pass
+
+
+_kinds: Dict[str, CacheKind] = {}
+_kinds_lock = threading.Lock()
+
+
+def register_kind(kind: CacheKind):
+    """Register (or replace) a cache kind."""
+    with _kinds_lock:
+        _kinds[kind.name] = kind
+
+
+def get_kinds() -> List[CacheKind]:
+    with _kinds_lock:
+        return list(_kinds.values())
+
+
+register_kind(CacheKind(
+    "ocr", "OCR results", OCR_CACHE_DIR, budget_mb=200, max_age_days=180,
+    match=lambda f: f.endswith(".json")))
+register_kind(CacheKind(
+    "audio", "Transcriptions", AUDIO_CACHE_DIR, budget_mb=1024, max_age_days=180,
+    match=_is_transcript_cache))
+register_kind(CacheKind(
+    # Audio saved beside the transcription cache ('yt_<id>.mp3') that the
+    # transcript player links to from library documents
+    "player_audio", "Audio kept for the transcript player", AUDIO_CACHE_DIR,
+    evictable=False, match=lambda f: not _is_transcript_cache(f)))
+register_kind(CacheKind(
+    "pdf_text", "PDF page text", PDF_TEXT_CACHE_DIR, budget_mb=200, max_age_days=90,
+    match=lambda f: f.endswith(".json")))
+register_kind(CacheKind(
+    "reduce", "AI chunk results", REDUCE_CACHE_DIR, budget_mb=100, max_age_days=30,
+    match=lambda f: f.endswith(".json")))
+register_kind(CacheKind(
+    "podcast_media", "Podcast downloads", PODCAST_MEDIA_DIR, budget_mb=2048,
+    clearable=False, match=lambda f: not f.endswith(".json"), on_evict=_remove_sidecar))
+register_kind(CacheKind(
+    # Conversions made by older versions beside their source files
+    # ('<name>_playback.mp3') stay indexed until evicted
+    "playback", "Player audio conversions", PLAYBACK_CACHE_DIR, budget_mb=2048,
+    max_age_days=60, clearable=False, match=lambda f: f.endswith(".mp3")))
+register_kind(CacheKind(
+    "media_index", "Player seek index & waveforms", MEDIA_INDEX_CACHE_DIR,
+    budget_mb=100, max_age_days=90, match=lambda f: f.endswith(".json")))
+register_kind(CacheKind(
+    # One condensed summary per subscription, replaced when its response changes
+    "digest", "Digest condensed summaries", DIGEST_CACHE_DIR, budget_mb=50,
+    max_age_days=90, match=lambda f: f.endswith(".json")))
+register_kind(CacheKind(
+    "http", "Web page responses", HTTP_CACHE_DIR, budget_mb=300, max_age_days=30,
+    match=lambda f: f.endswith(".http")))
+register_kind(CacheKind(
+    "outputs", "Processed outputs", DATA_DIR, evictable=False,
+    match=lambda f: f.startswith("output_") and f.endswith(".txt")))
+
+
+# ============================================================
+# INDEX
+# ============================================================
+
+_conn: Optional[sqlite3.Connection] = None
+_conn_lock = threading.RLock()
+
+
+def _get_connection() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(CACHE_INDEX_PATH), exist_ok=True)
+        _conn = sqlite3.connect(CACHE_INDEX_PATH, check_same_thread=False, timeout=10)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("PRAGMA synchronous=NORMAL")
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                path        TEXT PRIMARY KEY,
+                kind        TEXT NOT NULL,
+                key         TEXT,
+                size        INTEGER NOT NULL DEFAULT 0,
+                created     REAL NOT NULL,
+                last_access REAL NOT NULL
+            )""")
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_kind_access "
+                      "ON cache_entries(kind, last_access)")
+        _conn.commit()
+    return _conn
+
+
+def _norm(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def record(path: str, kind: str, key: Optional[str] = None):
+    """Index (or re-index) a cache file that has just been written."""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return
+    now = time.time()
+    try:
+        with _conn_lock:
+            conn = _get_connection()
+            conn.execute(
+                "INSERT INTO cache_entries (path, kind, key, size, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET kind=excluded.kind, "
+                "key=COALESCE(excluded.key, cache_entries.key), size=excluded.size, "
+                "last_access=excluded.last_access",
+                (_norm(path), kind, key, size, now, now))
+            conn.commit()
+    except sqlite3.Error as e:
+        print(f"⚠️ Cache index update failed: {e}")
+
+
+def touch(path: str, kind: Optional[str] = None):
+    """
+    Mark a cache file as just used.  With kind given, a file not yet in the
+    index is added (e.g. a cache written before the manager existed).
+    """
+    try:
+        with _conn_lock:
+            conn = _get_connection()
+            cur = conn.execute("UPDATE cache_entries SET last_access=? WHERE path=?",
+                               (time.time(), _norm(path)))
+            conn.commit()
+            updated = cur.rowcount
+    except sqlite3.Error:
+        return
+    if not updated and kind:
+        record(path, kind)
+
+
+def forget(path: str):
+    """Drop a file from the index (the caller deleted it)."""
+    try:
+        with _conn_lock:
+            conn = _get_connection()
+            conn.execute("DELETE FROM cache_entries WHERE path=?", (_norm(path),))
+            conn.commit()
+    except sqlite3.Error:
+        pass
+
+
+# ============================================================
+# ATOMIC WRITES
+# ============================================================
+
+def atomic_write(path: str, data, kind: Optional[str] = None,
+                 key: Optional[str] = None, encoding: str = "utf-8"):
+    """
+    Write data (bytes or str) to path via a temp file in the same directory
+    and os.replace, then index it under kind.  Raises OSError on failure.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            with open(tmp, "wb") as f:
+                f.write(data)
+        else:
+            with open(tmp, "w", encoding=encoding) as f:
+                f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    if kind:
+        record(path, kind, key)
+
+
+def atomic_write_json(path: str, obj, kind: Optional[str] = None,
+                      key: Optional[str] = None, indent: Optional[int] = None):
+    """atomic_write() for a JSON-serialisable object."""
+    atomic_write(path, json.dumps(obj, ensure_ascii=False, indent=indent), kind, key)
+
+
+# ============================================================
+# SCAN / USAGE
+# ============================================================
+
+def rescan(kinds: Optional[Iterable[str]] = None):
+    """
+    Bring the index in line with the disk: add untracked files found in each
+    kind's directory (last access = file mtime) and drop entries whose file
+    is gone or that no longer belong to the kind (its match changed).
+    """
+    names = None if kinds is None else set(kinds)
+    selected = [k for k in get_kinds() if names is None or k.name in names]
+    for kind in selected:
+        on_disk = {}
+        if kind.directory and os.path.isdir(kind.directory):
+            for name in os.listdir(kind.directory):
+                if name.endswith(_TRANSIENT_SUFFIXES) or not kind.match(name):
+                    continue
+                path = os.path.join(kind.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if os.path.isfile(path):
+                    on_disk[_norm(path)] = (st.st_size, st.st_mtime)
+
+        try:
+            with _conn_lock:
+                conn = _get_connection()
+                known = dict(conn.execute(
+                    "SELECT path, size FROM cache_entries WHERE kind=?", (kind.name,)))
+                gone = [p for p in known
+                        if (p not in on_disk and not os.path.isfile(p))
+                        or not kind.match(os.path.basename(p))]
+                conn.executemany("DELETE FROM cache_entries WHERE path=?",
+                                 [(p,) for p in gone])
+                conn.executemany(
+                    "INSERT OR IGNORE INTO cache_entries "
+                    "(path, kind, key, size, created, last_access) VALUES (?, ?, NULL, ?, ?, ?)",
+                    [(p, kind.name, size, mtime, mtime)
+                     for p, (size, mtime) in on_disk.items() if p not in known])
+                conn.executemany(
+                    "UPDATE cache_entries SET size=? WHERE path=?",
+                    [(size, p) for p, (size, _m) in on_disk.items()
+                     if p in known and known[p] != size])
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Cache rescan failed for {kind.name}: {e}")
+
+
+def get_usage() -> Dict[str, Dict]:
+    """
+    Bytes and file count per kind from the index, plus 'total'.
+    Each value: {'label', 'bytes', 'count', 'budget'}.
+    """
+    usage = {k.name: {"label": k.label, "bytes": 0, "count": 0, "budget": k.budget_bytes}
+             for k in get_kinds()}
+    try:
+        with _conn_lock:
+            rows = _get_connection().execute(
+                "SELECT kind, COALESCE(SUM(size), 0), COUNT(*) FROM cache_entries "
+                "GROUP BY kind").fetchall()
+    except sqlite3.Error:
+        rows = []
+    for kind, size, count in rows:
+        entry = usage.setdefault(kind, {"label": kind, "bytes": 0, "count": 0, "budget": 0})
+        entry["bytes"], entry["count"] = size, count
+    usage["total"] = {
+        "label": "Total",
+        "bytes": sum(v["bytes"] for v in usage.values()),
+        "count": sum(v["count"] for v in usage.values()),
+        "budget": 0,
+    }
+    return usage
+
+
+# ============================================================
+# EVICTION
+# ============================================================
+
+# Paths in use by a running job (e.g. downloaded episodes waiting to be
+# transcribed); no eviction, background or explicit, removes them.
+_held: Dict[str, int] = {}
+_held_lock = threading.Lock()
+
+
+def hold(path: str):
+    """Protect path from eviction until a matching unhold()."""
+    key = _norm(path)
+    with _held_lock:
+        _held[key] = _held.get(key, 0) + 1
+
+
+def unhold(path: str):
+    key = _norm(path)
+    with _held_lock:
+        count = _held.get(key, 0) - 1
+        if count > 0:
+            _held[key] = count
+        else:
+            _held.pop(key, None)
+
+
+def _delete(kind: CacheKind, path: str) -> bool:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"⚠️ Could not evict {path}: {e}")
+        return False
+    if kind.on_evict:
+        kind.on_evict(path)
+    forget(path)
+    return True
+
+
+def evict(kinds: Optional[Iterable[str]] = None, budget_mb: Optional[int] = None,
+          keep: Iterable[str] = ()) -> Tuple[int, int]:
+    """
+    Enforce limits for the given kinds (default: all evictable kinds):
+    first delete entries past max_age_days, then least recently used
+    entries until the kind is under budget.
+
+    Args:
+        kinds: Kind names to process
+        budget_mb: Override the kind's budget for this call
+        keep: Paths never to evict (e.g. the file just written); held
+              paths (see hold()) are always kept as well
+
+    Returns:
+        (files_removed, bytes_freed)
+    """
+    keep = {_norm(p) for p in keep}
+    with _held_lock:
+        keep.update(_held)
+    names = None if kinds is None else set(kinds)
+    selected = [k for k in get_kinds() if k.evictable and (names is None or k.name in names)]
+    rescan(k.name for k in selected if k.directory)
+
+    removed = freed = 0
+    now = time.time()
+    for kind in selected:
+        budget = kind.budget_bytes if budget_mb is None else int(budget_mb) * 1024 * 1024
+        try:
+            with _conn_lock:
+                rows = _get_connection().execute(
+                    "SELECT path, size, last_access FROM cache_entries "
+                    "WHERE kind=? ORDER BY last_access", (kind.name,)).fetchall()
+        except sqlite3.Error:
+            continue
+
+        total = sum(size for _p, size, _a in rows)
+        cutoff = now - kind.max_age_days * 86400 if kind.max_age_days else None
+        for path, size, last_access in rows:
+            too_old = cutoff is not None and last_access < cutoff
+            over = budget and total > budget
+            if not (too_old or over):
+                if cutoff is None:
+                    break   # Sorted by access: nothing later is too old either
+                continue
+            if path in keep:
+                continue
+            if _delete(kind, path):
+                removed += 1
+                freed += size
+                total -= size
+    if removed:
+        print(f"🧹 Cache eviction: removed {removed} file(s), freed {freed / 1048576:.1f} MB")
+    return removed, freed
+
+
+def clear(kinds: Optional[Iterable[str]] = None) -> Tuple[int, int]:
+    """
+    Delete every file of the given evictable kinds (default: every
+    clearable one). Returns (files, bytes).
+    """
+    names = None if kinds is None else set(kinds)
+    selected = [k for k in get_kinds() if k.evictable
+                and (k.clearable if names is None else k.name in names)]
+    rescan(k.name for k in selected if k.directory)
+    removed = freed = 0
+    for kind in selected:
+        try:
+            with _conn_lock:
+                rows = _get_connection().execute(
+                    "SELECT path, size FROM cache_entries WHERE kind=?",
+                    (kind.name,)).fetchall()
+        except sqlite3.Error:
+            continue
+        for path, size in rows:
+            if _delete(kind, path):
+                removed += 1
+                freed += size
+    return removed, freed
+
+
+def configure(budgets_mb: Optional[Dict[str, int]] = None,
+              max_age_days: Optional[Dict[str, int]] = None):
+    """Apply user budgets / ages (from config) to the registered kinds."""
+    with _kinds_lock:
+        for name, mb in (budgets_mb or {}).items():
+            if name in _kinds:
+                _kinds[name].budget_mb = int(mb)
+        for name, days in (max_age_days or {}).items():
+            if name in _kinds:
+                _kinds[name].max_age_days = int(days)
+
+
+_eviction_thread: Optional[threading.Thread] = None
+
+
+def start_background_eviction(budgets_mb: Optional[Dict[str, int]] = None,
+                              max_age_days: Optional[Dict[str, int]] = None,
+                              interval_s: int = EVICTION_INTERVAL_S):
+    """Apply config and start the periodic eviction thread (once per process)."""
+    global _eviction_thread
+    configure(budgets_mb, max_age_days)
+    if _eviction_thread and _eviction_thread.is_alive():
+        return
+
+    def loop():
+        time.sleep(STARTUP_EVICTION_DELAY_S)
+        while True:
+            try:
+                evict()
+            except Exception as e:
+                print(f"⚠️ Cache eviction failed: {e}")
+            time.sleep(interval_s)
+
+    _eviction_thread = threading.Thread(target=loop, daemon=True, name="cache-eviction")
+    _eviction_thread.start()
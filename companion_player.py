@@ -40,6 +40,13 @@ try:
 except Exception:
     PYGAME_OK = False
 
+# ── Seek index (optional: needs the rest of DocAnalyser alongside) ────────────
+try:
+    import media_index
+    MEDIA_INDEX_OK = True
+except Exception:
+    MEDIA_INDEX_OK = False
+
 # ── Appearance ────────────────────────────────────────────────────────────────
 BG         = "#2b2b2b"   # dark background — visible alongside white Word doc
 FG         = "#e8e8e8"
@@ -111,6 +118,8 @@ class CompanionPlayer:
         self._play_start_pos  = 0.0      # position (secs) when play started
         self._slider_dragging = False    # True while user drags the slider
         self._loading         = False    # True while ffmpeg conversion runs
+        self._index           = None     # media_index.MediaIndex of the loaded file
+        self._seek_stream     = None     # open slice pygame is playing from
 
         self._build_ui()
         self._poll_position()            # start the 200 ms update loop
@@ -317,14 +326,24 @@ class CompanionPlayer:
                 self.root.after(0, lambda: setattr(self, "_loading", False))
                 return
 
+            # Seek index: constant-time jumps, and the duration without
+            # decoding the whole file.
+            index = None
+            if MEDIA_INDEX_OK:
+                try:
+                    index = media_index.build(load_path, peaks=False)
+                except Exception:
+                    index = None
+
             # Measure duration.
-            duration = 0.0
-            try:
-                snd      = pygame.mixer.Sound(load_path)
-                duration = snd.get_length()
-                del snd
-            except Exception:
-                pass
+            duration = index.duration if index else 0.0
+            if not duration:
+                try:
+                    snd      = pygame.mixer.Sound(load_path)
+                    duration = snd.get_length()
+                    del snd
+                except Exception:
+                    pass
 
             def _apply():
                 if self._playing:
@@ -333,6 +352,9 @@ class CompanionPlayer:
 
                 self._audio_path      = path
                 self._mp3_path        = mp3_path if mp3_path != path else None
+                self._load_path       = load_path
+                self._index           = index
+                self._close_seek_stream()
                 self._duration        = duration
                 self._position        = 0.0
                 self._play_start_pos  = 0.0
@@ -383,7 +405,11 @@ class CompanionPlayer:
             return
         seconds = max(0.0, min(seconds, self._duration or seconds))
         pygame.mixer.music.stop()
-        pygame.mixer.music.play(start=seconds)
+        if not self._play_indexed(seconds):
+            if self._seek_stream is not None:
+                self._close_seek_stream()
+                pygame.mixer.music.load(self._load_path)
+            pygame.mixer.music.play(start=seconds)
         self._position        = seconds
         self._play_start_pos  = seconds
         self._play_start_wall = time.time()
@@ -391,6 +417,32 @@ class CompanionPlayer:
         self._update_play_btn()
         self._set_status(f"Playing from {_fmt_time(seconds)}")
 
+    def _play_indexed(self, seconds: float) -> bool:
+        """Play from seconds via the seek index (False if there isn't one)."""
+        if self._index is None or not self._index.can_seek:
+            return False
+        try:
+            stream, skip = self._index.open_at(seconds)
+        except OSError:
+            return False
+        try:
+            pygame.mixer.music.load(stream, "mp3")
+            pygame.mixer.music.play(start=skip)
+        except Exception:
+            stream.close()
+            return False
+        self._close_seek_stream()
+        self._seek_stream = stream
+        return True
+
+    def _close_seek_stream(self):
+        if self._seek_stream is not None:
+            try:
+                self._seek_stream.close()
+            except Exception:
+                pass
+            self._seek_stream = None
+
     def _seek_back10(self):  self._seek(max(0.0, self._position - 10.0))
     def _seek_fwd10(self):   self._seek(self._position + 10.0)
     def _seek_back30(self):  self._seek(max(0.0, self._position - 30.0))
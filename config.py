@@ -96,11 +96,27 @@ LIBRARY_PATH = os.path.join(DATA_DIR, "document_library.json")
 SUMMARIES_DIR = os.path.join(DATA_DIR, "summaries")
 OCR_CACHE_DIR = os.path.join(DATA_DIR, "ocr_cache")
 AUDIO_CACHE_DIR = os.path.join(DATA_DIR, "audio_cache")
+REDUCE_CACHE_DIR = os.path.join(DATA_DIR, "reduce_cache")
+PDF_TEXT_CACHE_DIR = os.path.join(DATA_DIR, "pdf_text_cache")
+PLAYBACK_CACHE_DIR = os.path.join(DATA_DIR, "playback_cache")
+MEDIA_INDEX_CACHE_DIR = os.path.join(DATA_DIR, "media_index_cache")
+DIGEST_CACHE_DIR = os.path.join(DATA_DIR, "digest_cache")
+HTTP_CACHE_DIR = os.path.join(DATA_DIR, "http_cache")
+PERFORMANCE_LOGS_DIR = os.path.join(DATA_DIR, "performance_logs")
+PODCAST_MEDIA_DIR = os.path.join(DATA_DIR, "podcast_media")
 
 # Create necessary directories
 os.makedirs(SUMMARIES_DIR, exist_ok=True)
 os.makedirs(OCR_CACHE_DIR, exist_ok=True)
 os.makedirs(AUDIO_CACHE_DIR, exist_ok=True)
+os.makedirs(REDUCE_CACHE_DIR, exist_ok=True)
+os.makedirs(PDF_TEXT_CACHE_DIR, exist_ok=True)
+os.makedirs(PLAYBACK_CACHE_DIR, exist_ok=True)
+os.makedirs(MEDIA_INDEX_CACHE_DIR, exist_ok=True)
+os.makedirs(DIGEST_CACHE_DIR, exist_ok=True)
+os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+os.makedirs(PERFORMANCE_LOGS_DIR, exist_ok=True)
+os.makedirs(PODCAST_MEDIA_DIR, exist_ok=True)
 
 
 # =============================================================================
@@ -436,6 +452,11 @@ DEFAULT_CONFIG = {
     "last_provider": "Google (Gemini)",  # Changed to cheapest option (was OpenAI)
     "last_model_update": None,
     "chunk_size": "medium",
+    "cost_confirm_threshold": 1.00,  # Ask before runs estimated to cost at least this many dollars
+    "consolidation_mode": "auto",    # auto / flat / tree - how multi-chunk results are combined
+    "reduce_workers": 4,             # Concurrent AI calls per tree-reduce level
+    "cache_budgets_mb": {},          # Per-kind cache budgets overriding cache_manager defaults, e.g. {"audio": 2048}
+    "cache_max_age_days": {},        # Per-kind maximum age overrides (0 = no limit)
     "ocr_language": "eng",
     "ocr_quality": "balanced",
     "tesseract_path": "",
@@ -450,7 +471,7 @@ DEFAULT_CONFIG = {
     "moonshine_chunk_seconds": 15,  # Moonshine audio chunk duration (10-30s, default 15)
     "corrections_enabled": True,  # Enable real-time corrections during transcription
     "corrections_project": "default",  # Active corrections project/dictionary
-    "performance_logging": True,  # Save performance logs after transcription
+    "performance_logging": True,  # Save performance logs (transcription, OCR, AI calls) to PERFORMANCE_LOGS_DIR
     # Dictation/Speech-to-text settings
     "dictation_mode": "local_first",  # local_first, cloud_direct, local_only
     "whisper_model": "large-v3-turbo",  # tiny, base, small, medium, large-v3-turbo, large-v3
@@ -459,6 +480,8 @@ DEFAULT_CONFIG = {
     # Ollama configuration
     "ollama_base_url": "http://localhost:11434",  # Ollama default server URL
     "auto_generate_embeddings": False,  # Auto-generate semantic search embeddings for new documents
+    "subscription_scheduler": True,  # Run scheduled subscription checks in the background while the app is open
+    "subscription_seen_retention_days": 180,  # Prune seen-item history older than this (latest 200 per subscription always kept)
     # Source input mode preference
     "source_mode_preference": "",  # "single", "multiple", or "" (no preference saved)
     "default_prompt": "",  # Name of the default prompt to select on startup
@@ -510,6 +533,14 @@ CHUNK_SIZES = {
         "label": "Large (20+ pages)",
         "description": "Fastest - Quick overview, may miss details",
         "quality": "⭐⭐⭐"
+    },
+    "auto": {
+        "chars": None,           # Sized in tokens from the selected model instead
+        "fill": 0.9,             # Fraction of the usable context to fill
+        "max_tokens": 200_000,   # Cap for very long-context models
+        "label": "Auto (fit to model)",
+        "description": "Fewest AI calls - packs each chunk close to the selected model's context window",
+        "quality": "⭐⭐⭐"
     }
 }
 
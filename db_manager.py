@@ -14,6 +14,9 @@ Tables (Phase 1):
 Tables (v1.7-alpha additions):
     corrections_lists, corrections, backups
 
+Tables (subscriptions):
+    subscriptions, subscription_seen
+
 Created: 28 February 2026
 v1.7-alpha additions: 28 April 2026
 v1.7-alpha Day 7 (backups table): 30 April 2026
@@ -31,6 +34,7 @@ import logging
 from typing import Dict, List, Optional, Tuple
 
 from config import DATA_DIR
+from performance_timer import timed
 
 # ---------------------------------------------------------------------------
 # Database path & connection
@@ -257,6 +261,30 @@ CREATE TABLE IF NOT EXISTS db_meta (
     key             TEXT PRIMARY KEY,
     value           TEXT
 );
+
+-- 16. subscriptions
+--     Hot fields are real columns; everything else in the subscription
+--     dict (prompt, filters, schedule, feed validators…) lives in settings.
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id              TEXT PRIMARY KEY,
+    position        INTEGER NOT NULL DEFAULT 0,
+    name            TEXT NOT NULL DEFAULT '',
+    sub_type        TEXT,
+    enabled         INTEGER DEFAULT 1,
+    last_checked    TEXT,
+    settings        TEXT,
+    updated_at      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_subscriptions_position ON subscriptions(position);
+
+-- 17. subscription_seen  (one row per processed/skipped feed item)
+CREATE TABLE IF NOT EXISTS subscription_seen (
+    sub_id          TEXT NOT NULL REFERENCES subscriptions(id) ON DELETE CASCADE,
+    guid            TEXT NOT NULL,
+    seen_at         TEXT NOT NULL,
+    PRIMARY KEY (sub_id, guid)
+);
+CREATE INDEX IF NOT EXISTS idx_subscription_seen_age ON subscription_seen(seen_at);
 """
 
 
@@ -451,6 +479,7 @@ def _blob_to_floats(blob: bytes) -> list:
 #  DOCUMENTS
 # ===================================================================
 
+@timed("db_write:add_document")
 def db_add_document(doc_id: str, doc_type: str, source: str, title: str,
                     entry_count: int = 0, metadata: dict = None,
                     document_class: str = "source",
@@ -507,6 +536,7 @@ def db_get_all_documents(include_deleted: bool = False) -> List[dict]:
     return results
 
 
+@timed("db_write:update_document")
 def db_update_document(doc_id: str, **fields) -> bool:
     """
     Update specific fields on a document.
@@ -558,6 +588,55 @@ def db_delete_document(doc_id: str, hard: bool = False) -> bool:
     return cur.rowcount > 0
 
 
+def db_get_documents_by_type(doc_type: str, include_deleted: bool = False,
+                             metadata_key: str = None,
+                             metadata_values: List[str] = None) -> List[dict]:
+    """
+    Documents of one doc_type (newest first), optionally only those whose
+    metadata[metadata_key] is one of metadata_values.  Uses the doc_type
+    index instead of loading the whole table.
+    """
+    conn = get_connection()
+    sql = "SELECT * FROM documents WHERE doc_type = ?"
+    params: list = [doc_type]
+    if not include_deleted:
+        sql += " AND is_deleted = 0"
+    if metadata_key is not None:
+        if not metadata_values:
+            return []
+        # CASE guards json_extract against a malformed metadata column
+        sql += (" AND CASE WHEN json_valid(metadata) "
+                "THEN json_extract(metadata, ?) END IN ("
+                + ",".join("?" * len(metadata_values)) + ")")
+        params += [f"$.{metadata_key}"] + list(metadata_values)
+    rows = conn.execute(sql + " ORDER BY created_at DESC", params).fetchall()
+    results = []
+    for row in rows:
+        d = _row_to_dict(row)
+        d["metadata"] = _from_json(d.get("metadata")) or {}
+        results.append(d)
+    return results
+
+
+def db_get_documents_by_ids(doc_ids: List[str], include_deleted: bool = False) -> List[dict]:
+    """The documents with the given IDs (missing IDs are skipped)."""
+    ids = [d for d in dict.fromkeys(doc_ids) if d]
+    if not ids:
+        return []
+    conn = get_connection()
+    results = []
+    for k in range(0, len(ids), 500):       # Stay under SQLite's variable limit
+        batch = ids[k:k + 500]
+        sql = f"SELECT * FROM documents WHERE id IN ({','.join('?' * len(batch))})"
+        if not include_deleted:
+            sql += " AND is_deleted = 0"
+        for row in conn.execute(sql, batch).fetchall():
+            d = _row_to_dict(row)
+            d["metadata"] = _from_json(d.get("metadata")) or {}
+            results.append(d)
+    return results
+
+
 def db_search_documents(query: str) -> List[dict]:
     """Search documents by title or source (case-insensitive substring)."""
     conn = get_connection()
@@ -610,6 +689,7 @@ def db_get_document_count(include_deleted: bool = False) -> int:
 #  DOCUMENT ENTRIES
 # ===================================================================
 
+@timed("db_write:save_entries")
 def db_save_entries(doc_id: str, entries: List[dict]) -> bool:
     """
     Replace all entries for a document.
@@ -671,6 +751,29 @@ def db_get_entries(doc_id: str) -> Optional[List[dict]]:
     return entries
 
 
+def db_iter_entries(doc_id: str):
+    """
+    Yield a document's entries one at a time, ordered by position.
+    Same dict format as db_get_entries(), without materialising the list
+    (used for streaming exports of large documents).
+    """
+    conn = get_connection()
+    cursor = conn.execute("""
+        SELECT content, entry_type, metadata
+        FROM document_entries
+        WHERE doc_id = ?
+        ORDER BY position
+    """, (doc_id,))
+    for row in cursor:
+        entry = {"text": row["content"]}
+        if row["entry_type"] != "text":
+            entry["entry_type"] = row["entry_type"]
+        meta = _from_json(row["metadata"])
+        if meta:
+            entry.update(meta)
+        yield entry
+
+
 # ===================================================================
 #  CONVERSATIONS & MESSAGES
 # ===================================================================
@@ -717,6 +820,7 @@ def db_get_conversation(doc_id: str) -> Optional[dict]:
     }
 
 
+@timed("db_write:save_conversation")
 def db_save_conversation(doc_id: str, messages: List[dict],
                          metadata: dict = None) -> bool:
     """
@@ -772,6 +876,7 @@ def db_save_conversation(doc_id: str, messages: List[dict],
     return True
 
 
+@timed("db_write:add_message")
 def db_add_message(doc_id: str, role: str, content: str,
                    provider: str = None, model: str = None) -> Optional[int]:
     """
@@ -1322,6 +1427,7 @@ def db_get_cost_summary(period: str = "30d",
 #  EMBEDDINGS
 # ===================================================================
 
+@timed("db_write:save_embeddings")
 def db_save_embeddings(doc_id: str, chunks: List[dict],
                        embeddings: List[list], cost: float = 0.0,
                        provider: str = None, model: str = None) -> bool:
@@ -1373,6 +1479,54 @@ def db_get_embeddings(doc_id: str) -> List[dict]:
     return results
 
 
+def db_iter_embedding_rows(doc_id: str):
+    """
+    Yield a document's embeddings as raw rows, ordered by chunk_idx:
+    {'chunk_idx', 'text', 'embedding_blob', 'model'} (blob left packed).
+    """
+    conn = get_connection()
+    cursor = conn.execute("""
+        SELECT chunk_idx, chunk_text, embedding, model
+        FROM embeddings
+        WHERE doc_id = ?
+        ORDER BY chunk_idx
+    """, (doc_id,))
+    for r in cursor:
+        yield {
+            "chunk_idx": r["chunk_idx"],
+            "text": r["chunk_text"],
+            "embedding_blob": r["embedding"],
+            "model": r["model"],
+        }
+
+
+@timed("db_write:save_embedding_rows")
+def db_save_embedding_rows(doc_id: str, rows) -> int:
+    """
+    Save already-packed embedding rows (as yielded by db_iter_embedding_rows)
+    for a document, replacing any existing embeddings. Returns rows written.
+    """
+    conn = get_connection()
+    now = _now()
+    count = 0
+    try:
+        conn.execute("DELETE FROM embeddings WHERE doc_id = ?", (doc_id,))
+        for row in rows:
+            conn.execute("""
+                INSERT INTO embeddings
+                    (doc_id, chunk_idx, chunk_text, embedding, model, cost, created_at)
+                VALUES (?, ?, ?, ?, ?, 0, ?)
+            """, (doc_id, row["chunk_idx"], row.get("text", ""),
+                  row["embedding_blob"], row.get("model"), now))
+            count += 1
+        conn.commit()
+    except Exception:
+        # Don't leave a half-written batch in the shared connection's transaction
+        conn.rollback()
+        raise
+    return count
+
+
 def db_has_embeddings(doc_id: str) -> bool:
     """Check whether a document has stored embeddings."""
     conn = get_connection()
@@ -1729,3 +1883,250 @@ def db_prune_backups(document_id: str, keep: int = 10) -> int:
     )
     conn.commit()
     return cur.rowcount
+
+
+# ===================================================================
+#  SUBSCRIPTIONS
+# ===================================================================
+
+# Columns stored directly; every other key goes into the settings JSON.
+# seen_guids is never stored on the row — it lives in subscription_seen.
+_SUBSCRIPTION_COLUMNS = ("id", "name", "type", "enabled", "last_checked")
+
+
+def _subscription_row_to_dict(row: sqlite3.Row) -> dict:
+    sub = _from_json(row["settings"]) or {}
+    sub.update({
+        "id":           row["id"],
+        "name":         row["name"],
+        "enabled":      bool(row["enabled"]),
+        "last_checked": row["last_checked"],
+    })
+    if row["sub_type"] is not None:
+        sub["type"] = row["sub_type"]
+    return sub
+
+
+def _subscription_settings(sub: dict) -> Optional[str]:
+    extra = {k: v for k, v in sub.items()
+             if k not in _SUBSCRIPTION_COLUMNS and k != "seen_guids"}
+    return _json_col(extra) if extra else None
+
+
+def db_get_all_subscriptions() -> List[dict]:
+    """Return all subscriptions in display order (without seen GUIDs)."""
+    conn = get_connection()
+    rows = conn.execute(
+        "SELECT * FROM subscriptions ORDER BY position, rowid"
+    ).fetchall()
+    return [_subscription_row_to_dict(r) for r in rows]
+
+
+def db_get_subscription(sub_id: str) -> Optional[dict]:
+    """Return one subscription dict (without seen GUIDs), or None."""
+    conn = get_connection()
+    row = conn.execute(
+        "SELECT * FROM subscriptions WHERE id = ?", (sub_id,)
+    ).fetchone()
+    return _subscription_row_to_dict(row) if row else None
+
+
+def db_save_subscription(sub: dict, position: int = None) -> bool:
+    """
+    Insert or replace a subscription row.  New rows go to the end of the
+    list unless `position` is given.  Any 'seen_guids' key is ignored —
+    use db_add_seen_guids().
+    """
+    conn = get_connection()
+    if position is None:
+        row = conn.execute(
+            "SELECT position FROM subscriptions WHERE id = ?", (sub["id"],)
+        ).fetchone()
+        if row:
+            position = row["position"]
+        else:
+            row = conn.execute(
+                "SELECT COALESCE(MAX(position), -1) + 1 AS next_pos FROM subscriptions"
+            ).fetchone()
+            position = row["next_pos"]
+
+    conn.execute("""
+        INSERT OR REPLACE INTO subscriptions
+            (id, position, name, sub_type, enabled, last_checked, settings, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, (sub["id"], position, sub.get("name", ""), sub.get("type"),
+          1 if sub.get("enabled", True) else 0, sub.get("last_checked"),
+          _subscription_settings(sub), _now()))
+    conn.commit()
+    return True
+
+
+def db_update_subscription(sub_id: str, updates: dict) -> bool:
+    """
+    Apply a partial update to one subscription row (no other row is
+    touched).  'seen_guids' in updates is ignored.
+    """
+    current = db_get_subscription(sub_id)
+    if current is None:
+        return False
+    current.update({k: v for k, v in updates.items() if k != "seen_guids"})
+
+    conn = get_connection()
+    cur = conn.execute("""
+        UPDATE subscriptions
+        SET name = ?, sub_type = ?, enabled = ?, last_checked = ?,
+            settings = ?, updated_at = ?
+        WHERE id = ?
+    """, (current.get("name", ""), current.get("type"),
+          1 if current.get("enabled", True) else 0, current.get("last_checked"),
+          _subscription_settings(current), _now(), sub_id))
+    conn.commit()
+    return cur.rowcount > 0
+
+
+def db_delete_subscription(sub_id: str) -> bool:
+    """Delete a subscription and (via cascade) its seen GUIDs."""
+    conn = get_connection()
+    cur = conn.execute("DELETE FROM subscriptions WHERE id = ?", (sub_id,))
+    conn.commit()
+    return cur.rowcount > 0
+
+
+def db_replace_subscriptions(subs: List[dict]) -> bool:
+    """
+    Make the subscriptions table match `subs` (order included).  Rows
+    not in the list are deleted; seen GUIDs of surviving rows are kept.
+    """
+    conn = get_connection()
+    keep_ids = [s["id"] for s in subs]
+    try:
+        if keep_ids:
+            placeholders = ",".join("?" * len(keep_ids))
+            conn.execute(
+                f"DELETE FROM subscriptions WHERE id NOT IN ({placeholders})",
+                keep_ids,
+            )
+        else:
+            conn.execute("DELETE FROM subscriptions")
+        now = _now()
+        for pos, sub in enumerate(subs):
+            conn.execute("""
+                INSERT INTO subscriptions
+                    (id, position, name, sub_type, enabled, last_checked, settings, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    position = excluded.position, name = excluded.name,
+                    sub_type = excluded.sub_type, enabled = excluded.enabled,
+                    last_checked = excluded.last_checked,
+                    settings = excluded.settings, updated_at = excluded.updated_at
+            """, (sub["id"], pos, sub.get("name", ""), sub.get("type"),
+                  1 if sub.get("enabled", True) else 0, sub.get("last_checked"),
+                  _subscription_settings(sub), now))
+        conn.commit()
+        return True
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def db_add_seen_guids(sub_id: str, guids: List[str], seen_at: str = None) -> int:
+    """
+    Record feed item GUIDs as seen for a subscription.  Already-seen
+    GUIDs keep their original seen_at.  Returns the number added.
+    """
+    if not guids:
+        return 0
+    conn = get_connection()
+    seen_at = seen_at or _now()
+    before = conn.total_changes
+    conn.executemany(
+        "INSERT OR IGNORE INTO subscription_seen (sub_id, guid, seen_at) VALUES (?, ?, ?)",
+        [(sub_id, g, seen_at) for g in dict.fromkeys(guids) if g]
+    )
+    conn.commit()
+    return conn.total_changes - before
+
+
+def db_filter_unseen_guids(sub_id: str, guids: List[str]) -> List[str]:
+    """
+    Return the GUIDs from `guids` not yet seen for this subscription,
+    preserving order.  Cost is proportional to len(guids), not to the
+    size of the seen history.
+    """
+    if not guids:
+        return []
+    conn = get_connection()
+    seen = set()
+    unique = list(dict.fromkeys(guids))
+    # Stay well under SQLite's bound-parameter limit
+    for start in range(0, len(unique), 500):
+        batch = unique[start:start + 500]
+        placeholders = ",".join("?" * len(batch))
+        rows = conn.execute(
+            f"SELECT guid FROM subscription_seen WHERE sub_id = ? AND guid IN ({placeholders})",
+            [sub_id, *batch]
+        ).fetchall()
+        seen.update(r["guid"] for r in rows)
+    return [g for g in guids if g not in seen]
+
+
+def db_get_seen_guids(sub_id: str) -> List[str]:
+    """Return every seen GUID for a subscription, oldest first."""
+    conn = get_connection()
+    rows = conn.execute(
+        "SELECT guid FROM subscription_seen WHERE sub_id = ? ORDER BY seen_at",
+        (sub_id,)
+    ).fetchall()
+    return [r["guid"] for r in rows]
+
+
+def db_clear_seen_guids(sub_id: str) -> int:
+    """Forget the seen history for a subscription. Returns rows deleted."""
+    conn = get_connection()
+    cur = conn.execute("DELETE FROM subscription_seen WHERE sub_id = ?", (sub_id,))
+    conn.commit()
+    return cur.rowcount
+
+
+def db_prune_seen_guids(older_than_days: int, keep_latest: int = 200) -> int:
+    """
+    Delete seen-GUID rows older than `older_than_days`, always keeping
+    each subscription's `keep_latest` most recent rows.  Returns rows
+    deleted.
+
+    The per-subscription floor matters for slow feeds: an item that is
+    still listed in a feed must stay "seen", or it would be processed
+    again once its row aged out.
+    """
+    cutoff = (datetime.datetime.now()
+              - datetime.timedelta(days=older_than_days)).isoformat()
+    conn = get_connection()
+    cur = conn.execute("""
+        DELETE FROM subscription_seen WHERE rowid IN (
+            SELECT rowid FROM (
+                SELECT rowid, seen_at,
+                       ROW_NUMBER() OVER (PARTITION BY sub_id
+                                          ORDER BY seen_at DESC) AS rn
+                FROM subscription_seen
+            )
+            WHERE rn > ? AND seen_at < ?
+        )
+    """, (keep_latest, cutoff))
+    conn.commit()
+    return cur.rowcount
+
+
+def db_get_meta(key: str) -> Optional[str]:
+    """Read a value from the db_meta key/value table."""
+    conn = get_connection()
+    row = conn.execute("SELECT value FROM db_meta WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else None
+
+
+def db_set_meta(key: str, value: str):
+    """Write a value to the db_meta key/value table."""
+    conn = get_connection()
+    conn.execute(
+        "INSERT OR REPLACE INTO db_meta (key, value) VALUES (?, ?)", (key, value)
+    )
+    conn.commit()
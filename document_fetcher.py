@@ -12,6 +12,8 @@ from typing import List, Dict, Optional, Tuple
 from config import *
 from utils import format_timestamp
 from ocr_handler import is_pdf_scanned
+from pdf_text import extract_pdf_pages
+import html_extract
 
 # Document processing library
 try:
@@ -56,16 +58,20 @@ except Exception:
 
 PDF_SUPPORT = PDF_SUPPORT_PYPDF2 or PDF_SUPPORT_PYMUPDF
 
-# Web scraping
+# Web scraping (HTML text extraction itself is html_extract.py)
 try:
     import requests
+
+    WEB_SUPPORT = True
+except Exception:
+    WEB_SUPPORT = False
+
+try:
     from bs4 import BeautifulSoup
 
     BS4_SUPPORT = True
-    WEB_SUPPORT = True
 except Exception:
     BS4_SUPPORT = False
-    WEB_SUPPORT = False
 
 # Spreadsheet support
 try:
@@ -429,9 +435,6 @@ def fetch_local_file(filepath: str) -> Tuple[bool, any, str, str]:
 
         elif ext in ['.html', '.htm']:
             # HTML files - extract text from HTML
-            if not BS4_SUPPORT:
-                return False, "BeautifulSoup not installed. Install with: pip install beautifulsoup4", title, "file"
-            
             try:
                 # Try multiple encodings
                 html_content = None
@@ -449,20 +452,10 @@ def fetch_local_file(filepath: str) -> Tuple[bool, any, str, str]:
                 if not html_content:
                     return False, "Could not read HTML file with any supported encoding", title, "file"
                 
-                # Parse HTML with BeautifulSoup
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                
-                # Get text
-                text = soup.get_text()
-                
-                # Clean up whitespace
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = '\n'.join(chunk for chunk in chunks if chunk)
+                # Keep all non-boilerplate text - a saved document, not just an article body
+                page = html_extract.extract(html_content, main_content=False,
+                                            max_bytes=len(html_content))
+                text = '\n'.join(page.paragraphs)
                 
                 # Clean up any encoding issues
                 text = clean_text_encoding(text)
@@ -583,22 +576,10 @@ def fetch_local_file(filepath: str) -> Tuple[bool, any, str, str]:
             # Try PyMuPDF first (most robust)
             if PDF_SUPPORT_PYMUPDF:
                 try:
-                    import fitz
-                    doc = fitz.open(filepath)
-
-                    for page_num in range(len(doc)):
-                        try:
-                            page = doc[page_num]
-                            text = page.get_text()
-
-                            if text and text.strip():
-                                entries.append(
-                                    {'start': page_num + 1, 'text': text.strip(), 'location': f'Page {page_num + 1}'})
-                        except Exception as e:
-                            print(f"Warning: Could not extract text from page {page_num + 1}: {e}")
-                            continue
-
-                    doc.close()
+                    for page_num, text in enumerate(extract_pdf_pages(filepath, engine="pymupdf"), start=1):
+                        if text and text.strip():
+                            entries.append(
+                                {'start': page_num, 'text': text.strip(), 'location': f'Page {page_num}'})
 
                     # If we got good results, return them
                     if entries and sum(len(e['text']) for e in entries) > 100:
@@ -611,22 +592,10 @@ def fetch_local_file(filepath: str) -> Tuple[bool, any, str, str]:
             # Fallback to PyPDF2 if PyMuPDF failed or not available
             if PDF_SUPPORT_PYPDF2 and not entries:
                 try:
-                    import warnings
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore")
-
-                        with open(filepath, 'rb') as f:
-                            reader = PyPDF2.PdfReader(f)
-
-                            for page_num, page in enumerate(reader.pages, start=1):
-                                try:
-                                    text = page.extract_text()
-                                    if text and text.strip():
-                                        entries.append(
-                                            {'start': page_num, 'text': text.strip(), 'location': f'Page {page_num}'})
-                                except Exception as e:
-                                    print(f"Warning: Could not extract text from page {page_num}: {e}")
-                                    continue
+                    for page_num, text in enumerate(extract_pdf_pages(filepath, engine="pypdf2"), start=1):
+                        if text and text.strip():
+                            entries.append(
+                                {'start': page_num, 'text': text.strip(), 'location': f'Page {page_num}'})
 
                     if entries and sum(len(e['text']) for e in entries) > 100:
                         extraction_method = "PyPDF2"
@@ -726,42 +695,46 @@ def fetch_local_file(filepath: str) -> Tuple[bool, any, str, str]:
 # Web URL Fetching
 # -------------------------
 
-def fetch_web_url(url: str) -> Tuple[bool, any, str, str, dict]:
+def fetch_web_url(url: str, probe_head: bool = False) -> Tuple[bool, any, str, str, dict]:
     """
     Fetch content from a web URL.
     Handles Google Sheets, HTML pages, and direct PDF links.
 
+    Requests go through http_client's shared connection pool and response
+    cache, so fetching an unchanged page again costs at most a 304.  The
+    GET response's Content-Type decides between PDF and HTML; pass
+    probe_head=True to check with a HEAD request first instead (avoids
+    downloading a large body that turns out to be neither).
+
     Returns: (success: bool, result: list/str, title: str, doc_type: str, metadata: dict)
     """
     if not WEB_SUPPORT:
-        return False, "requests and beautifulsoup4 not installed. Install with: pip install requests beautifulsoup4", url, "web", {}
+        return False, "requests not installed. Install with: pip install requests", url, "web", {}
     
     # Check if this is a Google Sheets URL
     if is_google_sheets_url(url):
         success, result, title, doc_type = fetch_google_sheet(url)
         return success, result, title, doc_type, {}
 
-    # Use browser-like headers to avoid 403 Forbidden errors
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-    }
+    import http_client
 
     try:
-        # First, make a HEAD request to check content type
-        head_response = requests.head(url, timeout=10, allow_redirects=True, headers=headers)
-        content_type = head_response.headers.get('Content-Type', '').lower()
+        if probe_head:
+            # Bail out before downloading a body that is neither a page nor a PDF
+            head_type = http_client.head(url).content_type
+            if head_type and not url.lower().endswith('.pdf') and not any(
+                    t in head_type for t in ('pdf', 'html', 'xml', 'text/')):
+                return False, f"Unsupported content type: {head_type}", url, "web", {}
+
+        response = http_client.get(url)
+        response.raise_for_status()
 
         # Check if it's a PDF by content-type or URL extension
-        is_pdf = 'application/pdf' in content_type or url.lower().endswith('.pdf')
+        is_pdf = 'application/pdf' in response.content_type or url.lower().endswith('.pdf')
 
         if is_pdf:
-            # Handle PDF URLs by downloading to temp file
+            # Handle PDF URLs by saving the download to a temp file
             try:
-                response = requests.get(url, timeout=30, headers=headers)
-                response.raise_for_status()
-
                 # Create a temporary file to save the PDF
                 with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_pdf:
                     temp_pdf.write(response.content)
@@ -792,29 +765,18 @@ def fetch_web_url(url: str) -> Tuple[bool, any, str, str, dict]:
             except Exception as e:
                 return False, f"Failed to download/process PDF: {str(e)}", url, "web_pdf", {}
 
-        # Not a PDF - proceed with HTML scraping
-        response = requests.get(url, timeout=10, headers=headers)
-        response.raise_for_status()
-
-        if BS4_SUPPORT:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            title = soup.title.string.strip() if soup.title else url
-            paragraphs = [p.get_text().strip() for p in soup.find_all('p') if p.get_text().strip()]
+        # Not a PDF - extract the main article text
+        page = html_extract.extract(response.text)
+        if not page:
+            return False, "No meaningful content found", url, "web", {}
 
-            if not paragraphs:
-                return False, "No meaningful content found", url, "web", {}
+        metadata = {}
+        published_date = normalize_publication_date(page.published)
+        if published_date:
+            metadata['published_date'] = published_date
 
-            # Extract publication date from meta tags
-            published_date = extract_publication_date(soup, response.text)
-            
-            metadata = {}
-            if published_date:
-                metadata['published_date'] = published_date
-
-            entries = [{'text': p} for p in paragraphs]
-            return True, entries, title, "web", metadata
-        else:
-            return False, "BeautifulSoup not installed. Install with: pip install beautifulsoup4", url, "web", {}
+        entries = [{'text': p} for p in page.paragraphs]
+        return True, entries, page.title or url, "web", metadata
 
     except Exception as e:
         return False, f"Failed to fetch URL: {str(e)}", url, "web", {}
@@ -891,6 +853,16 @@ def extract_publication_date(soup, html_text: str) -> str:
         except Exception:
             pass
     
+    return normalize_publication_date(date_str)
+
+
+def normalize_publication_date(date_str: Optional[str]) -> str:
+    """
+    Normalize a date string found on a page (meta tag, <time>, JSON-LD)
+    to ISO YYYY-MM-DD, or return an empty string if it can't be parsed.
+    """
+    from datetime import datetime
+
     # Parse and normalize the date
     if date_str:
         try:
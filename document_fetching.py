@@ -1757,7 +1757,6 @@ class DocumentFetchingMixin:
         try:
             from podcast_handler import resolve_podcast_episode, download_podcast_audio
             from audio_handler import transcribe_audio_file
-            import shutil
             
             # Step 1: Resolve podcast URL to episode metadata + audio URL
             success, msg, episode, podcast_info = resolve_podcast_episode(
@@ -1813,17 +1812,8 @@ class DocumentFetchingMixin:
                 progress_callback=self.set_status
             )
             
-            # Clean up temp audio file
-            try:
-                parent_dir = os.path.dirname(audio_path)
-                if os.path.exists(audio_path):
-                    os.remove(audio_path)
-                # If it was in a temp directory, clean that too
-                import tempfile
-                if parent_dir.startswith(tempfile.gettempdir()):
-                    shutil.rmtree(parent_dir, ignore_errors=True)
-            except Exception as e:
-                print(f"⚠️ Could not clean up temp audio: {e}")
+            # The audio stays in the podcast media store (size-capped, LRU
+            # evicted) so re-fetching this episode needs no download.
             
             if not tx_success:
                 self.root.after(0, self._handle_podcast_result,
@@ -2079,7 +2069,6 @@ class DocumentFetchingMixin:
         try:
             from podcast_handler import download_podcast_audio
             from audio_handler import transcribe_audio_file
-            import shutil
             
             # Step 1: Download audio
             self.set_status(f"🎙️ Downloading: {episode.title}...")
@@ -2116,16 +2105,8 @@ class DocumentFetchingMixin:
                 progress_callback=self.set_status
             )
             
-            # Clean up temp audio
-            try:
-                parent_dir = os.path.dirname(audio_path)
-                if os.path.exists(audio_path):
-                    os.remove(audio_path)
-                import tempfile
-                if parent_dir.startswith(tempfile.gettempdir()):
-                    shutil.rmtree(parent_dir, ignore_errors=True)
-            except Exception as e:
-                logging.warning(f"Could not clean up temp audio: {e}")
+            # The audio stays in the podcast media store (size-capped, LRU
+            # evicted) so re-fetching this episode needs no download.
             
             if not tx_success:
                 self.root.after(0, self._handle_podcast_result,
@@ -2176,8 +2157,9 @@ class DocumentFetchingMixin:
     
     def _fetch_podcast_episodes_batch(self, episodes, podcast_info=None):
         """
-        Download and transcribe multiple podcast episodes sequentially.
-        Each episode becomes its own library entry.
+        Download and transcribe multiple podcast episodes.
+        Up to PODCAST_DOWNLOAD_WORKERS downloads run ahead of the
+        (sequential) transcription. Each episode becomes its own library entry.
         """
         count = len(episodes)
         confirm = messagebox.askyesno(
@@ -2221,23 +2203,54 @@ class DocumentFetchingMixin:
         fail_count = 0
         last_success_data = None  # (entries, title, metadata) of last success
         
+        downloads = {}
+        held = []            # Store paths protected from eviction until the batch ends
+        pool = None
         try:
-            from podcast_handler import download_podcast_audio
+            import cache_manager
+            from podcast_handler import download_podcast_audio, PODCAST_DOWNLOAD_WORKERS
             from audio_handler import transcribe_audio_file
-            import shutil
+            from concurrent.futures import ThreadPoolExecutor
+            
+            # Downloads run ahead of transcription on a small pool: while
+            # episode N is being transcribed, the next few are downloading.
+            # The look-ahead is bounded so a large selection doesn't pull
+            # every episode at once.  Downloaded episodes are held in the
+            # media store until transcribed and the store is pruned only
+            # when the batch is over, so eviction can't remove an episode
+            # that is downloaded but not yet used.
+            pool = ThreadPoolExecutor(max_workers=PODCAST_DOWNLOAD_WORKERS,
+                                      thread_name_prefix="podcast-dl")
+            
+            def download_and_hold(episode, progress_callback):
+                result = download_podcast_audio(episode, prune=False,
+                                                progress_callback=progress_callback)
+                if result[0] and pool is not None:
+                    cache_manager.hold(result[1])
+                    held.append(result[1])
+                return result
+            
+            def submit_download(i):
+                if i < total and i not in downloads:
+                    downloads[i] = pool.submit(
+                        download_and_hold, episodes[i],
+                        progress_callback=lambda msg, n=i + 1, t=total: self.set_status(
+                            f"🎙️ [{n}/{t}] {msg}"
+                        )
+                    )
+            
+            for i in range(PODCAST_DOWNLOAD_WORKERS):
+                submit_download(i)
             
             for idx, episode in enumerate(episodes):
                 ep_num = idx + 1
                 self.set_status(f"🎙️ Batch [{ep_num}/{total}] Downloading: {episode.title}...")
                 
                 try:
-                    # Download
-                    dl_ok, filepath_or_err = download_podcast_audio(
-                        episode,
-                        progress_callback=lambda msg, n=ep_num, t=total: self.set_status(
-                            f"🎙️ [{n}/{t}] {msg}"
-                        )
-                    )
+                    # Download (already under way on the pool)
+                    submit_download(idx)
+                    dl_ok, filepath_or_err = downloads.pop(idx).result()
+                    submit_download(idx + PODCAST_DOWNLOAD_WORKERS)
                     
                     if not dl_ok:
                         logging.warning(f"Batch podcast: download failed for '{episode.title}': {filepath_or_err}")
@@ -2268,17 +2281,6 @@ class DocumentFetchingMixin:
                         )
                     )
                     
-                    # Clean up temp audio
-                    try:
-                        parent_dir = os.path.dirname(audio_path)
-                        if os.path.exists(audio_path):
-                            os.remove(audio_path)
-                        import tempfile
-                        if parent_dir.startswith(tempfile.gettempdir()):
-                            shutil.rmtree(parent_dir, ignore_errors=True)
-                    except Exception:
-                        pass
-                    
                     if not tx_ok:
                         logging.warning(f"Batch podcast: transcription failed for '{episode.title}': {entries_or_err}")
                         fail_count += 1
@@ -2347,6 +2349,20 @@ class DocumentFetchingMixin:
             self.root.after(0, lambda: messagebox.showerror("Batch Error", str(e)))
             self.root.after(0, lambda: self.set_status(f"❌ Batch error: {e}"))
             self.processing = False
+        finally:
+            if pool is not None:
+                for future in downloads.values():
+                    future.cancel()
+                pool.shutdown(wait=False)
+            pool = None         # Downloads still finishing no longer hold
+            try:
+                import cache_manager
+                for path in held:
+                    cache_manager.unhold(path)
+                from download_manager import prune_media_store
+                prune_media_store()
+            except Exception as e:
+                logging.warning(f"Batch podcast: media store prune failed: {e}")
     
     def _handle_batch_podcast_complete(self, success_count, fail_count, total, last_success_data):
         """
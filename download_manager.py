@@ -0,0 +1,424 @@
+"""
+download_manager.py - Resumable Media Downloads and Local Media Store
+=====================================================================
+Downloads large media files (podcast episodes) into a content-addressed
+local store so the same enclosure is never fetched twice.
+
+Features:
+  - Store key = SHA-256 of (enclosure URL, enclosure length), so a
+    re-published episode with a new file gets a new entry while repeat
+    requests for the same one are served from disk instantly
+  - HTTP Range resume: an interrupted download continues from where it
+    stopped (validated with If-Range against the server's ETag /
+    Last-Modified, so a changed file is restarted rather than spliced)
+  - Segmented downloads: files over SEGMENTED_MIN_BYTES on servers that
+    accept ranges are fetched over SEGMENT_COUNT parallel connections
+  - Concurrent requests for the same key share one download
+  - The store is size-capped (MEDIA_STORE_MAX_MB); least recently used
+    files are evicted first
+
+Store layout (PODCAST_MEDIA_DIR):
+    <key><ext>             completed file
+    <key><ext>.json        sidecar: url, size, title, downloaded
+    <key><ext>.part        partial download (preallocated to full size)
+    <key><ext>.state.json  segment progress for resume
+
+Usage:
+    from download_manager import download_to_store
+    ok, path_or_error = download_to_store(url, expected_length=0, ext=".mp3")
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Optional, Tuple, List, Callable, Dict
+from concurrent.futures import ThreadPoolExecutor
+
+import cache_manager
+
+logger = logging.getLogger(__name__)
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+
+SEGMENTED_MIN_BYTES = 32 * 1024 * 1024   # Split files larger than this
+SEGMENT_COUNT       = 4                  # Parallel connections per large file
+CHUNK_SIZE          = 256 * 1024
+STATE_SAVE_BYTES    = 4 * 1024 * 1024    # Persist resume state this often
+PROGRESS_INTERVAL   = 0.5                # Seconds between progress callbacks
+REQUEST_TIMEOUT     = (15, 60)           # (connect, read) seconds
+MEDIA_STORE_MAX_MB  = 2048               # Evict least recently used above this
+
+_key_locks: Dict[str, threading.Lock] = {}
+_key_locks_guard = threading.Lock()
+
+
+class DownloadCancelled(Exception):
+    """Raised inside a download when the caller's stop flag is set."""
+
+
+class _RangeIgnored(Exception):
+    """The server answered a ranged request with the whole file."""
+
+
+# ============================================================
+# STORE PATHS
+# ============================================================
+
+def get_media_store_dir() -> str:
+    from config import PODCAST_MEDIA_DIR
+    os.makedirs(PODCAST_MEDIA_DIR, exist_ok=True)
+    return PODCAST_MEDIA_DIR
+
+
+def media_key(url: str, expected_length: int = 0) -> str:
+    """Content-address for an enclosure: hash of its URL and declared length."""
+    url = (url or "").split("#", 1)[0].strip()
+    return hashlib.sha256(f"{url}|{int(expected_length or 0)}".encode("utf-8")).hexdigest()[:32]
+
+
+def get_store_path(url: str, expected_length: int = 0, ext: str = ".mp3") -> str:
+    return os.path.join(get_media_store_dir(), media_key(url, expected_length) + ext)
+
+
+def find_in_store(url: str, expected_length: int = 0, ext: str = ".mp3") -> Optional[str]:
+    """Return the stored file for this enclosure if it has been fully downloaded."""
+    path = get_store_path(url, expected_length, ext)
+    return path if os.path.isfile(path) else None
+
+
+def _lock_for(key: str) -> threading.Lock:
+    with _key_locks_guard:
+        lock = _key_locks.get(key)
+        if lock is None:
+            lock = _key_locks[key] = threading.Lock()
+        return lock
+
+
+def _write_json_atomic(path: str, data: dict):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+# ============================================================
+# HTTP HELPERS
+# ============================================================
+
+def _parse_content_range(value: str) -> Optional[int]:
+    """'bytes 0-0/12345' → 12345 (None if the total is unknown)."""
+    match = re.match(r"bytes\s+\d+-\d+/(\d+)", value or "")
+    return int(match.group(1)) if match else None
+
+
+def _validators(response) -> Dict[str, str]:
+    return {
+        "etag":          response.headers.get("ETag", ""),
+        "last_modified": response.headers.get("Last-Modified", ""),
+    }
+
+
+def _if_range(state: dict) -> Dict[str, str]:
+    # A weak ETag can't be used with If-Range; fall back to Last-Modified
+    etag = state.get("etag", "")
+    if etag and not etag.startswith("W/"):
+        return {"If-Range": etag}
+    if state.get("last_modified"):
+        return {"If-Range": state["last_modified"]}
+    return {}
+
+
+def _probe(session, url: str):
+    """
+    Ask for the first byte to learn the size, range support and validators.
+
+    Returns (response, total_size, accepts_ranges).  If the server ignored
+    the Range header the response is a full 200 body the caller can stream
+    straight away; otherwise it has already been closed.
+    """
+    response = session.get(url, headers={"Range": "bytes=0-0"}, stream=True,
+                           timeout=REQUEST_TIMEOUT, allow_redirects=True)
+    response.raise_for_status()
+    if response.status_code == 206:
+        total = _parse_content_range(response.headers.get("Content-Range", ""))
+        response.close()
+        return response, total, total is not None
+    total = int(response.headers.get("Content-Length") or 0) or None
+    return response, total, False
+
+
+# ============================================================
+# DOWNLOAD
+# ============================================================
+
+class _Progress:
+    """Thread-safe byte counter that throttles progress callbacks."""
+
+    def __init__(self, total: Optional[int], done: int, callback: Optional[Callable], label: str):
+        self.total = total
+        self.done = done
+        self.callback = callback
+        self.label = label
+        self._lock = threading.Lock()
+        self._last_report = 0.0
+        self._since_save = 0
+
+    def add(self, nbytes: int) -> bool:
+        """Count bytes; returns True when resume state is due to be saved."""
+        with self._lock:
+            self.done += nbytes
+            self._since_save += nbytes
+            save_due = self._since_save >= STATE_SAVE_BYTES
+            if save_due:
+                self._since_save = 0
+            now = time.monotonic()
+            report = self.callback and now - self._last_report >= PROGRESS_INTERVAL
+            if report:
+                self._last_report = now
+        if report:
+            self.report()
+        return save_due
+
+    def report(self):
+        if not self.callback:
+            return
+        mb = self.done / (1024 * 1024)
+        if self.total:
+            pct = int(self.done / self.total * 100)
+            self.callback(f"{self.label}{mb:.1f} / {self.total / (1024 * 1024):.1f} MB ({pct}%)")
+        else:
+            self.callback(f"{self.label}{mb:.1f} MB")
+
+
+def _stream_into(response, fh, segment: Optional[list], progress: _Progress,
+                 stop_flag, on_save: Callable):
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        if stop_flag and stop_flag[0]:
+            raise DownloadCancelled()
+        if not chunk:
+            continue
+        fh.write(chunk)
+        if segment is not None:
+            segment[2] += len(chunk)
+        if progress.add(len(chunk)):
+            on_save()
+
+
+def _download_segment(url: str, part_path: str, segment: list, state: dict,
+                      progress: _Progress, stop_flag, on_save: Callable):
+    """Fetch bytes [segment[2], segment[1]] into part_path at the same offset."""
+    start, end, pos = segment
+    if pos > end:
+        return
+    headers = {"Range": f"bytes={pos}-{end}"}
+    headers.update(_if_range(state))
+    with requests.Session() as session:
+        response = session.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT)
+        try:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise _RangeIgnored()
+            # Unbuffered, so saved resume state never counts bytes still
+            # sitting in a write buffer
+            with open(part_path, "r+b", buffering=0) as fh:
+                fh.seek(pos)
+                _stream_into(response, fh, segment, progress, stop_flag, on_save)
+        finally:
+            response.close()
+    if segment[2] <= end:
+        raise IOError(f"Connection closed early (bytes {segment[2]}-{end} missing)")
+
+
+def _plan_segments(total: int, segmented: bool) -> List[list]:
+    """Split [0, total) into [start, end, next_pos] triples."""
+    count = SEGMENT_COUNT if segmented and total >= SEGMENTED_MIN_BYTES else 1
+    size = -(-total // count)
+    return [[i, min(i + size, total) - 1, i] for i in range(0, total, size)]
+
+
+def _download(url: str, part_path: str, state_path: str,
+              progress_callback: Optional[Callable], label: str,
+              stop_flag, segmented: bool) -> int:
+    """
+    Download url into part_path, resuming from state_path when possible.
+    Returns the final size in bytes.
+    """
+    with requests.Session() as session:
+        response, total, accepts_ranges = _probe(session, url)
+        fresh = _validators(response)
+
+        # ── Server ignored Range or size unknown: one plain stream ────────
+        if not accepts_ranges:
+            if response.status_code != 200:
+                response = session.get(url, stream=True, timeout=REQUEST_TIMEOUT)
+                response.raise_for_status()
+            progress = _Progress(total, 0, progress_callback, label)
+            try:
+                with open(part_path, "wb") as fh:
+                    _stream_into(response, fh, None, progress, stop_flag, lambda: None)
+            finally:
+                response.close()
+            if os.path.exists(state_path):
+                os.remove(state_path)
+            size = os.path.getsize(part_path)
+            if total and size != total:
+                raise IOError(f"Incomplete download ({size} of {total} bytes)")
+            return size
+
+    # ── Ranged download, resuming any compatible partial state ────────────
+    state = _read_json(state_path) if os.path.exists(part_path) else None
+    if (not state or state.get("size") != total
+            or state.get("etag", "") != fresh["etag"]
+            or state.get("last_modified", "") != fresh["last_modified"]):
+        state = {"url": url, "size": total, **fresh,
+                 "segments": _plan_segments(total, segmented)}
+        with open(part_path, "wb") as fh:
+            fh.truncate(total)
+        _write_json_atomic(state_path, state)
+    else:
+        logger.info(f"Resuming download: {os.path.basename(part_path)}")
+
+    segments = state["segments"]
+    done = sum(seg[2] - seg[0] for seg in segments)
+    progress = _Progress(total, done, progress_callback, label)
+    save_lock = threading.Lock()
+
+    def save_state():
+        with save_lock:
+            _write_json_atomic(state_path, state)
+
+    pending = [seg for seg in segments if seg[2] <= seg[1]]
+    try:
+        if len(pending) <= 1:
+            for seg in pending:
+                _download_segment(url, part_path, seg, state, progress, stop_flag, save_state)
+        else:
+            with ThreadPoolExecutor(max_workers=len(pending),
+                                    thread_name_prefix="segment") as pool:
+                futures = [pool.submit(_download_segment, url, part_path, seg, state,
+                                       progress, stop_flag, save_state)
+                           for seg in pending]
+                errors = [f.exception() for f in futures]
+            for err in errors:
+                if err is not None:
+                    raise err
+    except _RangeIgnored:
+        # Server stopped honouring ranges (or the file changed): start over
+        os.remove(state_path)
+        raise IOError("Server no longer accepts range requests; retry to download again")
+    except BaseException:
+        save_state()
+        raise
+
+    progress.report()
+    os.remove(state_path)
+    return total
+
+
+def download_to_store(url: str, expected_length: int = 0, ext: str = ".mp3",
+                      title: str = "",
+                      progress_callback: Optional[Callable[[str], None]] = None,
+                      stop_flag: Optional[list] = None,
+                      segmented: bool = True,
+                      prune: bool = True) -> Tuple[bool, str]:
+    """
+    Download url into the media store (or find it there).
+
+    Args:
+        url: Media URL (e.g. a podcast enclosure)
+        expected_length: Declared size from the feed, part of the store key
+        ext: File extension for the stored file
+        title: Human-readable name recorded in the sidecar
+        progress_callback: Optional function(status_str)
+        stop_flag: Optional one-element list; set [True] to cancel.  The
+                   partial file is kept so the next call resumes it.
+        segmented: Allow multi-connection downloads for large files
+        prune: Enforce the store's size cap after a new download.  Batch
+               callers that download ahead pass False (so files not yet
+               used can't be evicted) and call prune_media_store() when done.
+
+    Returns:
+        (success, file_path_or_error)
+    """
+    if not REQUESTS_AVAILABLE:
+        return False, "requests library not installed"
+    if not url:
+        return False, "No URL to download"
+
+    key = media_key(url, expected_length)
+    final_path = os.path.join(get_media_store_dir(), key + ext)
+    part_path = final_path + ".part"
+    state_path = final_path + ".state.json"
+    label = "Downloading: "
+
+    with _lock_for(key):
+        if os.path.isfile(final_path):
+            cache_manager.touch(final_path, kind="podcast_media")   # mark as recently used
+            logger.info(f"Media store hit: {title or url}")
+            return True, final_path
+
+        try:
+            size = _download(url, part_path, state_path, progress_callback,
+                             label, stop_flag, segmented)
+        except DownloadCancelled:
+            return False, "Download cancelled (partial file kept for resume)"
+        except requests.exceptions.Timeout:
+            return False, "Download timed out (it will resume from where it stopped)"
+        except requests.exceptions.RequestException as e:
+            return False, f"Download error: {e}"
+        except Exception as e:
+            return False, f"Error saving audio: {e}"
+
+        if size < 10000:  # Less than 10KB is suspicious
+            os.remove(part_path)
+            return False, "Downloaded file is too small — may be an error page"
+
+        os.replace(part_path, final_path)
+        try:
+            _write_json_atomic(final_path + ".json", {
+                "url": url,
+                "expected_length": int(expected_length or 0),
+                "size": size,
+                "title": title,
+                "downloaded": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            })
+        except OSError as e:
+            logger.warning(f"Could not write media sidecar: {e}")
+        cache_manager.record(final_path, "podcast_media", key)
+
+    if prune:
+        prune_media_store(keep=[final_path])
+    return True, final_path
+
+
+# ============================================================
+# STORE MAINTENANCE
+# ============================================================
+
+def prune_media_store(max_mb: int = MEDIA_STORE_MAX_MB, keep: List[str] = ()) -> int:
+    """
+    Delete least recently used completed files until the store is under
+    max_mb (via cache_manager, which also removes sidecars).  Partial
+    downloads are left alone.  Returns files removed.
+    """
+    removed, _freed = cache_manager.evict(["podcast_media"], budget_mb=max_mb, keep=keep)
+    if removed:
+        logger.info(f"Media store: evicted {removed} file(s)")
+    return removed
@@ -14,6 +14,7 @@ from __future__ import annotations
 
 import os
 import re
+import sys
 import datetime
 import logging
 import tkinter as tk
@@ -52,7 +53,41 @@ class ExportUtilitiesMixin:
             print("✅ Thread saved!")
         else:
             print("ℹ️  No thread to save (either no messages or no document loaded)")
-        
+
+        # Stop scheduled subscription checks (an in-flight item finishes first)
+        scheduler = getattr(self, "subscription_scheduler", None)
+        if scheduler:
+            scheduler.stop(timeout=2.0)
+
+        # Don't leave player conversions running after exit
+        try:
+            import transcode_service
+            transcode_service.shutdown()
+        except Exception:
+            pass
+
+        # Close pooled web connections
+        try:
+            import http_client
+            http_client.close()
+        except Exception:
+            pass
+
+        # Quit pooled headless browsers (Substack scraping)
+        try:
+            import webdriver_pool
+            webdriver_pool.shutdown()
+        except Exception:
+            pass
+
+        # Release in-process Tesseract engines (only if OCR ran this session)
+        try:
+            ocr_handler = sys.modules.get("ocr_handler")
+            if ocr_handler is not None:
+                ocr_handler.TesseractWorker.shutdown()
+        except Exception:
+            pass
+
         print("👋 Goodbye!")
         print("=" * 60)
         
@@ -541,6 +576,11 @@ class ExportUtilitiesMixin:
         from cost_tracker import show_costs_dialog
         show_costs_dialog(self.root)
 
+    def show_performance_log(self):
+        """Display the performance rollup viewer - delegates to performance_timer module"""
+        from performance_timer import show_performance_dialog
+        show_performance_dialog(self.root)
+
     def open_add_sources(self):
         """
         Open the unified Add Sources dialog.
@@ -559,9 +599,10 @@ class ExportUtilitiesMixin:
                 'prompt_text': self.prompt_text.get('1.0', tk.END).strip() if hasattr(self, 'prompt_text') else ''
             }
         
-        def process_single_item(url_or_path: str, status_callback) -> tuple:
+        def process_single_item(url_or_path: str, status_callback, settings=None) -> tuple:
             """
-            Process a single URL or file path.
+            Process a single URL or file path (runs in a dialog worker thread).
+            settings: provider/model snapshot from the Tk thread (unused here).
             Returns: (success: bool, result_or_error: str, title: Optional[str])
             """
             try:
@@ -0,0 +1,494 @@
+"""
+html_extract.py - Fast HTML-to-text extraction with main-content detection.
+
+Web pages used to be turned into text either by BeautifulSoup with the
+pure-Python 'html.parser' (slow on big pages, and every <p> on the page -
+menus, comments, cookie banners - came along) or by a regex that replaced
+every tag with a space (fast, but the result was full of navigation,
+script and style text).  This module does it in one streaming pass:
+
+  * lxml's C parser is driven through a parser target when lxml is
+    installed, the standard library's html.parser otherwise - both feed
+    the same collector, so results match;
+  * script/style/nav/footer/forms, hidden elements and elements whose
+    class or id marks them as boilerplate (comments, sidebars, share
+    bars, related links...) are dropped as they are parsed;
+  * the remaining text blocks are scored readability-style (text length,
+    commas, class/id hints, link density) to find the main content
+    container, plus any siblings that score well enough;
+  * input is capped at max_bytes and output at max_chars, so a huge page
+    can't stall a bulk import.
+
+Usage:
+    from html_extract import extract
+    page = extract(html)                    # str or bytes
+    page.title, page.paragraphs, page.text, page.published
+
+    extract(html, main_content=False)       # all non-boilerplate text
+
+Called by:
+    document_fetcher.py      (web pages, local .html files)
+    subscription_manager.py  (generic article fetch, RSS item content)
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+MAX_INPUT_BYTES = 5 * 1024 * 1024     # parse at most this much of a page
+FEED_CHUNK = 64 * 1024
+MIN_BLOCK_CHARS = 25                  # shorter blocks don't score
+MIN_ARTICLE_CHARS = 250               # below this, fall back to all text
+
+# Subtrees dropped outright
+SKIP_TAGS = frozenset((
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe",
+    "object", "embed", "form", "button", "select", "textarea", "input",
+    "nav", "footer", "aside", "menu", "dialog", "head",
+))
+# Elements that start a new text block
+BLOCK_TAGS = frozenset((
+    "p", "div", "section", "article", "main", "header", "body", "li", "ul", "ol",
+    "dl", "dd", "dt", "blockquote", "pre", "table", "tr", "td", "th",
+    "h1", "h2", "h3", "h4", "h5", "h6", "figure", "figcaption", "caption",
+    "address", "details", "summary", "hr", "br",
+))
+VOID_TAGS = frozenset(("br", "hr", "img", "meta", "link", "input", "wbr", "source", "area", "col", "base"))
+HEADING_TAGS = frozenset(("h1", "h2", "h3", "h4", "h5", "h6"))
+# Block kinds that count as paragraph text when scoring
+SCORED_KINDS = frozenset(("p", "pre", "td", "blockquote", "div", "section", "article", "dd", "li"))
+# Starting a block inside an open <p> closes it (html.parser doesn't)
+_CLOSES_P = BLOCK_TAGS - {"br", "hr", "body"}
+
+_UNLIKELY = re.compile(
+    r"-ad-|\bads?\b|banner|breadcrumb|combx|comment|community|consent|cookie|"
+    r"disqus|extra|footer|gdpr|legends|masthead|menu|modal|newsletter|outbrain|"
+    r"pager|pagination|popup|promo|related|remark|replies|rss|share|sharing|"
+    r"shoutbox|sidebar|skyscraper|social|sponsor|subscribe|supplemental|taboola|"
+    r"toolbar|widget", re.IGNORECASE)
+_LIKELY = re.compile(r"and|article|body|column|content|main|shadow|story|entry|post", re.IGNORECASE)
+_POSITIVE = re.compile(
+    r"article|body|content|entry|hentry|h-entry|main|page|post|text|blog|story",
+    re.IGNORECASE)
+_NEGATIVE = re.compile(
+    r"hidden|^hid$|\bhid\b|banner|combx|comment|com-|contact|foot|footer|footnote|"
+    r"gdpr|masthead|media|meta|outbrain|promo|related|scroll|share|shoutbox|"
+    r"sidebar|skyscraper|sponsor|shopping|tags|tool|widget", re.IGNORECASE)
+_HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.IGNORECASE)
+
+_TAG_WEIGHT = {
+    "article": 10, "main": 10, "div": 5, "section": 3, "pre": 3, "td": 3, "blockquote": 3,
+    "address": -3, "ol": -3, "ul": -3, "dl": -3, "dd": -3, "dt": -3, "li": -3,
+    "th": -5, "header": -5,
+}
+
+# Meta tags holding a publication date, most specific first
+_DATE_META = ("article:published_time", "og:article:published_time", "datepublished",
+              "date", "dc.date", "pubdate", "publication_date", "og:updated_time")
+_TITLE_META = ("og:title", "twitter:title")
+
+
+# ============================================================
+# RESULT
+# ============================================================
+
+class ExtractedPage:
+    """Text pulled out of an HTML page."""
+
+    def __init__(self, title: str, paragraphs: List[str], meta: Dict[str, str],
+                 published: str, truncated: bool, parser: str):
+        self.title = title
+        self.paragraphs = paragraphs
+        self.meta = meta
+        self.published = published      # raw date string, as found on the page
+        self.truncated = truncated      # input or output hit its cap
+        self.parser = parser            # 'lxml' or 'html.parser'
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(self.paragraphs)
+
+    def __bool__(self):
+        return bool(self.paragraphs)
+
+
+# ============================================================
+# COLLECTOR
+# ============================================================
+
+class _Block:
+    __slots__ = ("text", "kind", "links", "path", "own")
+
+    def __init__(self, text: str, kind: str, links: int, path: tuple, own: int):
+        self.text = text
+        self.kind = kind          # tag of the innermost block element
+        self.links = links        # characters of link text
+        self.path = path          # IDs of all open elements, outermost first
+        self.own = own            # index in path of the innermost block element
+
+
+class _Collector:
+    """
+    Parser target: receives start/end/data events in document order and
+    turns them into text blocks tagged with their ancestor element IDs.
+    """
+
+    def __init__(self):
+        self.stack = []            # (tag, element id)
+        self.parent = {}           # element id -> parent element id
+        self.weights = {}          # element id -> class/id + tag weight
+        self.blocks: List[_Block] = []
+        self.meta: Dict[str, str] = {}
+        self.title_parts = []
+        self.ld_json = []
+        self.time_datetime = ""
+        self._next_id = 0
+        self._skip_depth = 0       # > 0 while inside a dropped subtree
+        self._link_depth = 0
+        self._in_title = False
+        self._in_ld_json = False
+        self._parts = []
+        self._link_chars = 0
+
+    # ── Parser target interface ──────────────────────────────────────────
+
+    def start(self, tag, attrib):
+        tag = tag.lower() if isinstance(tag, str) else ""
+        attrib = attrib or {}
+        if tag == "meta":
+            self._meta(attrib)
+            return
+        if tag == "title":
+            self._in_title = True
+        elif tag == "time" and not self.time_datetime and attrib.get("datetime"):
+            self.time_datetime = attrib["datetime"]
+
+        if tag in VOID_TAGS:
+            if tag in ("br", "hr") and not self._skip_depth:
+                self._flush()
+            return
+        if not self._skip_depth:
+            if tag in _CLOSES_P and self._open("p", stop_at=_CLOSES_P):
+                self.end("p")
+            if tag == "li" and self._open("li", stop_at={"ul", "ol"}):
+                self.end("li")
+
+        element_id = self._next_id
+        self._next_id += 1
+        self.parent[element_id] = self.stack[-1][1] if self.stack else None
+        self.stack.append((tag, element_id))
+
+        if tag == "script" and "ld+json" in (attrib.get("type") or "").lower():
+            self._in_ld_json = True
+        if self._skip_depth:
+            self._skip_depth += 1
+            return
+        if self._is_skipped(tag, attrib):
+            self._flush()
+            self._skip_depth = 1
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag == "a":
+            self._link_depth += 1
+        self.weights[element_id] = self._weight(tag, attrib)
+
+    def end(self, tag):
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if tag in VOID_TAGS or not self._open(tag):
+            return
+        while self.stack:
+            open_tag, element_id = self.stack[-1]
+            if self._skip_depth:
+                self._skip_depth -= 1
+                if open_tag == "script":
+                    self._in_ld_json = False
+            else:
+                if open_tag in BLOCK_TAGS:
+                    self._flush()
+                if open_tag == "a":
+                    self._link_depth = max(0, self._link_depth - 1)
+            self.stack.pop()
+            if open_tag == "title":
+                self._in_title = False
+            if open_tag == tag:
+                break
+
+    def data(self, text):
+        if self._in_title:
+            self.title_parts.append(text)
+        if self._in_ld_json:
+            self.ld_json.append(text)
+        if self._skip_depth or not text:
+            return
+        self._parts.append(text)
+        if self._link_depth:
+            self._link_chars += len(text.strip())
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        self._flush()
+        return self
+
+    # ── Helpers ──────────────────────────────────────────────────────────
+
+    def _open(self, tag, stop_at=()):
+        """Whether tag is open, looking no further up than a stop_at tag."""
+        for open_tag, _ in reversed(self.stack):
+            if open_tag == tag:
+                return True
+            if open_tag in stop_at:
+                return False
+        return False
+
+    def _meta(self, attrib):
+        key = (attrib.get("property") or attrib.get("name") or attrib.get("itemprop") or "").lower()
+        content = attrib.get("content")
+        if key and content and key not in self.meta:
+            self.meta[key] = content.strip()
+
+    @staticmethod
+    def _is_skipped(tag, attrib):
+        if tag in SKIP_TAGS:
+            return True
+        if "hidden" in attrib or (attrib.get("aria-hidden") or "").lower() == "true":
+            return True
+        if _HIDDEN_STYLE.search(attrib.get("style") or ""):
+            return True
+        if tag in ("html", "body", "article", "main"):
+            return False
+        match = f"{attrib.get('class') or ''} {attrib.get('id') or ''}"
+        if match.strip() and _UNLIKELY.search(match) and not _LIKELY.search(match):
+            return True
+        return (attrib.get("role") or "").lower() in ("navigation", "complementary", "banner", "dialog")
+
+    @staticmethod
+    def _weight(tag, attrib):
+        weight = _TAG_WEIGHT.get(tag, 0)
+        for name in (attrib.get("class"), attrib.get("id")):
+            if name:
+                if _NEGATIVE.search(name):
+                    weight -= 25
+                if _POSITIVE.search(name):
+                    weight += 25
+        return weight
+
+    def _flush(self):
+        if not self._parts:
+            return
+        text = " ".join("".join(self._parts).split())
+        links = self._link_chars
+        self._parts = []
+        self._link_chars = 0
+        if not text:
+            return
+        kind, own = "div", 0
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] in BLOCK_TAGS:
+                kind, own = self.stack[index][0], index
+                break
+        path = tuple(element_id for _, element_id in self.stack)
+        self.blocks.append(_Block(text, kind, links, path, own))
+
+
+class _StdlibParser(HTMLParser):
+    """Drives a _Collector from the standard library tokenizer."""
+
+    def __init__(self, target: _Collector):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, {k: (v or "") for k, v in attrs})
+
+    def handle_startendtag(self, tag, attrs):
+        self.target.start(tag, {k: (v or "") for k, v in attrs})
+        if tag not in VOID_TAGS:
+            self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+
+# ============================================================
+# SCORING
+# ============================================================
+
+def _link_density(blocks: List[_Block]) -> float:
+    chars = sum(len(b.text) for b in blocks)
+    return sum(b.links for b in blocks) / chars if chars else 0.0
+
+
+def _main_blocks(collector: _Collector) -> List[_Block]:
+    """Blocks belonging to the best-scoring content container and its good siblings."""
+    blocks = collector.blocks
+    scores: Dict[int, float] = {}
+    text_chars: Dict[int, int] = {}
+    link_chars: Dict[int, int] = {}
+
+    for block in blocks:
+        for element_id in block.path:
+            text_chars[element_id] = text_chars.get(element_id, 0) + len(block.text)
+            link_chars[element_id] = link_chars.get(element_id, 0) + block.links
+        if block.kind not in SCORED_KINDS or len(block.text) < MIN_BLOCK_CHARS:
+            continue
+        # A paragraph scores its parent fully, grandparent half, then a sixth
+        ancestors = block.path[max(0, block.own - 3):block.own]
+        score = 1 + block.text.count(",") + min(len(block.text) // 100, 3)
+        for level, element_id in enumerate(reversed(ancestors)):
+            divider = 1 if level == 0 else (2 if level == 1 else level * 3)
+            if element_id not in scores:
+                scores[element_id] = collector.weights.get(element_id, 0)
+            scores[element_id] += score / divider
+
+    if not scores:
+        return []
+    for element_id in scores:
+        chars = text_chars.get(element_id, 0)
+        density = link_chars.get(element_id, 0) / chars if chars else 0.0
+        scores[element_id] *= (1 - density)
+
+    top = max(scores, key=scores.get)
+    keep = {top}
+    parent = collector.parent.get(top)
+    if parent is not None:
+        threshold = max(10.0, scores[top] * 0.2)
+        for element_id, score in scores.items():
+            if element_id != top and collector.parent.get(element_id) == parent and score >= threshold:
+                keep.add(element_id)
+
+    selected = []
+    for block in blocks:
+        in_kept = any(element_id in keep for element_id in block.path)
+        # Loose paragraphs sitting directly beside the top candidate
+        loose = (parent is not None and block.kind == "p" and block.own > 0
+                 and block.path[block.own - 1] == parent
+                 and len(block.text) > 80 and block.links < len(block.text) * 0.25)
+        if in_kept or loose:
+            selected.append(block)
+    return selected
+
+
+def _clean_blocks(blocks: List[_Block]) -> List[str]:
+    """Drop link lists and repeated lines; keep document order."""
+    out = []
+    seen = set()
+    for block in blocks:
+        text = block.text
+        if block.links and block.links >= len(text) * 0.5 and block.kind not in HEADING_TAGS:
+            continue
+        if text in seen and len(text) < 200:
+            continue
+        seen.add(text)
+        out.append(text)
+    return out
+
+
+# ============================================================
+# PUBLIC API
+# ============================================================
+
+def _published(collector: _Collector) -> str:
+    for key in _DATE_META:
+        if collector.meta.get(key):
+            return collector.meta[key]
+    if collector.time_datetime:
+        return collector.time_datetime
+    match = re.search(r'"datePublished"\s*:\s*"([^"]+)"', "".join(collector.ld_json))
+    return match.group(1) if match else ""
+
+
+def _decode(html: bytes, encoding: Optional[str]) -> str:
+    if not encoding:
+        match = re.search(rb'<meta[^>]+charset=["\']?([\w-]+)', html[:4096], re.IGNORECASE)
+        encoding = match.group(1).decode("ascii", "ignore") if match else "utf-8"
+    try:
+        return html.decode(encoding, errors="replace")
+    except LookupError:
+        return html.decode("utf-8", errors="replace")
+
+
+def extract(html, main_content: bool = True, max_bytes: int = MAX_INPUT_BYTES,
+            max_chars: Optional[int] = None, encoding: Optional[str] = None,
+            use_lxml: Optional[bool] = None) -> ExtractedPage:
+    """
+    Extract readable text from an HTML page.
+
+    Args:
+        html: Page source, str or bytes (bytes are decoded using encoding,
+              or the page's <meta charset>, or UTF-8)
+        main_content: Keep only the detected article body; False keeps all
+                      text that isn't boilerplate (for documents rather than
+                      web articles)
+        max_bytes: Parse at most this many characters of input
+        max_chars: Cap on the extracted text (whole paragraphs)
+        use_lxml: Force a backend (default: lxml if installed)
+
+    Returns:
+        ExtractedPage; falsy if no text was found
+    """
+    if isinstance(html, (bytes, bytearray)):
+        html = _decode(bytes(html[:max_bytes]), encoding)
+    truncated = len(html) > max_bytes
+    html = html[:max_bytes]
+
+    lxml = LXML_AVAILABLE if use_lxml is None else (use_lxml and LXML_AVAILABLE)
+    if not html.strip():
+        # lxml's close() raises 'no element found' on an empty document
+        return ExtractedPage("", [], {}, "", truncated, "lxml" if lxml else "html.parser")
+
+    collector = _Collector()
+    if lxml:
+        parser = etree.HTMLParser(target=collector, recover=True, remove_comments=True)
+        for i in range(0, len(html), FEED_CHUNK):
+            parser.feed(html[i:i + FEED_CHUNK])
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            pass                                  # no elements at all (e.g. only a comment)
+    else:
+        parser = _StdlibParser(collector)
+        for i in range(0, len(html), FEED_CHUNK):
+            parser.feed(html[i:i + FEED_CHUNK])
+        parser.close()
+        collector.close()
+
+    blocks = _main_blocks(collector) if main_content else []
+    if sum(len(b.text) for b in blocks) < MIN_ARTICLE_CHARS:
+        blocks = collector.blocks
+    paragraphs = _clean_blocks(blocks)
+
+    if max_chars is not None:
+        kept, total = [], 0
+        for paragraph in paragraphs:
+            if total + len(paragraph) > max_chars:
+                truncated = True
+                if not kept:
+                    kept.append(paragraph[:max_chars])
+                break
+            kept.append(paragraph)
+            total += len(paragraph) + 2
+        paragraphs = kept
+
+    title = " ".join("".join(collector.title_parts).split())
+    if not title:
+        title = next((collector.meta[k] for k in _TITLE_META if collector.meta.get(k)), "")
+
+    return ExtractedPage(title, paragraphs, collector.meta, _published(collector),
+                         truncated, "lxml" if lxml else "html.parser")
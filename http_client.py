@@ -0,0 +1,311 @@
+"""
+http_client.py - Shared HTTP client: pooled connections and a response cache.
+
+Web fetching used to open a fresh connection for every request (a HEAD and
+then a GET per article) and never remembered anything it downloaded.  This
+module gives every caller one client:
+
+  * a single session with per-host connection pools, so a bulk import of
+    many pages from the same site reuses TCP/TLS connections;
+  * HTTP/2 when httpx and h2 are installed, requests otherwise;
+  * an on-disk response cache honouring Cache-Control, Expires, ETag and
+    Last-Modified.  A response that is still fresh costs no request at
+    all; a stale one is revalidated with If-None-Match / If-Modified-Since,
+    so re-fetching an unchanged article costs a single 304.
+
+Cached responses live in HTTP_CACHE_DIR as one '<sha256(url)>.http' file
+each (length-prefixed JSON meta, then the body) and are budgeted and
+evicted by cache_manager under the 'http' kind.
+
+Usage:
+    import http_client
+    resp = http_client.get(url)              # HttpResponse
+    resp.raise_for_status()
+    html = resp.text
+    resp.from_cache, resp.revalidated        # how it was served
+
+Called by:
+    document_fetcher.py      (web pages, PDFs, Google Sheets exports)
+    subscription_manager.py  (generic article fetch)
+"""
+
+import email.utils
+import hashlib
+import json
+import os
+import re
+import struct
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from config import HTTP_CACHE_DIR
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Browser-like headers; some sites answer 403 to anything else
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+DEFAULT_TIMEOUT = 30
+POOL_HOSTS = 32                  # hosts with a kept-alive connection pool
+POOL_PER_HOST = 8                # connections kept per host
+MAX_CACHED_BYTES = 25 * 1024 * 1024
+
+# Headers kept with a cached response (and refreshed by a 304)
+_KEPT_HEADERS = ("content-type", "etag", "last-modified", "cache-control",
+                 "expires", "date", "content-language")
+_META = struct.Struct("<I")
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+class HttpError(Exception):
+    """Non-success HTTP status; the message carries the code (e.g. '503')."""
+
+    def __init__(self, status_code: int, url: str, reason: str = ""):
+        super().__init__(f"HTTP {status_code} {reason} for url: {url}".replace("  ", " "))
+        self.status_code = status_code
+        self.url = url
+
+
+class HttpResponse:
+    """The parts of a response callers use, whichever backend served it."""
+
+    def __init__(self, url: str, status_code: int, headers, content: bytes,
+                 reason: str = "", from_cache: bool = False, revalidated: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = {k.lower(): v for k, v in dict(headers).items()}
+        self.content = content
+        self.reason = reason
+        self.from_cache = from_cache
+        self.revalidated = revalidated
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 400
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get("content-type", "").lower()
+
+    @property
+    def encoding(self) -> Optional[str]:
+        match = re.search(r"charset=([\w-]+)", self.content_type)
+        if match:
+            return match.group(1)
+        match = _CHARSET_RE.search(self.content[:4096])
+        return match.group(1).decode("ascii", "ignore") if match else None
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.content.decode(self.encoding or "utf-8", errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HttpError(self.status_code, self.url, self.reason)
+
+
+# ============================================================
+# TRANSPORT
+# ============================================================
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    """The shared httpx client or requests session, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            if HTTP2_AVAILABLE:
+                _client = httpx.Client(
+                    http2=True, follow_redirects=True,
+                    limits=httpx.Limits(max_connections=POOL_HOSTS * POOL_PER_HOST,
+                                        max_keepalive_connections=POOL_HOSTS))
+            elif REQUESTS_AVAILABLE:
+                _client = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_PER_HOST)
+                _client.mount("http://", adapter)
+                _client.mount("https://", adapter)
+            else:
+                raise ImportError("requests not installed. Install with: pip install requests")
+        return _client
+
+
+def _send(method: str, url: str, headers: Dict, timeout: float) -> HttpResponse:
+    client = _get_client()
+    if HTTP2_AVAILABLE:
+        r = client.request(method, url, headers=headers, timeout=timeout)
+        return HttpResponse(str(r.url), r.status_code, r.headers, r.content, r.reason_phrase)
+    r = client.request(method, url, headers=headers, timeout=timeout, allow_redirects=True)
+    return HttpResponse(r.url, r.status_code, r.headers, r.content, r.reason or "")
+
+
+def head(url: str, headers: Optional[Dict] = None, timeout: float = 10) -> HttpResponse:
+    """HEAD request over the shared pool (never cached)."""
+    return _send("HEAD", url, dict(BROWSER_HEADERS, **(headers or {})), timeout)
+
+
+def close():
+    """Drop pooled connections (called on app shutdown)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            try:
+                _client.close()
+            except Exception:
+                pass
+            _client = None
+
+
+# ============================================================
+# RESPONSE CACHE
+# ============================================================
+
+def _cache_path(url: str) -> str:
+    return os.path.join(HTTP_CACHE_DIR, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".http")
+
+
+def _load(path: str) -> Optional[Tuple[Dict, bytes]]:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        (meta_len,) = _META.unpack_from(data)
+        meta = json.loads(data[_META.size:_META.size + meta_len].decode("utf-8"))
+        body = data[_META.size + meta_len:]
+        if len(body) != meta.get("length"):
+            return None
+        return meta, body
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def _store(path: str, meta: Dict, body: bytes):
+    import cache_manager
+    meta["length"] = len(body)
+    encoded = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    try:
+        cache_manager.atomic_write(path, _META.pack(len(encoded)) + encoded + body,
+                                   kind="http", key=meta.get("url"))
+    except OSError:
+        pass
+
+
+def _directives(headers: Dict) -> Dict[str, Optional[str]]:
+    out = {}
+    for part in headers.get("cache-control", "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            out[name] = value.strip('"') or None
+    return out
+
+
+def _parse_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def _lifetime(headers: Dict) -> float:
+    """Seconds a response stays fresh (0 = always revalidate)."""
+    cc = _directives(headers)
+    if "no-cache" in cc or "no-store" in cc:
+        return 0.0
+    if cc.get("max-age"):
+        try:
+            return max(0.0, float(cc["max-age"]))
+        except ValueError:
+            return 0.0
+    expires = _parse_date(headers.get("expires"))
+    if expires is not None:
+        date = _parse_date(headers.get("date")) or time.time()
+        return max(0.0, expires - date)
+    return 0.0
+
+
+def _storable(resp: HttpResponse) -> bool:
+    headers = resp.headers
+    if resp.status_code != 200 or len(resp.content) > MAX_CACHED_BYTES:
+        return False
+    if "no-store" in _directives(headers) or headers.get("vary", "").strip() == "*":
+        return False
+    # Worth keeping only if it can be served fresh or revalidated later
+    return bool(headers.get("etag") or headers.get("last-modified") or _lifetime(headers))
+
+
+def _meta_for(resp: HttpResponse) -> Dict:
+    return {
+        "url": resp.url,
+        "status": resp.status_code,
+        "headers": {k: resp.headers[k] for k in _KEPT_HEADERS if k in resp.headers},
+        "stored": time.time(),
+    }
+
+
+def get(url: str, headers: Optional[Dict] = None, timeout: float = DEFAULT_TIMEOUT,
+        use_cache: bool = True) -> HttpResponse:
+    """
+    GET a URL through the shared pool and the response cache.
+
+    A fresh cached copy is returned without a request; a stale one is
+    revalidated and, on 304, returned with revalidated=True.  Error
+    statuses are returned, not raised - call raise_for_status().
+    """
+    request_headers = dict(BROWSER_HEADERS, **(headers or {}))
+    if not use_cache:
+        return _send("GET", url, request_headers, timeout)
+
+    import cache_manager
+    path = _cache_path(url)
+    cached = _load(path)
+    if cached:
+        meta, body = cached
+        kept = meta.get("headers", {})
+        if time.time() - meta.get("stored", 0) < _lifetime(kept):
+            cache_manager.touch(path, "http")
+            return HttpResponse(meta["url"], meta["status"], kept, body, from_cache=True)
+        if kept.get("etag"):
+            request_headers["If-None-Match"] = kept["etag"]
+        if kept.get("last-modified"):
+            request_headers["If-Modified-Since"] = kept["last-modified"]
+
+    resp = _send("GET", url, request_headers, timeout)
+
+    if resp.status_code == 304 and cached:
+        meta, body = cached
+        meta["headers"].update({k: resp.headers[k] for k in _KEPT_HEADERS if k in resp.headers})
+        meta["stored"] = time.time()
+        _store(path, meta, body)
+        return HttpResponse(meta["url"], meta["status"], meta["headers"], body,
+                            from_cache=True, revalidated=True)
+    if _storable(resp):
+        _store(path, _meta_for(resp), resp.content)
+    return resp
@@ -10,10 +10,16 @@ Format spec:
     ├── manifest.json           (metadata: version, type, created, source)
     └── prompts.json            (the actual prompt data with folder structure)
 
+Document packages (format 2.0) are streamed: one set of members per
+document instead of a single documents.json, so large libraries never
+have to be held in memory (see STREAMED DOCUMENT PACKAGES below).
+Format 1.0 document packages (documents.json) are still read.
+
 Author: DocAnalyser Development Team
 Date: March 2026
 """
 
+import io
 import json
 import os
 import datetime
@@ -46,6 +52,7 @@ except ImportError:
 # ============================================================================
 
 EXPORT_VERSION = "1.0"
+DOCUMENT_PACKAGE_VERSION = "2.0"
 FILE_EXTENSION = ".docanalyser"
 FILE_FILTER = [("DocAnalyser Package", "*.docanalyser"), ("All files", "*.*")]
 
@@ -294,6 +301,289 @@ def _read_package(filepath: str) -> tuple:
         return None, None
 
 
+# ============================================================================
+# STREAMED DOCUMENT PACKAGES (format 2.0)
+# ============================================================================
+#
+#   myfile.docanalyser
+#   ├── manifest.json
+#   ├── index.json                  (package flags + one summary per document)
+#   └── documents/0001/
+#       ├── document.json           (record + the document's own conversation)
+#       ├── entries.jsonl           (one entry per line)
+#       ├── branches/0001.json      (branch record, entries, conversation)
+#       ├── embeddings.jsonl        (optional: chunk_idx, text, model, offset, length)
+#       └── embeddings.bin          (optional: packed float32 vectors)
+#
+# The writer streams entries and embeddings straight from SQLite cursors into
+# the ZIP; the reader only loads index.json up front and pulls a document's
+# members when that document is actually imported.
+
+def _iter_doc_entries(doc_id: str):
+    """
+    Yield a document's entries one at a time.  Errors propagate, so a read
+    failure fails the export instead of silently truncating the document.
+    """
+    from document_library import USE_SQLITE_DOCUMENTS
+    if USE_SQLITE_DOCUMENTS:
+        import db_manager as db
+        yield from db.db_iter_entries(doc_id)
+    else:
+        from document_library import load_document_entries
+        yield from (load_document_entries(doc_id) or [])
+
+
+def _write_json_member(zf: zipfile.ZipFile, name: str, data):
+    zf.writestr(name, json.dumps(data, ensure_ascii=False))
+
+
+def _write_doc_embeddings(zf: zipfile.ZipFile, prefix: str, doc_id: str) -> bool:
+    """
+    Stream a document's embeddings into the package. Returns True if any.
+    A failure while writing them propagates (the package would be partial).
+    """
+    try:
+        from document_library import USE_SQLITE_DOCUMENTS
+        if not USE_SQLITE_DOCUMENTS:
+            return False
+        import db_manager as db
+        if not db.db_has_embeddings(doc_id):
+            return False
+    except Exception as e:
+        print(f"ERROR _write_doc_embeddings: {e}")
+        return False
+    index = []
+    offset = 0
+    with zf.open(prefix + "embeddings.bin", "w", force_zip64=True) as out:
+        for row in db.db_iter_embedding_rows(doc_id):
+            blob = row["embedding_blob"]
+            out.write(blob)
+            index.append({"chunk_idx": row["chunk_idx"], "text": row["text"],
+                          "model": row["model"],
+                          "offset": offset, "length": len(blob)})
+            offset += len(blob)
+    with io.TextIOWrapper(zf.open(prefix + "embeddings.jsonl", "w", force_zip64=True),
+                          encoding="utf-8", newline="\n") as out:
+        for meta in index:
+            out.write(json.dumps(meta, ensure_ascii=False) + "\n")
+    return True
+
+
+def _write_document_members(zf: zipfile.ZipFile, prefix: str, doc_id: str,
+                            include_conversations: bool = True,
+                            selected_branch_ids: list = None,
+                            include_embeddings: bool = False) -> Optional[dict]:
+    """
+    Write one document's members under prefix.
+
+    Returns the document's index.json summary, or None if the document
+    could not be loaded.
+    """
+    record = _load_doc_record(doc_id)
+    if not record:
+        return None
+
+    doc_data = {
+        'id': doc_id,
+        'title': record.get('title', 'Untitled'),
+        'doc_type': record.get('doc_type') or record.get('type', 'unknown'),
+        'document_class': record.get('document_class', 'source'),
+        'source': record.get('source', ''),
+        'metadata': record.get('metadata', {}),
+        'created_at': record.get('created_at') or record.get('created') or record.get('fetched', ''),
+    }
+    summary = {k: doc_data[k] for k in ('id', 'title', 'doc_type', 'document_class')}
+    summary['member'] = prefix
+    summary['branches'] = []
+
+    entry_count = 0
+    with io.TextIOWrapper(zf.open(prefix + "entries.jsonl", "w", force_zip64=True),
+                          encoding="utf-8", newline="\n") as out:
+        for entry in _iter_doc_entries(doc_id):
+            out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            entry_count += 1
+    summary['entry_count'] = entry_count
+
+    if include_conversations:
+        own_conv = _load_doc_conversation(doc_id)
+        if own_conv and own_conv.get('messages'):
+            doc_data['conversation'] = own_conv
+
+        if record.get('document_class', 'source') == 'source':
+            for branch in _load_branches_for_source(doc_id):
+                if selected_branch_ids is not None and branch['doc_id'] not in selected_branch_ids:
+                    continue
+                member = f"{prefix}branches/{len(summary['branches']) + 1:04d}.json"
+                _write_json_member(zf, member, {
+                    'id': branch['doc_id'],
+                    'title': branch['title'],
+                    'doc_type': branch['doc_record'].get('doc_type') or
+                                branch['doc_record'].get('type', 'conversation_thread'),
+                    'document_class': branch['doc_record'].get('document_class', 'response'),
+                    'source': branch['doc_record'].get('source', ''),
+                    'metadata': branch['doc_record'].get('metadata', {}),
+                    'entries': _load_doc_entries(branch['doc_id']),
+                    'conversation': branch['conversation'],
+                    'exchange_count': branch['exchange_count'],
+                })
+                summary['branches'].append({
+                    'member': member,
+                    'id': branch['doc_id'],
+                    'title': branch['title'],
+                    'exchange_count': branch['exchange_count'],
+                })
+
+    _write_json_member(zf, prefix + "document.json", doc_data)
+    summary['has_embeddings'] = (include_embeddings and
+                                 _write_doc_embeddings(zf, prefix, doc_id))
+    return summary
+
+
+def _write_document_package(filepath: str, doc_specs: list,
+                            includes_folders: bool = False,
+                            includes_conversations: bool = True,
+                            include_embeddings: bool = False) -> Optional[tuple]:
+    """
+    Write a streamed (format 2.0) documents package.
+
+    Args:
+        filepath: Full path for the output file.
+        doc_specs: [{'doc_id', 'selected_branch_ids', 'folder_path'}, ...]
+            (folder_path may be None).
+
+    Returns:
+        (documents_written, branches_written) on success, None on error.
+    """
+    tmp_path = filepath + ".tmp"
+    try:
+        summaries = []
+        branch_count = 0
+        with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for spec in doc_specs:
+                prefix = f"documents/{len(summaries) + 1:04d}/"
+                summary = _write_document_members(
+                    zf, prefix, spec['doc_id'],
+                    include_conversations=includes_conversations,
+                    selected_branch_ids=spec.get('selected_branch_ids'),
+                    include_embeddings=include_embeddings,
+                )
+                if summary is None:
+                    continue
+                if spec.get('folder_path') is not None:
+                    summary['_folder_path'] = spec['folder_path']
+                branch_count += len(summary['branches'])
+                summaries.append(summary)
+
+            if not summaries:
+                raise ValueError("no documents could be serialised")
+
+            manifest = _build_manifest(
+                content_type="documents",
+                item_count=len(summaries),
+                source_desc=f"Export: {len(summaries)} document(s), {branch_count} branch(es)",
+                includes_folders=includes_folders,
+            )
+            manifest["format_version"] = DOCUMENT_PACKAGE_VERSION
+            zf.writestr("manifest.json",
+                        json.dumps(manifest, indent=2, ensure_ascii=False))
+            _write_json_member(zf, "index.json", {
+                'export_type': 'documents',
+                'documents': summaries,
+                'includes_folders': includes_folders,
+                'includes_conversations': includes_conversations,
+                'includes_embeddings': include_embeddings,
+            })
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        os.rename(tmp_path, filepath)
+        return len(summaries), branch_count
+    except Exception as e:
+        print(f"ERROR _write_document_package: {e}")
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return None
+
+
+class _DocumentPackage:
+    """
+    Lazy read access to a documents package.
+
+    .data is the preview shape the import dialog works from (flags plus a
+    'documents' list of summaries); load_document()/load_branch() pull the
+    full member data for one summary only when it is imported.  Format 1.0
+    packages are wrapped too: their summaries already are the full data.
+    """
+
+    def __init__(self, filepath: str, data: dict, streamed: bool):
+        self.filepath = filepath
+        self.data = data
+        self.streamed = streamed
+
+    def load_document(self, summary: dict) -> dict:
+        """Full document data (record, entries, own conversation) for a summary."""
+        if not self.streamed:
+            return summary
+        prefix = summary['member']
+        with zipfile.ZipFile(self.filepath, 'r') as zf:
+            doc_data = json.loads(zf.read(prefix + "document.json").decode('utf-8'))
+            with io.TextIOWrapper(zf.open(prefix + "entries.jsonl"), encoding="utf-8") as f:
+                doc_data['entries'] = [json.loads(line) for line in f if line.strip()]
+        doc_data['branches'] = summary.get('branches', [])
+        if summary.get('_folder_path') is not None:
+            doc_data['_folder_path'] = summary['_folder_path']
+        return doc_data
+
+    def load_branch(self, summary: dict) -> dict:
+        """Full branch data (record, entries, conversation) for a branch summary."""
+        if not self.streamed:
+            return summary
+        with zipfile.ZipFile(self.filepath, 'r') as zf:
+            return json.loads(zf.read(summary['member']).decode('utf-8'))
+
+    def iter_embedding_rows(self, summary: dict):
+        """Yield packed embedding rows for db_save_embedding_rows()."""
+        if not (self.streamed and summary.get('has_embeddings')):
+            return
+        prefix = summary['member']
+        with zipfile.ZipFile(self.filepath, 'r') as zf:
+            with io.TextIOWrapper(zf.open(prefix + "embeddings.jsonl"), encoding="utf-8") as meta, \
+                    zf.open(prefix + "embeddings.bin") as blobs:
+                for line in meta:
+                    if not line.strip():
+                        continue
+                    row = json.loads(line)
+                    row['embedding_blob'] = blobs.read(row.pop('length'))
+                    row.pop('offset', None)
+                    yield row
+
+
+def _open_document_package(filepath: str) -> tuple:
+    """
+    Open a .docanalyser package for document import without reading
+    document contents.
+
+    Returns:
+        (manifest: dict, package: _DocumentPackage) or (None, None) on error.
+    """
+    try:
+        with zipfile.ZipFile(filepath, 'r') as zf:
+            if "index.json" in zf.namelist():
+                manifest = json.loads(zf.read("manifest.json").decode('utf-8'))
+                index = json.loads(zf.read("index.json").decode('utf-8'))
+                return manifest, _DocumentPackage(filepath, index, streamed=True)
+    except Exception as e:
+        print(f"ERROR _open_document_package: {e}")
+        return None, None
+
+    manifest, data = _read_package(filepath)
+    if manifest is None or data is None:
+        return None, None
+    return manifest, _DocumentPackage(filepath, data, streamed=False)
+
+
 # ============================================================================
 # SERIALISATION: PROMPTS → FLAT LIST / FOLDER TREE
 # ============================================================================
@@ -1942,67 +2232,6 @@ def _load_branches_for_source(doc_id: str) -> list:
         return []
 
 
-def _serialise_document_for_export(doc_id: str, include_conversations: bool = True,
-                                    selected_branch_ids: list = None) -> Optional[dict]:
-    """
-    Serialise a single document for export.
-
-    Args:
-        doc_id: The document ID.
-        include_conversations: Whether to include conversation branches.
-        selected_branch_ids: If set, only export these branch IDs. None means all.
-
-    Returns:
-        A dict ready for JSON serialisation, or None on error.
-    """
-    record = _load_doc_record(doc_id)
-    if not record:
-        return None
-
-    entries = _load_doc_entries(doc_id)
-
-    doc_data = {
-        'id': doc_id,
-        'title': record.get('title', 'Untitled'),
-        'doc_type': record.get('doc_type') or record.get('type', 'unknown'),
-        'document_class': record.get('document_class', 'source'),
-        'source': record.get('source', ''),
-        'metadata': record.get('metadata', {}),
-        'created_at': record.get('created_at') or record.get('created') or record.get('fetched', ''),
-        'entries': entries,
-        'branches': [],
-    }
-
-    if include_conversations:
-        # Also include the document's own conversation (for non-branch docs)
-        own_conv = _load_doc_conversation(doc_id)
-        if own_conv and own_conv.get('messages'):
-            doc_data['conversation'] = own_conv
-
-        # Load branches (for source documents)
-        if record.get('document_class', 'source') == 'source':
-            all_branches = _load_branches_for_source(doc_id)
-            for branch in all_branches:
-                if selected_branch_ids is not None and branch['doc_id'] not in selected_branch_ids:
-                    continue
-                branch_entries = _load_doc_entries(branch['doc_id'])
-                branch_data = {
-                    'id': branch['doc_id'],
-                    'title': branch['title'],
-                    'doc_type': branch['doc_record'].get('doc_type') or
-                                branch['doc_record'].get('type', 'conversation_thread'),
-                    'document_class': branch['doc_record'].get('document_class', 'response'),
-                    'source': branch['doc_record'].get('source', ''),
-                    'metadata': branch['doc_record'].get('metadata', {}),
-                    'entries': branch_entries,
-                    'conversation': branch['conversation'],
-                    'exchange_count': branch['exchange_count'],
-                }
-                doc_data['branches'].append(branch_data)
-
-    return doc_data
-
-
 # ============================================================================
 # DOCUMENT EXPORT: PUBLIC API
 # ============================================================================
@@ -2095,7 +2324,11 @@ class _DocExportDialog:
         self.include_convos_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(opts_frame, text="Include conversations",
                         variable=self.include_convos_var,
-                        command=self._toggle_conversations).pack(side=tk.LEFT)
+                        command=self._toggle_conversations).pack(side=tk.LEFT, padx=(0, 12))
+
+        self.include_embeddings_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(opts_frame, text="Include embeddings",
+                        variable=self.include_embeddings_var).pack(side=tk.LEFT)
 
         # ---- Email option ----
         email_frame = ttk.Frame(bottom_frame)
@@ -2356,9 +2589,8 @@ class _DocExportDialog:
         if not filepath:
             return
 
-        # Serialise each selected document
-        documents_out = []
-        total_branches = 0
+        # Describe each selected document; the package writer streams them
+        doc_specs = []
         for item in selected:
             doc_item = item['doc_item']
 
@@ -2369,42 +2601,31 @@ class _DocExportDialog:
                           if br['var'].get()]
                 if sel_br:
                     selected_branch_ids = sel_br
-                    total_branches += len(sel_br)
                 else:
                     selected_branch_ids = []  # explicitly none
 
-            doc_data = _serialise_document_for_export(
-                doc_item.doc_id,
-                include_conversations=include_convos,
-                selected_branch_ids=selected_branch_ids,
-            )
-            if doc_data:
-                # Add folder path for structure recreation
-                if include_folders:
-                    doc_data['_folder_path'] = self._get_folder_path(item['folder'])
-                documents_out.append(doc_data)
-
-        if not documents_out:
-            messagebox.showerror("Export Failed",
-                                 "Could not serialise any documents.",
-                                 parent=self.dialog)
-            return
-
-        payload = {
-            'export_type': 'documents',
-            'documents': documents_out,
-            'includes_folders': include_folders,
-            'includes_conversations': include_convos,
-        }
+            doc_specs.append({
+                'doc_id': doc_item.doc_id,
+                'selected_branch_ids': selected_branch_ids,
+                # Folder path for structure recreation
+                'folder_path': (self._get_folder_path(item['folder'])
+                                if include_folders else None),
+            })
 
-        manifest = _build_manifest(
-            content_type="documents",
-            item_count=len(documents_out),
-            source_desc=f"Export: {len(documents_out)} document(s), {total_branches} branch(es)",
-            includes_folders=include_folders,
-        )
+        self.dialog.config(cursor="watch")
+        self.dialog.update_idletasks()
+        try:
+            result = _write_document_package(
+                filepath, doc_specs,
+                includes_folders=include_folders,
+                includes_conversations=include_convos,
+                include_embeddings=self.include_embeddings_var.get(),
+            )
+        finally:
+            self.dialog.config(cursor="")
 
-        if _write_package(filepath, manifest, payload):
+        if result:
+            exported_count = result[0]
             # Check if user also wants to email
             want_email = self.email_var.get()
             recipient = self.email_entry.get().strip() if want_email else ""
@@ -2417,7 +2638,7 @@ class _DocExportDialog:
 
             messagebox.showinfo(
                 "Export Complete",
-                f"Exported {len(documents_out)} document(s) to:\n\n{filepath}",
+                f"Exported {exported_count} document(s) to:\n\n{filepath}",
                 parent=self.dialog,
             )
 
@@ -2437,7 +2658,7 @@ class _DocExportDialog:
                     filepath=filepath,
                     recipient=recipient,
                     content_type="documents",
-                    item_count=len(documents_out),
+                    item_count=exported_count,
                     item_names=names,
                     email_provider=provider,
                     parent=self.dialog,
@@ -2447,8 +2668,8 @@ class _DocExportDialog:
         else:
             messagebox.showerror(
                 "Export Failed",
-                "An error occurred while writing the file.\n"
-                "Check the console for details.",
+                "Could not serialise any documents, or an error occurred\n"
+                "while writing the file. Check the console for details.",
                 parent=self.dialog,
             )
 
@@ -2483,8 +2704,8 @@ def import_documents(parent: tk.Widget, tree_manager: TreeManager,
     if not filepath:
         return
 
-    manifest, data = _read_package(filepath)
-    if manifest is None or data is None:
+    manifest, package = _open_document_package(filepath)
+    if manifest is None or package is None:
         messagebox.showerror(
             "Import Failed",
             "Could not read the file. It may be corrupted or not a valid "
@@ -2507,7 +2728,7 @@ def import_documents(parent: tk.Widget, tree_manager: TreeManager,
         parent=parent,
         filepath=filepath,
         manifest=manifest,
-        data=data,
+        package=package,
         tree_manager=tree_manager,
         ui_instance=ui_instance,
         library_path=library_path,
@@ -2526,12 +2747,13 @@ class _DocImportDialog:
     destination folder picker, and duplicate handling.
     """
 
-    def __init__(self, parent, filepath, manifest, data,
+    def __init__(self, parent, filepath, manifest, package,
                  tree_manager, ui_instance, library_path, refresh_callback):
         self.parent = parent
         self.filepath = filepath
         self.manifest = manifest
-        self.data = data
+        self.package = package
+        self.data = package.data    # preview summaries; contents load on import
         self.tree_manager = tree_manager
         self.ui_instance = ui_instance
         self.library_path = library_path
@@ -2683,7 +2905,7 @@ class _DocImportDialog:
             label = f"\U0001F4C4 {title}"
             if doc_class != 'source':
                 label += f"  [{doc_class}]"
-            entry_count = len(doc_data.get('entries', []))
+            entry_count = doc_data.get('entry_count', len(doc_data.get('entries', [])))
             if entry_count:
                 label += f"  ({entry_count} entries)"
 
@@ -2825,6 +3047,8 @@ class _DocImportDialog:
             title = doc_data.get('title', 'Untitled')
 
             try:
+                doc_data = self.package.load_document(item['data'])
+
                 # Check for duplicate by title
                 existing = self._find_existing_doc_by_title(title)
 
@@ -2856,6 +3080,9 @@ class _DocImportDialog:
                     errors.append(f"{title}: failed to add to library")
                     continue
 
+                if item['data'].get('has_embeddings'):
+                    self._import_embeddings(doc_id, item['data'])
+
                 # Add to tree
                 doc_item = DocumentItem(
                     doc_id=doc_id,
@@ -2876,7 +3103,7 @@ class _DocImportDialog:
                     for br_entry in item.get('branch_entries', []):
                         if not br_entry['var'].get():
                             continue
-                        br_data = br_entry['data']
+                        br_data = self.package.load_branch(br_entry['data'])
                         br_title = br_data.get('title', 'Branch')
 
                         # Create the branch document
@@ -2956,6 +3183,17 @@ class _DocImportDialog:
 
     # -------------------- Helpers --------------------
 
+    def _import_embeddings(self, doc_id: str, summary: dict):
+        """Copy a document's packaged embeddings into the database."""
+        try:
+            from document_library import USE_SQLITE_DOCUMENTS
+            if not USE_SQLITE_DOCUMENTS:
+                return
+            import db_manager as db
+            db.db_save_embedding_rows(doc_id, self.package.iter_embedding_rows(summary))
+        except Exception as e:
+            print(f"ERROR importing embeddings for {doc_id}: {e}")
+
     def _find_existing_doc_by_title(self, title: str) -> Optional[dict]:
         """Search the library for a document with the same title."""
         try:
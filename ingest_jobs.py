@@ -0,0 +1,407 @@
+"""
+ingest_jobs.py - Job ledger and concurrent engine for bulk source imports.
+
+The Add Sources dialog used to fetch every URL and file one after another
+on a single thread, and a scheduled run only existed as a Tk timer - close
+the app and it was gone.  This module keeps a small SQLite ledger of every
+import batch and its items, and runs them through per-lane worker pools:
+
+    web      plain web pages                       8 at a time
+    media    YouTube / Substack (may transcribe)   2 at a time
+    file     local files (scanned PDFs are OCR'd)  2 at a time
+    library  documents already in the library      4 at a time
+
+so a 500-URL import runs at network speed while the heavy CPU/API work is
+still bounded.  Each item has a row with its status:
+
+    pending -> running -> fetched -> done
+                       -> failed | skipped | cancelled
+
+'fetched' means the text came back but the dialog has not yet saved it;
+the dialog marks the row 'done' once it has.  Transient failures (timeouts,
+connection errors, HTTP 429/5xx) go back to 'pending' with an exponential
+backoff, up to MAX_ATTEMPTS.  Batches interrupted by a crash or by closing
+the app are resumed on the next start: 'running' and 'fetched' rows are
+simply reset to 'pending'.  Scheduled batches keep their start time in the
+ledger, so a schedule survives a restart too.
+
+Usage:
+    batch_id = create_batch(items, options, scheduled_at=None)
+    engine = IngestEngine(batch_id, run_item, emit)
+    engine.run(lambda: cancelled)          # blocks; call from a worker thread
+    mark_done(batch_id, item)              # after the result has been saved
+    set_batch_state(batch_id, "done")      # once every result has been saved
+
+Called by:
+    sources_dialog.py   (runs and schedules batches)
+    Main.py             (reopens the dialog for unfinished batches)
+"""
+
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import DATA_DIR
+
+
+LEDGER_PATH = os.path.join(DATA_DIR, "ingest_jobs.db")
+
+LANE_LIMITS = {"web": 8, "media": 2, "file": 2, "library": 4}
+MAX_ATTEMPTS = 3            # attempts per item before it is reported failed
+RETRY_BASE_S = 5.0          # first retry delay; doubles per attempt
+RETRY_MAX_S = 120.0
+KEEP_FINISHED_DAYS = 30     # finished batches are pruned after this
+
+_TRANSIENT = re.compile(
+    r"timed?\s*out|timeout|connection|temporar|reset by peer|unreachable|"
+    r"rate.?limit|too many requests|\b429\b|\b50[0234]\b|unavailable|overloaded",
+    re.IGNORECASE)
+
+_FINISHED = ("done", "failed", "skipped", "cancelled")
+
+
+# ============================================================
+# CLASSIFICATION
+# ============================================================
+
+def lane_for(item: str) -> str:
+    """Which worker pool an item runs in."""
+    if item.startswith("library://"):
+        return "library"
+    lowered = item.lower()
+    if "youtube.com" in lowered or "youtu.be" in lowered or "substack.com" in lowered:
+        return "media"
+    if lowered.startswith(("http://", "https://", "www.")):
+        return "web"
+    return "file" if os.path.exists(item) else "web"
+
+
+def is_transient(error: str) -> bool:
+    """Whether a failure message looks worth retrying."""
+    return bool(error and _TRANSIENT.search(error))
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff before the next attempt, with jitter so retries don't bunch."""
+    delay = min(RETRY_MAX_S, RETRY_BASE_S * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+# ============================================================
+# LEDGER
+# ============================================================
+
+_conn: Optional[sqlite3.Connection] = None
+_conn_lock = threading.RLock()
+_claimed = set()            # batches owned by a dialog in this process
+
+
+def _get_connection() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(LEDGER_PATH), exist_ok=True)
+        _conn = sqlite3.connect(LEDGER_PATH, check_same_thread=False, timeout=10)
+        _conn.row_factory = sqlite3.Row
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("PRAGMA synchronous=NORMAL")
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS batches (
+                id            INTEGER PRIMARY KEY AUTOINCREMENT,
+                created       REAL NOT NULL,
+                scheduled_at  REAL,
+                state         TEXT NOT NULL,
+                options       TEXT NOT NULL DEFAULT '{}'
+            )""")
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id            INTEGER PRIMARY KEY AUTOINCREMENT,
+                batch_id      INTEGER NOT NULL REFERENCES batches(id) ON DELETE CASCADE,
+                position      INTEGER NOT NULL,
+                item          TEXT NOT NULL,
+                lane          TEXT NOT NULL,
+                status        TEXT NOT NULL DEFAULT 'pending',
+                attempts      INTEGER NOT NULL DEFAULT 0,
+                next_attempt  REAL NOT NULL DEFAULT 0,
+                error         TEXT,
+                title         TEXT,
+                updated       REAL NOT NULL
+            )""")
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_batch_status "
+                      "ON jobs(batch_id, status, next_attempt)")
+        _conn.commit()
+    return _conn
+
+
+def create_batch(items: List[str], options: Optional[Dict] = None,
+                 scheduled_at: Optional[float] = None) -> int:
+    """Record a new batch, claimed by the caller; returns its ID."""
+    now = time.time()
+    with _conn_lock:
+        conn = _get_connection()
+        cur = conn.execute(
+            "INSERT INTO batches (created, scheduled_at, state, options) VALUES (?, ?, ?, ?)",
+            (now, scheduled_at, "scheduled" if scheduled_at else "running",
+             json.dumps(options or {})))
+        batch_id = cur.lastrowid
+        _claimed.add(batch_id)
+        conn.executemany(
+            "INSERT INTO jobs (batch_id, position, item, lane, updated) VALUES (?, ?, ?, ?, ?)",
+            [(batch_id, i, item, lane_for(item), now) for i, item in enumerate(items)])
+        conn.commit()
+    return batch_id
+
+
+def get_batch(batch_id: int) -> Optional[Dict]:
+    """Batch row plus its options and per-status counts, or None."""
+    with _conn_lock:
+        conn = _get_connection()
+        row = conn.execute("SELECT * FROM batches WHERE id = ?", (batch_id,)).fetchone()
+        if row is None:
+            return None
+        counts = dict(conn.execute(
+            "SELECT status, COUNT(*) FROM jobs WHERE batch_id = ? GROUP BY status",
+            (batch_id,)).fetchall())
+    batch = dict(row)
+    batch["options"] = json.loads(batch["options"] or "{}")
+    batch["counts"] = counts
+    batch["total"] = sum(counts.values())
+    batch["remaining"] = sum(n for s, n in counts.items() if s not in _FINISHED)
+    return batch
+
+
+def batch_items(batch_id: int, unfinished_only: bool = False) -> List[str]:
+    """Items of a batch in their original order."""
+    sql = "SELECT item FROM jobs WHERE batch_id = ?"
+    if unfinished_only:
+        sql += " AND status NOT IN (%s)" % ",".join("?" * len(_FINISHED))
+        params = (batch_id,) + _FINISHED
+    else:
+        params = (batch_id,)
+    with _conn_lock:
+        rows = _get_connection().execute(sql + " ORDER BY position", params).fetchall()
+    return [r[0] for r in rows]
+
+
+def set_batch_state(batch_id: int, state: str):
+    """Move a batch to 'scheduled', 'running', 'done' or 'cancelled'."""
+    with _conn_lock:
+        conn = _get_connection()
+        conn.execute("UPDATE batches SET state = ? WHERE id = ?", (state, batch_id))
+        if state == "cancelled":
+            conn.execute(
+                "UPDATE jobs SET status = 'cancelled', updated = ? WHERE batch_id = ? "
+                "AND status IN ('pending', 'running')", (time.time(), batch_id))
+        conn.commit()
+
+
+def unfinished_batches() -> List[Dict]:
+    """
+    Scheduled or interrupted batches that can be picked up again, newest
+    first.  Batches created with options {'resumable': False} (results that
+    only lived in memory) are closed instead.
+    """
+    with _conn_lock:
+        ids = [r[0] for r in _get_connection().execute(
+            "SELECT id FROM batches WHERE state IN ('scheduled', 'running') "
+            "ORDER BY created DESC").fetchall()]
+    batches = []
+    for batch_id in ids:
+        batch = get_batch(batch_id)
+        if not batch or batch_id in _claimed:
+            continue
+        if not batch["remaining"]:
+            set_batch_state(batch_id, "done")
+        elif not batch["options"].get("resumable", True):
+            set_batch_state(batch_id, "cancelled")
+        else:
+            batches.append(batch)
+    return batches
+
+
+def claim(batch_id: int) -> bool:
+    """Take ownership of a batch in this process; False if already owned."""
+    with _conn_lock:
+        if batch_id in _claimed:
+            return False
+        _claimed.add(batch_id)
+        return True
+
+
+def release(batch_id: int):
+    with _conn_lock:
+        _claimed.discard(batch_id)
+
+
+def mark_done(batch_id: int, item: str):
+    """The dialog has saved a fetched item."""
+    _update_item(batch_id, item, "done", from_status="fetched")
+
+
+def _update_item(batch_id: int, item: str, status: str, from_status: Optional[str] = None):
+    sql = "UPDATE jobs SET status = ?, updated = ? WHERE batch_id = ? AND item = ?"
+    params = [status, time.time(), batch_id, item]
+    if from_status:
+        sql += " AND status = ?"
+        params.append(from_status)
+    with _conn_lock:
+        conn = _get_connection()
+        conn.execute(sql, params)
+        conn.commit()
+
+
+def _update_job(job_id: int, **fields):
+    fields["updated"] = time.time()
+    assignments = ", ".join(f"{k} = ?" for k in fields)
+    with _conn_lock:
+        conn = _get_connection()
+        conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+        conn.commit()
+
+
+def prune(max_age_days: int = KEEP_FINISHED_DAYS):
+    """Forget finished batches older than max_age_days."""
+    cutoff = time.time() - max_age_days * 86400
+    with _conn_lock:
+        conn = _get_connection()
+        old = [r[0] for r in conn.execute(
+            "SELECT id FROM batches WHERE state IN ('done', 'cancelled') AND created < ?",
+            (cutoff,)).fetchall()]
+        for batch_id in old:
+            conn.execute("DELETE FROM jobs WHERE batch_id = ?", (batch_id,))
+            conn.execute("DELETE FROM batches WHERE id = ?", (batch_id,))
+        conn.commit()
+
+
+# ============================================================
+# ENGINE
+# ============================================================
+
+class IngestEngine:
+    """
+    Runs one batch from the ledger through per-lane thread pools.
+
+    run_item(item, lane) does the work for one item and returns an event
+    tuple in the dialog's results_queue format:
+        ('success', item, title, text) | ('failed', item, error, None)
+        | ('skipped', item, reason, None)
+    emit(event) receives those plus 'progress'/'status' updates and a final
+    'complete' or 'cancelled'; it is called from worker threads.
+    """
+
+    POLL_S = 0.25
+
+    def __init__(self, batch_id: int,
+                 run_item: Callable[[str, str], Tuple],
+                 emit: Callable[[Tuple], None],
+                 describe: Callable[[str], str] = str,
+                 limits: Optional[Dict[str, int]] = None):
+        self.batch_id = batch_id
+        self.run_item = run_item
+        self.emit = emit
+        self.describe = describe
+        self.limits = dict(LANE_LIMITS, **(limits or {}))
+
+    def _reset_interrupted(self):
+        """Rows left 'running' or 'fetched' by a previous run start again."""
+        with _conn_lock:
+            conn = _get_connection()
+            conn.execute(
+                "UPDATE jobs SET status = 'pending', next_attempt = 0, updated = ? "
+                "WHERE batch_id = ? AND status IN ('running', 'fetched')",
+                (time.time(), self.batch_id))
+            conn.execute("UPDATE batches SET state = 'running' WHERE id = ?", (self.batch_id,))
+            conn.commit()
+
+    def _ready_jobs(self, now: float) -> List[sqlite3.Row]:
+        with _conn_lock:
+            return _get_connection().execute(
+                "SELECT id, item, lane, attempts FROM jobs WHERE batch_id = ? "
+                "AND status = 'pending' AND next_attempt <= ? ORDER BY position",
+                (self.batch_id, now)).fetchall()
+
+    def _next_retry_at(self) -> Optional[float]:
+        with _conn_lock:
+            row = _get_connection().execute(
+                "SELECT MIN(next_attempt) FROM jobs WHERE batch_id = ? AND status = 'pending'",
+                (self.batch_id,)).fetchone()
+        return row[0] if row else None
+
+    def _call(self, item: str, lane: str) -> Tuple:
+        try:
+            return self.run_item(item, lane)
+        except Exception as e:
+            # The class name (ConnectionError, ReadTimeout...) tells is_transient a lot
+            return ("failed", item, f"{type(e).__name__}: {e}", None)
+
+    def run(self, cancel_requested: Callable[[], bool]):
+        """Process the batch until every item is finished or cancel is requested."""
+        self._reset_interrupted()
+        batch = get_batch(self.batch_id) or {"total": 0, "remaining": 0}
+        total = batch["total"]
+        finished = total - batch["remaining"]
+        pools = {lane: ThreadPoolExecutor(max_workers=max(1, n), thread_name_prefix=f"ingest-{lane}")
+                 for lane, n in self.limits.items()}
+        in_flight = {}
+        cancelled = False
+        try:
+            while True:
+                if cancel_requested():
+                    cancelled = True
+                    break
+                now = time.time()
+                for job in self._ready_jobs(now):
+                    _update_job(job["id"], status="running", attempts=job["attempts"] + 1)
+                    pool = pools.get(job["lane"]) or pools["web"]
+                    future = pool.submit(self._call, job["item"], job["lane"])
+                    in_flight[future] = (job["id"], job["item"], job["attempts"] + 1)
+
+                if not in_flight:
+                    retry_at = self._next_retry_at()
+                    if retry_at is None:
+                        break
+                    time.sleep(min(self.POLL_S, max(0.0, retry_at - now)))
+                    continue
+
+                done, _ = wait(list(in_flight), timeout=self.POLL_S, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id, item, attempts = in_flight.pop(future)
+                    if self._finish(job_id, item, attempts, future.result()):
+                        finished += 1
+                        self.emit(("progress", finished / max(total, 1) * 100,
+                                   f"Fetched {finished}/{total}: {self.describe(item)}", None))
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        if cancelled:
+            set_batch_state(self.batch_id, "cancelled")
+            self.emit(("cancelled", None, None, None))
+        else:
+            # The batch is closed with set_batch_state(..., 'done') by whoever
+            # saves the fetched results, so a crash before then still resumes.
+            self.emit(("complete", None, None, None))
+
+    def _finish(self, job_id: int, item: str, attempts: int, event: Tuple) -> bool:
+        """Record an item's outcome; False if it was re-queued for a retry."""
+        kind, _source, message, _content = event
+        if kind == "success":
+            _update_job(job_id, status="fetched", title=message, error=None)
+        elif kind == "skipped":
+            _update_job(job_id, status="skipped", error=message)
+        elif attempts < MAX_ATTEMPTS and is_transient(message or ""):
+            delay = retry_delay(attempts)
+            _update_job(job_id, status="pending", error=message,
+                        next_attempt=time.time() + delay)
+            self.emit(("status", None,
+                       f"Retrying {self.describe(item)} in {delay:.0f}s: {message}", None))
+            return False
+        else:
+            _update_job(job_id, status="failed", error=message)
+        self.emit(event)
+        return True
@@ -239,11 +239,14 @@ class LibraryInteractionMixin:
             if not result:
                 return
         
-        def process_single_item(url_or_path: str, status_callback) -> tuple:
+        def process_single_item(url_or_path: str, status_callback, settings: Optional[dict] = None) -> tuple:
             """
-            Process a single URL or file path.
+            Process a single URL or file path (runs in a dialog worker thread).
+            settings is the provider/model snapshot taken on the Tk thread when
+            the run started - Tk variables must not be read from here.
             Returns: (success: bool, result_or_error: str, title: Optional[str])
             """
+            settings = settings or {}
             try:
                 # Detect type and process accordingly
                 url_or_path = url_or_path.strip()
@@ -266,7 +269,7 @@ class LibraryInteractionMixin:
                                 extracted_url = url_match.group(1).strip()
                                 status_callback(f"Extracted URL: {extracted_url[:50]}...")
                                 # Recursively process the extracted URL
-                                return process_single_item(extracted_url, status_callback)
+                                return process_single_item(extracted_url, status_callback, settings)
                             else:
                                 return False, "Could not extract URL from .url file", None
                         except Exception as e:
@@ -300,8 +303,8 @@ class LibraryInteractionMixin:
                                 return False, f"OCR not available: {error_msg}", None
                             
                             # Process with smart extraction (includes Cloud AI fallback)
-                            provider = self.provider_var.get()
-                            model = self.model_var.get()
+                            provider = settings.get('provider', '')
+                            model = settings.get('model', '')
                             api_key = self.config.get("keys", {}).get(provider, "")
                             all_api_keys = self.config.get("keys", {})
                             
@@ -493,11 +496,14 @@ class LibraryInteractionMixin:
                 'prompt_text': self.prompt_text.get('1.0', tk.END).strip() if hasattr(self, 'prompt_text') else ''
             }
         
-        def process_single_item(url_or_path: str, status_callback) -> tuple:
+        def process_single_item(url_or_path: str, status_callback, settings: Optional[dict] = None) -> tuple:
             """
-            Process a single URL or file path.
+            Process a single URL or file path (runs in a dialog worker thread).
+            settings is the provider/model snapshot taken on the Tk thread when
+            the run started - Tk variables must not be read from here.
             Returns: (success: bool, result_or_error: str, title: Optional[str])
             """
+            settings = settings or {}
             try:
                 url_or_path = url_or_path.strip()
                 
@@ -516,7 +522,7 @@ class LibraryInteractionMixin:
                             if url_match:
                                 extracted_url = url_match.group(1).strip()
                                 status_callback(f"Extracted URL: {extracted_url[:50]}...")
-                                return process_single_item(extracted_url, status_callback)
+                                return process_single_item(extracted_url, status_callback, settings)
                             else:
                                 return False, "Could not extract URL from .url file", None
                         except Exception as e:
@@ -546,8 +552,8 @@ class LibraryInteractionMixin:
                                 return False, f"OCR not available: {error_msg}", None
                             
                             # Process with smart extraction (includes Cloud AI fallback)
-                            provider = self.provider_var.get()
-                            model = self.model_var.get()
+                            provider = settings.get('provider', '')
+                            model = settings.get('model', '')
                             api_key = self.config.get("keys", {}).get(provider, "")
                             all_api_keys = self.config.get("keys", {})
                             
@@ -0,0 +1,114 @@
+"""
+benchmark_chunking.py  -  Compare chunk counts for the fixed presets vs 'auto'
+Run from the project root:
+    python maintenance/benchmark_chunking.py [repeats ...]
+
+Builds transcripts of increasing length by repeating dummy_transcript.txt and
+reports, for each chunk preset and for 'auto' across several models, how many
+AI calls the document needs and how full (in tokens) the chunks are.
+
+Whenever 'auto' needs more than one chunk, it is also checked: no chunk may
+exceed auto_chunk_budget, and the full chunks must average at least
+MIN_AUTO_FILL of it (otherwise a long document makes avoidable extra calls).
+Exits with status 1 if a check fails.
+"""
+import os, re, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import CHUNK_SIZES
+from token_counter import TIKTOKEN_AVAILABLE, count_tokens, get_context_window
+from utils import auto_chunk_budget, chunk_entries, entries_to_text_with_speakers
+
+LINE_RE = re.compile(
+    r'^\[(\d+):(\d+):(\d+(?:\.\d+)?) --> [\d:.]+\]\s+(\S+)\s+(.*)$'
+)
+
+MODELS = [
+    ("OpenAI (ChatGPT)", "gpt-4o-mini"),
+    ("Anthropic (Claude)", "claude-sonnet-4-5"),
+    ("Google (Gemini)", "gemini-2.5-flash"),
+    ("Ollama (Local)", "llama3.2"),
+]
+PROMPT = "Summarise the key points of this transcript with timestamps. " * 4
+MIN_AUTO_FILL = 0.90
+
+failures = []
+
+
+def load_entries(path):
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            m = LINE_RE.match(line.strip())
+            if not m:
+                continue
+            h, mnt, sec, speaker, text = m.groups()
+            start = int(h) * 3600 + int(mnt) * 60 + float(sec)
+            entries.append({"start": start, "speaker": speaker, "text": text})
+    return entries
+
+
+def repeat_entries(entries, times):
+    span = (entries[-1]["start"] + 5) if entries else 0
+    out = []
+    for r in range(times):
+        for e in entries:
+            out.append(dict(e, start=e["start"] + r * span))
+    return out
+
+
+def report(label, chunks, provider, model, budget=None):
+    # Measured on the text actually sent: timestamps and speaker labels included
+    sizes = [count_tokens(entries_to_text_with_speakers(c), provider, model) for c in chunks]
+    fill = ""
+    if budget:
+        full = sizes[:-1] or sizes
+        ratio = sum(full) / len(full) / budget
+        fill = f"  avg fill {ratio:6.1%} of {budget:,}"
+        if len(chunks) > 1:
+            ok = ratio >= MIN_AUTO_FILL and max(sizes) <= budget
+            fill += "  [OK]" if ok else "  [FAIL]"
+            if not ok:
+                failures.append(label)
+    print(f"    {label:<34} {len(chunks):>5} chunk(s)  max {max(sizes):>8,} tok{fill}")
+
+
+def main():
+    repeats = [int(a) for a in sys.argv[1:]] or [1, 20, 200]
+    base = load_entries(os.path.join(ROOT, "dummy_transcript.txt"))
+    print(f"tiktoken: {'yes' if TIKTOKEN_AVAILABLE else 'no (character estimate)'}")
+    print(f"Base transcript: {len(base)} entries\n")
+
+    for times in repeats:
+        entries = repeat_entries(base, times)
+        chars = sum(len(e["text"]) for e in entries)
+        print(f"x{times}: {len(entries):,} entries, {chars:,} chars")
+
+        for key, info in CHUNK_SIZES.items():
+            if info.get("chars") is None:
+                continue
+            report(f"{key} ({info['chars']:,} chars)", chunk_entries(entries, key), None, None)
+
+        for provider, model in MODELS:
+            t0 = time.perf_counter()
+            chunks = chunk_entries(entries, "auto", provider=provider, model=model,
+                                   prompt_text=PROMPT)
+            elapsed = (time.perf_counter() - t0) * 1000
+            budget = auto_chunk_budget(provider, model, PROMPT)
+            label = f"auto {model} ({get_context_window(provider, model) // 1000}k)"
+            report(label, chunks, provider, model, budget)
+            print(f"    {'':<34} chunked in {elapsed:.1f} ms")
+        print()
+
+    if failures:
+        print(f"FAILED (fill below {MIN_AUTO_FILL:.0%} or over budget): {', '.join(failures)}")
+        return 1
+    print("All multi-chunk 'auto' runs within budget and at least "
+          f"{MIN_AUTO_FILL:.0%} full.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+benchmark_html_extract.py  -  Throughput and text quality of HTML-to-text paths
+Run from the project root:
+    python maintenance/benchmark_html_extract.py [fixture_dir]
+
+Compares html_extract (lxml and html.parser backends) with the paths it
+replaced: the tag-stripping regex subscription_manager used, BeautifulSoup
+collecting every <p> (fetch_web_url) and BeautifulSoup get_text() (local
+.html files).  BeautifulSoup/lxml rows are skipped if not installed.
+
+fixture_dir holds saved pages as *.html; a '<name>.txt' beside a page is
+its expected article text and enables the quality columns (word-level
+precision / recall / F1 against it).  Without a directory, synthetic pages
+of increasing size are generated: a known article wrapped in navigation,
+sidebars, cookie banners, comments, scripts and a footer.
+"""
+import glob, os, random, re, sys, time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import html_extract
+
+try:
+    from bs4 import BeautifulSoup
+    BS4_AVAILABLE = True
+except ImportError:
+    BS4_AVAILABLE = False
+
+WORDS = ("the analysis of primary sources shows that historical records were often "
+         "incomplete however careful comparison across archives reveals patterns in "
+         "trade migration and policy which earlier scholars had overlooked").split()
+
+
+# ── Paths being compared ─────────────────────────────────────────────────────
+
+def regex_strip(html):
+    clean = re.sub(r"<[^>]+>", " ", html)
+    return re.sub(r"\s+", " ", clean).strip()
+
+
+def bs4_paragraphs(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return "\n\n".join(p.get_text().strip() for p in soup.find_all("p") if p.get_text().strip())
+
+
+def bs4_get_text(html):
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup(["script", "style"]):
+        script.decompose()
+    lines = (line.strip() for line in soup.get_text().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+METHODS = [("regex strip (subscriptions)", regex_strip)]
+if BS4_AVAILABLE:
+    METHODS += [("bs4 <p> (fetch_web_url)", bs4_paragraphs),
+                ("bs4 get_text (local .html)", bs4_get_text)]
+METHODS.append(("html_extract html.parser", lambda h: html_extract.extract(h, use_lxml=False).text))
+if html_extract.LXML_AVAILABLE:
+    METHODS.append(("html_extract lxml", lambda h: html_extract.extract(h, use_lxml=True).text))
+
+
+# ── Fixtures ─────────────────────────────────────────────────────────────────
+
+def sentence(rng, n):
+    words = [rng.choice(WORDS) for _ in range(n)]
+    return " ".join(words).capitalize() + ", " + " ".join(rng.choice(WORDS) for _ in range(6)) + "."
+
+
+def synthetic_page(paragraphs, seed=1):
+    """(html, expected article text) with realistic boilerplate around it."""
+    rng = random.Random(seed)
+    article = [" ".join(sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(2, 5)))
+               for _ in range(paragraphs)]
+    links = "".join(f'<li><a href="/s/{i}">Section {i}</a></li>' for i in range(40))
+    script = "<script>var cfg = {" + ",".join(f'"k{i}": "{"x" * 40}"' for i in range(200)) + "};</script>"
+    style = "<style>" + " ".join(f".c{i} {{ margin: {i}px; }}" for i in range(300)) + "</style>"
+    body = []
+    for i, p in enumerate(article):
+        if i % 7 == 3:
+            body.append(f'<p>{p[:60]}<a href="/ref/{i}">{p[60:90]}</a>{p[90:]}</p>')
+        else:
+            body.append(f"<p>{p}</p>")
+        if i % 25 == 10:
+            body.append('<div class="share-bar"><a href="#">Share</a> <a href="#">Tweet</a></div>')
+    comments = "".join(f'<div class="comment"><p>{sentence(rng, 12)}</p></div>' for _ in range(paragraphs // 4 + 3))
+    related = "".join(f'<p><a href="/r/{i}">{sentence(rng, 6)}</a></p>' for i in range(12))
+    html = f"""<!DOCTYPE html><html><head><meta charset="utf-8"><title>Primary Sources</title>
+{style}{script}<meta property="article:published_time" content="2025-03-14T09:00:00Z"></head>
+<body><header class="site-header"><nav><ul>{links}</ul></nav></header>
+<div class="cookie-banner"><p>We use cookies to improve your experience. Accept all cookies?</p></div>
+<div class="layout"><div class="sidebar"><h3>Popular</h3><ul>{links}</ul><p>{sentence(rng, 15)}</p></div>
+<main><article class="post"><h1>Primary Sources</h1><div class="post-content">{''.join(body)}</div></article>
+<section class="related"><h2>Related</h2>{related}</section>
+<section id="comments"><h2>Comments</h2>{comments}</section></main></div>
+{script}<footer><p>Copyright 2025. All rights reserved. {sentence(rng, 10)}</p></footer></body></html>"""
+    return html, "\n\n".join(["Primary Sources"] + article)
+
+
+def load_fixtures(directory):
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.htm*"))):
+        with open(path, "rb") as f:
+            raw = f.read()
+        html = raw.decode("utf-8", errors="replace")
+        expected_path = os.path.splitext(path)[0] + ".txt"
+        expected = None
+        if os.path.exists(expected_path):
+            with open(expected_path, encoding="utf-8") as f:
+                expected = f.read()
+        fixtures.append((os.path.basename(path), html, expected))
+    return fixtures
+
+
+# ── Measurement ──────────────────────────────────────────────────────────────
+
+def quality(text, expected):
+    got, want = Counter(text.lower().split()), Counter(expected.lower().split())
+    common = sum((got & want).values())
+    precision = common / max(sum(got.values()), 1)
+    recall = common / max(sum(want.values()), 1)
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def timed(fn, html, min_seconds=0.5):
+    runs, start = 0, time.perf_counter()
+    while True:
+        text = fn(html)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return text, elapsed / runs
+
+
+def main():
+    if len(sys.argv) > 1:
+        fixtures = load_fixtures(sys.argv[1])
+        if not fixtures:
+            sys.exit(f"No .html files in {sys.argv[1]}")
+    else:
+        fixtures = []
+        for n in (20, 200, 2000):
+            html, expected = synthetic_page(n, seed=n)
+            fixtures.append((f"synthetic-{n}p", html, expected))
+
+    print(f"lxml: {'yes' if html_extract.LXML_AVAILABLE else 'no'}   "
+          f"BeautifulSoup: {'yes' if BS4_AVAILABLE else 'no'}\n")
+    for name, html, expected in fixtures:
+        size_mb = len(html.encode("utf-8")) / 1e6
+        print(f"{name}: {size_mb * 1000:,.0f} KB")
+        for label, fn in METHODS:
+            text, seconds = timed(fn, html)
+            line = f"    {label:<30} {seconds * 1000:9.1f} ms  {size_mb / seconds:7.1f} MB/s  {len(text):>9,} chars"
+            if expected is not None:
+                p, r, f1 = quality(text, expected)
+                line += f"   P {p:5.1%}  R {r:5.1%}  F1 {f1:5.1%}"
+            print(line)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+test_thread_viewer_indexes.py
+=============================
+Standalone check that Thread Viewer find/replace positions and progressive
+tag ranges land on the right characters when the text contains emoji.
+
+Tk 8.6 counts a character above U+FFFF (the "🧑 YOU" / "🤖 AI" exchange
+headers) as two in "line.col" indices, Python as one.  TextIndex and
+ProgressiveText.insert_runs must convert, or every highlight after a
+header is shifted and Replace All edits the wrong characters.
+
+Run from the project root:
+    python maintenance/test_thread_viewer_indexes.py
+
+The index checks need only Tcl.  The widget checks (real Text widget,
+replace and insert_runs) are skipped when no display is available.
+
+Expected output: a series of [OK] lines ending with "ALL CHECKS PASSED".
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tkinter as tk
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.dirname(_SCRIPT_DIR)
+sys.path.insert(0, _PROJECT_ROOT)
+
+from thread_viewer_render import ProgressiveText, TextIndex, tk_len
+
+TEXT = (
+    "🧑 YOU  [10:02]\n"
+    "What did the speaker say about the archive?\n"
+    "🤖 AI  [10:03]\n"
+    "The archive 🗄️ was incomplete; the archive was rebuilt 🧑‍🔬 later.\n"
+    "🧑 YOU 🧑 YOU archive"
+)
+NEEDLE = "archive"
+
+_failures = 0
+
+
+def check(ok: bool, label: str):
+    global _failures
+    print(f"  [{'OK' if ok else 'FAIL'}]  {label}")
+    if not ok:
+        _failures += 1
+
+
+def tcl_range(tcl, text: str, start: str, end: str) -> str:
+    """What a Text widget holding text returns for get(start, end) (same line)."""
+    line, col = (int(p) for p in start.split("."))
+    end_line, end_col = (int(p) for p in end.split("."))
+    assert line == end_line
+    tcl.call("set", "lines", tcl.call("split", text, "\n"))
+    tcl.call("set", "line", tcl.eval(f"lindex $lines {line - 1}"))
+    return tcl.eval(f"string range $line {col} {end_col - 1}")
+
+
+def check_index_with_tcl():
+    print("  TextIndex against Tcl string indices...")
+    tcl = tk.Tcl()
+    index = TextIndex(TEXT)
+    offsets = index.find_all(NEEDLE)
+    check(len(offsets) == 4, f"found {len(offsets)} matches of '{NEEDLE}' (expected 4)")
+    for (start, end) in index.spans(offsets, len(NEEDLE)):
+        got = tcl_range(tcl, TEXT, start, end)
+        check(got == NEEDLE, f"{start}-{end} -> {got!r}")
+    check(tk_len("🧑 YOU") == int(tcl.eval('string length "🧑 YOU"')),
+          "tk_len matches Tcl's string length")
+
+
+def check_widget():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("  (no display - widget checks skipped)")
+        return
+    root.withdraw()
+    try:
+        print("  Replace All on a real Text widget...")
+        text = tk.Text(root)
+        text.insert("1.0", TEXT)
+        index = TextIndex(text.get("1.0", "end-1c"))
+        for offset in reversed(index.find_all(NEEDLE)):
+            text.replace(index.to_index(offset), index.to_index(offset + len(NEEDLE)), "ARCHIVE")
+        check(text.get("1.0", "end-1c") == TEXT.replace(NEEDLE, "ARCHIVE"),
+              "every match replaced, nothing else touched")
+
+        print("  ProgressiveText.insert_runs tag ranges...")
+        widget = ProgressiveText(root)
+        widget.insert("1.0", "before\nafter")
+        runs = ["🧑 YOU\n", "header", "plain ", "", "tagged", "mark", "\n", ""]
+        widget.insert_runs("2.0", runs)
+        ranges = widget.tag_ranges("mark")
+        check(bool(ranges) and widget.get(ranges[0], ranges[1]) == "tagged",
+              "tag lands on its run after an emoji")
+        check(widget.get("1.0", "end-1c") == "before\n🧑 YOU\nplain tagged\nafter",
+              "runs inserted in order at the given index")
+    finally:
+        root.destroy()
+
+
+def main() -> bool:
+    print("=" * 60)
+    print("  Thread Viewer index checks (emoji / non-BMP text)")
+    print("=" * 60)
+    check_index_with_tcl()
+    check_widget()
+    print()
+    if _failures:
+        print(f"  {_failures} CHECK(S) FAILED")
+        return False
+    print("  ALL CHECKS PASSED")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,128 @@
+"""
+test_thread_viewer_progressive.py
+=================================
+Standalone check that a progressive (background) Thread Viewer fill is not
+mistaken for user edits.
+
+ProgressiveText writes a large render in batches after end_batch().  Those
+inserts must not leave Tk's modified flag set, or expanding/collapsing an
+exchange mid-render (and the save-on-close checks) would save the viewer's
+own rendered text back as edits.
+
+Run from the project root:
+    python maintenance/test_thread_viewer_progressive.py
+
+Needs a display; the checks are skipped when none is available.
+
+Expected output: a series of [OK] lines ending with "ALL CHECKS PASSED".
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tkinter as tk
+from types import SimpleNamespace
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.dirname(_SCRIPT_DIR)
+sys.path.insert(0, _PROJECT_ROOT)
+
+from thread_viewer_render import ProgressiveText
+
+LINE = "🤖 AI  [10:03]\nThe archive was rebuilt later.\n"
+RUNS = 2000   # ~90k characters: several background batches
+
+_failures = 0
+
+
+def check(ok: bool, label: str):
+    global _failures
+    print(f"  [{'OK' if ok else 'FAIL'}]  {label}")
+    if not ok:
+        _failures += 1
+
+
+def start_render(root) -> ProgressiveText:
+    """A widget mid-way through a refresh: old content replaced, fill pending."""
+    widget = ProgressiveText(root)
+    widget.insert("1.0", "previous content")
+    widget.delete("1.0", tk.END)
+    widget.begin_batch()
+    for _ in range(RUNS):
+        widget.insert(tk.END, LINE, "normal")
+    widget.end_batch(sync_chars=1000)
+    return widget
+
+
+def step(root):
+    """Let one scheduled background batch run."""
+    root.after(5)
+    root.update()
+
+
+def check_flag(root):
+    print("  Modified flag during a background fill...")
+    widget = start_render(root)
+    check(widget.render_pending, "render still pending after end_batch")
+    check(not widget.edit_modified(), "clean after the synchronous part")
+    step(root)
+    check(widget.render_pending and not widget.edit_modified(),
+          "clean after a background batch")
+
+    # A user edit mid-render must survive later batches
+    widget.tk.call(widget._w, "insert", "1.0", "x")
+    check(bool(widget.edit_modified()), "user edit sets the flag")
+    widget.get("1.0", "end-1c")   # flushes the rest of the render
+    check(not widget.render_pending, "get() flushed the render")
+    check(bool(widget.edit_modified()), "user edit still reported after the flush")
+
+    widget = start_render(root)
+    widget.get("1.0", "end-1c")
+    check(not widget.edit_modified(), "flush with no user edit leaves the flag clear")
+
+
+def check_toggle(root):
+    print("  Toggling an exchange mid-render...")
+    from thread_viewer import ThreadViewerWindow
+
+    saved, refreshed, rerendered = [], [], []
+    viewer = SimpleNamespace(
+        thread_text=start_render(root),
+        exchange_expanded_state={},
+        _formatting_changed=False,
+        _save_edits_before_refresh=lambda: saved.append(True),
+        _refresh_thread_display=lambda: refreshed.append(True),
+        _rerender_exchange=lambda idx: rerendered.append(idx) or True,
+        window=SimpleNamespace(after=lambda ms, fn: None),
+    )
+    ThreadViewerWindow._toggle_exchange(viewer, 0)
+    check(not saved, "nothing saved as edits")
+    check(not refreshed and rerendered == [0], "exchange re-rendered in place")
+
+
+def main() -> bool:
+    print("=" * 60)
+    print("  Thread Viewer progressive render checks")
+    print("=" * 60)
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("  (no display - checks skipped)")
+        return True
+    root.withdraw()
+    try:
+        check_flag(root)
+        check_toggle(root)
+    finally:
+        root.destroy()
+    print()
+    if _failures:
+        print(f"  {_failures} CHECK(S) FAILED")
+        return False
+    print("  ALL CHECKS PASSED")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
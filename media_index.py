@@ -0,0 +1,366 @@
+"""
+media_index.py - Seek index and waveform peaks for the audio players.
+
+pygame (SDL_mixer) seeks in an MP3 by decoding from the start of the file, so
+every jump in a long recording stalls for longer the further in it lands.
+This module scans an MP3's frame headers once (no decoding) and records the
+byte offset of a frame every SEEK_INTERVAL_S seconds.  A player can then open
+the file at the nearest indexed frame and decode at most SEEK_INTERVAL_S of
+audio to reach any position - constant time however long the file is.
+
+It also stores a low-resolution waveform (PEAKS_PER_SECOND peak levels per
+second, 0-255), decoded once with ffmpeg at a low sample rate, so the player
+can draw the file without decoding it again.
+
+Indexes are cached as JSON under MEDIA_INDEX_CACHE_DIR, keyed by the media
+file's fingerprint, and built on a single background worker.
+
+Usage:
+    import media_index
+    media_index.request(path, callback)      # callback(MediaIndex or None)
+    stream, skip = index.open_at(seconds)    # pygame.mixer.music.load(stream, "mp3")
+                                             # pygame.mixer.music.play(start=skip)
+
+Author: DocAnalyser Development Team
+"""
+
+import base64
+import io
+import json
+import logging
+import mmap
+import os
+import queue
+import subprocess
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cache_manager
+import transcode_service
+from config import MEDIA_INDEX_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+INDEX_VERSION = 1
+SEEK_INTERVAL_S = 2.0       # Spacing of seek points
+PEAKS_PER_SECOND = 10       # Waveform resolution
+PEAK_DECODE_RATE = 2000     # Hz; plenty for a peak envelope, cheap to decode
+
+# MPEG audio tables, indexed [version][layer] / [version]
+# version: 3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5;  layer: 3 = I, 2 = II, 1 = III
+_BITRATES_V1 = {
+    3: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+}
+_BITRATES_V2 = {
+    3: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    1: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+# ============================================================
+# MP3 SEEK TABLE
+# ============================================================
+
+def _parse_frame_header(b0: int, b1: int, b2: int) -> Optional[Tuple[int, int, int]]:
+    """(frame length in bytes, samples, sample rate) for a frame header, or None."""
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 3
+    layer = (b1 >> 1) & 3
+    bitrate_idx = b2 >> 4
+    rate_idx = (b2 >> 2) & 3
+    if version == 1 or layer == 0 or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None     # Reserved values, or free-format (no fixed length)
+    padding = (b2 >> 1) & 1
+    bitrate = (_BITRATES_V1 if version == 3 else _BITRATES_V2)[layer][bitrate_idx] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_idx]
+    if layer == 3:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate
+    if layer == 1 and version != 3:
+        return 72 * bitrate // sample_rate + padding, 576, sample_rate
+    return 144 * bitrate // sample_rate + padding, 1152, sample_rate
+
+
+def _id3v2_size(data) -> int:
+    """Bytes taken by a leading ID3v2 tag (0 if none)."""
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def build_mp3_seek_table(path: str) -> Tuple[List[Tuple[float, int]], float]:
+    """
+    Walk an MP3's frame headers.  Returns ([(seconds, byte offset), ...] every
+    SEEK_INTERVAL_S, total duration).  Empty table if it isn't a parseable MP3.
+    """
+    points: List[Tuple[float, int]] = []
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < 4:
+            return points, 0.0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            end = len(data)
+            pos = _id3v2_size(data)
+            seconds = 0.0
+            next_point = 0.0
+            first = True
+            while pos + 4 <= end:
+                header = _parse_frame_header(data[pos], data[pos + 1], data[pos + 2])
+                if header is None or header[0] < 4:
+                    # Lost sync (junk, trailing tags) - look for the next frame
+                    nxt = data.find(b"\xff", pos + 1)
+                    if nxt < 0:
+                        break
+                    pos = nxt
+                    continue
+                length, samples, sample_rate = header
+                if first:
+                    # Guard against a false sync: a real frame is followed by another
+                    after = pos + length
+                    if after + 3 <= end and _parse_frame_header(
+                            data[after], data[after + 1], data[after + 2]) is None:
+                        pos += 1
+                        continue
+                    first = False
+                    if data.find(b"Xing", pos, pos + 64) >= 0 or data.find(b"Info", pos, pos + 64) >= 0:
+                        pos += length       # VBR info frame: no audio
+                        continue
+                if seconds >= next_point:
+                    points.append((seconds, pos))
+                    next_point = seconds + SEEK_INTERVAL_S
+                seconds += samples / sample_rate
+                pos += length
+    return points, (seconds if points else 0.0)
+
+
+class _FileSlice(io.RawIOBase):
+    """Read-only view of a file from a byte offset, presented as position 0."""
+
+    def __init__(self, path: str, offset: int):
+        self._f = open(path, "rb")
+        self._offset = offset
+        self._f.seek(offset)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        return self._f.readinto(b)
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos += self._offset
+        self._f.seek(pos, whence)
+        return self.tell()
+
+    def tell(self):
+        return self._f.tell() - self._offset
+
+    def close(self):
+        self._f.close()
+        super().close()
+
+
+# ============================================================
+# WAVEFORM PEAKS
+# ============================================================
+
+def compute_peaks(path: str) -> bytes:
+    """
+    Peak level per 1/PEAKS_PER_SECOND s, scaled to 0-255.  Decodes with ffmpeg
+    (mono, PEAK_DECODE_RATE Hz); b"" if ffmpeg is unavailable or fails.
+    """
+    bucket = PEAK_DECODE_RATE // PEAKS_PER_SECOND
+    cmd = [transcode_service.get_ffmpeg_cmd(), '-nostdin', '-loglevel', 'error', '-i', path,
+           '-vn', '-ac', '1', '-ar', str(PEAK_DECODE_RATE), '-f', 's16le', 'pipe:1']
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                **transcode_service._subprocess_kwargs())
+    except (FileNotFoundError, OSError):
+        return b""
+    peaks = bytearray()
+    block = bucket * 2 * 512        # 512 buckets per read
+    try:
+        while True:
+            raw = proc.stdout.read(block)
+            if not raw:
+                break
+            samples = array("h")
+            samples.frombytes(raw[:len(raw) - len(raw) % 2])
+            for k in range(0, len(samples), bucket):
+                chunk = samples[k:k + bucket]
+                peak = max(max(chunk), -min(chunk))
+                peaks.append(min(255, peak >> 7))
+    finally:
+        proc.stdout.close()
+        proc.wait()
+    return bytes(peaks) if proc.returncode == 0 else b""
+
+
+# ============================================================
+# INDEX
+# ============================================================
+
+class MediaIndex:
+    """Seek points and waveform peaks for one media file."""
+
+    def __init__(self, path: str, duration: float = 0.0,
+                 seek_points: Optional[List[Tuple[float, int]]] = None,
+                 peaks: bytes = b""):
+        self.path = path
+        self.duration = duration
+        self.seek_points = seek_points or []
+        self.peaks = peaks
+        self._times = [t for t, _ in self.seek_points]
+
+    @property
+    def can_seek(self) -> bool:
+        return bool(self.seek_points)
+
+    def locate(self, seconds: float) -> Tuple[float, int]:
+        """(time, byte offset) of the last seek point at or before seconds."""
+        k = max(0, bisect_right(self._times, max(0.0, seconds)) - 1)
+        return self.seek_points[k]
+
+    def open_at(self, seconds: float) -> Tuple[io.BufferedReader, float]:
+        """
+        A stream starting at the seek point before seconds, and how far past
+        its start seconds lies (at most SEEK_INTERVAL_S).  Caller closes it.
+        """
+        time, offset = self.locate(seconds)
+        return io.BufferedReader(_FileSlice(self.path, offset)), max(0.0, seconds - time)
+
+    def peaks_for_width(self, width: int) -> List[float]:
+        """Waveform resampled to width columns (max per column), 0.0-1.0."""
+        n = len(self.peaks)
+        if not n or width <= 0:
+            return []
+        out = []
+        for x in range(width):
+            lo = x * n // width
+            hi = max(lo + 1, (x + 1) * n // width)
+            out.append(max(self.peaks[lo:hi]) / 255.0)
+        return out
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": INDEX_VERSION,
+            "duration": self.duration,
+            "seek_interval": SEEK_INTERVAL_S,
+            "seek_points": self.seek_points,
+            "peaks_per_second": PEAKS_PER_SECOND,
+            "peaks": base64.b64encode(self.peaks).decode("ascii"),
+        }
+
+
+def _cache_path(path: str) -> str:
+    return os.path.join(MEDIA_INDEX_CACHE_DIR,
+                        f"{transcode_service.audio_fingerprint(path)}.json")
+
+
+def load_cached(path: str) -> Optional[MediaIndex]:
+    """The cached index for a media file, or None."""
+    try:
+        cache_path = _cache_path(path)
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != INDEX_VERSION or data.get("peaks_per_second") != PEAKS_PER_SECOND:
+        return None
+    cache_manager.touch(cache_path, kind="media_index")
+    return MediaIndex(path, data.get("duration", 0.0),
+                      [tuple(p) for p in data.get("seek_points", [])],
+                      base64.b64decode(data.get("peaks", "")))
+
+
+def build(path: str, peaks: bool = True) -> MediaIndex:
+    """
+    Load the cached index, computing whatever is missing (seek table for
+    MP3s, peaks if asked for) and saving the result.
+    """
+    index = load_cached(path)
+    changed = False
+    if index is None:
+        seek_points, duration = [], 0.0
+        if path.lower().endswith(".mp3"):
+            try:
+                seek_points, duration = build_mp3_seek_table(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not index {os.path.basename(path)}: {e}")
+        if not duration:
+            duration = transcode_service.probe_duration(path)
+        index = MediaIndex(path, duration, seek_points)
+        changed = True
+    if peaks and not index.peaks:
+        index.peaks = compute_peaks(path)
+        changed = changed or bool(index.peaks)
+    if changed:
+        try:
+            cache_manager.atomic_write_json(_cache_path(path), index.to_dict(),
+                                            kind="media_index")
+        except OSError as e:
+            logger.warning(f"Could not save media index: {e}")
+    return index
+
+
+# ============================================================
+# BACKGROUND WORKER
+# ============================================================
+
+_queue: "queue.Queue[Tuple[str, bool]]" = queue.Queue()
+_pending: Dict[Tuple[str, bool], List[Callable]] = {}
+_pending_lock = threading.Lock()
+_worker: Optional[threading.Thread] = None
+
+
+def _work():
+    while True:
+        item = _queue.get()
+        path, peaks = item
+        try:
+            index = build(path, peaks=peaks)
+        except Exception as e:
+            logger.warning(f"Media index failed for {os.path.basename(path)}: {e}")
+            index = None
+        with _pending_lock:
+            callbacks = _pending.pop(item, [])
+        for cb in callbacks:
+            try:
+                cb(index)
+            except Exception as e:
+                logger.warning(f"Media index callback error: {e}")
+
+
+def request(path: str, callback: Callable[[Optional[MediaIndex]], None],
+            peaks: bool = True) -> None:
+    """
+    Build (or load) the index for path in the background and call
+    callback(index) - None on failure - from the worker thread.
+    """
+    global _worker
+    item = (path, peaks)
+    with _pending_lock:
+        if item in _pending:
+            _pending[item].append(callback)
+            return
+        _pending[item] = [callback]
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_work, name="media-index", daemon=True)
+            _worker.start()
+    _queue.put(item)
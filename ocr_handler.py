@@ -16,11 +16,15 @@ import json
 import webbrowser
 import subprocess
 import tempfile
+import threading
+import weakref
 from typing import List, Dict, Optional
 
 # Import from our modules
 from config import *
 from utils import calculate_file_hash, format_size
+from performance_timer import timed
+import cache_manager
 
 # Vision AI for OCR escalation
 try:
@@ -56,6 +60,17 @@ except Exception:
 
 PDF_SUPPORT = PDF_SUPPORT_PYPDF2
 
+# Optional in-process Tesseract (libtesseract bindings): keeps the language
+# model loaded between pages instead of spawning tesseract.exe per call
+try:
+    import tesserocr
+
+    TESSEROCR_AVAILABLE = True
+except Exception:
+    TESSEROCR_AVAILABLE = False
+
+USE_PERSISTENT_TESSERACT = True  # Use tesserocr when installed
+
 
 # -------------------------
 # OCR Post-Processing (Fix Encoding Artifacts)
@@ -166,9 +181,11 @@ def load_cached_ocr(filepath: str, quality: str, language: str) -> Optional[List
 
     try:
         with open(cache_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            entries = json.load(f)
     except Exception:
         return None
+    cache_manager.touch(cache_path, kind="ocr")
+    return entries
 
 
 def save_ocr_cache(filepath: str, quality: str, language: str, entries: List[Dict]):
@@ -177,8 +194,7 @@ def save_ocr_cache(filepath: str, quality: str, language: str, entries: List[Dic
     cache_path = get_ocr_cache_path(filepath, quality, language)
 
     try:
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(entries, f, indent=2, ensure_ascii=False)
+        cache_manager.atomic_write_json(cache_path, entries, kind="ocr", indent=2)
     except Exception as e:
         print(f"Warning: Could not save OCR cache: {e}")
 
@@ -835,9 +851,169 @@ def extract_text_from_pdf_smart(
 # Confidence Scoring & Cloud AI OCR
 # -------------------------
 
+def text_from_tesseract_data(data: dict) -> str:
+    """
+    Rebuild page text from pytesseract.image_to_data output.
+
+    Words are joined by spaces within a line, lines by newlines, and
+    paragraphs / blocks by a blank line - the same layout image_to_string
+    produces - so one Tesseract pass gives both text and confidences.
+    """
+    levels = data.get('level')
+    lines = []          # [(block, par), [words]]
+    last_key = None
+    for i, word in enumerate(data['text']):
+        if levels is not None and levels[i] != 5:
+            continue
+        word = (word or '').strip()
+        if not word:
+            continue
+        key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        if key != last_key:
+            lines.append((key[:2], []))
+            last_key = key
+        lines[-1][1].append(word)
+
+    out = []
+    last_par = None
+    for par, words in lines:
+        if last_par is not None:
+            out.append('\n\n' if par != last_par else '\n')
+        out.append(' '.join(words))
+        last_par = par
+    return ''.join(out)
+
+
+def _parse_tesseract_config(config: str) -> Optional[dict]:
+    """
+    PyTessBaseAPI keyword arguments for a pytesseract config string.
+
+    Maps '--psm N', '--oem N' and '-c name=value'; returns None when the
+    string holds anything else, so the caller can use pytesseract instead
+    of silently dropping the option.
+    """
+    parts = (config or '').split()
+    kwargs = {}
+    variables = {}
+    i = 0
+    try:
+        while i < len(parts):
+            option = parts[i]
+            if option in ('--psm', '--oem'):
+                kwargs[option[2:]] = int(parts[i + 1])
+                i += 2
+            elif option == '-c':
+                name, value = parts[i + 1].split('=', 1)
+                variables[name] = value
+                i += 2
+            elif option.startswith('-c') and '=' in option:
+                name, value = option[2:].split('=', 1)
+                variables[name] = value
+                i += 1
+            else:
+                return None
+    except (IndexError, ValueError):
+        return None
+    if variables:
+        kwargs['variables'] = variables
+    return kwargs
+
+
+class _ThreadEngines:
+    """One thread's Tesseract engines: apis = {(language, config): PyTessBaseAPI}."""
+
+    def __init__(self):
+        self.apis = {}
+
+
+class TesseractWorker:
+    """
+    Long-lived libtesseract instance per thread (via tesserocr).
+
+    Loading a language model costs more than recognising a typical page, and
+    pytesseract pays it on every call by spawning the tesseract executable.
+    A worker keeps one initialised API per (language, config) per thread and
+    reuses it for every page.  Use TesseractWorker.available(config) to check.
+
+    The engines live in thread-local storage, so they are freed when their
+    thread exits; shutdown() releases those of threads still running.
+    """
+
+    _local = threading.local()
+    _lock = threading.Lock()
+    _engines = weakref.WeakSet()  # every live thread's _ThreadEngines
+
+    @staticmethod
+    def available(config: str = "") -> bool:
+        return (TESSEROCR_AVAILABLE and USE_PERSISTENT_TESSERACT
+                and _parse_tesseract_config(config) is not None)
+
+    @classmethod
+    def _api(cls, language: str, config: str):
+        engines = getattr(cls._local, 'engines', None)
+        if engines is None:
+            engines = cls._local.engines = _ThreadEngines()
+            with cls._lock:
+                cls._engines.add(engines)
+        apis = engines.apis
+        key = (language, ' '.join((config or '').split()))
+        api = apis.get(key)
+        if api is None:
+            kwargs = _parse_tesseract_config(config)
+            if kwargs is None:
+                raise ValueError(f"unsupported Tesseract config: {config!r}")
+            kwargs['lang'] = language
+            tessdata = get_tessdata_dir()
+            if tessdata:
+                kwargs['path'] = tessdata
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+            apis[key] = api
+        return api
+
+    @classmethod
+    def recognise(cls, image, language: str = "eng", config: str = "") -> tuple:
+        """Returns (text, word_confidences) for a PIL image."""
+        api = cls._api(language, config)
+        api.SetImage(image)
+        text = api.GetUTF8Text() or ''
+        confidences = [float(c) for c in api.AllWordConfidences()]
+        api.Clear()
+        return text, confidences
+
+    @classmethod
+    def shutdown(cls):
+        """Release the Tesseract instances of every thread (call on app exit)."""
+        with cls._lock:
+            all_engines = list(cls._engines)
+        for engines in all_engines:
+            apis, engines.apis = engines.apis, {}
+            for api in apis.values():
+                try:
+                    api.End()
+                except Exception:
+                    pass
+
+
+def tesseract_image_to_string(image, language: str = "eng", config: str = "") -> str:
+    """
+    pytesseract.image_to_string, served by the persistent TesseractWorker
+    when available (no per-page process spawn).
+    """
+    if TesseractWorker.available(config):
+        try:
+            return TesseractWorker.recognise(image, language, config)[0]
+        except Exception as e:
+            print(f"Warning: tesserocr failed ({e}), using pytesseract")
+    return pytesseract.image_to_string(image, lang=language, config=config)
+
+
 def get_tesseract_confidence(image, language: str = "eng", config: str = "") -> tuple:
     """
     Get OCR result with confidence score from Tesseract
+
+    Text and word confidences come from a single recognition pass: the
+    persistent TesseractWorker when available, else one image_to_data call
+    whose words are reassembled by text_from_tesseract_data.
     
     Args:
         image: PIL Image object
@@ -851,27 +1027,35 @@ def get_tesseract_confidence(image, language: str = "eng", config: str = "") ->
         return "", 0
     
     try:
-        # Get detailed data including confidence scores
-        data = pytesseract.image_to_data(image, lang=language, config=config, output_type=pytesseract.Output.DICT)
-        
-        # Extract text and confidences
+        full_text = None
         confidences = []
-        texts = []
-        
-        for i, conf in enumerate(data['conf']):
-            # Tesseract returns -1 for non-text elements
-            if conf != -1 and data['text'][i].strip():
-                confidences.append(float(conf))
-                texts.append(data['text'][i])
-        
+
+        if TesseractWorker.available(config):
+            try:
+                with timed("ocr_tesseract_data"):
+                    full_text, word_confs = TesseractWorker.recognise(image, language, config)
+                confidences = [c for c in word_confs if c >= 0]
+            except Exception as e:
+                print(f"Warning: tesserocr failed ({e}), using pytesseract")
+                full_text = None
+
+        if full_text is None:
+            # Get detailed data including confidence scores
+            with timed("ocr_tesseract_data"):
+                data = pytesseract.image_to_data(image, lang=language, config=config, output_type=pytesseract.Output.DICT)
+
+            for i, conf in enumerate(data['conf']):
+                # Tesseract returns -1 for non-text elements
+                if float(conf) != -1 and data['text'][i].strip():
+                    confidences.append(float(conf))
+
+            full_text = text_from_tesseract_data(data)
+
         # Calculate average confidence
         avg_confidence = sum(confidences) / len(confidences) if confidences else 0
         
-        # Also get the full text for comparison
-        full_text = pytesseract.image_to_string(image, lang=language, config=config).strip()
-        
         # Apply encoding artifact fixes
-        full_text = fix_ocr_encoding_artifacts(full_text)
+        full_text = fix_ocr_encoding_artifacts(full_text.strip())
         
         return full_text, avg_confidence
         
@@ -1136,7 +1320,8 @@ def extract_text_from_pdf_with_ocr(filepath: str, language: str = "eng",
     Image.MAX_IMAGE_PIXELS = 500_000_000  # ~500MP (raised from 178MP default)
 
     try:
-        images = convert_from_path(filepath, dpi=300)
+        with timed("ocr_pdf_to_images"):
+            images = convert_from_path(filepath, dpi=300)
         log(f"✅ Successfully converted {len(images)} pages to images")
 
     except Exception as e:
@@ -1170,8 +1355,9 @@ def extract_text_from_pdf_with_ocr(filepath: str, language: str = "eng",
             log(f"📄 Processing page {page_num + 1}/{total_pages}...")
 
             # Preprocess and extract text
-            processed_image = preprocess_image_for_ocr(image, quality)
-            text = pytesseract.image_to_string(processed_image, lang=language, config=custom_config)
+            with timed("ocr_page"):
+                processed_image = preprocess_image_for_ocr(image, quality)
+                text = tesseract_image_to_string(processed_image, language, custom_config)
             text = text.strip()
             
             # Apply encoding artifact fixes
@@ -1228,23 +1414,39 @@ def is_pdf_scanned(filepath: str) -> bool:
     - Word count validation
     - Character diversity check
     - Single character ratio check
+
+    The verdict and the sampled page text are cached per file content
+    (see pdf_text), so repeat checks of the same PDF skip parsing.
     """
     if not PDF_SUPPORT:
         return False
 
+    from pdf_text import extract_pdf_pages, get_cached_value, set_cached_value
+
+    cached = get_cached_value(filepath, "scanned")
+    if cached is not None:
+        return cached
+
+    result = _is_pdf_scanned_uncached(filepath, extract_pdf_pages)
+    if result is not None:
+        set_cached_value(filepath, "scanned", result)
+        return result
+    return True
+
+
+def _is_pdf_scanned_uncached(filepath: str, extract_pdf_pages) -> Optional[bool]:
+    """is_pdf_scanned() without the cache; None if the PDF couldn't be analysed."""
     try:
         with open(filepath, "rb") as f:
             reader = PyPDF2.PdfReader(f)
             pages_to_check = min(3, len(reader.pages))
-            total_text = ""
-            page_texts = []
+            page_texts = extract_pdf_pages(filepath, engine="pypdf2",
+                                           pages=range(pages_to_check))
+            total_text = "".join(page_texts)
             pages_with_large_images = 0
 
             for i in range(pages_to_check):
                 page = reader.pages[i]
-                text = page.extract_text()
-                page_texts.append(text)
-                total_text += text
 
                 # ═══════════════════════════════════════════════════════
                 # ⭐ NEW CHECK: Detect Large Images (Scanned Pages)
@@ -1340,7 +1542,7 @@ def is_pdf_scanned(filepath: str) -> bool:
 
     except Exception as e:
         print(f"Warning: Could not analyze PDF structure: {e}")
-        return True
+        return None
 
 
 # -------------------------
@@ -1348,57 +1550,20 @@ def is_pdf_scanned(filepath: str) -> bool:
 # -------------------------
 
 def get_cache_info() -> Dict:
-    """Get information about cache directories"""
-    ocr_size = 0
-    ocr_count = 0
-    audio_size = 0
-    audio_count = 0
-    outputs_size = 0
-    outputs_count = 0
-
-    # OCR cache
-    try:
-        if os.path.exists(OCR_CACHE_DIR):
-            for file in os.listdir(OCR_CACHE_DIR):
-                filepath = os.path.join(OCR_CACHE_DIR, file)
-                if os.path.isfile(filepath):
-                    ocr_size += os.path.getsize(filepath)
-                    ocr_count += 1
-    except Exception:
-        pass
-
-    # Audio cache
-    try:
-        if os.path.exists(AUDIO_CACHE_DIR):
-            for file in os.listdir(AUDIO_CACHE_DIR):
-                filepath = os.path.join(AUDIO_CACHE_DIR, file)
-                if os.path.isfile(filepath):
-                    audio_size += os.path.getsize(filepath)
-                    audio_count += 1
-    except Exception:
-        pass
-
-    # Outputs cache
-    try:
-        if os.path.exists(DATA_DIR):
-            for file in os.listdir(DATA_DIR):
-                if file.startswith('output_') and file.endswith('.txt'):
-                    filepath = os.path.join(DATA_DIR, file)
-                    if os.path.isfile(filepath):
-                        outputs_size += os.path.getsize(filepath)
-                        outputs_count += 1
-    except Exception:
-        pass
+    """Get information about cache directories (from the cache_manager index)"""
+    cache_manager.rescan(["ocr", "audio", "outputs"])
+    usage = cache_manager.get_usage()
+    ocr, audio, outputs = usage["ocr"], usage["audio"], usage["outputs"]
 
     return {
-        'ocr_size': ocr_size,
-        'ocr_count': ocr_count,
-        'audio_size': audio_size,
-        'audio_count': audio_count,
-        'outputs_size': outputs_size,
-        'outputs_count': outputs_count,
-        'total_size': ocr_size + audio_size + outputs_size,
-        'total_count': ocr_count + audio_count + outputs_count
+        'ocr_size': ocr["bytes"],
+        'ocr_count': ocr["count"],
+        'audio_size': audio["bytes"],
+        'audio_count': audio["count"],
+        'outputs_size': outputs["bytes"],
+        'outputs_count': outputs["count"],
+        'total_size': ocr["bytes"] + audio["bytes"] + outputs["bytes"],
+        'total_count': ocr["count"] + audio["count"] + outputs["count"]
     }
 
 
@@ -1408,25 +1573,10 @@ def clear_cache(cache_type: str) -> tuple:
     cleared_size = 0
 
     try:
-        # Clear OCR cache
-        if cache_type in ['all', 'ocr'] and os.path.exists(OCR_CACHE_DIR):
-            for file in os.listdir(OCR_CACHE_DIR):
-                filepath = os.path.join(OCR_CACHE_DIR, file)
-                if os.path.isfile(filepath):
-                    size = os.path.getsize(filepath)
-                    os.remove(filepath)
-                    cleared_count += 1
-                    cleared_size += size
-
-        # Clear audio cache
-        if cache_type in ['all', 'audio'] and os.path.exists(AUDIO_CACHE_DIR):
-            for file in os.listdir(AUDIO_CACHE_DIR):
-                filepath = os.path.join(AUDIO_CACHE_DIR, file)
-                if os.path.isfile(filepath):
-                    size = os.path.getsize(filepath)
-                    os.remove(filepath)
-                    cleared_count += 1
-                    cleared_size += size
+        # Clear OCR / audio caches
+        kinds = [k for k in ('ocr', 'audio') if cache_type in ('all', k)]
+        if kinds:
+            cleared_count, cleared_size = cache_manager.clear(kinds)
 
         # Clear processed outputs AND update document_library.json
         if cache_type in ['all', 'outputs']:
@@ -1437,6 +1587,7 @@ def clear_cache(cache_type: str) -> tuple:
                     if os.path.isfile(filepath):
                         size = os.path.getsize(filepath)
                         os.remove(filepath)
+                        cache_manager.forget(filepath)
                         cleared_count += 1
                         cleared_size += size
 
@@ -1783,7 +1934,7 @@ def _fallback_to_tesseract(image_path: str, language: str, quality: str, log_fun
         preset = OCR_PRESETS.get(quality, OCR_PRESETS["balanced"])
         custom_config = f'--psm {preset["psm"]} --oem 3'
         
-        text = pytesseract.image_to_string(processed_image, lang=language, config=custom_config)
+        text = tesseract_image_to_string(processed_image, language, custom_config)
         text = text.strip()
         
         if text:
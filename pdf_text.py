@@ -0,0 +1,252 @@
+"""
+pdf_text.py - Page-parallel PDF text extraction with a per-page text cache.
+
+Extracted page text is cached on disk under PDF_TEXT_CACHE_DIR, keyed by the
+file's content hash and the extraction engine, so attaching, re-attaching or
+re-loading the same PDF only parses it once.  Pages are filled in lazily:
+is_pdf_scanned() asks for the first three pages, and a later full load
+extracts only the pages not seen yet.
+
+Large extractions are split into page ranges and run on a process pool (PDF
+parsing is CPU-bound and both PyPDF2 and PyMuPDF hold the GIL).  Each worker
+opens the file itself, so nothing unpicklable crosses process boundaries.
+
+Engines:
+    "pymupdf"  - PyMuPDF (fitz), fastest and most robust
+    "pypdf2"   - PyPDF2, pure Python fallback
+    "auto"     - PyMuPDF if installed, else PyPDF2
+
+Usage:
+    from pdf_text import extract_pdf_pages
+    pages = extract_pdf_pages(filepath, engine="pypdf2")   # one str per page
+
+Author: DocAnalyser Development Team
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import PyPDF2
+    PDF_SUPPORT_PYPDF2 = True
+except Exception:
+    PDF_SUPPORT_PYPDF2 = False
+
+try:
+    import fitz  # PyMuPDF
+    PDF_SUPPORT_PYMUPDF = True
+except Exception:
+    PDF_SUPPORT_PYMUPDF = False
+
+import cache_manager
+from config import PDF_TEXT_CACHE_DIR
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+PARALLEL_MIN_PAGES = 40     # Fewer missing pages than this are extracted in-process
+PAGES_PER_TASK = 25         # Page range handed to each pool task
+MAX_WORKERS = 8             # Upper bound on extraction processes
+
+_lock = threading.Lock()
+_digests: Dict[tuple, str] = {}         # (path, size, mtime) -> content hash
+_records: Dict[str, Dict] = {}          # cache file name -> loaded record
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+def file_digest(filepath: str) -> str:
+    """
+    Content hash of a file, memoised per (path, size, mtime) so repeat
+    lookups in one session don't re-read the file.
+    """
+    st = os.stat(filepath)
+    stamp = (os.path.abspath(filepath), st.st_size, st.st_mtime_ns)
+    with _lock:
+        digest = _digests.get(stamp)
+    if digest:
+        return digest
+    h = hashlib.blake2b(digest_size=20)
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    with _lock:
+        _digests[stamp] = digest
+    return digest
+
+
+def _record_path(digest: str, engine: str) -> str:
+    return os.path.join(PDF_TEXT_CACHE_DIR, f"{digest}_{engine}.json")
+
+
+def _load_record(digest: str, engine: str) -> Dict:
+    """Cached record {'page_count', 'pages': [str|None], ...} ({} if none)."""
+    path = _record_path(digest, engine)
+    with _lock:
+        record = _records.get(path)
+    if record is not None:
+        return record
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+        cache_manager.touch(path, kind="pdf_text")
+    except (OSError, ValueError):
+        record = {}
+    with _lock:
+        _records[path] = record
+    return record
+
+
+def _save_record(digest: str, engine: str, record: Dict):
+    """Write a record atomically and keep it in memory."""
+    path = _record_path(digest, engine)
+    with _lock:
+        _records[path] = record
+    try:
+        cache_manager.atomic_write_json(path, record, kind="pdf_text")
+    except OSError as e:
+        print(f"Warning: Could not save PDF text cache: {e}")
+
+
+def get_cached_value(filepath: str, key: str, engine: str = "pypdf2"):
+    """Document-level value cached alongside the page text (e.g. 'scanned')."""
+    try:
+        return _load_record(file_digest(filepath), engine).get(key)
+    except OSError:
+        return None
+
+
+def set_cached_value(filepath: str, key: str, value, engine: str = "pypdf2"):
+    """Store a document-level value alongside the page text."""
+    try:
+        digest = file_digest(filepath)
+    except OSError:
+        return
+    record = dict(_load_record(digest, engine))
+    record[key] = value
+    _save_record(digest, engine, record)
+
+
+# ============================================================
+# EXTRACTION
+# ============================================================
+
+def _resolve_engine(engine: str) -> str:
+    if engine == "auto":
+        engine = "pymupdf" if PDF_SUPPORT_PYMUPDF else "pypdf2"
+    if engine == "pymupdf" and not PDF_SUPPORT_PYMUPDF:
+        raise ImportError("PyMuPDF not installed. Install with: pip install PyMuPDF")
+    if engine == "pypdf2" and not PDF_SUPPORT_PYPDF2:
+        raise ImportError("PyPDF2 not installed. Install with: pip install PyPDF2")
+    return engine
+
+
+def _page_count(filepath: str, engine: str) -> int:
+    if engine == "pymupdf":
+        with fitz.open(filepath) as doc:
+            return len(doc)
+    with open(filepath, "rb") as f:
+        return len(PyPDF2.PdfReader(f).pages)
+
+
+def _extract_range(filepath: str, engine: str, page_numbers: List[int]) -> List[tuple]:
+    """
+    Extract text for the given 0-based pages.  Runs in pool workers, so it
+    opens the file itself.  A page that fails yields '' (and a warning).
+    """
+    out = []
+    if engine == "pymupdf":
+        import fitz as _fitz
+        with _fitz.open(filepath) as doc:
+            for i in page_numbers:
+                try:
+                    out.append((i, doc[i].get_text() or ""))
+                except Exception as e:
+                    print(f"Warning: Could not extract text from page {i + 1}: {e}")
+                    out.append((i, ""))
+        return out
+
+    import warnings
+    import PyPDF2 as _PyPDF2
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with open(filepath, "rb") as f:
+            reader = _PyPDF2.PdfReader(f)
+            for i in page_numbers:
+                try:
+                    out.append((i, reader.pages[i].extract_text() or ""))
+                except Exception as e:
+                    print(f"Warning: Could not extract text from page {i + 1}: {e}")
+                    out.append((i, ""))
+    return out
+
+
+def _extract_missing(filepath: str, engine: str, missing: List[int]) -> List[tuple]:
+    """Extract pages in-process, or on a process pool for large batches."""
+    if len(missing) < PARALLEL_MIN_PAGES:
+        return _extract_range(filepath, engine, missing)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    tasks = [missing[k:k + PAGES_PER_TASK] for k in range(0, len(missing), PAGES_PER_TASK)]
+    workers = min(MAX_WORKERS, os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        return _extract_range(filepath, engine, missing)
+    results = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(_extract_range, [filepath] * len(tasks),
+                                 [engine] * len(tasks), tasks):
+                results.extend(part)
+    except Exception as e:
+        # Pool unavailable (restricted environment, broken worker) - go serial
+        print(f"Parallel PDF extraction unavailable ({e}), extracting serially")
+        results = _extract_range(filepath, engine, missing)
+    return results
+
+
+def extract_pdf_pages(filepath: str, engine: str = "auto",
+                      pages: Optional[Iterable[int]] = None) -> List[str]:
+    """
+    Text of each page of a PDF (raw, unstripped; '' for pages without text).
+
+    Args:
+        filepath: PDF file
+        engine: "auto", "pymupdf" or "pypdf2"
+        pages: 0-based page numbers wanted (default: all)
+
+    Returns:
+        One string per requested page, in order.  With pages given,
+        out-of-range numbers are ignored.
+
+    Raises:
+        ImportError if the engine's library isn't installed; the engine's own
+        exception if the file can't be opened at all.
+    """
+    engine = _resolve_engine(engine)
+    digest = file_digest(filepath)
+    record = _load_record(digest, engine)
+
+    page_count = record.get("page_count")
+    if page_count is None:
+        page_count = _page_count(filepath, engine)
+    cached = list(record.get("pages") or [None] * page_count)
+
+    wanted = range(page_count) if pages is None else [p for p in pages if 0 <= p < page_count]
+    missing = [p for p in wanted if cached[p] is None]
+    if missing:
+        for i, text in _extract_missing(filepath, engine, missing):
+            cached[i] = text
+        record = dict(_load_record(digest, engine))
+        record.update({"page_count": page_count, "pages": cached})
+        _save_record(digest, engine, record)
+
+    return [cached[p] for p in wanted]
@@ -0,0 +1,543 @@
+"""
+performance_timer.py - Wall-clock instrumentation for DocAnalyser
+
+Records where time goes during long-running operations (transcription,
+OCR, AI calls, embedding generation, database writes) and writes the
+results as JSON logs to PERFORMANCE_LOGS_DIR.
+
+Two levels of recording:
+
+1. PerformanceTimer — one per user-visible operation (e.g. "transcribe
+   this file").  Phases can be nested; counters and metadata are
+   attached; save_log() writes a JSON file when the operation finishes.
+
+2. timed(phase) — a lightweight context manager / decorator used at the
+   hot spots throughout the app.  It always adds to the process-wide
+   session totals, and, if a PerformanceTimer is active on the current
+   thread, also records the phase inside that timer.  The session totals
+   are written to a session_*.json log when the app exits.
+
+The rollup viewer (show_performance_dialog, or `python performance_timer.py`)
+aggregates all saved logs into per-phase totals.
+
+Usage:
+    from performance_timer import PerformanceTimer, timed
+
+    timer = PerformanceTimer("Audio Transcription: interview.mp3")
+    timer.start("transcription")
+    ...
+    timer.stop("transcription")
+    timer.increment("segments_processed", 412)
+    timer.complete_operation()
+    timer.save_log(path)
+
+    with timed("ocr_page"):
+        text = pytesseract.image_to_string(image)
+
+Created: October 2026
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import atexit
+import datetime
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+LOG_FORMAT_VERSION = 1
+
+# Per-thread stack of active PerformanceTimers — timed() records into the top one
+_thread_state = threading.local()
+
+# Process-wide phase totals: {phase: {"count", "total", "max"}}
+_session_stats: Dict[str, Dict[str, float]] = {}
+_session_lock = threading.Lock()
+_session_started = datetime.datetime.now()
+
+
+def _active_stack() -> list:
+    stack = getattr(_thread_state, "stack", None)
+    if stack is None:
+        stack = []
+        _thread_state.stack = stack
+    return stack
+
+
+def get_active_timer() -> Optional["PerformanceTimer"]:
+    """Return the PerformanceTimer active on this thread, or None."""
+    stack = _active_stack()
+    return stack[-1] if stack else None
+
+
+def _add_phase_stat(table: dict, phase: str, seconds: float):
+    """Accumulate one phase duration into a {phase: {count,total,max}} table."""
+    stat = table.get(phase)
+    if stat is None:
+        stat = {"count": 0, "total": 0.0, "max": 0.0}
+        table[phase] = stat
+    stat["count"] += 1
+    stat["total"] += seconds
+    if seconds > stat["max"]:
+        stat["max"] = seconds
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration as '850ms', '12.4s' or '3m 05s'."""
+    if seconds < 1:
+        return f"{seconds * 1000:.0f}ms"
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, secs = divmod(int(round(seconds)), 60)
+    if minutes < 60:
+        return f"{minutes}m {secs:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+# ============================================================
+# PER-OPERATION TIMER
+# ============================================================
+
+class PerformanceTimer:
+    """
+    Times the phases of a single operation.
+
+    Phases started while another phase is running are recorded as
+    children, e.g. start("transcription") then start("chunk") is stored
+    as "transcription/chunk".  Running the same phase more than once
+    accumulates into one entry (count, total, max).
+    """
+
+    def __init__(self, operation_name: str, activate: bool = True):
+        """
+        Args:
+            operation_name: Human-readable name written to the log
+            activate: If True, become the active timer for this thread so
+                      timed() calls made during the operation are recorded
+                      here too.  complete_operation() deactivates it.
+        """
+        self.operation_name = operation_name
+        self.started_at = datetime.datetime.now()
+        self._t0 = time.perf_counter()
+        self.total_seconds: Optional[float] = None
+        self.metadata: Dict = {}
+        self.counters: Dict[str, float] = {}
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self._open: List[tuple] = []   # stack of (phase_name, full_path, t_start)
+        self._lock = threading.Lock()
+        self._active = False
+        if activate:
+            self.activate()
+
+    # ── Activation ────────────────────────────────────────────────────────
+
+    def activate(self):
+        """Make this the active timer for timed() calls on the current thread."""
+        if not self._active:
+            _active_stack().append(self)
+            self._active = True
+
+    def deactivate(self):
+        """Stop receiving timed() calls on the current thread."""
+        if self._active:
+            stack = _active_stack()
+            if self in stack:
+                stack.remove(self)
+            self._active = False
+
+    # ── Phases ────────────────────────────────────────────────────────────
+
+    def start(self, phase: str):
+        """Start timing a phase (nested under any phase already running)."""
+        with self._lock:
+            parent = self._open[-1][1] if self._open else ""
+            path = f"{parent}/{phase}" if parent else phase
+            self._open.append((phase, path, time.perf_counter()))
+
+    def stop(self, phase: str) -> float:
+        """
+        Stop timing a phase and return its duration in seconds.
+
+        Any child phases still open under it are closed as well.
+        Stopping a phase that was never started returns 0.0.
+        """
+        with self._lock:
+            for idx in range(len(self._open) - 1, -1, -1):
+                if self._open[idx][0] == phase:
+                    break
+            else:
+                return 0.0
+            now = time.perf_counter()
+            duration = 0.0
+            while len(self._open) > idx:
+                _name, path, t_start = self._open.pop()
+                duration = now - t_start
+                _add_phase_stat(self.phases, path, duration)
+            return duration
+
+    @contextmanager
+    def phase(self, phase: str):
+        """Context manager form of start()/stop()."""
+        self.start(phase)
+        try:
+            yield self
+        finally:
+            self.stop(phase)
+
+    def record(self, phase: str, seconds: float):
+        """Record an externally measured duration under the current phase."""
+        with self._lock:
+            parent = self._open[-1][1] if self._open else ""
+            path = f"{parent}/{phase}" if parent else phase
+            _add_phase_stat(self.phases, path, seconds)
+
+    # ── Metadata & counters ───────────────────────────────────────────────
+
+    def set_metadata(self, key: str, value):
+        """Attach a JSON-serialisable value to the log."""
+        self.metadata[key] = value
+
+    def increment(self, counter: str, amount: float = 1):
+        """Add to a named counter (e.g. segments_processed, pages_ocrd)."""
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    # ── Completion & output ───────────────────────────────────────────────
+
+    def complete_operation(self) -> float:
+        """Close any open phases, fix the total duration and deactivate."""
+        with self._lock:
+            open_phases = [name for name, _path, _t in self._open]
+        if open_phases:
+            self.stop(open_phases[0])
+        if self.total_seconds is None:
+            self.total_seconds = time.perf_counter() - self._t0
+        self.deactivate()
+        return self.total_seconds
+
+    def elapsed(self) -> float:
+        """Seconds since the timer was created (or the final total)."""
+        if self.total_seconds is not None:
+            return self.total_seconds
+        return time.perf_counter() - self._t0
+
+    def to_dict(self) -> Dict:
+        """Return the log as a JSON-serialisable dict."""
+        return {
+            "format_version": LOG_FORMAT_VERSION,
+            "kind": "operation",
+            "operation": self.operation_name,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "total_seconds": round(self.elapsed(), 4),
+            "metadata": self.metadata,
+            "counters": self.counters,
+            "phases": {
+                path: {"count": s["count"],
+                       "total": round(s["total"], 4),
+                       "max": round(s["max"], 4)}
+                for path, s in sorted(self.phases.items())
+            },
+        }
+
+    def save_log(self, log_path: str) -> str:
+        """Write the log as JSON to log_path and return the path."""
+        os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+        with open(log_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        return log_path
+
+    def generate_summary(self) -> str:
+        """One-line summary of total time and the top-level phases."""
+        parts = [f"Total {format_duration(self.elapsed())}"]
+        for path, stat in sorted(self.phases.items(),
+                                 key=lambda kv: kv[1]["total"], reverse=True):
+            if "/" in path:
+                continue
+            parts.append(f"{path} {format_duration(stat['total'])}")
+        if self.metadata.get("cache_hit") is True:
+            parts.append("cache hit")
+        return " | ".join(parts)
+
+
+# ============================================================
+# LIGHTWEIGHT HOT-SPOT TIMING
+# ============================================================
+
+@contextmanager
+def timed(phase: str):
+    """
+    Time a block (or, used as a decorator, a function call).
+
+    Always adds to the session totals; also records into the active
+    PerformanceTimer for this thread, if there is one.
+    """
+    timer = get_active_timer()
+    if timer is not None:
+        timer.start(phase)
+    t_start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - t_start
+        if timer is not None:
+            timer.stop(phase)
+        with _session_lock:
+            _add_phase_stat(_session_stats, phase, duration)
+
+
+def get_session_stats() -> Dict[str, Dict[str, float]]:
+    """Return a copy of this session's phase totals."""
+    with _session_lock:
+        return {k: dict(v) for k, v in _session_stats.items()}
+
+
+def reset_session_stats():
+    """Clear this session's phase totals."""
+    with _session_lock:
+        _session_stats.clear()
+
+
+# ============================================================
+# LOG FILES
+# ============================================================
+
+def get_logs_dir() -> str:
+    """Return (creating if needed) the performance log directory."""
+    try:
+        from config import PERFORMANCE_LOGS_DIR
+        log_dir = PERFORMANCE_LOGS_DIR
+    except ImportError:
+        log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "performance_logs")
+    os.makedirs(log_dir, exist_ok=True)
+    return log_dir
+
+
+def build_log_path(prefix: str, label: str = "") -> str:
+    """Build a timestamped log path, e.g. perf_20261018_101500_interview.mp3.json."""
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    safe_label = "".join(c if c.isalnum() or c in "._-" else "_" for c in label)[:80]
+    name = f"{prefix}_{timestamp}_{safe_label}.json" if safe_label else f"{prefix}_{timestamp}.json"
+    return os.path.join(get_logs_dir(), name)
+
+
+def _logging_enabled() -> bool:
+    """Honour the 'performance_logging' setting (defaults to on)."""
+    try:
+        from config_manager import load_config
+        return bool(load_config().get("performance_logging", True))
+    except Exception:
+        return True
+
+
+def save_session_log() -> Optional[str]:
+    """Write this session's phase totals to a session_*.json log."""
+    stats = get_session_stats()
+    if not stats or not _logging_enabled():
+        return None
+    data = {
+        "format_version": LOG_FORMAT_VERSION,
+        "kind": "session",
+        "operation": "Session totals",
+        "started_at": _session_started.isoformat(timespec="seconds"),
+        "total_seconds": round((datetime.datetime.now() - _session_started).total_seconds(), 4),
+        "metadata": {"pid": os.getpid()},
+        "counters": {},
+        "phases": {
+            phase: {"count": s["count"], "total": round(s["total"], 4), "max": round(s["max"], 4)}
+            for phase, s in sorted(stats.items())
+        },
+    }
+    try:
+        log_path = build_log_path("session")
+        with open(log_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return log_path
+    except Exception as e:
+        print(f"⚠️ Could not save session performance log: {e}")
+        return None
+
+
+atexit.register(save_session_log)
+
+
+def load_logs(log_dir: str = None, since_days: Optional[int] = None) -> List[Dict]:
+    """
+    Load all performance logs (.json, and legacy .log files containing JSON).
+
+    Args:
+        log_dir: Directory to scan (default: PERFORMANCE_LOGS_DIR)
+        since_days: Only include logs started within this many days
+
+    Returns:
+        List of log dicts, oldest first.  Unreadable files are skipped.
+    """
+    log_dir = log_dir or get_logs_dir()
+    cutoff = None
+    if since_days is not None:
+        cutoff = datetime.datetime.now() - datetime.timedelta(days=since_days)
+
+    logs = []
+    try:
+        names = os.listdir(log_dir)
+    except OSError:
+        return logs
+
+    for name in names:
+        if not name.endswith((".json", ".log")):
+            continue
+        try:
+            with open(os.path.join(log_dir, name), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(data, dict) or "phases" not in data:
+            continue
+        if cutoff is not None:
+            try:
+                if datetime.datetime.fromisoformat(data.get("started_at", "")) < cutoff:
+                    continue
+            except ValueError:
+                continue
+        data["_file"] = name
+        logs.append(data)
+
+    logs.sort(key=lambda d: d.get("started_at", ""))
+    return logs
+
+
+def rollup_logs(logs: List[Dict]) -> Dict:
+    """
+    Aggregate logs into per-phase and per-counter totals.
+
+    Returns:
+        {"log_count", "operations": {name_prefix: {count, total}},
+         "phases": {phase: {count, total, max}}, "counters": {name: total}}
+    """
+    phases: Dict[str, Dict[str, float]] = {}
+    counters: Dict[str, float] = {}
+    operations: Dict[str, Dict[str, float]] = {}
+
+    for log in logs:
+        op = str(log.get("operation", "?")).split(":")[0]
+        op_stat = operations.setdefault(op, {"count": 0, "total": 0.0})
+        op_stat["count"] += 1
+        op_stat["total"] += float(log.get("total_seconds", 0) or 0)
+
+        for phase, s in log.get("phases", {}).items():
+            stat = phases.setdefault(phase, {"count": 0, "total": 0.0, "max": 0.0})
+            stat["count"] += s.get("count", 0)
+            stat["total"] += s.get("total", 0.0)
+            stat["max"] = max(stat["max"], s.get("max", 0.0))
+
+        for name, value in log.get("counters", {}).items():
+            counters[name] = counters.get(name, 0) + value
+
+    return {"log_count": len(logs), "operations": operations,
+            "phases": phases, "counters": counters}
+
+
+def format_rollup(rollup: Dict) -> str:
+    """Render a rollup as a fixed-width text report."""
+    lines = [f"Performance rollup — {rollup['log_count']} log(s)", ""]
+
+    if rollup["operations"]:
+        lines.append(f"{'Operation':<40} {'Runs':>6} {'Total':>10}")
+        lines.append("─" * 58)
+        for name, s in sorted(rollup["operations"].items(),
+                              key=lambda kv: kv[1]["total"], reverse=True):
+            lines.append(f"{name[:40]:<40} {s['count']:>6} {format_duration(s['total']):>10}")
+        lines.append("")
+
+    if rollup["phases"]:
+        lines.append(f"{'Phase':<40} {'Count':>7} {'Total':>10} {'Avg':>9} {'Max':>9}")
+        lines.append("─" * 78)
+        for phase, s in sorted(rollup["phases"].items(),
+                               key=lambda kv: kv[1]["total"], reverse=True):
+            avg = s["total"] / s["count"] if s["count"] else 0.0
+            lines.append(
+                f"{phase[:40]:<40} {s['count']:>7} {format_duration(s['total']):>10} "
+                f"{format_duration(avg):>9} {format_duration(s['max']):>9}"
+            )
+        lines.append("")
+
+    if rollup["counters"]:
+        lines.append("Counters")
+        lines.append("─" * 30)
+        for name, value in sorted(rollup["counters"].items()):
+            lines.append(f"  {name}: {value:,}")
+
+    return "\n".join(lines)
+
+
+# ============================================================
+# ROLLUP VIEWER
+# ============================================================
+
+def show_performance_dialog(parent):
+    """
+    Display the performance rollup for saved logs plus the current session.
+
+    Args:
+        parent: Parent tkinter window
+    """
+    import tkinter as tk
+    from tkinter import ttk
+
+    window = tk.Toplevel(parent)
+    window.title("Performance Log")
+    window.geometry("820x600")
+    window.transient(parent)
+
+    main_frame = ttk.Frame(window, padding=10)
+    main_frame.pack(fill=tk.BOTH, expand=True)
+
+    controls = ttk.Frame(main_frame)
+    controls.pack(fill=tk.X, pady=(0, 8))
+    ttk.Label(controls, text="Show:").pack(side=tk.LEFT)
+    period_var = tk.StringVar(value="Last 7 days")
+    periods = {"This session": 0, "Last 7 days": 7, "Last 30 days": 30, "All logs": None}
+    period_combo = ttk.Combobox(controls, textvariable=period_var, state="readonly",
+                                values=list(periods.keys()), width=16)
+    period_combo.pack(side=tk.LEFT, padx=(5, 10))
+
+    text = tk.Text(main_frame, wrap=tk.NONE, font=('Courier New', 10), padx=8, pady=8)
+    yscroll = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=text.yview)
+    text.configure(yscrollcommand=yscroll.set)
+    yscroll.pack(side=tk.RIGHT, fill=tk.Y)
+    text.pack(fill=tk.BOTH, expand=True)
+
+    def refresh(*_args):
+        days = periods[period_var.get()]
+        if days == 0:
+            rollup = rollup_logs([{"operation": "Session", "phases": get_session_stats(),
+                                   "total_seconds": 0, "counters": {}}])
+        else:
+            rollup = rollup_logs(load_logs(since_days=days))
+        text.configure(state=tk.NORMAL)
+        text.delete("1.0", tk.END)
+        text.insert(tk.END, format_rollup(rollup))
+        text.insert(tk.END, f"\n\nLog folder: {get_logs_dir()}\n")
+        text.configure(state=tk.DISABLED)
+
+    period_combo.bind("<<ComboboxSelected>>", refresh)
+    ttk.Button(controls, text="Refresh", command=refresh).pack(side=tk.LEFT)
+    ttk.Button(controls, text="Close", command=window.destroy).pack(side=tk.RIGHT)
+
+    refresh()
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line rollup: python performance_timer.py [days]"""
+    argv = sys.argv[1:] if argv is None else argv
+    days = int(argv[0]) if argv else None
+    print(format_rollup(rollup_logs(load_logs(since_days=days))))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,7 +27,6 @@ Usage:
 import re
 import os
 import json
-import tempfile
 import logging
 from dataclasses import dataclass, field
 from typing import Optional, Tuple, List, Callable
@@ -48,6 +47,10 @@ except ImportError:
     FEEDPARSER_AVAILABLE = False
 
 
+# Episodes downloaded concurrently (ahead of transcription) in batch mode
+PODCAST_DOWNLOAD_WORKERS = 3
+
+
 # ============================================================
 # DATA CLASSES
 # ============================================================
@@ -64,6 +67,7 @@ class PodcastEpisode:
     episode_url: str = ""       # Original Apple Podcasts or web URL
     episode_guid: str = ""
     artwork_url: str = ""
+    audio_length: int = 0       # Enclosure length in bytes as declared by the feed (0 = unknown)
 
 
 @dataclass
@@ -675,11 +679,13 @@ def _parse_rss_feed(feed_url: str, timeout: int = 20) -> Tuple[bool, str, Podcas
         
         # Parse episodes
         for entry in feed.entries:
+            audio_url = _get_episode_audio_url(entry)
             episode = PodcastEpisode(
                 title=entry.get("title", "Untitled Episode"),
                 podcast_name=podcast.name,
                 description=entry.get("summary", entry.get("subtitle", "")),
-                audio_url=_get_episode_audio_url(entry),
+                audio_url=audio_url,
+                audio_length=_get_episode_audio_length(entry, audio_url),
                 published=entry.get("published", ""),
                 duration=entry.get("itunes_duration", ""),
                 episode_guid=entry.get("id", entry.get("guid", "")),
@@ -738,6 +744,17 @@ def _get_episode_audio_url(entry) -> str:
     return ""
 
 
+def _get_episode_audio_length(entry, audio_url: str) -> int:
+    """Return the declared byte length of the entry's audio enclosure (0 if absent)."""
+    for enc in entry.get("enclosures", []):
+        if enc.get("url", enc.get("href", "")) == audio_url:
+            try:
+                return max(0, int(enc.get("length") or 0))
+            except (TypeError, ValueError):
+                return 0
+    return 0
+
+
 def _find_episode_by_apple_id(podcast: PodcastInfo, episode_id: str) -> Optional[PodcastEpisode]:
     """
     Try to find a specific episode matching an Apple Podcasts episode ID.
@@ -935,101 +952,106 @@ def resolve_podcast_episode(
     return True, "OK", episode, podcast_info
 
 
+def _audio_extension(audio_url: str) -> str:
+    """Guess the file extension from an audio URL."""
+    audio_url_lower = audio_url.lower().split('?')[0]
+    if '.m4a' in audio_url_lower:
+        return '.m4a'
+    elif '.ogg' in audio_url_lower:
+        return '.ogg'
+    elif '.opus' in audio_url_lower:
+        return '.opus'
+    elif '.wav' in audio_url_lower:
+        return '.wav'
+    return '.mp3'  # Default for podcasts
+
+
+def _safe_episode_filename(title: str) -> str:
+    """Create a safe filename stem from an episode title."""
+    # Replace smart quotes/dashes with ASCII equivalents first
+    safe_title = title
+    safe_title = safe_title.replace('\u2018', "'").replace('\u2019', "'")  # Smart single quotes
+    safe_title = safe_title.replace('\u201c', '"').replace('\u201d', '"')  # Smart double quotes
+    safe_title = safe_title.replace('\u2013', '-').replace('\u2014', '-')  # En/em dashes
+    # Remove Windows-illegal characters and any remaining non-ASCII that could cause issues
+    safe_title = re.sub(r'[<>:"/\\|?*]', '', safe_title)
+    # Strip any remaining characters that aren't printable ASCII, spaces, or common punctuation
+    safe_title = re.sub(r"[^\w\s\-'.!,()&+]", '', safe_title)[:80].strip()
+    return safe_title or "podcast_episode"
+
+
 def download_podcast_audio(
     episode: PodcastEpisode,
     dest_folder: Optional[str] = None,
-    progress_callback: Optional[Callable[[str], None]] = None
+    progress_callback: Optional[Callable[[str], None]] = None,
+    stop_flag: Optional[list] = None,
+    prune: bool = True
 ) -> Tuple[bool, str]:
     """
     Download podcast episode audio to a local file.
-    
+
+    Audio goes into the shared media store (see download_manager), keyed by
+    enclosure URL + length: an episode downloaded before is returned from
+    disk without a network round trip, and an interrupted download resumes
+    where it stopped.  Files in the store are managed (size-capped, LRU
+    evicted) — callers must NOT delete the returned path.
+
     Args:
         episode: PodcastEpisode with audio_url set
-        dest_folder: Where to save (default: temp directory)
+        dest_folder: If given, a copy named after the episode title is
+                     placed here and that path is returned instead
         progress_callback: Optional function(status_str)
-    
+        stop_flag: Optional one-element list; set [True] to cancel
+        prune: Enforce the media store's size cap after downloading (see
+               download_manager.download_to_store)
+
     Returns:
         (success, file_path_or_error)
     """
     if not REQUESTS_AVAILABLE:
         return False, "requests library not installed"
-    
+
     if not episode.audio_url:
         return False, "No audio URL for this episode"
-    
+
+    from download_manager import download_to_store, find_in_store
+
     def status(msg):
         logger.info(msg)
         if progress_callback:
             progress_callback(msg)
-    
-    # Determine file extension from URL
-    audio_url_lower = episode.audio_url.lower().split('?')[0]
-    if '.m4a' in audio_url_lower:
-        ext = '.m4a'
-    elif '.ogg' in audio_url_lower:
-        ext = '.ogg'
-    elif '.opus' in audio_url_lower:
-        ext = '.opus'
-    elif '.wav' in audio_url_lower:
-        ext = '.wav'
+
+    ext = _audio_extension(episode.audio_url)
+
+    if find_in_store(episode.audio_url, episode.audio_length, ext):
+        status(f"🎙️ Already downloaded: {episode.title}")
     else:
-        ext = '.mp3'  # Default for podcasts
-    
-    # Create safe filename from episode title
-    # Replace smart quotes/dashes with ASCII equivalents first
-    safe_title = episode.title
-    safe_title = safe_title.replace('\u2018', "'").replace('\u2019', "'")  # Smart single quotes
-    safe_title = safe_title.replace('\u201c', '"').replace('\u201d', '"')  # Smart double quotes
-    safe_title = safe_title.replace('\u2013', '-').replace('\u2014', '-')  # En/em dashes
-    # Remove Windows-illegal characters and any remaining non-ASCII that could cause issues
-    safe_title = re.sub(r'[<>:"/\\|?*]', '', safe_title)
-    # Strip any remaining characters that aren't printable ASCII, spaces, or common punctuation
-    safe_title = re.sub(r"[^\w\s\-'.!,()&+]", '', safe_title)[:80].strip()
-    if not safe_title:
-        safe_title = "podcast_episode"
-    filename = f"{safe_title}{ext}"
-    
-    if dest_folder is None:
-        dest_folder = tempfile.gettempdir()
-    
-    filepath = os.path.join(dest_folder, filename)
-    
-    try:
         status(f"🎙️ Downloading: {episode.title}...")
-        
-        response = requests.get(episode.audio_url, stream=True, timeout=300)
-        response.raise_for_status()
-        
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
-        
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=65536):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total_size > 0 and progress_callback:
-                        pct = int(downloaded / total_size * 100)
-                        mb = downloaded / (1024 * 1024)
-                        total_mb = total_size / (1024 * 1024)
-                        progress_callback(
-                            f"🎙️ Downloading: {mb:.1f} / {total_mb:.1f} MB ({pct}%)"
-                        )
-        
-        file_size = os.path.getsize(filepath)
-        if file_size < 10000:  # Less than 10KB is suspicious
-            os.remove(filepath)
-            return False, "Downloaded file is too small — may be an error page"
-        
-        status(f"🎙️ Downloaded: {file_size / (1024*1024):.1f} MB")
-        return True, filepath
-    
-    except requests.exceptions.Timeout:
-        return False, "Download timed out (podcast may be too large)"
-    except requests.exceptions.RequestException as e:
-        return False, f"Download error: {e}"
-    except Exception as e:
-        return False, f"Error saving audio: {e}"
+
+    ok, path_or_error = download_to_store(
+        episode.audio_url,
+        expected_length=episode.audio_length,
+        ext=ext,
+        title=episode.title,
+        progress_callback=(lambda msg: progress_callback(f"🎙️ {msg}")) if progress_callback else None,
+        stop_flag=stop_flag,
+        prune=prune,
+    )
+    if not ok:
+        return False, path_or_error
+
+    if dest_folder:
+        import shutil
+        filepath = os.path.join(dest_folder, f"{_safe_episode_filename(episode.title)}{ext}")
+        try:
+            shutil.copyfile(path_or_error, filepath)
+        except OSError as e:
+            return False, f"Error saving audio: {e}"
+    else:
+        filepath = path_or_error
+
+    status(f"🎙️ Downloaded: {os.path.getsize(filepath) / (1024*1024):.1f} MB")
+    return True, filepath
 
 
 # ============================================================
@@ -291,6 +291,21 @@ class ProcessOutputMixin:
                 print("\u274c DEBUG: User cancelled due to local AI audio-link warning")
                 return
 
+        # Pre-flight token / cost estimate; confirm when it is above threshold
+        estimate = self._estimate_run_cost(prompt)
+        if estimate and estimate["cost"] >= self.config.get("cost_confirm_threshold", 1.00):
+            response = messagebox.askyesno(
+                "Estimated Cost",
+                f"This run is estimated at about ${estimate['cost']:.2f}:\n\n"
+                f"  \u2022  {estimate['input_tokens']:,} input tokens\n"
+                f"  \u2022  ~{estimate['output_tokens']:,} output tokens\n"
+                f"  \u2022  {estimate['calls']} AI call{'s' if estimate['calls'] != 1 else ''}\n\n"
+                f"Continue?"
+            )
+            if not response:
+                print("\u274c DEBUG: User cancelled at cost estimate")
+                return
+
         print("\u2705 DEBUG: Starting thread...")
         self.processing = True
         self.process_btn.config(state=tk.DISABLED)
@@ -309,18 +324,56 @@ class ProcessOutputMixin:
         is_local_ai = provider == "Ollama (Local)"
         ai_label = "💻 Local AI" if is_local_ai else "AI"
         
+        estimate_note = ""
+        if estimate:
+            estimate_note = f" (est. {estimate['input_tokens']:,} tokens"
+            estimate_note += f", ~${estimate['cost']:.3f})" if estimate["cost"] else ")"
+        
         if not has_any_content:
-            self.set_status(f"⚙️ Processing general query with {ai_label}...")
+            self.set_status(f"⚙️ Processing general query with {ai_label}...{estimate_note}")
         elif attachment_count > 0:
-            self.set_status(f"⚙️ Processing with {ai_label}: main document + {attachment_count} attachment{'s' if attachment_count != 1 else ''}...")
+            self.set_status(f"⚙️ Processing with {ai_label}: main document + {attachment_count} attachment{'s' if attachment_count != 1 else ''}...{estimate_note}")
         else:
-            self.set_status(f"⚙️ Processing with {ai_label}...")
+            self.set_status(f"⚙️ Processing with {ai_label}...{estimate_note}")
         
         self.processing_thread = threading.Thread(target=self._process_document_thread)
         self.processing_thread.start()
         print(f"✅ DEBUG: Thread started, alive={self.processing_thread.is_alive()}")
         self.root.after(100, self.check_processing_thread)
 
+    def _estimate_run_cost(self, prompt: str):
+        """
+        Estimate input/output tokens and cost for the run about to start,
+        using the selected model's tokenizer. Returns None if it can't.
+        """
+        try:
+            from token_counter import estimate_run_cost
+            provider = self.provider_var.get()
+            model = self._model_id_from_var()
+
+            per_call = [prompt]
+            calls = 1
+            if self.current_entries:
+                chunk_size_setting = self.config.get("chunk_size", "medium")
+                calls = len(chunk_entries(self.current_entries, chunk_size_setting,
+                                          provider=provider, model=model, prompt_text=prompt))
+            if calls == 1:
+                # Single call: attachments and history go out with it
+                if hasattr(self, 'attachment_manager') and self.attachment_manager.get_attachment_count() > 0:
+                    per_call.append(self.attachment_manager.build_attachment_text())
+                per_call.extend(msg.get("content", "") for msg in (self.current_thread or [])
+                                if isinstance(msg.get("content"), str))
+
+            return estimate_run_cost(
+                provider, model,
+                input_texts=[self.current_document_text or ""],
+                calls=calls,
+                per_call_texts=per_call,
+            )
+        except Exception as e:
+            print(f"Warning: Could not estimate run cost: {e}")
+            return None
+
     def _process_document_thread(self):
         prompt = self.prompt_text.get('1.0', tk.END).strip()
         self.current_prompt_text = prompt
@@ -376,7 +429,10 @@ class ProcessOutputMixin:
         chunk_size_setting = self.config.get("chunk_size", "medium")
 
         # Chunk the entries
-        chunks = chunk_entries(self.current_entries, chunk_size_setting)
+        chunks = chunk_entries(self.current_entries, chunk_size_setting,
+                               provider=self.provider_var.get(),
+                               model=self._model_id_from_var(),
+                               prompt_text=prompt)
 
         # ============================================================
         # Get document title and prompt name for cost tracking
@@ -548,19 +604,13 @@ class ProcessOutputMixin:
                 time.sleep(delay_seconds)
 
         # ============================================================
-        # HIERARCHICAL CONSOLIDATION
+        # CONSOLIDATION
         # ============================================================
-        # Consolidate chunk results in batches of BATCH_SIZE so that
-        # each individual AI call only ever sees a small, fixed number
-        # of summaries — keeping the prompt within the local model's
-        # context window regardless of how many chunks the document had.
-        #
-        # Example: 29 chunks, BATCH_SIZE=5
-        #   Level 1: 6 batch calls  (chunks  1-5, 6-10, ... 26-29)
-        #   Level 2: 1 final call   (6 batch summaries)
-        #   Each call receives at most 5 summaries — always manageable.
-
-        BATCH_SIZE = 5
+        # Chunk results that would not fit one consolidation prompt are
+        # condensed first by ai_handler.tree_reduce: token-budgeted groups,
+        # reduced concurrently level by level until they fit, so each call
+        # stays within the model's context window however many chunks the
+        # document had.
 
         # Collect attachment text — added only to the final consolidation call
         attachment_text = ""
@@ -571,29 +621,14 @@ class ProcessOutputMixin:
                 attachment_text = "\n\n" + self.attachment_manager.build_attachment_text()
                 print(f"📎 Attachments queued for final consolidation ({len(attachment_text)} chars)")
 
-        def _make_consolidation_call(batch_results, batch_label, is_final_pass, extra_text=""):
-            """Send one batch of summaries to the AI and return (success, result)."""
-            combined = "\n\n---\n\n".join(
-                f"Section {i + 1}:\n{r}" for i, r in enumerate(batch_results)
-            )
-            if is_final_pass:
-                # Final pass: apply the user's original prompt so the output
-                # answers exactly what was asked.
-                consolidation_prompt = (
-                    f"{prompt}\n\n"
-                    f"Here are the summaries from all sections of the document:\n\n"
-                    f"{combined}"
-                )
-            else:
-                # Intermediate pass: neutral summarisation — keep all detail.
-                consolidation_prompt = (
-                    "Summarise the key points from these document sections into a "
-                    "single cohesive summary. Preserve all important details.\n\n"
-                    f"{combined}"
-                )
-            if extra_text:
-                consolidation_prompt += extra_text
+        provider = self.provider_var.get()
+        model = self._model_id_from_var()
+        api_key = self.api_key_var.get()
 
+        def _consolidation_call(consolidation_prompt, label):
+            """Send one consolidation prompt to the AI and return (success, result)."""
+            if not self.processing:
+                return False, "Processing cancelled"
             messages = [
                 {
                     "role": "system",
@@ -602,69 +637,69 @@ class ProcessOutputMixin:
                 },
                 {"role": "user", "content": consolidation_prompt},
             ]
-            return get_ai().call_ai_provider(
-                provider=self.provider_var.get(),
-                model=self._model_id_from_var(),
+            success, result = get_ai().call_ai_provider(
+                provider=provider,
+                model=model,
                 messages=messages,
-                api_key=self.api_key_var.get(),
-                document_title=f"{doc_title} ({batch_label})",
-                prompt_name=f"{prompt_name} - {batch_label}",
+                api_key=api_key,
+                document_title=f"{doc_title} ({label})",
+                prompt_name=f"{prompt_name} - {label}",
             )
-
-        # ── Level 1: condense per-chunk results into batch summaries ─────
-        if len(results) <= BATCH_SIZE:
-            # Already small enough — skip the intermediate level entirely.
-            batch_summaries = results
-            print(f"📊 Consolidation: {len(results)} chunk(s) — single-pass (no batching needed)")
-        else:
-            batches = [results[i:i + BATCH_SIZE] for i in range(0, len(results), BATCH_SIZE)]
-            print(f"📊 Consolidation: {len(results)} chunks → {len(batches)} batch(es) of ≤{BATCH_SIZE}")
-            batch_summaries = []
-
-            for b_idx, batch in enumerate(batches, 1):
-                if not self.processing:
-                    self.root.after(0, self._handle_process_result, False, "Processing cancelled")
-                    return
-
-                if attachment_count > 0:
-                    self.set_status(
-                        f"⚙️ Consolidating batch {b_idx}/{len(batches)} "
-                        f"(+ {attachment_count} attachment{'s' if attachment_count != 1 else ''})..."
-                    )
-                else:
-                    self.set_status(f"⚙️ Consolidating batch {b_idx}/{len(batches)}...")
-
-                success, batch_result = _make_consolidation_call(
-                    batch, f"Batch {b_idx}/{len(batches)}", is_final_pass=False
+            if success and (not result or not result.strip()):
+                return False, (
+                    f"The AI returned an empty response while consolidating "
+                    f"{label}.\n\n"
+                    f"CAUSE: The section summaries still exceeded the model's context window.\n\n"
+                    f"Try a model with a larger context window "
+                    f"(e.g. mistral:7b or llama3.1:8b).\n"
+                    f"Model used: {model}"
                 )
-                if not success:
-                    self.root.after(0, self._handle_process_result, False, batch_result)
-                    return
-                if not batch_result or not batch_result.strip():
-                    self.root.after(0, self._handle_process_result, False,
-                        f"The AI returned an empty response while consolidating "
-                        f"batch {b_idx} of {len(batches)}.\n\n"
-                        f"CAUSE: The batch summaries still exceeded the model's context window.\n\n"
-                        f"Try a model with a larger context window "
-                        f"(e.g. mistral:7b or llama3.1:8b).\n"
-                        f"Model used: {self._model_id_from_var()}"
-                    )
-                    return
-
-                batch_summaries.append(batch_result)
-                print(f"   Batch {b_idx}/{len(batches)} done ({len(batch_result)} chars)")
+            return success, result
+
+        print(f"📊 Consolidation: {len(results)} chunk result(s)")
+        success, combined = get_ai().reduce_chunk_results(
+            results, prompt, provider, model,
+            call=_consolidation_call,
+            consolidation=self.config.get("consolidation_mode", "auto"),
+            workers=self.config.get("reduce_workers", 4),
+            status_callback=lambda msg: self.set_status(f"⚙️ {msg.strip()}"),
+        )
+        if not success:
+            if not self.processing:
+                combined = "Processing cancelled"
+            self.root.after(0, self._handle_process_result, False, combined)
+            return
 
-        # ── Level 2: final consolidation of all batch summaries ───────────
+        # ── Final consolidation ───────────────────────────────────────────
         if attachment_count > 0:
             self.set_status(
-                f"⚙️ Final consolidation ({len(batch_summaries)} section(s), "
-                f"+ {attachment_count} attachment{'s' if attachment_count != 1 else ''})..."
+                f"⚙️ Final consolidation "
+                f"(+ {attachment_count} attachment{'s' if attachment_count != 1 else ''})..."
             )
         else:
-            self.set_status(f"⚙️ Final consolidation ({len(batch_summaries)} section(s))...")
-
-        success, final_result = _make_consolidation_call(
-            batch_summaries, "Final", is_final_pass=True, extra_text=attachment_text
+            self.set_status("⚙️ Final consolidation...")
+
+        # Final pass: apply the user's original prompt so the output
+        # answers exactly what was asked.
+        success, final_result = get_ai().call_ai_provider(
+            provider=provider,
+            model=model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a helpful AI assistant consolidating "
+                               "information from multiple document sections.",
+                },
+                {
+                    "role": "user",
+                    "content": f"{prompt}\n\n"
+                               f"Here are the summaries from all sections of the document:\n\n"
+                               f"{combined}{attachment_text}",
+                },
+            ],
+            api_key=api_key,
+            document_title=f"{doc_title} (Final)",
+            prompt_name=f"{prompt_name} - Final",
         )
 
         if not success:
@@ -673,14 +708,13 @@ class ProcessOutputMixin:
 
         if not final_result or not final_result.strip():
             self.root.after(0, self._handle_process_result, False,
-                f"All {len(results)} chunk(s) and {len(batch_summaries)} batch summary/summaries "
-                f"were processed successfully, but the AI returned an empty response "
-                f"on the final consolidation call.\n\n"
-                f"This is unusual — the final prompt contained only "
-                f"{len(batch_summaries)} summary/summaries.\n\n"
+                f"All {len(results)} chunk(s) were processed successfully, but the AI "
+                f"returned an empty response on the final consolidation call.\n\n"
+                f"This is unusual — the section summaries were reduced to fit "
+                f"the model's context window.\n\n"
                 f"Try a model with a larger context window "
                 f"(e.g. mistral:7b or llama3.1:8b).\n"
-                f"Model used: {self._model_id_from_var()}"
+                f"Model used: {model}"
             )
             return
 
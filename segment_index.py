@@ -0,0 +1,69 @@
+"""
+segment_index.py - Start-time lookup for transcript entries / segments.
+
+Maps a playback position or a paragraph timestamp to a transcript entry with
+a bisect over a sorted start-time table, so cursor-following and highlight
+updates cost O(log n) regardless of transcript length.
+
+Used by:
+    - TranscriptPlayer._find_segment_for_position (segment under the playhead)
+    - WordEditorPanel._match_entry_for_para (nearest entry to a [MM:SS] anchor)
+
+The index holds a reference to the list it was built from; callers rebuild
+it via index_for() whenever that list is replaced.
+
+Author: DocAnalyser Development Team
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+
+
+class StartTimeIndex:
+    """Sorted start times of a list of transcript entries."""
+
+    def __init__(self, entries: List[Dict]):
+        self.entries = entries
+        self.count = len(entries)
+        order = sorted(
+            (float(e.get('start', 0) or 0.0), i) for i, e in enumerate(entries)
+        )
+        self._starts = [start for start, _ in order]
+        self._order = [i for _, i in order]
+
+    def segment_at(self, position: float) -> int:
+        """
+        Index of the entry playing at position: the last one (by start time)
+        starting at or before it.  Returns -1 before the first entry.
+        """
+        k = bisect_right(self._starts, position)
+        return self._order[k - 1] if k else -1
+
+    def nearest(self, seconds: float, tolerance: float) -> Optional[int]:
+        """
+        Index of the entry whose start is closest to seconds, if closer than
+        tolerance.  Ties go to the earliest entry in list order.
+        """
+        starts = self._starts
+        if not starts:
+            return None
+        k = bisect_left(starts, seconds)
+        best = None
+        # Candidates: the group of equal starts on each side of seconds;
+        # the first of each group has the lowest list index.
+        for start in {starts[k - 1] if k else None,
+                      starts[k] if k < len(starts) else None}:
+            if start is None:
+                continue
+            i = self._order[bisect_left(starts, start)]
+            candidate = (abs(start - seconds), i)
+            if candidate[0] < tolerance and (best is None or candidate < best):
+                best = candidate
+        return best[1] if best else None
+
+
+def index_for(cached: Optional[StartTimeIndex], entries: List[Dict]) -> StartTimeIndex:
+    """Return cached if it still describes entries, else a fresh index."""
+    if cached is not None and cached.entries is entries and cached.count == len(entries):
+        return cached
+    return StartTimeIndex(entries)
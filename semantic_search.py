@@ -30,6 +30,8 @@ import math
 from datetime import datetime
 from typing import Optional, Tuple, List, Dict
 
+from performance_timer import timed
+
 
 class SemanticSearch:
     """
@@ -81,10 +83,11 @@ class SemanticSearch:
         if len(text) > max_chars:
             text = text[:max_chars]
         
-        if self.provider == "openai":
-            return self._generate_openai_embedding(text)
-        elif self.provider == "gemini":
-            return self._generate_gemini_embedding(text)
+        with timed(f"embedding:{self.provider}"):
+            if self.provider == "openai":
+                return self._generate_openai_embedding(text)
+            elif self.provider == "gemini":
+                return self._generate_gemini_embedding(text)
     
     def generate_embeddings_batch(self, texts: List[str]) -> Tuple[List[list], float]:
         """
@@ -116,7 +119,8 @@ class SemanticSearch:
             return [], 0.0
         
         if self.provider == "openai":
-            return self._generate_openai_embeddings_batch(processed_texts)
+            with timed("embedding_batch:openai"):
+                return self._generate_openai_embeddings_batch(processed_texts)
         else:
             # Fallback to individual calls for other providers
             embeddings = []
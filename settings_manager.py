@@ -694,10 +694,17 @@ class SettingsMixin:
 
         # Show current cache size
         try:
-            from utils import get_total_cache_size
+            from utils import get_total_cache_size, format_size
             cache_info = get_total_cache_size()
             ttk.Label(cache_frame, text=f"Current cache size: {cache_info['total_display']}",
                       font=('Arial', 8), foreground='gray').pack(anchor=tk.W, padx=(20, 0))
+            breakdown = ", ".join(
+                f"{info['label']} {format_size(info['bytes'])}"
+                + (f" / {format_size(info['budget'])}" if info['budget'] else "")
+                for info in cache_info['kinds'].values() if info['count'])
+            if breakdown:
+                ttk.Label(cache_frame, text=breakdown, font=('Arial', 8), foreground='gray',
+                          wraplength=500, justify=tk.LEFT).pack(anchor=tk.W, padx=(20, 0))
         except Exception:
             pass
 
@@ -882,7 +889,7 @@ class SettingsMixin:
             # Show current chunk size in status bar as a reminder, but do NOT auto-change it.
             # The user controls chunk size via Settings → Chunk Settings.
             current_chunk_size = self.config.get("chunk_size", "medium")
-            chunk_label = {"tiny": "Tiny", "small": "Small", "medium": "Medium", "large": "Large"}.get(current_chunk_size, current_chunk_size)
+            chunk_label = {"tiny": "Tiny", "small": "Small", "medium": "Medium", "large": "Large", "auto": "Auto"}.get(current_chunk_size, current_chunk_size)
             
             # Get model count for combined status message
             model_count = len([m for m in self.models.get("Ollama (Local)", []) if not m.startswith("(")])
@@ -2099,7 +2106,8 @@ class SettingsMixin:
             "Chunking splits large documents into sections for AI processing. "
             "Smaller chunks give more detailed analysis but take more API calls. "
             "Larger chunks are faster and cheaper but may miss detail. "
-            "'Medium' is recommended for most use cases."
+            "'Medium' is recommended for most use cases. "
+            "'Auto' sizes chunks to the selected model's context window."
         )
         ttk.Label(about_frame, text=about_text, font=('Arial', 8), foreground='gray',
                   wraplength=430).pack(anchor=tk.W)
@@ -25,6 +25,8 @@ from datetime import datetime, timedelta
 from typing import List, Tuple, Optional, Callable, Dict, Any
 from urllib.parse import urlparse
 
+import ingest_jobs
+
 # Try to import TkinterDnD for drag-and-drop support
 try:
     from tkinterdnd2 import DND_FILES, DND_TEXT, DND_ALL
@@ -56,8 +58,9 @@ class SourcesDialog:
     - Enter multiple URLs/file paths
     - Drag and drop files or URLs
     - Add documents from existing library
-    - Process all items sequentially
-    - Schedule processing for later (library mode only)
+    - Process items concurrently, per source type (see ingest_jobs.py)
+    - Schedule processing for later; schedules and unfinished imports
+      survive a restart
     - View results summary
     """
     
@@ -76,7 +79,9 @@ class SourcesDialog:
         Args:
             parent: Parent tkinter window
             process_callback: Function to process a single item (extract text).
-                             Signature: (url_or_path: str, status_callback: Callable) -> Tuple[bool, str, Optional[str]]
+                             Signature: (url_or_path: str, status_callback: Callable, settings: dict) -> Tuple[bool, str, Optional[str]]
+                             Runs in worker threads; settings is the get_current_settings()
+                             snapshot taken on the Tk thread when the run started.
                              Returns: (success, result_text_or_error, title)
             get_current_settings: Function to get current AI provider/model/prompt settings
                                  Returns: dict with 'provider', 'model', 'prompt', 'prompt_text' keys
@@ -126,9 +131,17 @@ class SourcesDialog:
         self.schedule_timer = None
         self.scheduled_time = None
         
+        # Ledger batch being run or scheduled (see ingest_jobs.py)
+        self.batch_id = None
+        self._run_flags = ("library", False, False)  # (dest, save_to_lib, add_to_ctx)
+        self._run_settings: Dict[str, Any] = {}        # provider/model for the workers
+        
         # Create window
         self._create_window()
         
+        # Offer to pick up a scheduled or interrupted import
+        self.window.after(300, self._restore_pending_batch)
+        
     def _create_window(self):
         """Create the sources dialog window UI."""
         self.window = tk.Toplevel(self.parent)
@@ -951,15 +964,28 @@ class SourcesDialog:
         ttk.Button(btn_frame, text="Cancel", command=picker.destroy, width=10).pack(side=tk.RIGHT, padx=5)
         ttk.Label(btn_frame, text=f"{len(documents)} documents in library", foreground='gray').pack(side=tk.RIGHT, padx=10)
         
-    def _start_processing(self):
-        """Start processing all items."""
+    def _start_processing(self, batch_id: Optional[int] = None):
+        """
+        Start processing all items.
+        
+        Args:
+            batch_id: Ledger batch to run (a scheduled or resumed import).
+                     Used only if it still holds the items in the list;
+                     otherwise a new batch is recorded.
+        """
         items = self._get_items()
         
         if not items:
             messagebox.showwarning("No Items", "Please add URLs, files, or library documents to process.")
             return
         
-        dest = self.destination_var.get()
+        # A resumed or scheduled batch keeps the destination chosen when it
+        # was created, whatever the checkboxes show now
+        reuse_batch = (batch_id is not None and
+                       set(ingest_jobs.batch_items(batch_id, unfinished_only=True)) == set(items))
+        batch = ingest_jobs.get_batch(batch_id) if reuse_batch else None
+        flags = self._flags_from_options(batch['options']) if batch else self._current_run_flags()
+        dest = flags[0]
         
         # Check for local AI context warning (prompt_context mode only)
         if dest == 'prompt_context' and self.get_provider_callback and self.attachment_manager:
@@ -987,6 +1013,25 @@ class SourcesDialog:
             self.schedule_timer = None
             self.scheduled_time = None
             self.schedule_label.config(text="")
+        
+        # Record the batch in the job ledger
+        if batch_id is not None and not reuse_batch:
+            ingest_jobs.set_batch_state(batch_id, 'cancelled')
+            ingest_jobs.release(batch_id)
+            batch_id = None
+        if self.batch_id is not None and self.batch_id != batch_id:
+            self._drop_batch()
+        if batch_id is None:
+            batch_id = ingest_jobs.create_batch(items, self._batch_options(flags))
+        self.batch_id = batch_id
+        
+        # Snapshot destination and AI settings - workers must not touch Tk variables
+        self._run_flags = flags
+        try:
+            self._run_settings = dict(self.get_current_settings() or {})
+        except Exception as e:
+            print(f"⚠️ Could not read current AI settings: {e}")
+            self._run_settings = {}
             
         # Reset results
         self.results = {
@@ -1010,86 +1055,101 @@ class SourcesDialog:
         # Start processing thread
         self.processing_thread = threading.Thread(
             target=self._process_items,
-            args=(items,),
+            args=(batch_id,),
             daemon=True
         )
         self.processing_thread.start()
         
-    def _process_items(self, items: List[str]):
-        """Process all items (runs in separate thread)."""
-        total = len(items)
-        dest = self.destination_var.get()
+    def _process_items(self, batch_id: int):
+        """Process a ledger batch (runs in separate thread)."""
+        engine = ingest_jobs.IngestEngine(
+            batch_id,
+            run_item=self._process_one,
+            emit=self.results_queue.put,
+            describe=self._get_display_name
+        )
+        engine.run(lambda: self.cancel_requested)
+    
+    def _current_run_flags(self) -> Tuple[str, bool, bool]:
+        """(dest, save_to_lib, add_to_ctx) as the dialog's controls show them."""
+        return (
+            self.destination_var.get(),
+            self.save_to_library_var.get() if hasattr(self, 'save_to_library_var') else False,
+            self.add_to_context_var.get() if hasattr(self, 'add_to_context_var') else False
+        )
+    
+    def _flags_from_options(self, options: Dict[str, Any]) -> Tuple[str, bool, bool]:
+        """Run flags stored with a ledger batch (current controls for older batches)."""
+        current = self._current_run_flags()
+        return (
+            options.get('destination', current[0]),
+            bool(options.get('save_to_library', current[1])),
+            bool(options.get('add_to_context', current[2]))
+        )
+    
+    def _batch_options(self, flags: Optional[Tuple[str, bool, bool]] = None) -> Dict[str, Any]:
+        """Options stored with a ledger batch, used when it is resumed."""
+        dest, save_to_lib, add_to_ctx = flags or self._current_run_flags()
+        return {
+            'mode': self.mode,
+            'destination': dest,
+            'save_to_library': save_to_lib,
+            'add_to_context': add_to_ctx,
+            # Results that only go to the prompt context die with the app
+            'resumable': self.mode != 'prompt_context',
+        }
+    
+    def _process_one(self, item: str, lane: str) -> Tuple:
+        """
+        Fetch one item (runs in an ingest worker thread).
         
-        # Get checkbox states for status messages
-        save_to_lib = self.save_to_library_var.get() if hasattr(self, 'save_to_library_var') else False
-        add_to_ctx = self.add_to_context_var.get() if hasattr(self, 'add_to_context_var') else False
+        Returns a results_queue event: ('success', item, title, text),
+        ('failed', item, error, None) or ('skipped', item, reason, None).
+        """
+        dest, save_to_lib, add_to_ctx = self._run_flags
         
-        for i, item in enumerate(items):
-            if self.cancel_requested:
-                self.results_queue.put(('cancelled', None, None, None))
-                return
-            
-            # Generate a friendly display name for the item
-            display_name = self._get_display_name(item)
-            
-            # Build descriptive status message
-            action_parts = ["Fetching"]
-            if add_to_ctx and save_to_lib:
-                suffix = " (saving to library & adding to prompt)"
-            elif add_to_ctx:
-                suffix = " (adding to current prompt)"
-            elif save_to_lib:
-                suffix = " (saving to library)"
-            else:
-                suffix = ""
-                
-            # Update progress
-            progress = (i / total) * 100
-            status_msg = f"Fetching {i+1}/{total}: {display_name}{suffix}"
-            self.results_queue.put(('progress', progress, status_msg, None))
-            
-            # Check if it's a library document
-            if item.startswith('library://'):
-                doc_id = item[10:]  # Remove 'library://' prefix
-                self._process_library_item(doc_id, dest)
-                continue
+        # Check if it's a library document
+        if item.startswith('library://'):
+            doc_id = item[10:]  # Remove 'library://' prefix
+            return self._process_library_item(doc_id, dest)
+        
+        # Validate item
+        item_type = self._detect_item_type(item)
+        
+        if item_type == 'invalid':
+            return ('skipped', item, "Invalid URL or file path", None)
             
-            # Validate item
-            item_type = self._detect_item_type(item)
+        if item_type == 'file' and not os.path.exists(item):
+            return ('skipped', item, "File not found", None)
+        
+        # Build descriptive status message
+        if add_to_ctx and save_to_lib:
+            suffix = " (saving to library & adding to prompt)"
+        elif add_to_ctx:
+            suffix = " (adding to current prompt)"
+        elif save_to_lib:
+            suffix = " (saving to library)"
+        else:
+            suffix = ""
+        self.results_queue.put(('status', None, f"Fetching {self._get_display_name(item)}{suffix}", None))
             
-            if item_type == 'invalid':
-                self.results_queue.put(('skipped', item, "Invalid URL or file path", None))
-                continue
-                
-            if item_type == 'file' and not os.path.exists(item):
-                self.results_queue.put(('skipped', item, "File not found", None))
-                continue
-                
-            # Process item - extract text
-            try:
-                success, result, title = self.process_callback(
-                    item,
-                    lambda msg: self.results_queue.put(('status', None, msg, None))
-                )
-                
-                if success:
-                    extracted_text = result
-                    doc_title = title or item
-                    
-                    # Show what we're doing with the content
-                    if add_to_ctx:
-                        self.results_queue.put(('status', None, f"Adding '{doc_title}' to current prompt...", None))
-                    
-                    # Queue success with destination info
-                    self.results_queue.put(('success', item, doc_title, extracted_text))
-                else:
-                    self.results_queue.put(('failed', item, result, None))
-                    
-            except Exception as e:
-                self.results_queue.put(('failed', item, str(e), None))
-                
-        # Done
-        self.results_queue.put(('complete', None, None, None))
+        # Process item - extract text
+        success, result, title = self.process_callback(
+            item,
+            lambda msg: self.results_queue.put(('status', None, msg, None)),
+            self._run_settings
+        )
+        
+        if not success:
+            return ('failed', item, result, None)
+        
+        doc_title = title or item
+        
+        # Show what we're doing with the content
+        if add_to_ctx:
+            self.results_queue.put(('status', None, f"Adding '{doc_title}' to current prompt...", None))
+        
+        return ('success', item, doc_title, result)
     
     def _get_display_name(self, item: str) -> str:
         """Get a friendly display name for an item."""
@@ -1132,25 +1192,21 @@ class SourcesDialog:
         return item[:50] + '...' if len(item) > 50 else item
     
     def _process_library_item(self, doc_id: str, dest: str):
-        """Process a library document."""
+        """Process a library document; returns a results_queue event."""
         try:
             from document_library import get_document_by_id, load_document_entries
             from utils import entries_to_text, entries_to_text_with_speakers
             
-            # Get checkbox states
-            save_to_lib = self.save_to_library_var.get() if hasattr(self, 'save_to_library_var') else False
-            add_to_ctx = self.add_to_context_var.get() if hasattr(self, 'add_to_context_var') else False
+            _dest, save_to_lib, add_to_ctx = self._run_flags
             
             # Check if trying to save library item back to library only (redundant)
             if save_to_lib and not add_to_ctx:
-                self.results_queue.put(('skipped', f"library://{doc_id}", 
-                    "Already in library - check 'Add to prompt context' to use this document", None))
-                return
+                return ('skipped', f"library://{doc_id}",
+                        "Already in library - check 'Add to prompt context' to use this document", None)
             
             doc = get_document_by_id(doc_id)
             if not doc:
-                self.results_queue.put(('failed', f"library://{doc_id}", "Document not found in library", None))
-                return
+                return ('failed', f"library://{doc_id}", "Document not found in library", None)
             
             title = doc.get('title', 'Untitled')
             
@@ -1159,8 +1215,7 @@ class SourcesDialog:
             
             entries = load_document_entries(doc_id)
             if not entries:
-                self.results_queue.put(('failed', f"library://{doc_id}", "Could not load document content", None))
-                return
+                return ('failed', f"library://{doc_id}", "Could not load document content", None)
             
             # Convert entries to text
             if doc.get('type') == 'audio_transcription':
@@ -1172,10 +1227,10 @@ class SourcesDialog:
             if add_to_ctx:
                 self.results_queue.put(('status', None, f"Adding '{title}' to current prompt...", None))
             
-            self.results_queue.put(('success', f"library://{doc_id}", title, text))
+            return ('success', f"library://{doc_id}", title, text)
             
         except Exception as e:
-            self.results_queue.put(('failed', f"library://{doc_id}", str(e), None))
+            return ('failed', f"library://{doc_id}", str(e), None)
         
     def _detect_item_type(self, item: str) -> str:
         """Detect whether item is a URL, file path, or invalid."""
@@ -1210,13 +1265,12 @@ class SourcesDialog:
         
     def _poll_results(self):
         """Poll the results queue and update UI."""
-        # Get checkbox states for determining destination
-        save_to_lib = self.save_to_library_var.get() if hasattr(self, 'save_to_library_var') else False
-        add_to_ctx = self.add_to_context_var.get() if hasattr(self, 'add_to_context_var') else False
+        # Destination as snapshotted when the run started (or stored with
+        # a resumed batch), not whatever the checkboxes show now
+        dest, save_to_lib, add_to_ctx = self._run_flags
         
-        # Fallback to destination_var for non-unified modes
+        # Fallback to the destination for non-unified modes
         if not hasattr(self, 'save_to_library_var'):
-            dest = self.destination_var.get()
             save_to_lib = (dest == 'library')
             add_to_ctx = (dest == 'prompt_context')
         
@@ -1261,6 +1315,9 @@ class SourcesDialog:
                                     self.changes_made = True
                             except Exception as e:
                                 print(f"Failed to add to prompt context: {e}")
+                    
+                    if self.batch_id is not None:
+                        ingest_jobs.mark_done(self.batch_id, source)
                             
                 elif msg_type == 'failed':
                     self.results['failed'].append((source, message))
@@ -1286,6 +1343,12 @@ class SourcesDialog:
         self.is_processing = False
         self.progress_var.set(100)
         
+        # Every fetched result has been saved by now (they precede 'complete')
+        if self.batch_id is not None:
+            ingest_jobs.set_batch_state(self.batch_id, 'done')
+            ingest_jobs.release(self.batch_id)
+            self.batch_id = None
+        
         # Reset UI state
         self.process_btn.config(state=tk.NORMAL)
         if hasattr(self, 'schedule_btn') and self.schedule_btn:
@@ -1334,6 +1397,10 @@ class SourcesDialog:
         """Handle processing cancellation."""
         self.is_processing = False
         
+        if self.batch_id is not None:
+            ingest_jobs.release(self.batch_id)
+            self.batch_id = None
+        
         # Reset UI state
         self.process_btn.config(state=tk.NORMAL)
         if hasattr(self, 'schedule_btn') and self.schedule_btn:
@@ -1402,32 +1469,7 @@ class SourcesDialog:
         
     def _schedule_processing(self, minutes: int):
         """Schedule processing to start after specified minutes."""
-        items = self._get_items()
-        
-        if not items:
-            messagebox.showwarning("No Items", "Please add items to process.")
-            return
-            
-        # Cancel any existing schedule
-        if self.schedule_timer:
-            self.window.after_cancel(self.schedule_timer)
-            
-        # Calculate start time
-        self.scheduled_time = datetime.now() + timedelta(minutes=minutes)
-        start_str = self.scheduled_time.strftime("%H:%M")
-        
-        self.schedule_label.config(text=f"⏰ Scheduled to start at {start_str}")
-        
-        # Schedule the processing
-        self.schedule_timer = self.window.after(
-            minutes * 60 * 1000,
-            self._start_processing
-        )
-        
-        messagebox.showinfo(
-            "Processing Scheduled",
-            f"Processing will start at {start_str}"
-        )
+        self._schedule_processing_at(datetime.now() + timedelta(minutes=minutes))
         
     def _schedule_custom(self):
         """Show dialog for custom scheduling."""
@@ -1443,24 +1485,39 @@ class SourcesDialog:
             self._schedule_processing_at(dialog.result)
             
     def _schedule_processing_at(self, scheduled_datetime: datetime):
-        """Schedule processing to start at a specific datetime."""
+        """
+        Schedule processing to start at a specific datetime.
+        
+        The schedule is recorded in the job ledger, so it is picked up
+        again if DocAnalyser is closed and reopened before it runs.
+        """
         items = self._get_items()
         
         if not items:
             messagebox.showwarning("No Items", "Please add items to process.")
             return
             
+        if (scheduled_datetime - datetime.now()).total_seconds() <= 0:
+            messagebox.showwarning("Invalid Time", "Please select a time in the future.")
+            return
+        
+        # Replace any existing schedule
+        self._drop_batch()
+        batch_id = ingest_jobs.create_batch(
+            items, self._batch_options(), scheduled_at=scheduled_datetime.timestamp())
+        start_str = self._arm_schedule(scheduled_datetime, batch_id)
+        
+        messagebox.showinfo("Processing Scheduled", f"Processing will start {start_str}")
+    
+    def _arm_schedule(self, scheduled_datetime: datetime, batch_id: int) -> str:
+        """Start the timer for a scheduled batch; returns the 'starts at' text."""
         if self.schedule_timer:
             self.window.after_cancel(self.schedule_timer)
-            
+        
+        self.batch_id = batch_id
         self.scheduled_time = scheduled_datetime
         now = datetime.now()
-        delta = scheduled_datetime - now
         
-        if delta.total_seconds() <= 0:
-            messagebox.showwarning("Invalid Time", "Please select a time in the future.")
-            return
-            
         if scheduled_datetime.date() == now.date():
             start_str = f"today at {scheduled_datetime.strftime('%H:%M')}"
         elif scheduled_datetime.date() == (now + timedelta(days=1)).date():
@@ -1470,10 +1527,64 @@ class SourcesDialog:
         
         self.schedule_label.config(text=f"⏰ Scheduled to start {start_str}")
         
-        ms = int(delta.total_seconds() * 1000)
-        self.schedule_timer = self.window.after(ms, self._start_processing)
+        ms = max(0, int((scheduled_datetime - now).total_seconds() * 1000))
+        self.schedule_timer = self.window.after(ms, lambda: self._start_processing(batch_id))
+        return start_str
+    
+    def _drop_batch(self):
+        """Cancel the scheduled (not yet running) batch, if any."""
+        if self.schedule_timer:
+            self.window.after_cancel(self.schedule_timer)
+            self.schedule_timer = None
+            self.scheduled_time = None
+            self.schedule_label.config(text="")
+        if self.batch_id is not None and not self.is_processing:
+            ingest_jobs.set_batch_state(self.batch_id, 'cancelled')
+            ingest_jobs.release(self.batch_id)
+            self.batch_id = None
+    
+    def _restore_pending_batch(self):
+        """Pick up an import that was scheduled or interrupted in an earlier session."""
+        if self.mode == 'prompt_context' or self.is_processing or self.batch_id is not None:
+            return
+        try:
+            ingest_jobs.prune()
+            batches = ingest_jobs.unfinished_batches()
+        except Exception as e:
+            print(f"⚠️ Could not read import ledger: {e}")
+            return
         
-        messagebox.showinfo("Processing Scheduled", f"Processing will start {start_str}")
+        for batch in batches:
+            if not ingest_jobs.claim(batch['id']):
+                continue
+            items = ingest_jobs.batch_items(batch['id'], unfinished_only=True)
+            
+            # Put the outstanding items back in the list
+            existing = set(self._get_items())
+            for item in items:
+                if item not in existing:
+                    self.input_listbox.insert(tk.END, item)
+                    existing.add(item)
+            self._update_item_count()
+            
+            scheduled_at = batch.get('scheduled_at')
+            if batch['state'] == 'scheduled' and scheduled_at and scheduled_at > datetime.now().timestamp():
+                start_str = self._arm_schedule(datetime.fromtimestamp(scheduled_at), batch['id'])
+                self.status_label.config(text=f"Restored scheduled import of {len(items)} item(s) - starts {start_str}")
+                return
+            
+            when = datetime.fromtimestamp(scheduled_at or batch['created']).strftime("%Y-%m-%d %H:%M")
+            verb = "was scheduled for" if batch['state'] == 'scheduled' else "started"
+            if messagebox.askyesno(
+                    "Resume Import",
+                    f"An import of {batch['total']} item(s) {verb} {when} and did not finish "
+                    f"({len(items)} left).\n\nResume it now?",
+                    parent=self.window):
+                self._start_processing(batch['id'])
+            else:
+                ingest_jobs.set_batch_state(batch['id'], 'cancelled')
+                ingest_jobs.release(batch['id'])
+            return
             
     def _on_close(self):
         """Handle window close."""
@@ -1486,13 +1597,16 @@ class SourcesDialog:
             if self.schedule_timer:
                 if messagebox.askyesno("Scheduled Processing",
                                        "Processing is scheduled. Cancel and close?"):
-                    self.window.after_cancel(self.schedule_timer)
+                    self._drop_batch()
                     self._finish_close()
             else:
                 self._finish_close()
     
     def _finish_close(self):
         """Finish closing the window and call completion callback."""
+        if self.batch_id is not None:
+            ingest_jobs.release(self.batch_id)
+            self.batch_id = None
         if self.changes_made and self.on_complete_callback:
             self.on_complete_callback()
         self.window.destroy()
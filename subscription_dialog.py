@@ -285,11 +285,11 @@ class SubscriptionDialog:
         ttk.Label(parent, textvariable=self.last_checked_var,
                   foreground="#666").grid(row=9, column=1, sticky=tk.W, pady=3)
 
-        # Scheduling (placeholder)
+        # Scheduling
         ttk.Separator(parent, orient=tk.HORIZONTAL).grid(
             row=10, column=0, columnspan=3, sticky=tk.EW, pady=(8, 4))
-        ttk.Label(parent, text="Scheduling (coming soon)",
-                  foreground="#e07020", font=("Arial", 9, "bold")).grid(
+        ttk.Label(parent, text="Scheduling",
+                  font=("Arial", 9, "bold")).grid(
             row=11, column=0, columnspan=3, sticky=tk.W, padx=(0, 0))
 
         sched_frame = ttk.Frame(parent)
@@ -297,20 +297,22 @@ class SubscriptionDialog:
 
         self.sched_enabled_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(sched_frame, text="Enable automatic scheduled checking",
-                        variable=self.sched_enabled_var,
-                        state=tk.DISABLED).pack(anchor=tk.W)
+                        variable=self.sched_enabled_var).pack(anchor=tk.W)
 
         interval_row = ttk.Frame(sched_frame)
         interval_row.pack(anchor=tk.W, pady=(2, 0))
         ttk.Label(interval_row, text="Check every").pack(side=tk.LEFT)
         self.interval_var = tk.IntVar(value=6)
         ttk.Spinbox(interval_row, textvariable=self.interval_var,
-                    from_=1, to=168, width=5,
-                    state=tk.DISABLED).pack(side=tk.LEFT, padx=(4, 4))
-        ttk.Label(interval_row, text="hours").pack(side=tk.LEFT)
+                    from_=1, to=168, width=5).pack(side=tk.LEFT, padx=(4, 4))
+        ttk.Label(interval_row, text="hours, at").pack(side=tk.LEFT)
+        self.check_time_var = tk.StringVar(value="06:00")
+        ttk.Entry(interval_row, textvariable=self.check_time_var,
+                  width=6).pack(side=tk.LEFT, padx=(4, 0))
 
         ttk.Label(sched_frame,
-                  text="Scheduled checking will be available in a future update.",
+                  text="Runs while DocAnalyser is open. The \"at\" time (HH:MM) applies "
+                       "to 24/48/… hour intervals.",
                   foreground="#888", font=("Arial", 8)).pack(anchor=tk.W, pady=(2, 0))
 
         # Save button
@@ -392,6 +394,8 @@ class SubscriptionDialog:
                 return True
             if int(self.interval_var.get()) != int(sub.get("check_interval_hours", 6)):
                 return True
+            if self.check_time_var.get().strip() != (sub.get("check_time") or "06:00"):
+                return True
             if self.prompt_name_var.get() != (sub.get("prompt_name") or ""):
                 return True
             form_prompt = self.prompt_text.get("1.0", tk.END).strip()
@@ -418,6 +422,7 @@ class SubscriptionDialog:
         self.enabled_var.set(sub.get("enabled", True))
         self.sched_enabled_var.set(sub.get("schedule_enabled", False))
         self.interval_var.set(sub.get("check_interval_hours", 6))
+        self.check_time_var.set(sub.get("check_time") or "06:00")
 
         # Prompt
         pname = sub.get("prompt_name", "")
@@ -522,6 +527,7 @@ class SubscriptionDialog:
         dup["name"]       = dup["name"] + " (copy)"
         dup["last_checked"] = None
         dup["seen_guids"] = []
+        dup["feed_validators"] = {}
         self._subs = add_subscription(dup)
         self._load_list()
         self.sub_listbox.selection_clear(0, tk.END)
@@ -548,7 +554,8 @@ class SubscriptionDialog:
         for idx in sel:
             if idx < len(self._subs):
                 update_subscription(self._subs[idx]["id"],
-                                    {"seen_guids": [], "last_checked": None})
+                                    {"seen_guids": [], "last_checked": None,
+                                     "feed_validators": {}})
         self._load_list()
         sel_idx = sel[0]
         self.sub_listbox.selection_set(sel_idx)
@@ -619,6 +626,7 @@ class SubscriptionDialog:
             "enabled":              self.enabled_var.get(),
             "schedule_enabled":     self.sched_enabled_var.get(),
             "check_interval_hours": self.interval_var.get(),
+            "check_time":           self.check_time_var.get().strip() or "06:00",
             "prompt_name":          self.prompt_name_var.get(),
             "prompt_text":          self.prompt_text.get("1.0", tk.END).strip(),
         }
@@ -893,14 +901,8 @@ class SubscriptionDialog:
                     totals["total_skipped"]   += result["skipped"]
                     totals["total_errors"]    += result["errors"]
                     errors.extend(result.get("error_messages", []))
-                    from subscription_manager import update_subscription
-                    import datetime
-                    new_guids = result.get("new_seen_guids", [])
-                    merged = list(set(sub.get("seen_guids", []) + new_guids))
-                    update_subscription(sub["id"], {
-                        "seen_guids":   merged,
-                        "last_checked": datetime.datetime.now().isoformat(),
-                    })
+                    from subscription_manager import apply_check_result
+                    apply_check_result(sub, result)
                     _sub_done(sub["name"], result)
                 p, sk, er = totals["total_processed"], totals["total_skipped"], totals["total_errors"]
                 _cb(f"Done — {p} processed, {sk} skipped, {er} error(s).")
@@ -6,13 +6,14 @@ and AI processing for YouTube channels, Substack publications,
 and generic RSS feeds.
 
 Architecture note:
-  Currently designed for manual "Check Now" execution only.
-  Scheduling fields are included in the data model so that
-  Windows Task Scheduler / background polling can be wired up
-  later without changing the data schema.
+  Checks run either manually ("Check Now") or from
+  subscription_scheduler.py, which acts on the scheduling fields.
+  A subscription is only ever checked by one run at a time — a
+  second run that reaches it while it's in progress skips it.
 
 Called by:
-  subscription_dialog.py  (UI)
+  subscription_dialog.py     (UI)
+  subscription_scheduler.py  (background / headless scheduling)
 """
 
 import os
@@ -20,13 +21,28 @@ import json
 import logging
 import datetime
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Callable
 
-from config import DATA_DIR
+from config import DATA_DIR, DIGEST_CACHE_DIR
 
 SUBSCRIPTIONS_PATH = os.path.join(DATA_DIR, "subscriptions.json")
 SUBSCRIPTION_LOG_PATH = os.path.join(DATA_DIR, "subscription_log.txt")
 
+# Feed polling is pure network wait, so Check All polls this many feeds at
+# once.  Content fetching / transcription / AI calls stay one-at-a-time
+# behind _processing_lock so provider rate limits aren't hit in bursts.
+FEED_POLL_WORKERS = 8
+
+# Serialises the expensive per-item stage (content fetch + AI + library
+# save) across every thread that runs subscription checks.
+_processing_lock = threading.Lock()
+
+# IDs of subscriptions currently being checked (manual or scheduled run)
+_active_checks = set()
+_active_checks_lock = threading.Lock()
+
 logger = logging.getLogger(__name__)
 
 
@@ -70,20 +86,57 @@ def default_subscription() -> Dict:
         # State tracking
         "last_checked":     None,     # ISO datetime string, or None
         "seen_guids":       [],       # Video IDs / post GUIDs already processed
+        "feed_validators":  {},       # {feed_url: {"etag", "last_modified"}} for conditional GETs
 
-        # ── Scheduling hooks — not active yet; reserved for future use ──────
+        # ── Scheduling — acted on by subscription_scheduler.py ──────────────
         "schedule_enabled":      False,
         "check_interval_hours":  6,
-        "check_time":            "06:00",   # for a daily "run at" schedule
+        "check_time":            "06:00",   # "run at" time for whole-day intervals
     }
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Persistence
 # ─────────────────────────────────────────────────────────────────────────────
+#
+# Subscriptions live in the SQLite `subscriptions` table and their seen
+# items in `subscription_seen` (indexed on sub_id + guid).  Each check
+# only touches its own row and inserts its new GUIDs, instead of
+# rewriting the whole file.  Subscription dicts returned by the SQLite
+# path do NOT carry 'seen_guids' — use filter_unseen_guids() /
+# mark_seen_guids() instead.
+#
+# On first use an existing subscriptions.json is imported and renamed
+# to subscriptions.json.bak.
+
+# --- SQLite feature flag ---
+# Set to False to revert to subscriptions.json file-based storage
+USE_SQLITE_SUBSCRIPTIONS = True
+
+# Seen-item rows older than this are pruned (each subscription always
+# keeps its most recent SEEN_GUID_KEEP_LATEST rows regardless of age).
+SEEN_GUID_RETENTION_DAYS = 180
+SEEN_GUID_KEEP_LATEST    = 200
+
+_db_ready = False
+_db_ready_lock = threading.Lock()
+
+
+def _db():
+    """Return db_manager, initialised and with subscriptions.json imported."""
+    global _db_ready
+    import db_manager as db
+    if _db_ready:
+        return db
+    with _db_ready_lock:
+        if not _db_ready:
+            db.init_database()   # no-op if already initialised
+            _migrate_json_subscriptions(db)
+            _db_ready = True
+    return db
 
-def load_subscriptions() -> List[Dict]:
-    """Load subscriptions from disk.  Returns [] if the file doesn't exist."""
+
+def _load_json_subscriptions() -> List[Dict]:
     if not os.path.exists(SUBSCRIPTIONS_PATH):
         return []
     try:
@@ -95,8 +148,51 @@ def load_subscriptions() -> List[Dict]:
         return []
 
 
+def _migrate_json_subscriptions(db):
+    """One-time import of subscriptions.json (and its seen_guids) into SQLite."""
+    if db.db_get_meta("subscriptions_migrated") == "true":
+        return
+    subs = _load_json_subscriptions()
+    try:
+        db.db_replace_subscriptions(subs)
+        for sub in subs:
+            db.db_add_seen_guids(sub["id"], sub.get("seen_guids") or [],
+                                 seen_at=sub.get("last_checked") or None)
+        db.db_set_meta("subscriptions_migrated", "true")
+    except Exception as exc:
+        logger.error(f"Subscription migration failed (JSON file left in place): {exc}")
+        return
+    if subs:
+        try:
+            os.replace(SUBSCRIPTIONS_PATH, SUBSCRIPTIONS_PATH + ".bak")
+        except OSError as exc:
+            logger.warning(f"Could not rename {SUBSCRIPTIONS_PATH}: {exc}")
+        logger.info(f"Migrated {len(subs)} subscription(s) to SQLite")
+
+
+def load_subscriptions() -> List[Dict]:
+    """Load all subscriptions.  Returns [] if there are none."""
+    if USE_SQLITE_SUBSCRIPTIONS:
+        try:
+            return _db().db_get_all_subscriptions()
+        except Exception as exc:
+            logger.error(f"load_subscriptions: {exc}")
+            return []
+    return _load_json_subscriptions()
+
+
 def save_subscriptions(subs: List[Dict]) -> bool:
-    """Atomically write the subscriptions list to disk."""
+    """
+    Replace the stored subscription list with `subs` (order included).
+    In the SQLite path any 'seen_guids' keys are ignored — seen history
+    is kept per row and changed via mark_seen_guids().
+    """
+    if USE_SQLITE_SUBSCRIPTIONS:
+        try:
+            return _db().db_replace_subscriptions(subs)
+        except Exception as exc:
+            logger.error(f"save_subscriptions: {exc}")
+            return False
     try:
         tmp = SUBSCRIPTIONS_PATH + ".tmp"
         with open(tmp, "w", encoding="utf-8") as fh:
@@ -115,6 +211,11 @@ def save_subscriptions(subs: List[Dict]) -> bool:
 def add_subscription(sub: Dict) -> List[Dict]:
     if not sub.get("id"):
         sub["id"] = _make_id()
+    if USE_SQLITE_SUBSCRIPTIONS:
+        db = _db()
+        db.db_save_subscription(sub)
+        db.db_add_seen_guids(sub["id"], sub.get("seen_guids") or [])
+        return load_subscriptions()
     subs = load_subscriptions()
     subs.append(sub)
     save_subscriptions(subs)
@@ -122,12 +223,26 @@ def add_subscription(sub: Dict) -> List[Dict]:
 
 
 def remove_subscription(sub_id: str) -> List[Dict]:
+    if USE_SQLITE_SUBSCRIPTIONS:
+        _db().db_delete_subscription(sub_id)
+        return load_subscriptions()
     subs = [s for s in load_subscriptions() if s.get("id") != sub_id]
     save_subscriptions(subs)
     return subs
 
 
 def update_subscription(sub_id: str, updates: Dict) -> List[Dict]:
+    """
+    Apply `updates` to one subscription.  A 'seen_guids' value replaces
+    the seen history (pass [] to clear it, as Reset History does).
+    """
+    if USE_SQLITE_SUBSCRIPTIONS:
+        db = _db()
+        if "seen_guids" in updates:
+            db.db_clear_seen_guids(sub_id)
+            db.db_add_seen_guids(sub_id, updates.get("seen_guids") or [])
+        db.db_update_subscription(sub_id, updates)
+        return load_subscriptions()
     subs = load_subscriptions()
     for s in subs:
         if s.get("id") == sub_id:
@@ -138,12 +253,46 @@ def update_subscription(sub_id: str, updates: Dict) -> List[Dict]:
 
 
 def get_subscription(sub_id: str) -> Optional[Dict]:
+    if USE_SQLITE_SUBSCRIPTIONS:
+        return _db().db_get_subscription(sub_id)
     for s in load_subscriptions():
         if s.get("id") == sub_id:
             return s
     return None
 
 
+def filter_unseen_guids(sub: Dict, guids: List[str]) -> List[str]:
+    """Return the GUIDs in `guids` this subscription hasn't seen yet (order kept)."""
+    if USE_SQLITE_SUBSCRIPTIONS:
+        return _db().db_filter_unseen_guids(sub["id"], guids)
+    stored = get_subscription(sub.get("id", "")) or sub
+    seen = set(stored.get("seen_guids", []))
+    return [g for g in guids if g not in seen]
+
+
+def mark_seen_guids(sub_id: str, guids: List[str]):
+    """Record GUIDs as seen for a subscription."""
+    if not guids:
+        return
+    if USE_SQLITE_SUBSCRIPTIONS:
+        _db().db_add_seen_guids(sub_id, guids)
+        return
+    stored = get_subscription(sub_id) or {}
+    merged = list(dict.fromkeys(stored.get("seen_guids", []) + list(guids)))
+    update_subscription(sub_id, {"seen_guids": merged})
+
+
+def prune_seen_history(retention_days: int = SEEN_GUID_RETENTION_DAYS) -> int:
+    """Drop seen-item rows past the retention window. Returns rows deleted."""
+    if not USE_SQLITE_SUBSCRIPTIONS:
+        return 0
+    try:
+        return _db().db_prune_seen_guids(retention_days, keep_latest=SEEN_GUID_KEEP_LATEST)
+    except Exception as exc:
+        logger.warning(f"prune_seen_history: {exc}")
+        return 0
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # YouTube helpers
 # ─────────────────────────────────────────────────────────────────────────────
@@ -185,6 +334,26 @@ def resolve_youtube_channel(url_or_handle: str,
 
 
 def _fetch_youtube_rss(channel_id: str) -> List[Dict]:
+    """
+    Fetch recent videos for a YouTube channel (unconditional).
+    See _fetch_youtube_feed for the strategy.
+    """
+    items, _validators, _not_modified = _fetch_youtube_feed(channel_id)
+    return items
+
+
+def _conditional_headers(validators: Optional[Dict]) -> Dict[str, str]:
+    """Build If-None-Match / If-Modified-Since headers from stored validators."""
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def _fetch_youtube_feed(channel_id: str, feed_validators: Optional[Dict] = None):
     """
     Fetch recent videos for a YouTube channel.
 
@@ -202,10 +371,18 @@ def _fetch_youtube_rss(channel_id: str) -> List[Dict]:
     returned items with empty `published` strings; that's why we use
     full extraction here.
 
-    Returns a list of dicts: {id, title, published, url, duration_seconds}
+    feed_validators maps each RSS URL to the ETag / Last-Modified seen on
+    the previous check.  They are sent as conditional headers, so an
+    unchanged feed costs a single 304 and no parsing.
+
+    Returns (items, new_validators, not_modified), where items is a list
+    of dicts: {id, title, published, url, duration_seconds}
     """
     import xml.etree.ElementTree as ET
     import urllib.request
+    import urllib.error
+
+    feed_validators = feed_validators or {}
 
     ua = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
           "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
@@ -248,10 +425,22 @@ def _fetch_youtube_rss(channel_id: str) -> List[Dict]:
 
     # ── Try each RSS URL in turn ──────────────────────────────────────────
     for url in rss_urls:
+        headers = {"User-Agent": ua}
+        headers.update(_conditional_headers(feed_validators.get(url)))
         try:
-            req = urllib.request.Request(url, headers={"User-Agent": ua})
+            req = urllib.request.Request(url, headers=headers)
             with urllib.request.urlopen(req, timeout=15) as resp:
                 xml_bytes = resp.read()
+                new_validators = {url: {
+                    "etag":          resp.headers.get("ETag", ""),
+                    "last_modified": resp.headers.get("Last-Modified", ""),
+                }}
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304:
+                logger.info(f"_fetch_youtube_rss: {url} not modified (304)")
+                return [], {url: feed_validators[url]}, True
+            logger.warning(f"_fetch_youtube_rss: {url} failed: {exc}")
+            continue
         except Exception as exc:
             logger.warning(f"_fetch_youtube_rss: {url} failed: {exc}")
             continue
@@ -260,7 +449,7 @@ def _fetch_youtube_rss(channel_id: str) -> List[Dict]:
             items = _parse_rss_xml(xml_bytes)
             if items:
                 logger.info(f"_fetch_youtube_rss: RSS success via {url} — {len(items)} items")
-                return items
+                return items, new_validators, False
             logger.warning(f"_fetch_youtube_rss: {url} parsed but empty")
         except ET.ParseError as exc:
             logger.warning(f"_fetch_youtube_rss: XML parse error from {url}: {exc}")
@@ -322,11 +511,11 @@ def _fetch_youtube_rss(channel_id: str) -> List[Dict]:
                     "url":              f"https://www.youtube.com/watch?v={vid_id}",
                     "duration_seconds": entry.get("duration"),
                 })
-        return items
+        return items, {}, False
 
     except Exception as exc:
         logger.warning(f"_fetch_youtube_rss yt-dlp fallback failed: {exc}")
-        return []
+        return [], {}, False
 
 
 def _extract_interviewee(content_text: str, provider: str, model: str,
@@ -435,12 +624,35 @@ def _to_rss_url(sub_type: str, url: str) -> str:
 
 def _fetch_rss(feed_url: str) -> List[Dict]:
     """
-    Fetch items from an RSS feed via feedparser.
+    Fetch items from an RSS feed via feedparser (unconditional).
     Returns list of dicts: {id, title, published, url, content}
     """
+    items, _validators, _not_modified = _fetch_rss_feed(feed_url)
+    return items
+
+
+def _fetch_rss_feed(feed_url: str, feed_validators: Optional[Dict] = None):
+    """
+    Fetch items from an RSS feed via feedparser, sending the stored
+    ETag / Last-Modified so an unchanged feed comes back as a cheap 304.
+
+    Returns (items, new_validators, not_modified).
+    """
+    previous = (feed_validators or {}).get(feed_url) or {}
     try:
         import feedparser
-        feed = feedparser.parse(feed_url)
+        feed = feedparser.parse(
+            feed_url,
+            etag=previous.get("etag") or None,
+            modified=previous.get("last_modified") or None,
+        )
+        if getattr(feed, "status", None) == 304:
+            logger.info(f"_fetch_rss({feed_url}): not modified (304)")
+            return [], {feed_url: previous}, True
+        new_validators = {feed_url: {
+            "etag":          feed.get("etag", "") or "",
+            "last_modified": feed.get("modified", "") or "",
+        }}
         items = []
         for entry in feed.entries:
             guid      = entry.get("id") or entry.get("link") or ""
@@ -460,10 +672,10 @@ def _fetch_rss(feed_url: str) -> List[Dict]:
                 "url":       url,
                 "content":   content,
             })
-        return items
+        return items, new_validators, False
     except Exception as exc:
         logger.warning(f"_fetch_rss({feed_url}): {exc}")
-        return []
+        return [], {}, False
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -531,8 +743,8 @@ def _fetch_content(item: Dict, sub_type: str,
     # 1. Use the content already in the RSS entry (fastest, no extra HTTP call)
     rss_content = item.get("content", "")
     if rss_content:
-        clean = re.sub(r"<[^>]+>", " ", rss_content)
-        clean = re.sub(r"\s+", " ", clean).strip()
+        from html_extract import extract
+        clean = extract(rss_content, main_content=False).text
         if len(clean) > 200:            # enough to be useful
             return clean, [], title
 
@@ -546,15 +758,14 @@ def _fetch_content(item: Dict, sub_type: str,
         except Exception as exc:
             log(f"  Substack utility error: {exc}")
 
-    # 3. Generic URL fetch (plain HTTP, strip HTML)
+    # 3. Generic URL fetch (shared pool + response cache, main article text)
     try:
-        import urllib.request
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            html = resp.read().decode("utf-8", errors="replace")
-        clean = re.sub(r"<[^>]+>", " ", html)
-        clean = re.sub(r"\s+", " ", clean).strip()
-        return clean[:50_000], [], title
+        import http_client
+        from html_extract import extract
+        resp = http_client.get(url, timeout=30)
+        resp.raise_for_status()
+        page = extract(resp.text, max_chars=50_000)
+        return page.text, [], title
     except Exception as exc:
         log(f"  URL fetch error: {exc}")
         return None, [], title
@@ -748,6 +959,8 @@ def _run_ai_and_save(item: Dict, sub: Dict,
         doc_title=doc_title,
         prompt_name=prompt_name,
         status_callback=log,
+        consolidation=config.get("consolidation_mode", "auto"),
+        reduce_workers=config.get("reduce_workers", 4),
     )
 
     if not ok:
@@ -885,6 +1098,85 @@ def _run_ai_and_save(item: Dict, sub: Dict,
         return False
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Feed polling
+# ─────────────────────────────────────────────────────────────────────────────
+
+def poll_subscription_feed(sub: Dict, status_cb: Callable = None) -> Dict:
+    """
+    Fetch the candidate item list for one subscription — network only,
+    no content fetching or AI.  Safe to run concurrently for many
+    subscriptions (check_all_subscriptions does exactly that).
+
+    Returns:
+        {items, not_modified, feed_validators, channel_id, error}
+    """
+    def log(msg: str):
+        logger.info(f"[{sub.get('name','?')}] {msg}")
+        _write_log(sub.get('name', '?'), msg)
+        if status_cb:
+            status_cb(msg)
+
+    poll = {
+        "items":           [],
+        "not_modified":    False,
+        "feed_validators": {},
+        "channel_id":      sub.get("channel_id", ""),
+        "error":           "",
+    }
+    sub_type   = sub.get("type", "youtube_channel")
+    validators = sub.get("feed_validators") or {}
+
+    if sub_type == "youtube_channel":
+        channel_id = poll["channel_id"]
+        if not channel_id:
+            channel_id = resolve_youtube_channel(sub.get("url", ""), status_cb=log)
+            if not channel_id:
+                poll["error"] = "Could not resolve YouTube channel ID."
+                return poll
+            poll["channel_id"] = channel_id
+
+        log(f"Fetching YouTube feed for channel {channel_id}…")
+        items, new_validators, not_modified = _fetch_youtube_feed(channel_id, validators)
+
+    else:  # substack or rss
+        feed_url = _to_rss_url(sub_type, sub.get("url", ""))
+        log(f"Fetching RSS: {feed_url}")
+        items, new_validators, not_modified = _fetch_rss_feed(feed_url, validators)
+
+    poll["items"]           = items
+    poll["not_modified"]    = not_modified
+    poll["feed_validators"] = new_validators
+    return poll
+
+
+def apply_check_result(sub: Dict, result: Dict) -> List[Dict]:
+    """
+    Persist the state produced by check_subscription(): newly seen
+    GUIDs, last_checked, any newly resolved channel ID and the feed's
+    conditional-GET validators.
+
+    Validators are only stored when every item was handled, so a feed
+    whose items failed (and must be retried) is not hidden behind a 304
+    on the next check.  Coalesced results (the subscription was already
+    being checked by another run) change nothing.
+    """
+    if result.get("coalesced"):
+        return load_subscriptions()
+
+    mark_seen_guids(sub["id"], result.get("new_seen_guids", []))
+
+    updates = {
+        "last_checked": datetime.datetime.now().isoformat(),
+    }
+    if result.get("channel_id") and not sub.get("channel_id"):
+        updates["channel_id"] = result["channel_id"]
+    if result.get("feed_validators") and not result.get("errors") \
+            and not result.get("cancelled"):
+        updates["feed_validators"] = result["feed_validators"]
+    return update_subscription(sub["id"], updates)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Single-subscription check
 # ─────────────────────────────────────────────────────────────────────────────
@@ -892,7 +1184,8 @@ def _run_ai_and_save(item: Dict, sub: Dict,
 def check_subscription(sub: Dict, config: Dict,
                         status_cb: Callable = None,
                         item_done_cb: Callable = None,
-                        stop_flag: Optional[list] = None) -> Dict:
+                        stop_flag: Optional[list] = None,
+                        poll: Optional[Dict] = None) -> Dict:
     """
     Check one subscription for new content and process anything new.
 
@@ -902,9 +1195,12 @@ def check_subscription(sub: Dict, config: Dict,
         status_cb:    Called with (str) for progress messages.
         item_done_cb: Called with (title: str, success: bool) after each item.
         stop_flag:    Single-element list [False]; set to [True] from outside to abort.
+        poll:         Result of poll_subscription_feed() if the feed has already
+                      been fetched (Check All polls feeds in parallel first).
 
     Returns:
-        {processed, skipped, errors, new_seen_guids}
+        {processed, skipped, errors, new_seen_guids, feed_validators, ...}
+        Pass it to apply_check_result() to persist the new state.
     """
     def log(msg: str):
         logger.info(f"[{sub.get('name','?')}] {msg}")
@@ -913,39 +1209,63 @@ def check_subscription(sub: Dict, config: Dict,
             status_cb(msg)
 
     result = {
-        "processed":      0,
-        "skipped":        0,
-        "errors":         0,
-        "new_seen_guids": [],
-        "error_messages": [],   # collects human-readable error details
+        "processed":       0,
+        "skipped":         0,
+        "errors":          0,
+        "new_seen_guids":  [],
+        "error_messages":  [],   # collects human-readable error details
+        "feed_validators": {},
+        "channel_id":      "",
+        "cancelled":       False,
+        "coalesced":       False,
     }
 
     if not sub.get("enabled", True):
         log("Skipped (disabled).")
         return result
 
+    sub_id = sub.get("id", "")
+    with _active_checks_lock:
+        if sub_id in _active_checks:
+            log("Already being checked by another run — skipped.")
+            result["coalesced"] = True
+            return result
+        _active_checks.add(sub_id)
+    try:
+        return _check_subscription_claimed(sub, config, result, log, status_cb,
+                                           item_done_cb, stop_flag, poll)
+    finally:
+        with _active_checks_lock:
+            _active_checks.discard(sub_id)
+
+
+def _check_subscription_claimed(sub: Dict, config: Dict, result: Dict,
+                                log: Callable, status_cb: Optional[Callable],
+                                item_done_cb: Callable,
+                                stop_flag: Optional[list],
+                                poll: Optional[Dict]) -> Dict:
+    """Body of check_subscription(), run while this thread owns the subscription."""
     sub_type = sub.get("type", "youtube_channel")
-    seen     = set(sub.get("seen_guids", []))
     min_min  = int(sub.get("min_duration", 0))
 
     # ── Fetch candidate items ─────────────────────────────────────────────
-    if sub_type == "youtube_channel":
-        channel_id = sub.get("channel_id", "")
-        if not channel_id:
-            channel_id = resolve_youtube_channel(sub.get("url", ""), status_cb=log)
-            if not channel_id:
-                log("ERROR: Could not resolve YouTube channel ID.")
-                result["errors"] += 1
-                return result
-
-        log(f"Fetching YouTube feed for channel {channel_id}…")
-        items = _fetch_youtube_rss(channel_id)
+    if poll is None:
+        # poll_subscription_feed logs for itself; pass the caller's callback
+        # (not log) so each message is shown once
+        poll = poll_subscription_feed(sub, status_cb=status_cb)
+
+    result["channel_id"] = poll.get("channel_id", "")
+    if poll.get("error"):
+        log(f"ERROR: {poll['error']}")
+        result["errors"] += 1
+        return result
 
-    else:  # substack or rss
-        feed_url = _to_rss_url(sub_type, sub.get("url", ""))
-        log(f"Fetching RSS: {feed_url}")
-        items = _fetch_rss(feed_url)
+    result["feed_validators"] = poll.get("feed_validators") or {}
+    if poll.get("not_modified"):
+        log("Feed unchanged since last check (304).")
+        return result
 
+    items = poll.get("items") or []
     if not items:
         log("No items returned from feed.")
         return result
@@ -953,7 +1273,10 @@ def check_subscription(sub: Dict, config: Dict,
     log(f"Feed returned {len(items)} items.")
 
     # ── Filter to unseen items ─────────────────────────────────────────────
-    new_items = [it for it in items if it["id"] not in seen]
+    # Looked up from storage (not the caller's copy) so an item another
+    # run has just finished is never processed twice.
+    unseen    = set(filter_unseen_guids(sub, [it["id"] for it in items]))
+    new_items = [it for it in items if it["id"] in unseen]
     if not new_items:
         log("No new items since last check.")
         return result
@@ -1026,6 +1349,7 @@ def check_subscription(sub: Dict, config: Dict,
     for item in new_items:
         if stop_flag and stop_flag[0]:
             log("Check cancelled by user.")
+            result["cancelled"] = True
             break
 
         item_title = item.get("title") or item.get("id", "?")
@@ -1048,22 +1372,25 @@ def check_subscription(sub: Dict, config: Dict,
                     continue
                 log(f"  Duration OK ({dur_min:.0f} min).")
 
-            # Fetch content
-            log(f"  Fetching content: {item_title}…")
-            text, entries, doc_title = _fetch_content(item, sub_type, config, log)
-
-            if not text:
-                err_msg = f"Could not fetch content: {item_title}"
-                log(f"  ERROR: {err_msg}")
-                result["errors"] += 1
-                result["error_messages"].append(f"{sub.get('name','?')}: {err_msg}")
-                if item_done_cb:
-                    item_done_cb(item_title, False)
-                continue
+            # Content fetch, transcription and AI calls run one item at a
+            # time across all checking threads (see _processing_lock).
+            with _processing_lock:
+                # Fetch content
+                log(f"  Fetching content: {item_title}…")
+                text, entries, doc_title = _fetch_content(item, sub_type, config, log)
+
+                if not text:
+                    err_msg = f"Could not fetch content: {item_title}"
+                    log(f"  ERROR: {err_msg}")
+                    result["errors"] += 1
+                    result["error_messages"].append(f"{sub.get('name','?')}: {err_msg}")
+                    if item_done_cb:
+                        item_done_cb(item_title, False)
+                    continue
 
-            # AI processing + library save
-            log(f"  Running AI: {item_title}…")
-            ok = _run_ai_and_save(item, sub, text, entries, doc_title, config, log)
+                # AI processing + library save
+                log(f"  Running AI: {item_title}…")
+                ok = _run_ai_and_save(item, sub, text, entries, doc_title, config, log)
 
             if ok:
                 # Only mark as seen on success
@@ -1134,27 +1461,33 @@ def get_recent_responses(subscription_ids: List[str]) -> List[Dict]:
     # removed from the tree we still want its URL/title/published-date
     # available to populate the digest's Sources section.
     # See ProjectMap/14_ROADMAP_STATUS.md polish item P8.
-    all_docs = db.db_get_all_documents(include_deleted=True)
-
-    # Index all documents by ID so we can look up source docs for each
-    # ai_response doc.  The source doc carries the URL, published date
-    # and original title (video / article name) - fields we need to pass
-    # into the digest AI call for the Sources section.
-    docs_by_id = {d["id"]: d for d in all_docs}
+    #
+    # Only the ai_response rows for these subscriptions are read (doc_type
+    # index + metadata filter), then just the source docs they point at -
+    # not the whole documents table.
+    response_docs = db.db_get_documents_by_type(
+        "ai_response", include_deleted=True,
+        metadata_key="subscription_id", metadata_values=list(subscription_ids))
 
     # Group ai_response docs by subscription_id, keeping only the newest
     best: Dict[str, dict] = {}   # sub_id -> doc row
-    for doc in all_docs:
-        if doc.get("doc_type") != "ai_response":
-            continue
-        meta = doc.get("metadata") or {}
-        sid = meta.get("subscription_id", "")
-        if not sid or sid not in subscription_ids:
-            continue
+    for doc in response_docs:
+        sid = (doc.get("metadata") or {}).get("subscription_id", "")
         existing = best.get(sid)
         if existing is None or doc["created_at"] > existing["created_at"]:
             best[sid] = doc
 
+    # Index the source docs by ID.  The source doc carries the URL,
+    # published date and original title (video / article name) - fields we
+    # need to pass into the digest AI call for the Sources section.
+    source_ids = [
+        (doc.get("metadata") or {}).get("source_document_id")
+        or (doc.get("metadata") or {}).get("parent_document_id")
+        for doc in best.values()
+    ]
+    docs_by_id = {d["id"]: d for d in
+                  db.db_get_documents_by_ids(source_ids, include_deleted=True)}
+
     results = []
     for sid in subscription_ids:
         doc = best.get(sid)
@@ -1210,6 +1543,114 @@ def get_recent_responses(subscription_ids: List[str]) -> List[Dict]:
     return results
 
 
+# Each subscription's latest response is condensed once (and cached until
+# that response changes) so the digest's merge call only sees short parts.
+DIGEST_CONDENSE_WORDS = 250
+DIGEST_CONDENSE_MIN_CHARS = 2500   # Shorter responses go into the digest as-is
+DIGEST_CONDENSE_PROMPT = (
+    "Condense the following summary into its essential points in no more than "
+    "{words} words. Keep names, claims, figures, dates and any quotations that "
+    "matter; drop repetition and filler. Use short bullet points."
+)
+
+
+def _digest_cache_path(sub_id: str) -> str:
+    return os.path.join(DIGEST_CACHE_DIR, f"{sub_id}.json")
+
+
+def _condense_for_digest(response: Dict, provider: str, model: str,
+                         api_key: str, config: Dict) -> tuple:
+    """
+    Condensed text of one subscription's latest response.
+
+    The result is cached per subscription, keyed by the response text and
+    the provider / model / condense prompt, so it is only recomputed when
+    that subscription has a new (or edited) response.
+
+    Returns: (text, status) where status is 'as-is' | 'cached' | 'condensed'
+             | 'failed' (the original text is returned on failure).
+    """
+    import hashlib
+    import cache_manager
+
+    text = response.get("text", "")
+    if len(text) < DIGEST_CONDENSE_MIN_CHARS:
+        return text, "as-is"
+
+    prompt = DIGEST_CONDENSE_PROMPT.format(words=DIGEST_CONDENSE_WORDS)
+    key = hashlib.sha256("\0".join((provider, model, prompt, text))
+                         .encode("utf-8", "surrogatepass")).hexdigest()
+    path = _digest_cache_path(response["sub_id"])
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            cached = json.load(fh)
+        if cached.get("key") == key and cached.get("condensed"):
+            cache_manager.touch(path, kind="digest")
+            return cached["condensed"], "cached"
+    except (OSError, ValueError):
+        pass
+
+    from ai_handler import process_entries_chunked
+    ok, condensed = process_entries_chunked(
+        entries=[{"text": text, "start": 0}],
+        prompt_text=prompt,
+        provider=provider,
+        model=model,
+        api_key=api_key,
+        chunk_size_setting=config.get("chunk_size", "medium"),
+        include_timestamps=False,
+        doc_title=f"Digest: {response.get('sub_name', '?')}",
+        prompt_name="Digest condense",
+        consolidation=config.get("consolidation_mode", "auto"),
+        reduce_workers=1,
+    )
+    if not ok or not condensed.strip():
+        logger.warning(f"[Digest] condense failed for {response.get('sub_name')}: "
+                       f"{condensed[:200]}")
+        return text, "failed"
+
+    try:
+        cache_manager.atomic_write_json(path, {
+            "key":       key,
+            "doc_id":    response.get("doc_id", ""),
+            "condensed": condensed,
+            "saved":     datetime.datetime.now().isoformat(),
+        }, kind="digest", key=response["sub_id"])
+    except OSError as exc:
+        logger.warning(f"[Digest] could not cache condensed summary: {exc}")
+    return condensed, "condensed"
+
+
+def condense_responses(responses: List[Dict], provider: str, model: str,
+                       api_key: str, config: Dict,
+                       status_cb: Callable = None) -> List[Dict]:
+    """
+    Condense each response concurrently (see _condense_for_digest).
+    Returns copies of the response dicts with 'text' replaced by the
+    condensed text, in the same order.
+    """
+    # Local models serve one request at a time; cloud providers take several
+    workers = 1 if provider == "Ollama (Local)" else max(1, int(config.get("reduce_workers", 4)))
+
+    def _one(r: Dict) -> tuple:
+        try:
+            return _condense_for_digest(r, provider, model, api_key, config)
+        except Exception as exc:
+            logger.warning(f"[Digest] condense error for {r.get('sub_name')}: {exc}")
+            return r.get("text", ""), "failed"
+
+    with ThreadPoolExecutor(max_workers=min(workers, max(1, len(responses))),
+                            thread_name_prefix="digest") as pool:
+        outcomes = list(pool.map(_one, responses))
+
+    counts: Dict[str, int] = {}
+    for _, status in outcomes:
+        counts[status] = counts.get(status, 0) + 1
+    if status_cb:
+        status_cb("  Condensed: " + ", ".join(f"{n} {k}" for k, n in sorted(counts.items())))
+    return [dict(r, text=text) for r, (text, _) in zip(responses, outcomes)]
+
+
 def generate_digest(
     subscription_ids: List[str],
     prompt_text: str,
@@ -1218,9 +1659,11 @@ def generate_digest(
     status_cb: Callable = None,
 ) -> tuple:
     """
-    Collect the most recent AI response for each subscription, concatenate
-    them with source headers, run through the AI with `prompt_text`, then
-    save the result as a new 'digest' document in the library.
+    Collect the most recent AI response for each subscription, condense
+    each one (concurrently, and cached per subscription until its response
+    changes - see condense_responses), concatenate the condensed parts with
+    source headers, run them through the AI with `prompt_text`, then save
+    the result as a new 'digest' document in the library.
 
     The digest is saved with a companion conversation thread (user turn =
     the digest prompt, assistant turn = the digest output) so that when it
@@ -1257,6 +1700,24 @@ def generate_digest(
 
     _log(f"  Found {len(responses)} summaries to digest.")
 
+    # ── Resolve AI ────────────────────────────────────────────────────────────
+    provider = _resolve_provider(config)
+    model    = (config.get("last_model") or {}).get(provider, "")
+    api_key  = (config.get("keys") or {}).get(provider, "")
+
+    if not model:
+        from config import DEFAULT_MODELS
+        fallback = DEFAULT_MODELS.get(provider, [])
+        model = fallback[0] if fallback else ""
+
+    if not model:
+        return False, f"No model configured for {provider}."
+
+    # ── Condense each source ──────────────────────────────────────────────────
+    _log(f"Condensing {len(responses)} summaries ({provider} / {model})\u2026")
+    condensed = condense_responses(responses, provider, model, api_key, config,
+                                   status_cb=_log)
+
     # ── Build combined text ───────────────────────────────────────────────────
     # Each source is preceded by a structured metadata block so the AI
     # can populate the Sources section with real Channel / Title / URL /
@@ -1278,7 +1739,7 @@ def generate_digest(
             return iso_or_raw[:10]
 
     sections = []
-    for idx, r in enumerate(responses, start=1):
+    for idx, r in enumerate(condensed, start=1):
         date_str = _format_date(r.get("published_date") or r.get("created_at", ""))
 
         lines = [f"[SOURCE {idx}]"]
@@ -1302,18 +1763,6 @@ def generate_digest(
     combined_entries = [{"text": combined_text, "start": 0}]
 
     # ── Run AI ────────────────────────────────────────────────────────────────
-    provider = _resolve_provider(config)
-    model    = (config.get("last_model") or {}).get(provider, "")
-    api_key  = (config.get("keys") or {}).get(provider, "")
-
-    if not model:
-        from config import DEFAULT_MODELS
-        fallback = DEFAULT_MODELS.get(provider, [])
-        model = fallback[0] if fallback else ""
-
-    if not model:
-        return False, f"No model configured for {provider}."
-
     _log(f"Running AI ({provider} / {model})\u2026")
 
     from ai_handler import process_entries_chunked
@@ -1328,6 +1777,8 @@ def generate_digest(
         doc_title="Subscription Digest",
         prompt_name=prompt_name,
         status_callback=_log,
+        consolidation=config.get("consolidation_mode", "auto"),
+        reduce_workers=config.get("reduce_workers", 4),
     )
 
     if not ok:
@@ -1430,6 +1881,31 @@ def generate_digest(
         return False, str(exc)
 
 
+def poll_subscription_feeds(subs: List[Dict],
+                            max_workers: int = FEED_POLL_WORKERS) -> Dict[str, Dict]:
+    """
+    Poll several subscription feeds concurrently on a bounded pool.
+
+    Returns {sub_id: poll_result}.  A subscription whose poll raised is
+    returned with an 'error' entry rather than aborting the whole batch.
+    """
+    if not subs:
+        return {}
+
+    def _safe_poll(sub: Dict) -> Dict:
+        try:
+            return poll_subscription_feed(sub)
+        except Exception as exc:
+            logger.warning(f"poll_subscription_feed({sub.get('name','?')}): {exc}")
+            return {"items": [], "not_modified": False, "feed_validators": {},
+                    "channel_id": sub.get("channel_id", ""), "error": f"Feed poll failed: {exc}"}
+
+    workers = max(1, min(max_workers, len(subs)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-poll") as pool:
+        results = list(pool.map(_safe_poll, subs))
+    return {sub["id"]: poll for sub, poll in zip(subs, results)}
+
+
 def check_all_subscriptions(config: Dict,
                               status_cb:   Callable = None,
                               item_done_cb: Callable = None,
@@ -1458,6 +1934,15 @@ def check_all_subscriptions(config: Dict,
             status_cb("No enabled subscriptions.")
         return totals
 
+    prune_seen_history(int(config.get("subscription_seen_retention_days",
+                                      SEEN_GUID_RETENTION_DAYS)))
+
+    # ── Poll every feed concurrently (network-bound, cheap) ──────────────────
+    if status_cb:
+        status_cb(f"Polling {len(enabled)} feed(s)…")
+    polls = poll_subscription_feeds(enabled)
+
+    # ── Process new items one subscription at a time ─────────────────────────
     for i, sub in enumerate(enabled):
         if stop_flag and stop_flag[0]:
             if status_cb:
@@ -1472,19 +1957,11 @@ def check_all_subscriptions(config: Dict,
             status_cb=status_cb,
             item_done_cb=item_done_cb,
             stop_flag=stop_flag,
+            poll=polls.get(sub["id"]),
         )
 
-        # Persist new seen GUIDs + last_checked
-        new_guids = result.get("new_seen_guids", [])
-        if new_guids:
-            merged = list(set(sub.get("seen_guids", []) + new_guids))
-        else:
-            merged = sub.get("seen_guids", [])
-
-        update_subscription(sub["id"], {
-            "seen_guids":   merged,
-            "last_checked": datetime.datetime.now().isoformat(),
-        })
+        # Persist new seen GUIDs, last_checked and feed validators
+        apply_check_result(sub, result)
 
         totals["total_processed"] += result["processed"]
         totals["total_skipped"]   += result["skipped"]
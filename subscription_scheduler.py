@@ -0,0 +1,322 @@
+"""
+subscription_scheduler.py — Background scheduling for subscription checks
+
+Acts on the scheduling fields of each subscription:
+
+    schedule_enabled      — opt-in per subscription
+    check_interval_hours  — run every N hours (1–168)
+    check_time            — "HH:MM"; used when the interval is a whole
+                            number of days, so a 24-hour subscription runs
+                            at (about) that time each day
+
+Load is spread out in three ways so a morning catch-up of dozens of
+feeds never hits provider rate limits all at once:
+
+  * each subscription gets a stable jitter (derived from its ID) added to
+    its due time, so subscriptions with the same interval don't all fire
+    on the same tick;
+  * at most MAX_SUBS_PER_TICK due subscriptions are started per tick —
+    the rest wait for the next tick, oldest-due first;
+  * the expensive per-item work (transcription, AI calls) still runs one
+    item at a time behind subscription_manager's processing lock.
+
+Overlapping runs are coalesced: if a tick is still running when the next
+one fires it is skipped, and a subscription already being checked by
+another run (e.g. the user pressed Check Now) is skipped by
+check_subscription itself.
+
+Two ways to run it:
+
+  In-app:   SubscriptionScheduler(lambda: app.config).start()
+            (started by Main at startup, stopped on close)
+
+  Headless: python subscription_scheduler.py          # run forever
+            python subscription_scheduler.py --once   # run due subs, exit
+
+Called by:
+  Main.py  (in-process scheduler)
+"""
+
+import sys
+import time
+import zlib
+import logging
+import datetime
+import threading
+from typing import List, Dict, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_TICK_SECONDS  = 60     # how often to look for due subscriptions
+STARTUP_DELAY_SECONDS   = 120    # let the app settle before the first tick
+MAX_SUBS_PER_TICK       = 4      # subscriptions started per tick
+MAX_JITTER_MINUTES      = 15     # upper bound on per-subscription jitter
+JITTER_FRACTION         = 0.1    # jitter is at most this share of the interval
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Due-time calculation
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime.datetime]:
+    if not value:
+        return None
+    try:
+        dt = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+    # last_checked is written with datetime.now() (naive local time)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+def _parse_check_time(value: Optional[str]) -> Optional[datetime.time]:
+    try:
+        hours, minutes = str(value or "").split(":")
+        return datetime.time(int(hours), int(minutes))
+    except (ValueError, TypeError):
+        return None
+
+
+def _jitter(sub: Dict, interval_hours: float) -> datetime.timedelta:
+    """
+    Stable per-subscription offset in [0, min(MAX_JITTER_MINUTES,
+    JITTER_FRACTION × interval)).  Derived from the subscription ID so the
+    spread is the same on every run and across restarts.
+    """
+    max_seconds = min(MAX_JITTER_MINUTES * 60, interval_hours * 3600 * JITTER_FRACTION)
+    if max_seconds <= 0:
+        return datetime.timedelta(0)
+    bucket = zlib.crc32(str(sub.get("id", "")).encode("utf-8")) % 10_000
+    return datetime.timedelta(seconds=max_seconds * bucket / 10_000)
+
+
+def next_due_time(sub: Dict,
+                  now: Optional[datetime.datetime] = None) -> Optional[datetime.datetime]:
+    """
+    Return when this subscription is next due, or None if it isn't
+    scheduled (disabled, or schedule_enabled is off).
+    """
+    if not sub.get("enabled", True) or not sub.get("schedule_enabled", False):
+        return None
+
+    now = now or datetime.datetime.now()
+    try:
+        interval_hours = max(1.0, float(sub.get("check_interval_hours") or 6))
+    except (ValueError, TypeError):
+        interval_hours = 6.0
+
+    last       = _parse_iso(sub.get("last_checked"))
+    check_time = _parse_check_time(sub.get("check_time"))
+    jitter     = _jitter(sub, interval_hours)
+
+    # Whole-day intervals honour the "run at" time of day
+    if check_time is not None and interval_hours >= 24 and interval_hours % 24 == 0:
+        days = int(interval_hours // 24)
+        if last is None:
+            due = datetime.datetime.combine(now.date(), check_time)
+            if due > now:
+                due -= datetime.timedelta(days=1)   # yesterday's slot was missed
+        else:
+            due = datetime.datetime.combine(last.date(), check_time)
+            if due <= last:
+                due += datetime.timedelta(days=days)
+        return due + jitter
+
+    if last is None:
+        return now - datetime.timedelta(seconds=1) + jitter
+    return last + datetime.timedelta(hours=interval_hours) + jitter
+
+
+def get_due_subscriptions(subs: List[Dict],
+                          now: Optional[datetime.datetime] = None) -> List[Dict]:
+    """Return the scheduled subscriptions that are due, most overdue first."""
+    now = now or datetime.datetime.now()
+    due = []
+    for sub in subs:
+        when = next_due_time(sub, now)
+        if when is not None and when <= now:
+            due.append((when, sub))
+    due.sort(key=lambda pair: pair[0])
+    return [sub for _when, sub in due]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Scheduler
+# ─────────────────────────────────────────────────────────────────────────────
+
+class SubscriptionScheduler:
+    """
+    Daemon thread that runs due subscriptions on their intervals.
+
+    Args:
+        get_config:   Callable returning the current app config dict (read
+                      on every tick so Settings changes take effect).
+        status_cb:    Optional callable(str) for progress messages.
+        sub_done_cb:  Optional callable(sub_name, result) per subscription.
+        tick_seconds / max_per_tick / startup_delay: override the module
+                      defaults (mainly for the headless runner).
+    """
+
+    def __init__(self, get_config: Callable[[], Dict],
+                 status_cb: Callable = None,
+                 sub_done_cb: Callable = None,
+                 tick_seconds: int = SCHEDULER_TICK_SECONDS,
+                 max_per_tick: int = MAX_SUBS_PER_TICK,
+                 startup_delay: int = STARTUP_DELAY_SECONDS):
+        self._get_config   = get_config
+        self._status_cb    = status_cb
+        self._sub_done_cb  = sub_done_cb
+        self.tick_seconds  = tick_seconds
+        self.max_per_tick  = max_per_tick
+        self.startup_delay = startup_delay
+
+        self._stop_event = threading.Event()
+        self._stop_flag  = [False]          # shared with check_subscription
+        self._run_lock   = threading.Lock() # coalesces overlapping ticks
+        self._thread: Optional[threading.Thread] = None
+
+    def _log(self, msg: str):
+        logger.info(f"[Scheduler] {msg}")
+        if self._status_cb:
+            try:
+                self._status_cb(msg)
+            except Exception:
+                pass
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the background thread (no-op if already running)."""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._stop_flag[0] = False
+        self._thread = threading.Thread(target=self._loop, name="subscription-scheduler",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Ask the thread to stop; an in-flight item finishes first."""
+        self._stop_event.set()
+        self._stop_flag[0] = True
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        if self._stop_event.wait(self.startup_delay):
+            return
+        while not self._stop_event.is_set():
+            try:
+                self.run_due_now()
+            except Exception as exc:
+                logger.error(f"Subscription scheduler tick failed: {exc}", exc_info=True)
+            self._stop_event.wait(self.tick_seconds)
+
+    # ── One tick ──────────────────────────────────────────────────────────
+
+    def run_due_now(self) -> Optional[Dict]:
+        """
+        Run up to max_per_tick due subscriptions.
+
+        Returns totals {total_processed, total_skipped, total_errors,
+        subscriptions}, or None if another tick was still running.
+        """
+        if not self._run_lock.acquire(blocking=False):
+            logger.info("[Scheduler] Previous run still in progress — tick skipped.")
+            return None
+        try:
+            from subscription_manager import (
+                load_subscriptions, poll_subscription_feeds,
+                check_subscription, apply_check_result,
+                prune_seen_history, SEEN_GUID_RETENTION_DAYS,
+            )
+
+            config = self._get_config() or {}
+            totals = {"total_processed": 0, "total_skipped": 0,
+                      "total_errors": 0, "subscriptions": 0}
+            if not config.get("subscription_scheduler", True):
+                return totals
+
+            due = get_due_subscriptions(load_subscriptions())
+            if not due:
+                return totals
+
+            prune_seen_history(int(config.get("subscription_seen_retention_days",
+                                              SEEN_GUID_RETENTION_DAYS)))
+
+            batch = due[:self.max_per_tick]
+            waiting = len(due) - len(batch)
+            self._log(f"{len(batch)} scheduled subscription(s) due"
+                      + (f", {waiting} deferred to later ticks." if waiting else "."))
+
+            polls = poll_subscription_feeds(batch)
+            for sub in batch:
+                if self._stop_event.is_set():
+                    break
+                self._log(f"Scheduled check: {sub.get('name', '?')}")
+                result = check_subscription(
+                    sub, config,
+                    stop_flag=self._stop_flag,
+                    poll=polls.get(sub["id"]),
+                )
+                apply_check_result(sub, result)
+
+                totals["subscriptions"]   += 1
+                totals["total_processed"] += result["processed"]
+                totals["total_skipped"]   += result["skipped"]
+                totals["total_errors"]    += result["errors"]
+                if self._sub_done_cb:
+                    try:
+                        self._sub_done_cb(sub.get("name", "?"), result)
+                    except Exception:
+                        pass
+            return totals
+        finally:
+            self._run_lock.release()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Headless entry point
+# ─────────────────────────────────────────────────────────────────────────────
+
+def main(argv: List[str] = None) -> int:
+    """
+    Run the scheduler without the UI.
+
+        python subscription_scheduler.py          # loop until Ctrl+C
+        python subscription_scheduler.py --once   # run everything due, then exit
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s %(levelname)s %(message)s")
+
+    from config_manager import load_config
+
+    scheduler = SubscriptionScheduler(load_config, status_cb=print, startup_delay=0)
+
+    if "--once" in argv:
+        # Drain everything currently due, a tick-sized batch at a time
+        from subscription_manager import load_subscriptions
+        pending = len(get_due_subscriptions(load_subscriptions()))
+        for _batch in range(0, pending, scheduler.max_per_tick):
+            scheduler.run_due_now()
+        return 0
+
+    scheduler.start()
+    try:
+        while scheduler.is_running:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("Stopping scheduler…")
+        scheduler.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,18 +2,25 @@
 substack_utils.py
 
 Substack transcript scraping utilities for DocAnalyser.
-Uses Selenium with automatic browser detection (Chrome, Edge, or Firefox).
+Tries the post's JSON API first (transcripts published with the post are
+read directly, no browser needed), then falls back to Selenium with
+automatic browser detection (Chrome, Edge, or Firefox).  Browser sessions come from a shared
+pool (see webdriver_pool.py), so a batch of posts reuses one warm browser.
 Handles Substack's format where timestamps are on separate lines from text.
 
 Usage:
     from substack_utils import is_substack_url, fetch_substack_transcript
 """
 
+import json
 import re
 from typing import Optional, Tuple, Any, Dict, List
+from urllib.parse import urlparse
 import time
 import logging
 
+import webdriver_pool
+
 
 def is_substack_url(url: str) -> bool:
     """Check if a URL is a Substack post URL."""
@@ -30,12 +37,16 @@ def extract_post_slug(url: str) -> Optional[str]:
     return match.group(1) if match else None
 
 
-def get_webdriver(headless: bool = True):
+def get_webdriver(headless: bool = True, browser: Optional[str] = None):
     """
     Get a working WebDriver, trying Chrome, Edge, then Firefox.
     
+    Starts a new browser every call - scraping code should borrow a
+    session from get_browser_pool() instead.
+    
     Args:
         headless: Whether to run in headless mode (invisible)
+        browser: Only try this browser ('Chrome', 'Edge' or 'Firefox')
         
     Returns:
         Tuple of (driver, browser_name) or (None, None) if all fail
@@ -81,6 +92,8 @@ def get_webdriver(headless: bool = True):
         ('Edge', webdriver.Edge, setup_edge_options),
         ('Firefox', webdriver.Firefox, setup_firefox_options),
     ]
+    if browser:
+        browsers = [b for b in browsers if b[0] == browser]
     
     for browser_name, driver_class, options_func in browsers:
         try:
@@ -100,12 +113,202 @@ def get_webdriver(headless: bool = True):
     return None, None
 
 
+# ============================================================
+# JSON API FAST PATH
+# ============================================================
+
+# Post fields that mean there is a video or audio (and so maybe a transcript)
+_MEDIA_FIELDS = ('videoUpload', 'video_upload_id', 'podcastUpload', 'podcast_upload_id', 'podcast_url')
+
+
+def _api_url(url: str) -> Optional[str]:
+    """https://<host>/api/v1/posts/<slug> for a post URL (custom domains too)."""
+    slug = extract_post_slug(url)
+    parsed = urlparse(url if '://' in url else f"https://{url}")
+    if not slug or not parsed.netloc:
+        return None
+    return f"{parsed.scheme or 'https'}://{parsed.netloc}/api/v1/posts/{slug}"
+
+
+def _format_clock(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def _parse_clock(value: str) -> float:
+    """'01:02:03.500' / '1:02,5' -> seconds."""
+    total = 0.0
+    for part in value.replace(',', '.').split(':'):
+        total = total * 60 + float(part)
+    return total
+
+
+def _segments_to_entries(segments: List) -> List[Dict]:
+    """Transcript segments as JSON ({'start'/'startTime'/... or 'startMs', 'text'}) -> entries."""
+    entries = []
+    for seg in segments:
+        if not isinstance(seg, dict):
+            continue
+        text = (seg.get('text') or seg.get('content') or '').strip()
+        start = next((seg[k] for k in ('start', 'startTime', 'start_time', 'offset', 'begin') if k in seg), None)
+        start_ms = next((seg[k] for k in ('startMs', 'start_ms') if k in seg), None)
+        if not text or (start is None and start_ms is None):
+            continue
+        try:
+            if start is not None:
+                start = _parse_clock(start) if isinstance(start, str) else float(start)
+            else:
+                start = float(start_ms) / 1000.0
+        except (TypeError, ValueError):
+            continue
+        entry = {'text': text, 'start': int(start), 'timestamp': _format_clock(start)}
+        if seg.get('speaker'):
+            entry['speaker'] = seg['speaker']
+        entries.append(entry)
+    return entries
+
+
+def _parse_transcript_payload(payload) -> List[Dict]:
+    """Transcript data in whatever form the API gave it: JSON, WebVTT/SRT or text."""
+    if isinstance(payload, str):
+        stripped = payload.strip()
+        if stripped[:1] in ('[', '{'):
+            try:
+                return _parse_transcript_payload(json.loads(stripped))
+            except ValueError:
+                pass
+        if '-->' in stripped:
+            entries = []
+            for match in re.finditer(
+                    r'(\d{1,2}:\d{2}(?::\d{2})?[.,]\d+)\s*-->[^\n]*\n(.+?)(?:\n\s*\n|\Z)', stripped, re.S):
+                text = ' '.join(line.strip() for line in match.group(2).splitlines() if line.strip())
+                start = _parse_clock(match.group(1))
+                if text:
+                    entries.append({'text': text, 'start': int(start), 'timestamp': _format_clock(start)})
+            return entries
+        return parse_transcript_text(stripped)
+    if isinstance(payload, list):
+        return _segments_to_entries(payload)
+    if isinstance(payload, dict):
+        for key in ('segments', 'transcript', 'results', 'items', 'cues'):
+            if isinstance(payload.get(key), (list, str)):
+                entries = _parse_transcript_payload(payload[key])
+                if entries:
+                    return entries
+    return []
+
+
+def _transcript_candidates(node, depth: int = 0):
+    """Values stored under '...transcri...' keys anywhere in the post JSON."""
+    if depth > 6:
+        return
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if 'transcri' in key.lower() and value:
+                yield value
+            elif isinstance(value, (dict, list)):
+                yield from _transcript_candidates(value, depth + 1)
+    elif isinstance(node, list):
+        for value in node[:50]:
+            if isinstance(value, (dict, list)):
+                yield from _transcript_candidates(value, depth + 1)
+
+
+def _load_transcript(candidate) -> List[Dict]:
+    """Entries from one candidate: inline data, or a URL to fetch it from."""
+    import http_client
+    urls = []
+    if isinstance(candidate, str) and candidate.startswith('http'):
+        urls.append(candidate)
+    elif isinstance(candidate, dict):
+        urls += [v for k, v in candidate.items()
+                 if isinstance(v, str) and v.startswith('http') and 'url' in k.lower()]
+    for transcript_url in urls:
+        try:
+            resp = http_client.get(transcript_url, timeout=20)
+            if resp.ok:
+                entries = _parse_transcript_payload(resp.text)
+                if entries:
+                    return entries
+        except Exception as e:
+            print(f"⚠️ Transcript download failed: {e}")
+    return [] if urls else _parse_transcript_payload(candidate)
+
+
+def fetch_transcript_via_api(url: str) -> Optional[Tuple[bool, Any, str, str, Dict]]:
+    """
+    Try to answer fetch_substack_transcript from the post's JSON API.
+    
+    Returns the same tuple as fetch_substack_transcript when the API has
+    the transcript, and None when the browser is still needed - including
+    posts the API lists without video/audio, whose body may still embed
+    a player.
+    """
+    api_url = _api_url(url)
+    if not api_url:
+        return None
+    try:
+        import http_client
+        resp = http_client.get(api_url, headers={'Accept': 'application/json'}, timeout=20)
+        if resp.status_code != 200:
+            print(f"⚠️ Substack API returned status {resp.status_code}")
+            return None
+        post = json.loads(resp.text)
+    except Exception as e:
+        print(f"⚠️ Substack API attempt failed: {e}")
+        return None
+    if not isinstance(post, dict):
+        return None
+    
+    title = post.get('title') or 'Unknown Post'
+    bylines = post.get('publishedBylines') or []
+    metadata = {
+        'author': (bylines[0].get('name') if bylines and isinstance(bylines[0], dict) else None) or 'Unknown',
+        'published_date': (post.get('post_date') or '')[:10],
+        'url': url,
+        'post_slug': extract_post_slug(url),
+        'transcript_source': 'api',
+    }
+    
+    has_media = post.get('type') in ('video', 'podcast') or any(post.get(k) for k in _MEDIA_FIELDS)
+    if not has_media:
+        print(f"🔍 Substack API: no video or audio listed - checking the page in the browser")
+        return None
+    
+    for candidate in _transcript_candidates(post):
+        entries = _load_transcript(candidate)
+        if entries:
+            metadata['entry_count'] = len(entries)
+            print(f"✅ Substack API: {len(entries)} transcript entries (no browser needed)")
+            return True, entries, f"Substack: {title}", "substack", metadata
+    
+    print(f"🔍 Substack API: post has media but no transcript data - using the browser")
+    return None
+
+
+# ============================================================
+# BROWSER PATH
+# ============================================================
+
+def _browser_factory(browser: Optional[str]):
+    return get_webdriver(headless=True, browser=browser)
+
+
+def get_browser_pool() -> webdriver_pool.WebDriverPool:
+    """The shared pool of headless browsers used for Substack pages."""
+    return webdriver_pool.get_pool("substack", _browser_factory)
+
+
 def fetch_substack_transcript(url: str) -> Tuple[bool, Any, str, str, Dict]:
     """
-    Fetch transcript from a Substack video post using Selenium.
+    Fetch transcript from a Substack video post.
     
-    Opens the page in a headless browser, clicks the transcript button,
-    waits for content to load, then scrapes the transcript.
+    Tries the post's JSON API first; if that isn't conclusive, opens the
+    page in a pooled headless browser, clicks the transcript button,
+    waits for content to load, then scrapes the transcript.  A browser
+    that crashes mid-fetch is replaced and the fetch retried once.
     
     Works with Chrome, Edge, or Firefox - whichever is installed.
     
@@ -115,141 +318,147 @@ def fetch_substack_transcript(url: str) -> Tuple[bool, Any, str, str, Dict]:
     Returns:
         Tuple of (success, result/error, title, source_type, metadata)
     """
+    api_result = fetch_transcript_via_api(url)
+    if api_result is not None:
+        return api_result
+    
+    # Check if Selenium is available
     try:
-        # Check if Selenium is available
+        from selenium.common.exceptions import WebDriverException
+    except ImportError:
+        error = "Selenium not installed. Install with: pip install selenium"
+        print(f"❌ {error}")
+        return False, error, "", "substack", {}
+    
+    print(f"🌐 Starting browser automation for Substack...")
+    pool = get_browser_pool()
+    
+    for attempt in range(2):
         try:
-            from selenium import webdriver
-            from selenium.webdriver.common.by import By
-            from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-        except ImportError:
-            error = "Selenium not installed. Install with: pip install selenium"
-            print(f"❌ {error}")
-            return False, error, "", "substack", {}
-        
-        print(f"🌐 Starting browser automation for Substack...")
+            with pool.session() as (driver, browser_name):
+                return _scrape_transcript_page(driver, browser_name, url)
         
-        # Get a working browser
-        driver, browser_name = get_webdriver(headless=True)
-        
-        if not driver:
+        except webdriver_pool.NoBrowserError as e:
             error = ("No compatible browser found.\n\n"
                     "Substack transcript scraping requires Chrome, Edge, or Firefox.\n"
                     "Please install one of these browsers.")
+            print(f"❌ {error} ({e})")
+            return False, error, "", "substack", {}
+        
+        except WebDriverException as e:
+            if attempt == 0 and webdriver_pool.is_browser_failure(e):
+                print(f"⚠️ Browser session lost - retrying with a fresh browser")
+                continue
+            error = f"Browser automation error: {str(e)}"
             print(f"❌ {error}")
             return False, error, "", "substack", {}
         
+        except Exception as e:
+            error = f"Error: {str(e)}"
+            print(f"❌ {error}")
+            import traceback
+            traceback.print_exc()
+            return False, error, "", "substack", {}
+
+
+def _scrape_transcript_page(driver, browser_name: str, url: str) -> Tuple[bool, Any, str, str, Dict]:
+    """Load a post in a browser session and scrape its transcript."""
+    from selenium.webdriver.common.by import By
+    
+    # Load the page
+    print(f"📥 Loading page...")
+    driver.get(url)
+    time.sleep(2)
+    
+    # Extract metadata
+    try:
+        title = driver.title
+        if '|' in title:
+            post_title = title.split('|')[0].strip()
+        else:
+            post_title = title
+        full_title = f"Substack: {post_title}"
+    except:
+        full_title = "Substack: Unknown Post"
+    
+    # Extract author
+    author = "Unknown"
+    try:
+        author_elem = driver.find_element(By.CLASS_NAME, "frontend-pencraft-ComponentAuthor")
+        author = author_elem.text.strip()
+    except:
+        pass
+    
+    # Look for transcript button
+    print(f"🔍 Looking for transcript button...")
+    transcript_button = None
+    
+    selectors = [
+        (By.XPATH, "//button[contains(translate(text(), 'TRANSCRIPT', 'transcript'), 'transcript')]"),
+        (By.XPATH, "//a[contains(translate(text(), 'TRANSCRIPT', 'transcript'), 'transcript')]"),
+    ]
+    
+    for by, selector in selectors:
         try:
-            # Load the page
-            print(f"📥 Loading page...")
-            driver.get(url)
-            time.sleep(2)
-            
-            # Extract metadata
-            try:
-                title = driver.title
-                if '|' in title:
-                    post_title = title.split('|')[0].strip()
-                else:
-                    post_title = title
-                full_title = f"Substack: {post_title}"
-            except:
-                full_title = "Substack: Unknown Post"
-            
-            # Extract author
-            author = "Unknown"
-            try:
-                author_elem = driver.find_element(By.CLASS_NAME, "frontend-pencraft-ComponentAuthor")
-                author = author_elem.text.strip()
-            except:
-                pass
-            
-            # Look for transcript button
-            print(f"🔍 Looking for transcript button...")
-            transcript_button = None
-            
-            selectors = [
-                (By.XPATH, "//button[contains(translate(text(), 'TRANSCRIPT', 'transcript'), 'transcript')]"),
-                (By.XPATH, "//a[contains(translate(text(), 'TRANSCRIPT', 'transcript'), 'transcript')]"),
-            ]
-            
-            for by, selector in selectors:
+            elements = driver.find_elements(by, selector)
+            for elem in elements:
                 try:
-                    elements = driver.find_elements(by, selector)
-                    for elem in elements:
-                        try:
-                            if elem.is_displayed() and 'transcript' in elem.text.lower():
-                                transcript_button = elem
-                                print(f"✅ Found transcript button")
-                                break
-                        except:
-                            continue
-                    if transcript_button:
+                    if elem.is_displayed() and 'transcript' in elem.text.lower():
+                        transcript_button = elem
+                        print(f"✅ Found transcript button")
                         break
                 except:
                     continue
-            
             if transcript_button:
-                # Click the transcript button
-                print(f"🖱️ Clicking transcript button...")
-                try:
-                    driver.execute_script("arguments[0].scrollIntoView(true);", transcript_button)
-                    time.sleep(0.5)
-                    transcript_button.click()
-                    print(f"✅ Clicked, waiting for content...")
-                    time.sleep(4)  # Wait for transcript to load
-                except Exception as e:
-                    print(f"⚠️ Trying JavaScript click...")
-                    driver.execute_script("arguments[0].click();", transcript_button)
-                    time.sleep(4)
-            else:
-                print(f"⚠️ No transcript button found")
-            
-            # Get all text from the page
-            page_text = driver.find_element(By.TAG_NAME, "body").text
-            
-            # Parse transcript
-            print(f"📝 Parsing transcript...")
-            transcript_entries = parse_transcript_text(page_text)
-            
-            if not transcript_entries:
-                error = ("No transcript found on this Substack page.\n\n"
-                        "Possible reasons:\n"
-                        "• The video doesn't have a transcript\n"
-                        "• The transcript requires authentication\n"
-                        "• The transcript format is not recognized")
-                print(f"❌ {error}")
-                return False, error, "", "substack", {}
-            
-            # Build metadata
-            metadata = {
-                'author': author,
-                'published_date': '',
-                'url': url,
-                'post_slug': extract_post_slug(url),
-                'entry_count': len(transcript_entries),
-                'browser_used': browser_name
-            }
-            
-            print(f"✅ Successfully extracted {len(transcript_entries)} transcript entries")
-            
-            return True, transcript_entries, full_title, "substack", metadata
-            
-        finally:
-            if driver:
-                driver.quit()
-                print(f"🚪 Browser closed")
+                break
+        except:
+            continue
     
-    except WebDriverException as e:
-        error = f"Browser automation error: {str(e)}"
-        print(f"❌ {error}")
-        return False, error, "", "substack", {}
+    if transcript_button:
+        # Click the transcript button
+        print(f"🖱️ Clicking transcript button...")
+        try:
+            driver.execute_script("arguments[0].scrollIntoView(true);", transcript_button)
+            time.sleep(0.5)
+            transcript_button.click()
+            print(f"✅ Clicked, waiting for content...")
+            time.sleep(4)  # Wait for transcript to load
+        except Exception as e:
+            print(f"⚠️ Trying JavaScript click...")
+            driver.execute_script("arguments[0].click();", transcript_button)
+            time.sleep(4)
+    else:
+        print(f"⚠️ No transcript button found")
     
-    except Exception as e:
-        error = f"Error: {str(e)}"
+    # Get all text from the page
+    page_text = driver.find_element(By.TAG_NAME, "body").text
+    
+    # Parse transcript
+    print(f"📝 Parsing transcript...")
+    transcript_entries = parse_transcript_text(page_text)
+    
+    if not transcript_entries:
+        error = ("No transcript found on this Substack page.\n\n"
+                "Possible reasons:\n"
+                "• The video doesn't have a transcript\n"
+                "• The transcript requires authentication\n"
+                "• The transcript format is not recognized")
         print(f"❌ {error}")
-        import traceback
-        traceback.print_exc()
         return False, error, "", "substack", {}
+    
+    # Build metadata
+    metadata = {
+        'author': author,
+        'published_date': '',
+        'url': url,
+        'post_slug': extract_post_slug(url),
+        'entry_count': len(transcript_entries),
+        'browser_used': browser_name
+    }
+    
+    print(f"✅ Successfully extracted {len(transcript_entries)} transcript entries")
+    
+    return True, transcript_entries, full_title, "substack", metadata
 
 
 def parse_transcript_text(text: str) -> List[Dict]:
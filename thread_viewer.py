@@ -25,6 +25,7 @@ from document_library import get_document_by_id
 from utils import safe_filename, format_display_date
 from document_export import export_conversation_thread, get_file_extension_and_types, export_document
 from thread_viewer_markdown import MarkdownMixin
+from thread_viewer_render import ProgressiveText, TextIndex
 from thread_viewer_copy import CopyMixin
 from thread_viewer_save import SaveMixin
 from thread_viewer_branches import BranchMixin
@@ -1031,6 +1032,7 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
         try:
             # 1. Update the live entries the player/paragraph editor reads.
             self.current_entries = new_entries
+            self._invalidate_source_link_index()
             # Also push to the parent app if it's tracking the same entries
             # (e.g. for chunking when the user submits a new prompt).
             if self.app is not None and hasattr(self.app, "current_entries"):
@@ -1200,8 +1202,8 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
         )
         self.find_entry.pack(side=tk.LEFT, padx=(0, 4))
         self.find_entry.bind('<Return>', lambda e: self._find_next())
-        # Clear match cache when search text changes
-        self.find_var.trace_add('write', lambda *_: self._invalidate_find_cache())
+        # Clear match cache when search text changes (and re-count once typing pauses)
+        self.find_var.trace_add('write', lambda *_: self._on_find_text_changed())
 
         # Prev / Next buttons  (sit between Find entry and Replace entry)
         self._prev_btn = ttk.Button(
@@ -1260,6 +1262,10 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
         self._search_start  = "1.0"
         self._find_matches  = []   # list of (start_pos, end_pos) for current query
         self._find_match_idx = -1  # which match is currently highlighted
+        self._find_index    = None # TextIndex mirror of the widget text
+        self._find_query    = ""   # query that _find_offsets belong to
+        self._find_offsets  = []   # character offsets of its matches
+        self._find_after_id = None
     
     def _focus_find_field(self):
         """Focus the find entry field"""
@@ -1272,23 +1278,69 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
         self._find_matches   = []
         self._find_match_idx = -1
         self.thread_text.tag_remove("search_highlight", "1.0", tk.END)
+        self.thread_text.tag_remove("search_match", "1.0", tk.END)
         self.match_count_label.config(text="", foreground='gray')
 
+    def _on_find_text_changed(self):
+        """Reset the current match and re-count shortly after typing stops."""
+        self._invalidate_find_cache()
+        if self._find_after_id is not None:
+            self.window.after_cancel(self._find_after_id)
+        self._find_after_id = self.window.after(150, self._live_find)
+
+    def _live_find(self):
+        """Highlight and count matches for the query being typed."""
+        self._find_after_id = None
+        search_text = self.find_var.get()
+        if not search_text or self._find_matches:
+            return
+        try:
+            self._build_find_cache(search_text)
+        except tk.TclError:
+            return  # Window closed while the timer was pending
+        total = len(self._find_matches)
+        if total:
+            self.match_count_label.config(text=f"0/{total}", foreground='gray')
+        else:
+            self.match_count_label.config(text="Not found", foreground='red')
+
     def _build_find_cache(self, search_text: str):
-        """Scan the whole text widget and store every match position."""
+        """
+        Find every match position using a Python mirror of the widget text.
+
+        The mirror is reused while the text is unchanged, and when the new
+        query extends the previous one its matches are narrowed down from the
+        previous matches rather than rescanned.
+        """
         self._find_matches = []
         if not search_text:
             return
-        start = "1.0"
-        while True:
-            pos = self.thread_text.search(
-                search_text, start, stopindex=tk.END, nocase=True
-            )
-            if not pos:
-                break
-            end_pos = f"{pos}+{len(search_text)}c"
-            self._find_matches.append((pos, end_pos))
-            start = f"{pos}+1c"   # advance one char to avoid infinite loop
+        text = self.thread_text.get("1.0", "end-1c")
+        index = self._find_index
+        if index is None or index.text != text:
+            index = self._find_index = TextIndex(text)
+            self._find_query, self._find_offsets = "", []
+
+        previous = self._find_query
+        if previous and search_text.lower().startswith(previous.lower()):
+            offsets = index.refine(self._find_offsets, search_text)
+        else:
+            offsets = index.find_all(search_text)
+        self._find_query, self._find_offsets = search_text, offsets
+        self._find_matches = index.spans(offsets, len(search_text))
+        self._highlight_all_matches()
+
+    def _highlight_all_matches(self):
+        """Tag every match in a few batched tag_add calls."""
+        self.thread_text.tag_remove("search_match", "1.0", tk.END)
+        if not self._find_matches:
+            return
+        self.thread_text.tag_config("search_match", background="#fff3b0")
+        self.thread_text.tag_raise("search_highlight")
+        step = 500
+        for i in range(0, len(self._find_matches), step):
+            flat = [pos for span in self._find_matches[i:i + step] for pos in span]
+            self.thread_text.tag_add("search_match", *flat)
 
     def _show_match(self, idx: int):
         """Highlight and scroll to match at index idx in _find_matches."""
@@ -1304,6 +1356,7 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
         self.thread_text.tag_remove("search_highlight", "1.0", tk.END)
         self.thread_text.tag_config("search_highlight",
                                      background="yellow", foreground="black")
+        self.thread_text.tag_raise("search_highlight")
         self.thread_text.tag_add("search_highlight", start, end)
         try:
             self.thread_text.tag_remove(tk.SEL, "1.0", tk.END)
@@ -1376,38 +1429,34 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
         if not search_text:
             return
         
-        # Count replacements
-        count = 0
-        
-        # Start from the beginning
-        self.thread_text.mark_set(tk.INSERT, "1.0")
-        
-        while True:
-            # Find next occurrence
-            pos = self.thread_text.search(
-                search_text, 
-                tk.INSERT, 
-                stopindex=tk.END,
-                nocase=True
+        # Locate every match in the Python mirror, then keep the
+        # non-overlapping ones left to right (same as searching on
+        # from the end of each replacement).
+        self._build_find_cache(search_text)
+        targets = []
+        next_free = 0
+        for offset in self._find_offsets:
+            if offset >= next_free:
+                targets.append(offset)
+                next_free = offset + len(search_text)
+        
+        # Replace from the end backwards so earlier indices stay valid
+        index = self._find_index
+        for offset in reversed(targets):
+            self.thread_text.replace(
+                index.to_index(offset),
+                index.to_index(offset + len(search_text)),
+                replace_text
             )
-            
-            if not pos:
-                break
-            
-            # Calculate end position
-            end_pos = f"{pos}+{len(search_text)}c"
-            
-            # Delete and insert replacement
-            self.thread_text.delete(pos, end_pos)
-            self.thread_text.insert(pos, replace_text)
-            
-            # Move cursor past the replacement
-            self.thread_text.mark_set(tk.INSERT, f"{pos}+{len(replace_text)}c")
-            
-            count += 1
+        count = len(targets)
         
         # Remove any highlights
+        self._find_matches   = []
+        self._find_match_idx = -1
         self.thread_text.tag_remove("search_highlight", "1.0", tk.END)
+        self.thread_text.tag_remove("search_match", "1.0", tk.END)
+        if count:
+            self.thread_text.mark_set(tk.INSERT, "1.0")
         
         # Update status
         if count > 0:
@@ -1610,6 +1659,7 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
                 return
             try:
                 self.current_entries = updated_entries
+                self._invalidate_source_link_index()
                 from document_library import update_transcript_entries
                 update_transcript_entries(doc_id, updated_entries)
                 self._set_status(
@@ -1766,6 +1816,7 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
 
             def _editor_save_callback(new_entries):
                 self.current_entries = new_entries
+                self._invalidate_source_link_index()
                 if self.app is not None and hasattr(self.app, 'current_entries'):
                     self.app.current_entries = new_entries
 
@@ -1923,6 +1974,7 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
 
             # 2. Update in-memory entries
             self.current_entries = restored_entries
+            self._invalidate_source_link_index()
 
             # 3. Refresh paragraph editor — same idiom as elsewhere
             if (hasattr(self, "paragraph_editor")
@@ -2513,6 +2565,7 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
                 print(f"💾 update_transcript_entries returned: {result}", flush=True)
                 # Update our own in-memory copy
                 self.current_entries = new_entries
+                self._invalidate_source_link_index()
                 # Also update the main app's copy so reopening the Thread
                 # Viewer gets the edited entries rather than stale originals
                 if self.app is not None and hasattr(self.app, 'current_entries'):
@@ -2583,7 +2636,9 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
         
         # Create scrolled text widget - white background indicates editable
         # undo=True enables built-in undo/redo (Ctrl+Z works automatically)
-        self.thread_text = scrolledtext.ScrolledText(
+        # ProgressiveText batches render inserts and fills long documents
+        # visible-region-first (see thread_viewer_render.py)
+        self.thread_text = ProgressiveText(
             content_frame, 
             wrap=tk.WORD,
             font=('Arial', self._get_font_size()),
@@ -2630,10 +2685,20 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
         self._refresh_thread_display()
     
     def _refresh_thread_display(self):
-        """Refresh the display based on current mode (source or conversation)"""
+        """
+        Refresh the display based on current mode (source or conversation).
+
+        All inserts are batched: the first screenfuls appear immediately and
+        the rest of a long document is filled in at idle time. Anything that
+        reads the widget (find, copy, save) flushes the remainder first.
+        Link tagging, scrolling and the modified-flag reset run once the
+        content is complete (_finish_thread_display).
+        """
+        self.thread_text.cancel_pending()
         self.thread_text.config(state=tk.NORMAL)
         self.thread_text.delete('1.0', tk.END)
         self._seek_locations = []  # Reset seek links built during previous render
+        self._seek_seconds = {}
 
         # Ensure heading and title match current mode
         self._update_heading()
@@ -2664,20 +2729,30 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
         self.thread_text.tag_config("collapsed_indicator", font=('Arial', font_size, 'italic'), foreground='#7f8c8d')
         # Exchange header style - clickable section headers for collapsible exchanges
         self.thread_text.tag_config("exchange_header", font=('Arial', font_size, 'bold'), foreground='#1a5276', background='#e8f4f8')
+        self._ensure_seek_link_tags()
         
         # Dispatch to appropriate display method based on mode
+        self.thread_text.begin_batch()
         if self.current_mode == 'source':
             self._display_source_mode()
         else:
             self._display_conversation_mode()
+        self.thread_text.end_batch(on_complete=self._finish_thread_display)
         
+        if self.current_mode == 'source':
+            self.thread_text.see('1.0')  # Scroll to top for source
+        
+        # Update info label based on mode
+        self._update_info_label()
+        self._formatting_changed = False
+    
+    def _finish_thread_display(self):
+        """Post-render steps that need the complete content."""
         # Add clickable hyperlinks
         self._make_links_clickable()
         
-        # Scroll position depends on mode
-        if self.current_mode == 'source':
-            self.thread_text.see('1.0')  # Scroll to top for source
-        else:
+        # Scroll position depends on mode (source already scrolled to top)
+        if self.current_mode != 'source':
             # Scroll to top of last exchange so user can see the last Q&A
             num_exchanges = self._count_exchanges()
             if num_exchanges > 0:
@@ -2686,12 +2761,8 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
             else:
                 self.thread_text.see('1.0')  # No exchanges, scroll to top
         
-        # Update info label based on mode
-        self._update_info_label()
-        
         # Reset modification flag - content was just loaded, not edited
         self.thread_text.edit_modified(False)
-        self._formatting_changed = False
     
     def _display_source_mode(self):
         """Display source document(s) in prose format with collapsible sections"""
@@ -2786,55 +2857,60 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
         current_time = datetime.datetime.now()
         
         for exchange_idx, exchange in enumerate(exchanges):
-            is_expanded = self.exchange_expanded_state.get(exchange_idx, True)
-            
-            # Calculate approximate timestamp for this exchange
-            approx_time = current_time - datetime.timedelta(
-                minutes=(len(exchanges) - exchange_idx) * 5
-            )
-            timestamp_str = approx_time.strftime("%H:%M")
+            self._insert_exchange(exchange_idx, exchange, len(exchanges), current_time)
+    
+    def _insert_exchange(self, exchange_idx: int, exchange: dict, num_exchanges: int,
+                         current_time: datetime.datetime):
+        """Insert one exchange (header, and the Q&A when expanded) at the end."""
+        is_expanded = self.exchange_expanded_state.get(exchange_idx, True)
+        
+        # Calculate approximate timestamp for this exchange
+        approx_time = current_time - datetime.timedelta(
+            minutes=(num_exchanges - exchange_idx) * 5
+        )
+        timestamp_str = approx_time.strftime("%H:%M")
+        
+        # Get preview of user question for collapsed view
+        user_msg = exchange.get('user', {})
+        user_content = user_msg.get('content', 'Question')
+        question_preview = user_content[:80] + "..." if len(user_content) > 80 else user_content
+        question_preview = question_preview.replace('\n', ' ')
+        
+        if is_expanded:
+            # Expanded exchange header
+            self._insert_exchange_header(exchange_idx, timestamp_str, question_preview, expanded=True)
             
-            # Get preview of user question for collapsed view
-            user_msg = exchange.get('user', {})
-            user_content = user_msg.get('content', 'Question')
-            question_preview = user_content[:80] + "..." if len(user_content) > 80 else user_content
-            question_preview = question_preview.replace('\n', ' ')
+            # User message
+            self.thread_text.insert(tk.END, f"🧑 YOU ", "user")
+            self.thread_text.insert(tk.END, f"[{timestamp_str}]\n", "timestamp")
+            self.thread_text.insert(tk.END, f"{user_content}\n", "normal")
             
-            if is_expanded:
-                # Expanded exchange header
-                self._insert_exchange_header(exchange_idx, timestamp_str, question_preview, expanded=True)
+            # Assistant message (if present)
+            assistant_msg = exchange.get('assistant', {})
+            if assistant_msg:
+                assistant_content = assistant_msg.get('content', '')
+                msg_provider = assistant_msg.get('provider', '')
+                msg_model = assistant_msg.get('model', '')
                 
-                # User message
-                self.thread_text.insert(tk.END, f"🧑 YOU ", "user")
-                self.thread_text.insert(tk.END, f"[{timestamp_str}]\n", "timestamp")
-                self.thread_text.insert(tk.END, f"{user_content}\n", "normal")
+                if msg_provider or msg_model:
+                    ai_label = f"🤖 {msg_provider}" if msg_provider else "🤖 AI"
+                    if msg_model and msg_model != msg_provider:
+                        ai_label += f" ({msg_model})"
+                else:
+                    ai_label = "🤖 AI"
                 
-                # Assistant message (if present)
-                assistant_msg = exchange.get('assistant', {})
-                if assistant_msg:
-                    assistant_content = assistant_msg.get('content', '')
-                    msg_provider = assistant_msg.get('provider', '')
-                    msg_model = assistant_msg.get('model', '')
-                    
-                    if msg_provider or msg_model:
-                        ai_label = f"🤖 {msg_provider}" if msg_provider else "🤖 AI"
-                        if msg_model and msg_model != msg_provider:
-                            ai_label += f" ({msg_model})"
-                    else:
-                        ai_label = "🤖 AI"
-                    
-                    self.thread_text.insert(tk.END, f"\n{ai_label} ", "assistant")
-                    self.thread_text.insert(tk.END, f"[{timestamp_str}]\n", "timestamp")
-                    
-                    # Render AI response content with markdown formatting
-                    self._render_markdown_content(assistant_content)
+                self.thread_text.insert(tk.END, f"\n{ai_label} ", "assistant")
+                self.thread_text.insert(tk.END, f"[{timestamp_str}]\n", "timestamp")
                 
-                # End of exchange
-                self.thread_text.insert(tk.END, "\n" + "─" * 60 + "\n", "divider")
-            else:
-                # Collapsed exchange - just show header
-                self._insert_exchange_header(exchange_idx, timestamp_str, question_preview, expanded=False)
-    
+                # Render AI response content with markdown formatting
+                self._render_markdown_content(assistant_content)
+            
+            # End of exchange
+            self.thread_text.insert(tk.END, "\n" + "─" * 60 + "\n", "divider")
+        else:
+            # Collapsed exchange - just show header
+            self._insert_exchange_header(exchange_idx, timestamp_str, question_preview, expanded=False)
+
     def _insert_source_header_multi(self, index: int):
         """Insert a clickable header for a specific source document (multi-source mode)"""
         is_expanded = self.source_expanded_state.get(index, False)
@@ -2981,15 +3057,57 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
         new_state = not current_state
         self.exchange_expanded_state[exchange_idx] = new_state
         
-        # Save any edits before refreshing (otherwise they'll be lost)
-        self._save_edits_before_refresh()
-        
-        self._refresh_thread_display()
+        has_edits = (self.thread_text.edit_modified()
+                     or getattr(self, '_formatting_changed', False))
+        if has_edits or not self._rerender_exchange(exchange_idx):
+            # Save any edits before refreshing (otherwise they'll be lost)
+            self._save_edits_before_refresh()
+            self._refresh_thread_display()
         
         # If expanding, scroll to the beginning of this exchange
         if new_state:
             self.window.after(10, lambda: self._scroll_to_exchange(exchange_idx))
     
+    def _rerender_exchange(self, exchange_idx: int) -> bool:
+        """
+        Replace just one exchange's region of the widget (used by expand /
+        collapse instead of a full rebuild). The region runs from the
+        exchange's header to the next exchange's header, or to the end.
+
+        Returns False if the region can't be located, in which case the
+        caller falls back to a full refresh.
+        """
+        if self.current_mode != 'conversation':
+            return False
+        exchanges = self._group_messages_into_exchanges()
+        if not 0 <= exchange_idx < len(exchanges):
+            return False
+        header = self.thread_text.tag_ranges(f"exchange_header_{exchange_idx}")
+        if not header:
+            return False
+        start = self.thread_text.index(header[0])
+        if exchange_idx + 1 < len(exchanges):
+            next_header = self.thread_text.tag_ranges(f"exchange_header_{exchange_idx + 1}")
+            if not next_header:
+                return False
+            end = self.thread_text.index(next_header[0])
+        else:
+            end = self.thread_text.index('end-1c')
+        
+        try:
+            self.thread_text.begin_batch(capture=True)
+            self._insert_exchange(exchange_idx, exchanges[exchange_idx], len(exchanges),
+                                  datetime.datetime.now())
+        finally:
+            runs = self.thread_text.capture_batch()
+        
+        self.thread_text.config(state=tk.NORMAL)
+        self.thread_text.delete(start, end)
+        self.thread_text.insert_runs(start, runs)
+        self._make_links_clickable()
+        self.thread_text.edit_modified(False)
+        return True
+    
     def _scroll_to_exchange(self, exchange_idx: int):
         """Scroll to show the beginning of the specified exchange"""
         try:
@@ -3449,6 +3567,7 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
                     self.source_documents[0]['char_count'] = len(edited_text)
                     # Update legacy field
                     self.current_document_text = edited_text
+                    self._invalidate_source_link_index()
                     
                     # === FIX: Actually persist the changes to the Documents Library ===
                     if self.current_document_id:
@@ -3784,13 +3903,20 @@ class ThreadViewerWindow(MarkdownMixin, CopyMixin, SaveMixin, BranchMixin):
             cost = info.get("cost", 0.0)
             session = ai_handler.session_cost
             
+            # Share of the input served from the provider's prompt cache
+            cached_note = ""
+            input_tokens = info.get("input_tokens", 0)
+            if input_tokens and info.get("cached_tokens"):
+                cached_pct = int(info["cached_tokens"] / input_tokens * 100)
+                cached_note = f" | {cached_pct}% of input cached"
+            
             if cost <= 0:
                 # Local model or free call
                 self._set_status("✅ Response received (no cost — local model)", 5000)
             elif cost < 0.01:
-                self._set_status(f"Cost: <$0.01 | Session total: ${session:.4f}", 8000)
+                self._set_status(f"Cost: <$0.01{cached_note} | Session total: ${session:.4f}", 8000)
             else:
-                self._set_status(f"Cost: ${cost:.4f} | Session total: ${session:.4f}", 8000)
+                self._set_status(f"Cost: ${cost:.4f}{cached_note} | Session total: ${session:.4f}", 8000)
         except Exception as e:
             print(f"⚠️ Cost status display error: {e}")  # Log for debugging
     
@@ -15,6 +15,11 @@ import re
 import webbrowser
 from typing import Optional, Tuple
 
+from thread_viewer_render import (
+    parse_markdown_model, parse_source_model, ts_to_seconds,
+    SourceLinkIndex,
+)
+
 
 class MarkdownMixin:
     """
@@ -30,128 +35,31 @@ class MarkdownMixin:
         Render markdown-formatted content into the thread text widget.
         Supports: **bold**, *italic*, # headers, bullets, numbered lists,
         and [SOURCE: "..."] seek links.
-        """
-        lines = content.split('\n')
-
-        # SOURCE pattern — two variants:
-        #   New (timestamp): [SOURCE: 14:23] or [SOURCE: 1:04:23]
-        #   Old (sentence):  [SOURCE: "first sentence of paragraph"]
-        # Use search() not match() so the marker is found anywhere on the line.
-        _source_ts_pat = re.compile(
-            r'\[SOURCE:\s*(\d{1,2}:\d{2}(?::\d{2})?)\s*\]',
-            re.IGNORECASE
-        )
-        _source_sent_pat = re.compile(
-            r'\[SOURCE:\s*["\u2018\u2019\u201c\u201d\'](.+?)["\u2018\u2019\u201c\u201d\']\]',
-            re.IGNORECASE
-        )
-        # Numbered list item: leading digits, period, space  e.g. "1. " or "12. "
-        _numbered_pat = re.compile(r'^\s*\d+\.\s+')
-
-        # Auto-incrementing counter for numbered lists.
-        # Resets whenever a non-numbered-list line is encountered (blank lines
-        # between items are fine — blank lines don't reset the counter).
-        _list_counter  = 0
-        _last_was_heading = False   # suppress blank line immediately after a heading
-
-        for line in lines:
-            # New-style: [SOURCE: 14:23] — direct timestamp lookup (fast, local-AI friendly)
-            ts_match = _source_ts_pat.search(line)
-            if ts_match:
-                _list_counter = 0
-                _last_was_heading = False
-                self._render_timestamp_seek_link(ts_match.group(1))
-                continue
 
-            # Old-style: [SOURCE: "sentence"] — verbatim text search (cloud AI)
-            source_match = _source_sent_pat.search(line)
-            if source_match:
-                _list_counter = 0
-                _last_was_heading = False
-                self._render_source_seek_link(source_match.group(1))
-                continue
-
-            # Suppress blank lines that immediately follow a heading — they
-            # create an unwanted gap between the heading and its body text.
-            if not line.strip() and _last_was_heading:
-                continue
-
-            # Headers: # Header or ## Header
-            if line.strip().startswith('#'):
-                _list_counter = 0
-                _last_was_heading = True
-                text = line.lstrip('# ').strip()
-                self.thread_text.insert(tk.END, text + '\n', 'header')
-                continue
-
-            _last_was_heading = False
-
-            # Bullets: - item or * item
-            if line.strip().startswith(('- ', '* ')):
-                _list_counter = 0
-                text = '• ' + line.strip()[2:]
-                self.thread_text.insert(tk.END, text + '\n', 'bullet')
-                continue
-
-            # Numbered list items: "1. text", "2. text", etc.
-            # Auto-increment so items always display in order even when the AI
-            # outputs all items as "1." (standard Markdown practice).
-            num_match = _numbered_pat.match(line)
-            if num_match:
-                _list_counter += 1
-                item_text = line[num_match.end():]
-                prefix = f"{_list_counter}. "
-                self.thread_text.insert(tk.END, prefix, 'numbered')
-                self._render_inline_markdown(item_text)
-                self.thread_text.insert(tk.END, '\n', 'numbered')
-                continue
-
-            # Any other line (blank or body text) — do NOT reset the counter.
-            # Body text, quotes, and blank lines sitting between numbered items
-            # are common in AI output and must not break the sequence.
-            # The counter only resets on structural Markdown elements (headers,
-            # bullets) which are handled above with their own explicit resets.
-
-            # Process bold and italic inline
-            self._render_inline_markdown(line)
-            self.thread_text.insert(tk.END, '\n', 'normal')
-    
-    def _render_inline_markdown(self, line: str):
+        The markdown is parsed once into a cached display model
+        (thread_viewer_render.parse_markdown_model) and inserted as
+        multi-run inserts rather than one insert per fragment.
         """
-        Render inline markdown (bold, italic, underline) in a line of text.
-
-        Handles: **bold**, *italic*, <u>underline</u>
-        """
-        # Pattern: **bold**, *italic*, or <u>underline</u>
-        # Negative lookahead/lookbehind on the italic pattern ensures a lone *
-        # never steals a character from a ** bold ** pair.
-        combined_pattern = r'((?<![a-zA-Z0-9])\*\*(.*?)\*\*(?![a-zA-Z0-9])|\*(?!\*|\s)((?:(?!\*\*).)*?)(?<!\s|\*)\*(?!\*)|<u>(.*?)</u>)'
-
-        current_pos = 0
-        matches = list(re.finditer(combined_pattern, line))
-
-        if matches:
-            for match in matches:
-                # Insert text before the match
-                if match.start() > current_pos:
-                    self.thread_text.insert(tk.END, line[current_pos:match.start()], 'normal')
-
-                # Insert the formatted text
-                if match.group(0).startswith('**'):
-                    self.thread_text.insert(tk.END, match.group(2), 'bold')
-                elif match.group(0).startswith('<u>'):
-                    self.thread_text.insert(tk.END, match.group(4), 'underline')
-                else:
-                    self.thread_text.insert(tk.END, match.group(3), 'italic')
-
-                current_pos = match.end()
-
-            # Insert remaining text
-            if current_pos < len(line):
-                self.thread_text.insert(tk.END, line[current_pos:], 'normal')
-        else:
-            # No markdown formatting, just insert the line
-            self.thread_text.insert(tk.END, line, 'normal')
+        pairs = []
+        for run in parse_markdown_model(content):
+            kind = run[0]
+            if kind == "text":
+                pairs.extend((run[1], run[2]))
+            elif kind == "ts_link":
+                seconds = self._ts_to_seconds(run[1])
+                pairs.extend(self._seek_link_pairs(
+                    f"\u25b6 Jump to {self._fmt_seek_time(seconds)}", seconds, bold=True))
+                pairs.extend(('\n', 'normal'))
+            elif kind == "src_link":
+                result = self._find_entry_for_text(run[1])
+                if result is None:
+                    continue  # No match — silently omit
+                seconds = result[1]
+                pairs.extend(self._seek_link_pairs(
+                    f"\u25b6 Jump to {self._fmt_seek_time(seconds)}", seconds, bold=True))
+                pairs.extend(('\n', 'normal'))
+        if pairs:
+            self.thread_text.insert(tk.END, *pairs)
     
     # ------------------------------------------------------------------
     # Audio seek links  ([SOURCE: "..."] markers in AI output)
@@ -169,55 +77,33 @@ class MarkdownMixin:
           2. Word-overlap scoring as a fuzzy fallback (>=40% of significant
              words, length 4+, must overlap).
 
+        Lookups go through a SourceLinkIndex built once per entries list.
+
         Returns (entry_index, start_seconds) or None.
         """
         entries = getattr(self, 'current_entries', None)
         if not entries or not search_text:
             return None
 
-        # Strip leading timestamp prefixes that the AI may have copied verbatim
-        # from the formatted transcript (e.g. "[00:02] But the problem is...")
-        # so they don't prevent an exact match against raw entry text.
-        search_text_stripped = re.sub(r'^\[\d+:\d{2}(?::\d{2})?\]\s*', '', search_text.strip())
-        search_clean = re.sub(r'\s+', ' ', search_text_stripped.lower())
-
-        # Build (starting_entry_index, window_text) pairs for 1-, 2-, 3-entry windows
-        windows = []
-        for i, entry in enumerate(entries):
-            t0 = entry.get('text', '').strip().lower()
-            windows.append((i, t0))
-            if i + 1 < len(entries):
-                windows.append((i, t0 + ' ' + entries[i + 1].get('text', '').strip().lower()))
-            if i + 2 < len(entries):
-                windows.append((i, t0 + ' '
-                                + entries[i + 1].get('text', '').strip().lower() + ' '
-                                + entries[i + 2].get('text', '').strip().lower()))
-
-        # Pass 1: exact substring match
-        for idx, window_text in windows:
-            if search_clean in window_text or window_text in search_clean:
-                return (idx, entries[idx].get('start', 0.0))
-
-        # Pass 2: word-overlap scoring (words 4+ chars only)
-        search_words = set(re.findall(r'\b\w{4,}\b', search_clean))
-        if len(search_words) < 2:
+        idx = self._source_link_index(entries).lookup(search_text)
+        if idx is None:
             return None
+        return (idx, entries[idx].get('start', 0.0))
 
-        best_score = 0.0
-        best_idx = -1
-        for idx, window_text in windows:
-            window_words = set(re.findall(r'\b\w{4,}\b', window_text))
-            if not window_words:
-                continue
-            score = len(search_words & window_words) / len(search_words)
-            if score > best_score:
-                best_score = score
-                best_idx = idx
-
-        if best_score >= 0.4 and best_idx >= 0:
-            return (best_idx, entries[best_idx].get('start', 0.0))
+    def _source_link_index(self, entries: list) -> SourceLinkIndex:
+        """
+        Return the SourceLinkIndex for entries, rebuilding it when the
+        entries list has been replaced (every edit path assigns a new list)
+        or invalidated via _invalidate_source_link_index().
+        """
+        index = getattr(self, '_source_index', None)
+        if index is None or index.entries is not entries or index.count != len(entries):
+            index = self._source_index = SourceLinkIndex(entries)
+        return index
 
-        return None
+    def _invalidate_source_link_index(self):
+        """Drop the cached SourceLinkIndex (entries were edited in place)."""
+        self._source_index = None
 
     @staticmethod
     def _fmt_seek_time(seconds: float) -> str:
@@ -227,99 +113,51 @@ class MarkdownMixin:
             return f"{s // 3600}:{(s % 3600) // 60:02d}:{s % 60:02d}"
         return f"{s // 60:02d}:{s % 60:02d}"
 
-    def _render_timestamp_seek_link(self, ts_str: str):
+    def _ensure_seek_link_tags(self):
         """
-        Resolve a [SOURCE: MM:SS] marker to a direct seek link.
+        Configure the shared seek-link styles and bind their events once.
 
-        Unlike _render_source_seek_link (which searches entries for matching
-        text), this converts the timestamp string directly to seconds and
-        renders a clickable \u25b6 Jump to MM:SS link.  No entry lookup needed.
-
-        This is the preferred mechanism for local AI models since copying
-        a timestamp token is far more reliable than reproducing exact sentences.
+        Every link carries a unique seek_N tag (recorded in _seek_locations)
+        plus one of the shared styling tags, so rendering thousands of
+        timestamps needs no per-link tag_config / tag_bind calls.
         """
-        seconds = self._ts_to_seconds(ts_str)
-        time_str = self._fmt_seek_time(seconds)
-        link_text = f"\u25b6 Jump to {time_str}"
-
-        if not hasattr(self, '_seek_locations'):
-            self._seek_locations = []
-
-        seek_idx = len(self._seek_locations)
-        tag_name = f"seek_{seek_idx}"
-
         font_size = self._get_font_size()
-        self.thread_text.tag_config(
-            tag_name,
-            foreground='#1565C0',
-            underline=True,
-            font=('Arial', font_size, 'bold'),
-        )
-        self.thread_text.insert(tk.END, link_text, (tag_name,))
-        self.thread_text.insert(tk.END, '\n', 'normal')
-
-        self._seek_locations.append((tag_name, seconds))
-
-        self.thread_text.tag_bind(
-            tag_name, "<Button-1>",
-            lambda e, s=seconds: self._on_seek_link_click(s)
-        )
-        self.thread_text.tag_bind(
-            tag_name, "<Enter>",
-            lambda e: self.thread_text.config(cursor="hand2")
-        )
-        self.thread_text.tag_bind(
-            tag_name, "<Leave>",
-            lambda e: self.thread_text.config(cursor="")
-        )
-
-    def _render_source_seek_link(self, search_text: str):
-        """
-        Resolve a [SOURCE: "..."] marker to an audio timestamp and insert a
-        clickable seek link (e.g. "\u25b6 Jump to 01:23") into the text widget.
-
-        If no entry matches the search_text the marker is silently omitted,
-        keeping the summary clean even when the model quotes imprecisely.
-        """
-        result = self._find_entry_for_text(search_text)
-        if result is None:
-            return  # No match — silently omit
-
-        entry_idx, start_seconds = result
-        time_str = self._fmt_seek_time(start_seconds)
-        link_text = f"\u25b6 Jump to {time_str}"
-
+        self.thread_text.tag_config('seek_link', foreground='#1565C0', underline=True,
+                                    font=('Arial', font_size, 'bold'))
+        self.thread_text.tag_config('seek_link_plain', foreground='#1565C0', underline=True,
+                                    font=('Arial', font_size))
+        if getattr(self, '_seek_tags_bound', False):
+            return
+        for tag in ('seek_link', 'seek_link_plain'):
+            self.thread_text.tag_bind(tag, "<Button-1>", self._on_seek_tag_click)
+            self.thread_text.tag_bind(
+                tag, "<Enter>", lambda e: self.thread_text.config(cursor="hand2"))
+            self.thread_text.tag_bind(
+                tag, "<Leave>", lambda e: self.thread_text.config(cursor=""))
+        self._seek_tags_bound = True
+
+    def _seek_link_pairs(self, link_text: str, seconds: float, bold: bool) -> tuple:
+        """Register a seek link and return its (text, tags) insert pair."""
         if not hasattr(self, '_seek_locations'):
             self._seek_locations = []
+        if not hasattr(self, '_seek_seconds'):
+            self._seek_seconds = {}
+        if not self._seek_locations:
+            self._ensure_seek_link_tags()
 
-        seek_idx = len(self._seek_locations)
-        tag_name = f"seek_{seek_idx}"
-
-        font_size = self._get_font_size()
-        self.thread_text.tag_config(
-            tag_name,
-            foreground='#1565C0',
-            underline=True,
-            font=('Arial', font_size, 'bold'),
-        )
-        self.thread_text.insert(tk.END, link_text, (tag_name,))
-        self.thread_text.insert(tk.END, '\n', 'normal')
-
-        self._seek_locations.append((tag_name, start_seconds))
+        tag_name = f"seek_{len(self._seek_locations)}"
+        self._seek_locations.append((tag_name, seconds))
+        self._seek_seconds[tag_name] = seconds
+        return (link_text, (tag_name, 'seek_link' if bold else 'seek_link_plain'))
 
-        # Bind click: seek to position and auto-start playback
-        self.thread_text.tag_bind(
-            tag_name, "<Button-1>",
-            lambda e, s=start_seconds: self._on_seek_link_click(s)
-        )
-        self.thread_text.tag_bind(
-            tag_name, "<Enter>",
-            lambda e: self.thread_text.config(cursor="hand2")
-        )
-        self.thread_text.tag_bind(
-            tag_name, "<Leave>",
-            lambda e: self.thread_text.config(cursor="")
-        )
+    def _on_seek_tag_click(self, event):
+        """Resolve the clicked seek_N tag to its time and seek there."""
+        index = self.thread_text.index(f"@{event.x},{event.y}")
+        for tag in self.thread_text.tag_names(index):
+            seconds = getattr(self, '_seek_seconds', {}).get(tag)
+            if seconds is not None:
+                self._on_seek_link_click(seconds)
+                return
 
     def _on_seek_link_click(self, seconds: float):
         """
@@ -473,15 +311,7 @@ class MarkdownMixin:
         Convert a MM:SS or HH:MM:SS string to a float number of seconds.
         Used when making source-document timestamps clickable.
         """
-        parts = ts_str.split(':')
-        try:
-            if len(parts) == 2:
-                return int(parts[0]) * 60 + int(parts[1])
-            elif len(parts) == 3:
-                return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-        except (ValueError, IndexError):
-            pass
-        return 0.0
+        return ts_to_seconds(ts_str)
 
     def _insert_source_text_with_seek_links(self, text: str) -> None:
         """
@@ -499,57 +329,15 @@ class MarkdownMixin:
         Falls back to a plain source_text insert if anything goes wrong so
         the viewer is never left blank.
         """
-        import re
-        TS_PAT = re.compile(r'\[(\d{1,2}:\d{2}(?::\d{2})?)\]')
-
-        if not hasattr(self, '_seek_locations'):
-            self._seek_locations = []
-
-        font_size = self._get_font_size()
-        last_end = 0
-
         try:
-            for m in TS_PAT.finditer(text):
-                # Plain text before this timestamp
-                before = text[last_end:m.start()]
-                if before:
-                    self.thread_text.insert(tk.END, before, 'source_text')
-
-                ts_str  = m.group(1)
-                seconds = self._ts_to_seconds(ts_str)
-                link_text = f'[{ts_str}]'
-
-                seek_idx = len(self._seek_locations)
-                tag_name = f'seek_{seek_idx}'
-
-                self.thread_text.tag_config(
-                    tag_name,
-                    foreground='#1565C0',
-                    underline=True,
-                    font=('Arial', font_size),
-                )
-                self.thread_text.insert(tk.END, link_text, (tag_name,))
-                self._seek_locations.append((tag_name, seconds))
-
-                self.thread_text.tag_bind(
-                    tag_name, '<Button-1>',
-                    lambda e, s=seconds: self._on_seek_link_click(s)
-                )
-                self.thread_text.tag_bind(
-                    tag_name, '<Enter>',
-                    lambda e: self.thread_text.config(cursor='hand2')
-                )
-                self.thread_text.tag_bind(
-                    tag_name, '<Leave>',
-                    lambda e: self.thread_text.config(cursor='')
-                )
-
-                last_end = m.end()
-
-            # Any remaining text after the last timestamp
-            remainder = text[last_end:]
-            if remainder:
-                self.thread_text.insert(tk.END, remainder, 'source_text')
+            pairs = []
+            for run in parse_source_model(text):
+                if run[0] == "seek":
+                    pairs.extend(self._seek_link_pairs(run[1], run[2], bold=False))
+                else:
+                    pairs.extend((run[1], run[2]))
+            if pairs:
+                self.thread_text.insert(tk.END, *pairs)
 
         except Exception:
             # Safety fallback: plain insert so viewer is never blank
@@ -577,6 +365,7 @@ class MarkdownMixin:
         
         # Store URL positions and cleaned URLs
         self.url_locations = []
+        markdown_spans = []  # (start, end) character offsets of markdown links
         
         # Find Markdown-style links
         for match in re.finditer(markdown_pattern, content):
@@ -591,6 +380,7 @@ class MarkdownMixin:
             self.thread_text.tag_add("hyperlink", start_pos, end_pos)
             # Store for click handling
             self.url_locations.append((start_pos, end_pos, clean_url))
+            markdown_spans.append((match.start(), match.end()))
         
         # Find plain URLs (that aren't part of markdown links)
         for match in re.finditer(plain_url_pattern, content):
@@ -602,13 +392,12 @@ class MarkdownMixin:
             start_pos = f"1.0+{match.start()}c"
             end_pos = f"1.0+{match.start() + len(url)}c"
             
-            # Check if this URL is already tagged (part of a markdown link)
-            already_tagged = False
-            for existing_start, existing_end, _ in self.url_locations:
-                if (self.thread_text.compare(start_pos, ">=", existing_start) and 
-                    self.thread_text.compare(end_pos, "<=", existing_end)):
-                    already_tagged = True
-                    break
+            # Check if this URL is already tagged (part of a markdown link).
+            # Compared on character offsets — a Tcl compare per pair is
+            # quadratic in the number of links on long documents.
+            url_end = match.start() + len(url)
+            already_tagged = any(span_start <= match.start() and url_end <= span_end
+                                 for span_start, span_end in markdown_spans)
             
             if not already_tagged:
                 # Tag the URL
@@ -0,0 +1,624 @@
+"""
+thread_viewer_render.py - Display model and progressive text widget for ThreadViewerWindow
+
+Rendering a multi-hour transcript or a long thread used to mean thousands
+of individual Text.insert / tag_config / tag_bind calls, each a round
+trip into Tcl, on every mode switch, expand/collapse and edit.  This
+module splits that work in two:
+
+  * Display model - markdown and timestamped source text are parsed once
+    into a flat tuple of runs and cached by content (parse_markdown_model,
+    parse_source_model).  Re-rendering the same message costs no regex work.
+
+  * ProgressiveText - a ScrolledText that buffers END inserts during a
+    render batch and writes them as multi-run inserts (one Tcl call per
+    few hundred runs).  The first PROGRESSIVE_SYNC_CHARS (the visible
+    region plus a generous margin) are inserted immediately; the rest is
+    streamed in idle-time batches so the window stays responsive.
+
+Any call that reads or positions content (get, index, search, tag_add,
+mark_set, ...) first flushes whatever is still pending, so existing code
+that inspects the widget always sees the full document.
+
+Tk's Text widget has no true virtual-scrolling mode (and find, copy, save
+and edit all operate on the widget contents), so "windowing" here means
+front-loading the visible region rather than never inserting the rest.
+"""
+
+import re
+import tkinter as tk
+from tkinter import scrolledtext
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+
+
+PROGRESSIVE_SYNC_CHARS  = 60_000   # Inserted before the render call returns
+PROGRESSIVE_BATCH_CHARS = 40_000   # Per idle-time batch after that
+RUNS_PER_INSERT         = 400      # Text/tag pairs per Tcl insert call
+MODEL_CACHE_SIZE        = 256      # Parsed messages/sources kept in memory
+
+
+# ============================================================
+# DISPLAY MODEL
+# ============================================================
+# A model is a tuple of runs:
+#   ("text", text, tag)        plain text with a single style tag
+#   ("ts_link", "14:23")       [SOURCE: 14:23]  -> "▶ Jump to" link line
+#   ("src_link", "sentence")   [SOURCE: "..."] -> resolved against entries
+#   ("seek", "[12:34]", secs)  inline timestamp link in source text
+
+_SOURCE_TS_PAT = re.compile(
+    r'\[SOURCE:\s*(\d{1,2}:\d{2}(?::\d{2})?)\s*\]',
+    re.IGNORECASE
+)
+_SOURCE_SENT_PAT = re.compile(
+    r'\[SOURCE:\s*["‘’“”\'](.+?)["‘’“”\']\]',
+    re.IGNORECASE
+)
+# Numbered list item: leading digits, period, space  e.g. "1. " or "12. "
+_NUMBERED_PAT = re.compile(r'^\s*\d+\.\s+')
+# Pattern: **bold**, *italic*, or <u>underline</u>
+# Negative lookahead/lookbehind on the italic pattern ensures a lone *
+# never steals a character from a ** bold ** pair.
+_INLINE_PAT = re.compile(
+    r'((?<![a-zA-Z0-9])\*\*(.*?)\*\*(?![a-zA-Z0-9])|\*(?!\*|\s)((?:(?!\*\*).)*?)(?<!\s|\*)\*(?!\*)|<u>(.*?)</u>)'
+)
+_SOURCE_TIMESTAMP_PAT = re.compile(r'\[(\d{1,2}:\d{2}(?::\d{2})?)\]')
+
+
+def ts_to_seconds(ts_str: str) -> float:
+    """Convert a MM:SS or HH:MM:SS string to seconds (0.0 if malformed)."""
+    parts = ts_str.split(':')
+    try:
+        if len(parts) == 2:
+            return int(parts[0]) * 60 + int(parts[1])
+        elif len(parts) == 3:
+            return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+    except (ValueError, IndexError):
+        pass
+    return 0.0
+
+
+def _inline_runs(line: str, runs: list):
+    """Append runs for inline markdown (bold, italic, underline) in one line."""
+    current_pos = 0
+    for match in _INLINE_PAT.finditer(line):
+        if match.start() > current_pos:
+            runs.append(("text", line[current_pos:match.start()], 'normal'))
+        if match.group(0).startswith('**'):
+            runs.append(("text", match.group(2), 'bold'))
+        elif match.group(0).startswith('<u>'):
+            runs.append(("text", match.group(4), 'underline'))
+        else:
+            runs.append(("text", match.group(3), 'italic'))
+        current_pos = match.end()
+    if current_pos < len(line):
+        runs.append(("text", line[current_pos:], 'normal'))
+
+
+@lru_cache(maxsize=MODEL_CACHE_SIZE)
+def parse_markdown_model(content: str) -> Tuple[tuple, ...]:
+    """
+    Parse AI-response markdown into display runs.
+    Supports: **bold**, *italic*, <u>underline</u>, # headers, bullets,
+    numbered lists, and [SOURCE: ...] seek-link markers.
+    """
+    runs = []
+
+    # Auto-incrementing counter for numbered lists.
+    # Resets whenever a non-numbered-list line is encountered (blank lines
+    # between items are fine — blank lines don't reset the counter).
+    list_counter = 0
+    last_was_heading = False   # suppress blank line immediately after a heading
+
+    for line in content.split('\n'):
+        # New-style: [SOURCE: 14:23] — direct timestamp lookup (fast, local-AI friendly)
+        ts_match = _SOURCE_TS_PAT.search(line)
+        if ts_match:
+            list_counter = 0
+            last_was_heading = False
+            runs.append(("ts_link", ts_match.group(1)))
+            continue
+
+        # Old-style: [SOURCE: "sentence"] — verbatim text search (cloud AI)
+        source_match = _SOURCE_SENT_PAT.search(line)
+        if source_match:
+            list_counter = 0
+            last_was_heading = False
+            runs.append(("src_link", source_match.group(1)))
+            continue
+
+        # Suppress blank lines that immediately follow a heading — they
+        # create an unwanted gap between the heading and its body text.
+        if not line.strip() and last_was_heading:
+            continue
+
+        # Headers: # Header or ## Header
+        if line.strip().startswith('#'):
+            list_counter = 0
+            last_was_heading = True
+            runs.append(("text", line.lstrip('# ').strip() + '\n', 'header'))
+            continue
+
+        last_was_heading = False
+
+        # Bullets: - item or * item
+        if line.strip().startswith(('- ', '* ')):
+            list_counter = 0
+            runs.append(("text", '• ' + line.strip()[2:] + '\n', 'bullet'))
+            continue
+
+        # Numbered list items: "1. text", "2. text", etc.
+        # Auto-increment so items always display in order even when the AI
+        # outputs all items as "1." (standard Markdown practice).
+        num_match = _NUMBERED_PAT.match(line)
+        if num_match:
+            list_counter += 1
+            runs.append(("text", f"{list_counter}. ", 'numbered'))
+            _inline_runs(line[num_match.end():], runs)
+            runs.append(("text", '\n', 'numbered'))
+            continue
+
+        # Any other line (blank or body text) — do NOT reset the counter.
+        # Body text, quotes, and blank lines sitting between numbered items
+        # are common in AI output and must not break the sequence.
+        _inline_runs(line, runs)
+        runs.append(("text", '\n', 'normal'))
+
+    return tuple(runs)
+
+
+@lru_cache(maxsize=MODEL_CACHE_SIZE)
+def parse_source_model(text: str) -> Tuple[tuple, ...]:
+    """Split source-document text into plain runs and [MM:SS] seek-link runs."""
+    runs = []
+    last_end = 0
+    for m in _SOURCE_TIMESTAMP_PAT.finditer(text):
+        if m.start() > last_end:
+            runs.append(("text", text[last_end:m.start()], 'source_text'))
+        runs.append(("seek", f'[{m.group(1)}]', ts_to_seconds(m.group(1))))
+        last_end = m.end()
+    if last_end < len(text):
+        runs.append(("text", text[last_end:], 'source_text'))
+    return tuple(runs)
+
+
+# ============================================================
+# SOURCE LINK INDEX
+# ============================================================
+
+_WORD_PAT = re.compile(r'\b\w{4,}\b')
+_SRC_PREFIX_PAT = re.compile(r'^\[\d+:\d{2}(?::\d{2})?\]\s*')
+_PREFIX_LEN = 8
+
+
+class SourceLinkIndex:
+    """
+    Resolves [SOURCE: "..."] quotes to transcript entries.
+
+    Built once per entries list.  Gives the same answers as scanning every
+    1-, 2- and 3-entry window of consecutive entries, but from:
+      * one joined corpus string (a quote inside a window is an occurrence
+        in the corpus spanning at most three entries),
+      * a prefix table of entry texts (an entry inside the quote), and
+      * an inverted word index for the fuzzy word-overlap fallback.
+    """
+
+    def __init__(self, entries: list):
+        self.entries = entries
+        self.count = len(entries)
+        texts = [(e.get('text') or '').strip().lower() for e in entries]
+        self._starts = []
+        pos = 0
+        for t in texts:
+            self._starts.append(pos)
+            pos += len(t) + 1
+        self._corpus = ' '.join(texts)
+
+        self._short = {}     # whole text (shorter than _PREFIX_LEN) -> first entry
+        self._long = {}      # first _PREFIX_LEN chars -> [(entry, text), ...]
+        self._postings = {}  # word -> [entry, ...] ascending
+        for i, t in enumerate(texts):
+            if not t:
+                continue
+            if len(t) < _PREFIX_LEN:
+                self._short.setdefault(t, i)
+            else:
+                self._long.setdefault(t[:_PREFIX_LEN], []).append((i, t))
+            for word in set(_WORD_PAT.findall(t)):
+                self._postings.setdefault(word, []).append(i)
+
+    def lookup(self, search_text: str) -> Optional[int]:
+        """Index of the best-matching entry for search_text, or None."""
+        if not self.entries or not search_text:
+            return None
+        search = _SRC_PREFIX_PAT.sub('', search_text.strip())
+        search = re.sub(r'\s+', ' ', search.lower())
+        if not search:
+            return None
+
+        exact = self._exact(search)
+        if exact is not None:
+            return exact
+        return self._fuzzy(search)
+
+    def _entry_at(self, offset: int) -> int:
+        return bisect_right(self._starts, offset) - 1
+
+    def _exact(self, search: str) -> Optional[int]:
+        best = None
+
+        # Quote inside a window: it must span at most three entries, and the
+        # first window containing entries a..b starts at max(0, b - 2).
+        corpus, n = self._corpus, len(search)
+        pos = corpus.find(search)
+        while pos != -1:
+            first = self._entry_at(pos)
+            last = self._entry_at(pos + n - 1)
+            if last - first <= 2:
+                best = max(0, last - 2)
+                break  # Later occurrences can only start later windows
+            pos = corpus.find(search, pos + 1)
+
+        # Window inside the quote: holds whenever its first entry is inside
+        # the quote, so find the earliest entry whose text occurs in it.
+        short, long_ = self._short, self._long
+        for p in range(len(search)):
+            if best == 0:
+                break
+            for k in range(1, min(_PREFIX_LEN, len(search) - p + 1)):
+                i = short.get(search[p:p + k])
+                if i is not None and (best is None or i < best):
+                    best = i
+            for i, text in long_.get(search[p:p + _PREFIX_LEN], ()):
+                if best is not None and i >= best:
+                    break
+                if search.startswith(text, p):
+                    best = i
+                    break
+        return best
+
+    def _fuzzy(self, search: str) -> Optional[int]:
+        search_words = set(_WORD_PAT.findall(search))
+        if len(search_words) < 2:
+            return None
+
+        # Score each window start by how many search words its 1-, 2- or
+        # 3-entry windows contain; only windows touching a hit can score.
+        last = self.count - 1
+        scores = {}
+        for word in search_words:
+            windows = set()
+            for e in self._postings.get(word, ()):
+                for i in range(max(0, e - 2), e + 1):
+                    for size in range(e - i + 1, 4):
+                        if i + size - 1 <= last:
+                            windows.add((i, size))
+            for w in windows:
+                scores[w] = scores.get(w, 0) + 1
+        if not scores:
+            return None
+
+        top = max(scores.values())
+        if top / len(search_words) < 0.4:
+            return None
+        return min(i for (i, _size), score in scores.items() if score == top)
+
+
+# ============================================================
+# TK CHARACTER COUNTS
+# ============================================================
+# Tk 8.6 stores text as UTF-16, so a character above U+FFFF (the emoji in
+# the "🧑 YOU" / "🤖 AI" headers) is two characters in "line.col" indices
+# and "+Nc" arithmetic, while Python counts it as one.
+
+_ASTRAL_PAT = re.compile('[\U00010000-\U0010FFFF]')
+_tk_surrogates: Optional[bool] = None
+
+
+def tk_counts_surrogates() -> bool:
+    """True if this Tk counts non-BMP characters as two (Tk 8.6)."""
+    global _tk_surrogates
+    if _tk_surrogates is None:
+        try:
+            _tk_surrogates = tk.Tcl().eval('string length "\U0001F9D1"') == "2"
+        except tk.TclError:
+            _tk_surrogates = tk.TkVersion < 9.0
+    return _tk_surrogates
+
+
+def tk_len(text: str) -> int:
+    """len(text) as Tk counts characters."""
+    if text.isascii() or not tk_counts_surrogates():
+        return len(text)
+    return len(text) + len(_ASTRAL_PAT.findall(text))
+
+
+# ============================================================
+# FIND INDEX
+# ============================================================
+
+class TextIndex:
+    """
+    In-Python mirror of a Text widget's contents for searching.
+
+    Holds the text and the offset at which each line starts, so a match
+    offset maps to a Tk "line.col" index with one bisect instead of a
+    Tcl round-trip per match.  Offsets are Python string offsets; columns
+    are in Tk characters (see tk_len).
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.folded = text.lower()
+        starts = [0]
+        pos = text.find("\n")
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = text.find("\n", pos + 1)
+        self._line_starts = starts
+        # Offsets of characters Tk counts twice (empty on Tk 9 / plain text)
+        if text.isascii() or not tk_counts_surrogates():
+            self._wide = []
+        else:
+            self._wide = [m.start() for m in _ASTRAL_PAT.finditer(text)]
+
+    def to_index(self, offset: int) -> str:
+        """Character offset -> Tk "line.col" index."""
+        line = bisect_right(self._line_starts, offset)
+        start = self._line_starts[line - 1]
+        col = offset - start
+        if self._wide:
+            col += bisect_left(self._wide, offset) - bisect_left(self._wide, start)
+        return f"{line}.{col}"
+
+    def find_all(self, needle: str) -> List[int]:
+        """Start offsets of every case-insensitive match (overlapping)."""
+        if not needle:
+            return []
+        pattern = re.compile(f"(?={re.escape(needle)})", re.IGNORECASE)
+        return [m.start() for m in pattern.finditer(self.text)]
+
+    def refine(self, offsets: List[int], needle: str) -> List[int]:
+        """
+        Narrow the matches of a prefix of needle down to matches of needle
+        itself (as the user keeps typing), without rescanning the text.
+        """
+        folded = needle.lower()
+        n = len(needle)
+        if len(folded) != n or len(self.folded) != len(self.text):
+            return self.find_all(needle)
+        text = self.folded
+        return [o for o in offsets if text.startswith(folded, o)]
+
+    def spans(self, offsets: List[int], length: int) -> List[Tuple[str, str]]:
+        """Tk (start, end) index pairs for matches of the given length."""
+        to_index = self.to_index
+        return [(to_index(o), to_index(o + length)) for o in offsets]
+
+
+# ============================================================
+# PROGRESSIVE TEXT WIDGET
+# ============================================================
+
+def _is_end(index) -> bool:
+    return index == tk.END or str(index) == "end"
+
+
+class ProgressiveText(scrolledtext.ScrolledText):
+    """
+    ScrolledText that batches END inserts during a render.
+
+    Usage:
+        text.begin_batch()
+        ... any number of text.insert(tk.END, ...) calls ...
+        text.end_batch(on_complete=callback)
+
+    Between begin_batch() and end_batch(), inserts at END are buffered.
+    end_batch() writes the first PROGRESSIVE_SYNC_CHARS straight away and
+    schedules the remainder; on_complete runs once everything is in.
+    Inserts anywhere else, and every method that reads or positions
+    content, flush the buffer first so callers always see a complete
+    document.
+
+    capture_batch() returns the buffered runs instead of inserting them, for
+    re-rendering one region (e.g. a single exchange) in place.
+
+    Render writes leave Tk's modified flag as they found it, and end_batch()
+    clears it (the content was just replaced), so edit_modified() during a
+    background fill reports only the user's own edits.
+    """
+
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self._batching = False
+        self._capturing = False
+        self._pending: List = []          # flat [text, tags, text, tags, ...]
+        self._pending_chars = 0
+        self._after_id = None
+        self._on_complete: Optional[Callable] = None
+
+    # ── Batch control ─────────────────────────────────────────────────────
+
+    @property
+    def render_pending(self) -> bool:
+        return self._batching or bool(self._pending)
+
+    def begin_batch(self, capture: bool = False):
+        """
+        Start buffering END inserts (cancels any unfinished render).
+        With capture=True the runs are collected for capture_batch() and
+        the render code must not read the widget meanwhile.
+        """
+        self.cancel_pending()
+        self._batching = True
+        self._capturing = capture
+
+    def end_batch(self, on_complete: Optional[Callable] = None,
+                  sync_chars: Optional[int] = None):
+        """
+        Insert the buffered runs: sync_chars (default PROGRESSIVE_SYNC_CHARS)
+        now, the rest in the background.
+        """
+        self._batching = False
+        self._capturing = False
+        self._on_complete = on_complete
+        self._write_pending(PROGRESSIVE_SYNC_CHARS if sync_chars is None else sync_chars)
+        self.edit_modified(False)
+        if self._pending:
+            self._after_id = self.after(1, self._write_next_batch)
+        else:
+            self._complete()
+
+    def capture_batch(self) -> List:
+        """Stop buffering and return the buffered [text, tags, ...] pairs."""
+        self._batching = False
+        self._capturing = False
+        runs, self._pending, self._pending_chars = self._pending, [], 0
+        return runs
+
+    def insert_runs(self, index, runs: List):
+        """Insert [text, tags, text, tags, ...] pairs at index, chunked per Tcl call."""
+        step = RUNS_PER_INSERT * 2
+        index = super().index(index)
+        for i in range(0, len(runs), step):
+            chunk = runs[i:i + step]
+            super().insert(index, *chunk)
+            index = super().index(f"{index}+{sum(tk_len(t) for t in chunk[::2])}c")
+
+    def flush(self):
+        """Insert everything still pending, synchronously."""
+        if self._batching:
+            # The render itself is reading (e.g. setting a mark at END):
+            # write what it has produced so far and keep collecting.
+            # A capture has no place in the widget yet, so leave it be.
+            if not self._capturing:
+                self._write_pending(None)
+            return
+        if self._pending:
+            if self._after_id is not None:
+                self.after_cancel(self._after_id)
+                self._after_id = None
+            self._write_pending(None)
+            self._complete()
+
+    def cancel_pending(self):
+        """Drop anything not yet inserted (the content is being replaced)."""
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        self._batching = False
+        self._capturing = False
+        self._pending = []
+        self._pending_chars = 0
+        self._on_complete = None
+
+    def _write_pending(self, max_chars: Optional[int]):
+        """Insert up to max_chars of pending runs (all of them if None)."""
+        if not self._pending:
+            return
+        if max_chars is None or max_chars >= self._pending_chars:
+            take = len(self._pending)
+        else:
+            take, chars = 0, 0
+            while take < len(self._pending) and chars < max_chars:
+                chars += len(self._pending[take])
+                take += 2
+        chunk, self._pending = self._pending[:take], self._pending[take:]
+        self._pending_chars -= sum(len(t) for t in chunk[::2])
+        was_modified = self.edit_modified()
+        step = RUNS_PER_INSERT * 2
+        for i in range(0, len(chunk), step):
+            super().insert(tk.END, *chunk[i:i + step])
+        if not was_modified:
+            self.edit_modified(False)
+
+    def _write_next_batch(self):
+        self._after_id = None
+        self._write_pending(PROGRESSIVE_BATCH_CHARS)
+        if self._pending:
+            self._after_id = self.after(1, self._write_next_batch)
+        else:
+            self._complete()
+
+    def _complete(self):
+        callback, self._on_complete = self._on_complete, None
+        if callback:
+            callback()
+
+    # ── Overrides ─────────────────────────────────────────────────────────
+
+    def insert(self, index, chars, *args):
+        if self._batching and _is_end(index):
+            if not args:
+                args = ("",)
+            # Normalise to strict text/tags pairs
+            pairs = [chars, args[0]] + list(args[1:])
+            if len(pairs) % 2:
+                pairs.append("")
+            self._pending.extend(pairs)
+            self._pending_chars += sum(len(t) for t in pairs[::2])
+            return
+        self.flush()
+        return super().insert(index, chars, *args)
+
+    def delete(self, index1, index2=None):
+        self.flush()
+        return super().delete(index1, index2)
+
+    def get(self, index1, index2=None):
+        self.flush()
+        return super().get(index1, index2)
+
+    def index(self, index):
+        self.flush()
+        return super().index(index)
+
+    def search(self, pattern, index, *args, **kwargs):
+        self.flush()
+        return super().search(pattern, index, *args, **kwargs)
+
+    def dump(self, *args, **kwargs):
+        self.flush()
+        return super().dump(*args, **kwargs)
+
+    def count(self, *args, **kwargs):
+        self.flush()
+        return super().count(*args, **kwargs)
+
+    def compare(self, index1, op, index2):
+        self.flush()
+        return super().compare(index1, op, index2)
+
+    def mark_set(self, markName, index):
+        self.flush()
+        return super().mark_set(markName, index)
+
+    def replace(self, index1, index2, chars, *args):
+        self.flush()
+        return super().replace(index1, index2, chars, *args)
+
+    def tag_add(self, tagName, index1, *args):
+        self.flush()
+        return super().tag_add(tagName, index1, *args)
+
+    def tag_remove(self, tagName, index1, index2=None):
+        self.flush()
+        return super().tag_remove(tagName, index1, index2)
+
+    def tag_ranges(self, tagName):
+        self.flush()
+        return super().tag_ranges(tagName)
+
+    def tag_nextrange(self, tagName, index1, index2=None):
+        self.flush()
+        return super().tag_nextrange(tagName, index1, index2)
+
+    def tag_prevrange(self, tagName, index1, index2=None):
+        self.flush()
+        return super().tag_prevrange(tagName, index1, index2)
+
+    def tag_names(self, index=None):
+        self.flush()
+        return super().tag_names(index)
@@ -308,6 +308,7 @@ class SaveMixin:
                             return
                         try:
                             self.current_entries = updated_entries
+                            self._invalidate_source_link_index()
                             from document_library import update_transcript_entries
                             update_transcript_entries(doc_id, updated_entries)
                             self._set_status(
@@ -0,0 +1,277 @@
+"""
+token_counter.py - Token counting and pre-flight cost estimates for DocAnalyser.
+
+Counts tokens per provider:
+    - OpenAI-family models use their own tiktoken BPE encoding
+      (o200k_base for GPT-4o / GPT-4.1 / GPT-5 / o-series, cl100k_base otherwise).
+    - Other providers use cl100k_base scaled by a calibration factor, since
+      their tokenizers are not published as Python packages.
+    - Without tiktoken installed, a calibrated character estimator is used
+      (ASCII text ~4 chars/token, other scripts ~1 char/token).
+
+Counts are cached in an LRU keyed by (tokenizer, text hash), so re-counting
+the same document or attachment on every run costs one hash.
+
+Usage:
+    from token_counter import count_tokens, estimate_run_cost, get_context_window
+    n = count_tokens(text, provider, model)
+    est = estimate_run_cost(provider, model, [doc_text, prompt], calls=3)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+CACHE_SIZE = 4096               # Cached (tokenizer, text) counts
+MESSAGE_OVERHEAD_TOKENS = 4     # Role / separator tokens per chat message
+DEFAULT_OUTPUT_TOKENS = 1000    # Assumed response length per AI call
+
+# Token count relative to cl100k_base for providers without a public
+# tokenizer (measured on mixed English prose).
+_CALIBRATION = {
+    "anthropic": 1.10,
+    "google": 0.95,
+    "xai": 1.00,
+    "deepseek": 1.05,
+    "ollama": 1.05,
+}
+
+# Characters per token for the fallback estimator (ASCII text)
+_CHARS_PER_TOKEN = {
+    "openai": 4.0,
+    "anthropic": 3.6,
+    "google": 4.2,
+    "xai": 4.0,
+    "deepseek": 3.8,
+    "ollama": 3.8,
+}
+_DEFAULT_CHARS_PER_TOKEN = 4.0
+
+# Context windows in tokens, matched as substrings of the model id
+# (longest match wins), then per-provider defaults.
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-5": 400_000,
+    "gpt-4.1": 1_047_576,
+    "gpt-4o": 128_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-4": 8_192,
+    "gpt-3.5": 16_385,
+    "o1": 200_000,
+    "o3": 200_000,
+    "o4": 200_000,
+    "claude": 200_000,
+    "gemini": 1_048_576,
+    "grok-4": 256_000,
+    "grok": 131_072,
+    "deepseek": 128_000,
+}
+_PROVIDER_CONTEXT_WINDOWS = {
+    "openai": 128_000,
+    "anthropic": 200_000,
+    "google": 1_048_576,
+    "xai": 131_072,
+    "deepseek": 128_000,
+    "ollama": 8_192,      # Ollama's own default num_ctx is smaller than most models allow
+}
+_DEFAULT_CONTEXT_WINDOW = 32_000
+
+# Model name prefixes that use o200k_base
+_O200K_PREFIXES = ("gpt-4o", "gpt-4.1", "gpt-4.5", "gpt-5", "o1", "o3", "o4", "chatgpt-4o")
+
+
+# ============================================================
+# TOKENIZER SELECTION
+# ============================================================
+
+def _provider_key(provider: Optional[str]) -> str:
+    """Map a UI provider name (e.g. "Anthropic (Claude)") to a short key."""
+    p = (provider or "").lower()
+    for key in ("openai", "anthropic", "google", "xai", "deepseek", "ollama"):
+        if key in p:
+            return key
+    if "gemini" in p:
+        return "google"
+    if "grok" in p:
+        return "xai"
+    if "claude" in p:
+        return "anthropic"
+    return ""
+
+
+def _encoding_name(provider_key: str, model: Optional[str]) -> str:
+    if provider_key == "openai":
+        m = (model or "").lower()
+        if m.startswith(_O200K_PREFIXES):
+            return "o200k_base"
+    return "cl100k_base"
+
+
+def get_context_window(provider: Optional[str], model: Optional[str]) -> int:
+    """Context window (tokens) for a provider/model."""
+    provider_key = _provider_key(provider)
+    if provider_key != "ollama":
+        m = (model or "").lower()
+        best, best_len = None, 0
+        for key, window in MODEL_CONTEXT_WINDOWS.items():
+            if key in m and len(key) > best_len:
+                best, best_len = window, len(key)
+        if best:
+            return best
+    return _PROVIDER_CONTEXT_WINDOWS.get(provider_key, _DEFAULT_CONTEXT_WINDOW)
+
+
+_encodings: Dict[str, object] = {}
+_encodings_lock = threading.Lock()
+
+
+def _get_encoding(name: str):
+    """Load a tiktoken encoding once; None if unavailable (e.g. offline)."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    with _encodings_lock:
+        if name not in _encodings:
+            try:
+                _encodings[name] = tiktoken.get_encoding(name)
+            except Exception as e:
+                print(f"⚠️ tiktoken encoding {name} unavailable: {e}")
+                _encodings[name] = None
+        return _encodings[name]
+
+
+# ============================================================
+# COUNTING
+# ============================================================
+
+_cache: "OrderedDict[tuple, int]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _estimate_chars(text: str, chars_per_token: float) -> int:
+    """Calibrated character estimator used when no BPE is available."""
+    non_ascii = sum(1 for c in text if ord(c) > 127) if not text.isascii() else 0
+    ascii_chars = len(text) - non_ascii
+    return int(ascii_chars / chars_per_token + non_ascii + 0.5)
+
+
+def _count_uncached(text: str, provider_key: str, encoding_name: str) -> int:
+    encoding = _get_encoding(encoding_name)
+    if encoding is not None:
+        n = len(encoding.encode(text, disallowed_special=()))
+        if provider_key != "openai":
+            n = int(n * _CALIBRATION.get(provider_key, 1.0) + 0.5)
+        return n
+    return _estimate_chars(text, _CHARS_PER_TOKEN.get(provider_key, _DEFAULT_CHARS_PER_TOKEN))
+
+
+def count_tokens(text: str, provider: Optional[str] = None,
+                 model: Optional[str] = None) -> int:
+    """
+    Count the tokens text will use with the given provider/model.
+
+    Args:
+        text: Text to count
+        provider: UI provider name (None = generic estimate)
+        model: Model id (selects the OpenAI encoding)
+
+    Returns:
+        Token count (exact for OpenAI models when tiktoken is installed)
+    """
+    if not text:
+        return 0
+    provider_key = _provider_key(provider)
+    encoding_name = _encoding_name(provider_key, model)
+    digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"),
+                             digest_size=16).digest()
+    key = (provider_key, encoding_name, TIKTOKEN_AVAILABLE, digest)
+
+    with _cache_lock:
+        n = _cache.get(key)
+        if n is not None:
+            _cache.move_to_end(key)
+            return n
+
+    n = _count_uncached(text, provider_key, encoding_name)
+
+    with _cache_lock:
+        _cache[key] = n
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return n
+
+
+def count_messages_tokens(messages: List[Dict], provider: Optional[str] = None,
+                          model: Optional[str] = None) -> int:
+    """Count tokens for a chat message list, including per-message overhead."""
+    total = 0
+    for msg in messages:
+        content = msg.get("content", "")
+        if isinstance(content, list):
+            content = "".join(part.get("text", "") for part in content
+                              if isinstance(part, dict))
+        total += count_tokens(content, provider, model) + MESSAGE_OVERHEAD_TOKENS
+    return total
+
+
+def clear_cache():
+    """Drop all cached counts."""
+    with _cache_lock:
+        _cache.clear()
+
+
+# ============================================================
+# COST ESTIMATION
+# ============================================================
+
+def estimate_run_cost(provider: str, model: str, input_texts: List[str],
+                      calls: int = 1, per_call_texts: Optional[List[str]] = None,
+                      output_tokens_per_call: int = DEFAULT_OUTPUT_TOKENS) -> Dict:
+    """
+    Estimate tokens and cost for a run before it starts.
+
+    Args:
+        provider: UI provider name
+        model: Model id
+        input_texts: Texts sent once across the run (e.g. the document,
+            however it gets chunked)
+        calls: Number of chunk calls; a multi-chunk run also makes one
+            consolidation call over the partial outputs
+        per_call_texts: Texts repeated in every call (prompt, attachments)
+        output_tokens_per_call: Assumed response size per call
+
+    Returns:
+        {'input_tokens', 'output_tokens', 'calls', 'cost'}
+    """
+    calls = max(1, calls)
+    input_tokens = sum(count_tokens(t, provider, model) for t in input_texts)
+    repeated = sum(count_tokens(t, provider, model) for t in (per_call_texts or []))
+    input_tokens += repeated * calls
+    output_tokens = output_tokens_per_call * calls
+    if calls > 1:
+        input_tokens += output_tokens + repeated
+        output_tokens += output_tokens_per_call
+        calls += 1
+
+    cost = 0.0
+    if _provider_key(provider) != "ollama":
+        from ai_handler import estimate_cost
+        cost = estimate_cost(provider, model, input_tokens, output_tokens)
+
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "calls": calls,
+        "cost": cost,
+    }
@@ -0,0 +1,435 @@
+"""
+transcode_service.py - Shared ffmpeg transcode pool for the transcript player.
+
+pygame can only stream a few formats reliably, so .m4a/.aac/.wma audio and
+video containers are converted to a small MP3 before playback.  This module
+owns those conversions:
+
+    - A bounded pool of worker threads, each running one ffmpeg process, fed
+      from a priority queue.  The file the user is opening right now
+      (PRIORITY_INTERACTIVE) jumps ahead of pre-conversions queued after
+      transcription (PRIORITY_BACKGROUND); re-submitting a queued file at a
+      higher priority promotes it.
+    - Outputs live in PLAYBACK_CACHE_DIR, named by an audio fingerprint, and
+      are indexed by cache_manager (kind "playback") so they are evicted with
+      the other caches instead of piling up beside the user's files.
+    - Interactive jobs first produce a short head chunk (HEAD_SECONDS of
+      audio) so the player can start while the full conversion continues.
+      Progress is reported from ffmpeg's -progress output.
+
+Callbacks run on worker threads; Tk callers should marshal with after().
+
+Usage:
+    import transcode_service as ts
+    path = ts.find_playback_file(source)         # ready-made conversion or None
+    job = ts.submit(source, ts.PRIORITY_INTERACTIVE,
+                    on_progress=..., on_chunk=..., on_done=...)
+
+Author: DocAnalyser Development Team
+"""
+
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import cache_manager
+from config import PLAYBACK_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+PRIORITY_INTERACTIVE = 0    # The file the user is opening
+PRIORITY_BACKGROUND = 10    # Pre-conversion after a transcription
+
+MAX_WORKERS = max(1, min(2, os.cpu_count() or 1))
+HEAD_SECONDS = 90           # Length of the quick first chunk
+FFMPEG_TIMEOUT_S = 900      # Kill a conversion that runs longer than this
+
+_SAMPLE_BYTES = 1 << 20     # Fingerprint reads this much at 3 points of the file
+
+# Same settings the player has always used: small, pygame-friendly MP3
+_ENCODE_ARGS = ['-vn', '-acodec', 'libmp3lame', '-q:a', '4', '-ar', '44100', '-f', 'mp3']
+
+
+# ============================================================
+# FFMPEG
+# ============================================================
+
+def _find_tool(name: str) -> str:
+    """Bundled tool (via dependency_checker.find_ffmpeg) if present, else PATH."""
+    try:
+        from dependency_checker import find_ffmpeg
+        ok, path, _ = find_ffmpeg()
+        if ok and path:
+            for candidate in (os.path.join(path, name + '.exe'), os.path.join(path, name)):
+                if os.path.isfile(candidate):
+                    return candidate
+    except Exception:
+        pass
+    return name
+
+
+def get_ffmpeg_cmd() -> str:
+    """Path to the ffmpeg executable (bundled tools first, then PATH)."""
+    return _find_tool('ffmpeg')
+
+
+def get_ffprobe_cmd() -> str:
+    """Path to the ffprobe executable (same directory as ffmpeg)."""
+    return _find_tool('ffprobe')
+
+
+def _subprocess_kwargs() -> Dict:
+    """Keep ffmpeg's console window hidden on Windows."""
+    if sys.platform == "win32":
+        return {"creationflags": subprocess.CREATE_NO_WINDOW}
+    return {}
+
+
+def probe_duration(path: str) -> float:
+    """Duration in seconds from container metadata (0.0 if unknown)."""
+    try:
+        result = subprocess.run(
+            [get_ffprobe_cmd(), '-v', 'quiet', '-print_format', 'json', '-show_format', path],
+            capture_output=True, timeout=10, **_subprocess_kwargs()
+        )
+        if result.returncode == 0:
+            return max(0.0, float(json.loads(result.stdout).get('format', {}).get('duration', 0)))
+    except Exception:
+        pass
+    return 0.0
+
+
+# ============================================================
+# OUTPUT LOCATIONS
+# ============================================================
+
+_fingerprints: Dict[tuple, str] = {}
+_fingerprint_lock = threading.Lock()
+
+
+def audio_fingerprint(path: str) -> str:
+    """
+    Identity of a media file for cache naming: size plus samples from the
+    start, middle and end.  Cheap even for multi-GB video, and memoised per
+    (path, size, mtime).
+    """
+    st = os.stat(path)
+    stamp = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    with _fingerprint_lock:
+        fp = _fingerprints.get(stamp)
+    if fp:
+        return fp
+    h = hashlib.blake2b(str(st.st_size).encode(), digest_size=16)
+    with open(path, 'rb') as f:
+        for offset in (0, st.st_size // 2, st.st_size - _SAMPLE_BYTES):
+            f.seek(max(0, offset))
+            h.update(f.read(_SAMPLE_BYTES))
+    fp = h.hexdigest()
+    with _fingerprint_lock:
+        _fingerprints[stamp] = fp
+    return fp
+
+
+def _output_paths(source: str):
+    fp = audio_fingerprint(source)
+    return (fp, os.path.join(PLAYBACK_CACHE_DIR, f"{fp}.mp3"),
+            os.path.join(PLAYBACK_CACHE_DIR, f"{fp}_head.mp3"))
+
+
+def find_playback_file(source: str) -> Optional[str]:
+    """
+    A finished conversion of source, or None.  Conversions made by older
+    versions beside the source ('<name>_playback.mp3' / '<name>_audio.mp3')
+    are still used.
+    """
+    try:
+        _fp, output, _head = _output_paths(source)
+    except OSError:
+        return None
+    if os.path.isfile(output):
+        cache_manager.touch(output, kind="playback")
+        return output
+    base = os.path.splitext(source)[0]
+    for legacy in (base + '_playback.mp3', base + '_audio.mp3'):
+        if os.path.isfile(legacy):
+            return legacy
+    return None
+
+
+# ============================================================
+# JOBS
+# ============================================================
+
+class TranscodeJob:
+    """
+    One source file's conversion.  State moves queued -> running -> done or
+    failed; wait() blocks until it finishes.
+    """
+
+    def __init__(self, source: str, key: str, output: str, head_output: str, priority: int):
+        self.source = source
+        self.key = key
+        self.output = output
+        self.head_output = head_output
+        self.priority = priority
+        self.state = "queued"
+        self.progress = 0.0         # 0..1 of the full conversion
+        self.duration = 0.0         # Source duration, once probed
+        self.head_ready = False
+        self.error = ""
+        self._on_progress: List[Callable[[float], None]] = []
+        self._on_chunk: List[Callable[[str], None]] = []
+        self._on_done: List[Callable[[Optional[str]], None]] = []
+        self._finished = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Block until finished; the output path, or None on failure/timeout."""
+        self._finished.wait(timeout)
+        return self.output if self.state == "done" else None
+
+    @staticmethod
+    def _fire(callbacks, *args):
+        for cb in list(callbacks):
+            try:
+                cb(*args)
+            except Exception as e:
+                logger.warning(f"Transcode callback error: {e}")
+
+
+class TranscodeService:
+    """Bounded ffmpeg worker pool fed by a priority queue."""
+
+    def __init__(self, workers: int = MAX_WORKERS):
+        self._max_workers = max(1, workers)
+        self._workers: List[threading.Thread] = []
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._jobs: Dict[str, TranscodeJob] = {}      # key -> unfinished job
+        self._procs: Dict[str, subprocess.Popen] = {}
+        self._cond = threading.Condition()
+        self._stopping = False
+
+    # ── Submission ────────────────────────────────────────────────────────
+
+    def submit(self, source: str, priority: int = PRIORITY_BACKGROUND,
+               on_progress: Optional[Callable[[float], None]] = None,
+               on_chunk: Optional[Callable[[str], None]] = None,
+               on_done: Optional[Callable[[Optional[str]], None]] = None) -> TranscodeJob:
+        """
+        Queue a conversion of source (or join the one already queued).
+
+        on_progress(fraction) reports the full conversion; on_chunk(path) fires
+        once a playable head chunk exists (interactive jobs only); on_done(path)
+        fires with the finished MP3, or None if conversion failed.
+        """
+        key, output, head_output = _output_paths(source)
+        with self._cond:
+            job = self._jobs.get(key)
+            if job is None:
+                job = TranscodeJob(source, key, output, head_output, priority)
+                if os.path.isfile(output):
+                    job.state, job.progress = "done", 1.0
+                    job._finished.set()
+                    cache_manager.touch(output, kind="playback")
+                else:
+                    self._jobs[key] = job
+                    self._push(job)
+            elif priority < job.priority and job.state == "queued":
+                job.priority = priority
+                self._push(job)     # The old heap entry is skipped when popped
+            if on_progress:
+                job._on_progress.append(on_progress)
+            if on_chunk:
+                job._on_chunk.append(on_chunk)
+            if on_done:
+                job._on_done.append(on_done)
+            self._ensure_workers()
+
+        # Late subscribers still hear about what already happened
+        if on_chunk and job.head_ready and not job.finished:
+            TranscodeJob._fire([on_chunk], job.head_output)
+        if on_done and job.finished:
+            TranscodeJob._fire([on_done], job.output if job.state == "done" else None)
+        return job
+
+    def _push(self, job: TranscodeJob):
+        heapq.heappush(self._heap, (job.priority, next(self._seq), job))
+        self._cond.notify()
+
+    def _ensure_workers(self):
+        self._workers = [t for t in self._workers if t.is_alive()]
+        while len(self._workers) < min(self._max_workers, len(self._heap)):
+            t = threading.Thread(target=self._worker, name="transcode", daemon=True)
+            self._workers.append(t)
+            t.start()
+
+    def shutdown(self):
+        """Stop taking work and kill running ffmpeg processes."""
+        with self._cond:
+            self._stopping = True
+            self._heap.clear()
+            procs = list(self._procs.values())
+            self._cond.notify_all()
+        for proc in procs:
+            try:
+                proc.kill()
+            except OSError:
+                pass
+
+    # ── Workers ───────────────────────────────────────────────────────────
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._heap and not self._stopping:
+                    if not self._cond.wait(timeout=60):
+                        return      # Idle - let the thread go
+                if self._stopping:
+                    return
+                _prio, _seq, job = heapq.heappop(self._heap)
+                if job.state != "queued":
+                    continue        # Stale entry from a promotion
+                job.state = "running"
+            try:
+                self._run(job)
+            except Exception as e:
+                job.error = str(e)
+            finally:
+                with self._cond:
+                    self._jobs.pop(job.key, None)
+                job.state = "done" if os.path.isfile(job.output) else "failed"
+                if job.state == "failed":
+                    logger.warning(f"Playback conversion failed for "
+                                   f"{os.path.basename(job.source)}: {job.error}")
+                job._finished.set()
+                TranscodeJob._fire(job._on_done, job.output if job.state == "done" else None)
+                self._remove_head(job)
+
+    def _run(self, job: TranscodeJob):
+        job.duration = probe_duration(job.source)
+        name = os.path.basename(job.source)
+
+        if job.priority <= PRIORITY_INTERACTIVE and job.duration > 2 * HEAD_SECONDS:
+            # A head left over from an interrupted run is reused as-is
+            if (os.path.isfile(job.head_output)
+                    or self._ffmpeg(job, job.head_output, ['-t', str(HEAD_SECONDS)], report=False)):
+                job.head_ready = True
+                TranscodeJob._fire(job._on_chunk, job.head_output)
+
+        print(f"🎵 FFMPEG START: converting {name} for playback", flush=True)
+        if self._ffmpeg(job, job.output, [], report=True):
+            cache_manager.record(job.output, "playback", key=job.key)
+            job.progress = 1.0
+            logger.info(f"Converted for player: {name} → {os.path.basename(job.output)}")
+            print(f"🎵 FFMPEG DONE: {name}", flush=True)
+
+    def _ffmpeg(self, job: TranscodeJob, output: str, extra: List[str], report: bool) -> bool:
+        """Run one conversion to output (via a .tmp file).  True on success."""
+        tmp_path = output + '.tmp'
+        cmd = ([get_ffmpeg_cmd(), '-y', '-nostdin', '-loglevel', 'error', '-i', job.source]
+               + extra + _ENCODE_ARGS + ['-progress', 'pipe:1', '-nostats', tmp_path])
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                    **_subprocess_kwargs())
+        except FileNotFoundError:
+            job.error = "ffmpeg not found"
+            return False
+        with self._cond:
+            self._procs[job.key] = proc
+
+        # ffmpeg's stderr is short at -loglevel error, but drain it on the side
+        # so a chatty failure can't fill the pipe and stall the progress reader
+        stderr_chunks: List[bytes] = []
+        drain = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()),
+                                 daemon=True)
+        drain.start()
+        deadline = time.time() + FFMPEG_TIMEOUT_S
+        try:
+            for raw in proc.stdout:
+                if time.time() > deadline:
+                    proc.kill()
+                    job.error = "timed out"
+                    break
+                line = raw.decode(errors='replace').strip()
+                if report and job.duration and line.startswith('out_time_us='):
+                    try:
+                        done = int(line.split('=', 1)[1]) / 1e6
+                    except ValueError:
+                        continue
+                    fraction = min(0.99, max(0.0, done / job.duration))
+                    if fraction - job.progress >= 0.01:
+                        job.progress = fraction
+                        TranscodeJob._fire(job._on_progress, fraction)
+            proc.wait()
+            drain.join(timeout=5)
+        finally:
+            with self._cond:
+                self._procs.pop(job.key, None)
+
+        if proc.returncode == 0 and os.path.isfile(tmp_path):
+            # Only visible to the rest of the app once fully written
+            os.replace(tmp_path, output)
+            return True
+        if not job.error:
+            job.error = (f"rc={proc.returncode}: "
+                         f"{b''.join(stderr_chunks).decode(errors='replace')[:200]}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+    @staticmethod
+    def _remove_head(job: TranscodeJob):
+        """The head chunk is only a stopgap; drop it once the job is over."""
+        if job.head_ready:
+            try:
+                os.remove(job.head_output)
+            except OSError:
+                pass
+
+
+# ============================================================
+# SHARED INSTANCE
+# ============================================================
+
+_service: Optional[TranscodeService] = None
+_service_lock = threading.Lock()
+
+
+def get_service() -> TranscodeService:
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = TranscodeService()
+        return _service
+
+
+def submit(source: str, priority: int = PRIORITY_BACKGROUND, **callbacks) -> TranscodeJob:
+    """Queue a conversion on the shared service (see TranscodeService.submit)."""
+    return get_service().submit(source, priority, **callbacks)
+
+
+def shutdown():
+    """Stop the shared service, if it was ever started."""
+    with _service_lock:
+        service = _service
+    if service is not None:
+        service.shutdown()
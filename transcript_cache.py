@@ -0,0 +1,305 @@
+"""
+transcript_cache.py - Compact binary format for cached transcriptions.
+
+A multi-hour transcript is tens of thousands of segment dicts; as indented
+JSON it is large, slow to load, and has to be parsed completely just to see
+whether it is usable.  This format stores:
+
+    header   magic, version, codec, segment count, section lengths
+    meta     small JSON: language, text length, extra result keys
+    starts   float64 x n   (little-endian, uncompressed)
+    ends     float64 x n
+    offsets  uint32 x n+1  (byte offsets of each segment's text in the blob)
+    blob     compressed:  segment texts | full text
+    extras   compressed JSON: other segment fields, sparse per field
+
+Validation needs only the header and meta (no decompression).  Start/end
+times are available without touching the text, and segments(0, k) only
+decompresses as far as segment k, which makes previews cheap.
+
+Segment fields other than start/end/text (e.g. 'speaker') - and 'timestamp'
+when it isn't the usual "[HH:MM:SS]" of start - round-trip through the
+extras section, so any result dict reads back exactly as written.
+
+Usage:
+    from transcript_cache import encode_transcript, TranscriptCacheReader
+    data = encode_transcript(result)                # bytes
+    reader = TranscriptCacheReader(path)
+    if reader.valid:
+        result = reader.to_result()
+
+Author: DocAnalyser Development Team
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+MAGIC = b"DATC"
+VERSION = 1
+CODEC_ZLIB = 0
+CODEC_ZSTD = 1
+FILE_EXTENSION = ".dtc"
+
+# magic, version, codec, reserved, segments, meta bytes, blob bytes
+_HEADER = struct.Struct("<4sBBHIIQ")
+_CORE_KEYS = ("start", "end", "text", "timestamp")
+
+
+def _le_array(typecode: str, values) -> bytes:
+    a = array(typecode, values)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a.tobytes()
+
+
+def _from_le(typecode: str, data: bytes) -> array:
+    a = array(typecode)
+    a.frombytes(data)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a
+
+
+def _default_timestamp(start: float) -> str:
+    """The '[HH:MM:SS]' label the transcription engines give each segment."""
+    if start >= 0:
+        minutes, secs = divmod(int(start), 60)
+        hours, minutes = divmod(minutes, 60)
+    else:
+        hours = int(start // 3600)
+        minutes = int((start % 3600) // 60)
+        secs = int(start % 60)
+    return "[%02d:%02d:%02d]" % (hours, minutes, secs)
+
+
+def _compress(codec: int, raw: bytes) -> bytes:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=9).compress(raw)
+    return zlib.compress(raw, 6)
+
+
+def _decompress(codec: int, blob: bytes) -> bytes:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdDecompressor().stream_reader(blob).read()
+    return zlib.decompress(blob)
+
+
+# ============================================================
+# WRITE
+# ============================================================
+
+def encode_transcript(result: Dict, codec: Optional[int] = None) -> bytes:
+    """
+    Serialise a transcription result ({'text', 'segments', 'language', ...})
+    to the binary cache format.
+    """
+    if codec is None:
+        codec = CODEC_ZSTD if ZSTD_AVAILABLE else CODEC_ZLIB
+    segments = result.get("segments") or []
+    full_text = result.get("text") or ""
+
+    starts, ends, offsets, parts = [], [], [0], []
+    extras: Dict[str, list] = {}     # field -> [[segment indices], [values]]
+    position = 0
+
+    def add_extra(field, i, value):
+        column = extras.setdefault(field, [[], []])
+        column[0].append(i)
+        column[1].append(value)
+
+    for i, seg in enumerate(segments):
+        start = float(seg.get("start") or 0.0)
+        starts.append(start)
+        ends.append(float(seg.get("end") or start))
+        encoded = (seg.get("text") or "").encode("utf-8")
+        parts.append(encoded)
+        position += len(encoded)
+        offsets.append(position)
+        for field, value in seg.items():
+            if field not in _CORE_KEYS:
+                add_extra(field, i, value)
+        if "timestamp" not in seg:
+            add_extra("__no_timestamp", i, True)
+        elif seg["timestamp"] != _default_timestamp(start):
+            add_extra("timestamp", i, seg["timestamp"])
+
+    full_encoded = full_text.encode("utf-8")
+    blob = _compress(codec, b"".join(parts) + full_encoded)
+    extras_blob = b""
+    if extras:
+        extras_blob = _compress(codec, json.dumps(extras, ensure_ascii=False).encode("utf-8"))
+
+    meta = {
+        "language": result.get("language"),
+        "text_bytes": len(full_encoded),
+        "text_chars": len(full_text.strip()),
+        "extras_blob_bytes": len(extras_blob),
+        "extra": {k: v for k, v in result.items()
+                  if k not in ("text", "segments", "language", "cached")},
+    }
+    meta_encoded = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+
+    header = _HEADER.pack(MAGIC, VERSION, codec, 0, len(segments), len(meta_encoded), len(blob))
+    return b"".join([
+        header, meta_encoded,
+        _le_array("d", starts), _le_array("d", ends), _le_array("I", offsets),
+        blob, extras_blob,
+    ])
+
+
+# ============================================================
+# READ
+# ============================================================
+
+class TranscriptCacheReader:
+    """
+    Lazy reader for a cached transcription file.
+
+    Construction reads the header, meta and the start/end/offset columns;
+    text is decompressed on first need, and only as far as required.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.valid = False
+        self.error = ""
+        self.count = 0
+        self.meta: Dict = {}
+        self.starts: array = array("d")
+        self.ends: array = array("d")
+        self._offsets: array = array("I")
+        self._codec = CODEC_ZLIB
+        self._blob_pos = 0
+        self._blob_len = 0
+        self._raw = b""          # Decompressed prefix of the blob
+        self._complete = False
+        self._extras: Optional[Dict] = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    raise ValueError("truncated header")
+                magic, version, codec, _r, count, meta_len, blob_len = _HEADER.unpack(header)
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError("not a transcript cache file")
+                if codec == CODEC_ZSTD and not ZSTD_AVAILABLE:
+                    raise ValueError("zstd-compressed cache but zstandard not installed")
+                self.meta = json.loads(f.read(meta_len).decode("utf-8"))
+                self.starts = _from_le("d", f.read(8 * count))
+                self.ends = _from_le("d", f.read(8 * count))
+                self._offsets = _from_le("I", f.read(4 * (count + 1)))
+                self._blob_pos = f.tell()
+                f.seek(0, 2)
+                expected = blob_len + self.meta.get("extras_blob_bytes", 0)
+                if f.tell() - self._blob_pos != expected or len(self._offsets) != count + 1:
+                    raise ValueError("truncated file")
+        except (OSError, ValueError, struct.error) as e:
+            self.error = str(e)
+            return
+
+        self.count = count
+        self._codec = codec
+        self._blob_len = blob_len
+        if not count:
+            self.error = "no segments"
+        elif not self.meta.get("text_chars"):
+            self.error = "empty text"
+        else:
+            self.valid = True
+
+    # ── Decompression ─────────────────────────────────────────────────────
+
+    def _read_blob(self, extras: bool = False) -> bytes:
+        with open(self.path, "rb") as f:
+            if extras:
+                f.seek(self._blob_pos + self._blob_len)
+                return f.read(self.meta.get("extras_blob_bytes", 0))
+            f.seek(self._blob_pos)
+            return f.read(self._blob_len)
+
+    def _ensure(self, nbytes: Optional[int]):
+        """Decompress at least nbytes of the blob (None = all of it)."""
+        if self._complete or (nbytes is not None and len(self._raw) >= nbytes):
+            return
+        blob = self._read_blob()
+        if self._codec == CODEC_ZSTD:
+            reader = zstandard.ZstdDecompressor().stream_reader(blob)
+            self._raw = reader.read() if nbytes is None else reader.read(nbytes)
+            if nbytes is not None:
+                while len(self._raw) < nbytes:
+                    more = reader.read(nbytes - len(self._raw))
+                    if not more:
+                        break
+                    self._raw += more
+        else:
+            d = zlib.decompressobj()
+            self._raw = d.decompress(blob) if nbytes is None else d.decompress(blob, nbytes)
+        if nbytes is None:
+            self._complete = True
+
+    def _load_extras(self) -> Dict:
+        if self._extras is None:
+            self._extras = {}
+            if self.meta.get("extras_blob_bytes"):
+                raw = _decompress(self._codec, self._read_blob(extras=True))
+                self._extras = json.loads(raw.decode("utf-8"))
+        return self._extras
+
+    # ── Access ────────────────────────────────────────────────────────────
+
+    def segments(self, start: int = 0, stop: Optional[int] = None) -> List[Dict]:
+        """Segment dicts [start:stop], decompressing only what's needed."""
+        stop = self.count if stop is None else min(stop, self.count)
+        if start >= stop:
+            return []
+        self._ensure(self._offsets[stop])
+        offsets, raw, starts, ends = self._offsets, self._raw, self.starts, self.ends
+        out = [
+            {
+                "start": starts[i],
+                "end": ends[i],
+                "text": raw[offsets[i]:offsets[i + 1]].decode("utf-8"),
+                "timestamp": _default_timestamp(starts[i]),
+            }
+            for i in range(start, stop)
+        ]
+        for field, (indices, values) in self._load_extras().items():
+            lo = bisect_left(indices, start)
+            hi = bisect_left(indices, stop, lo)
+            for i, value in zip(indices[lo:hi], values[lo:hi]):
+                if field == "__no_timestamp":
+                    out[i - start].pop("timestamp", None)
+                else:
+                    out[i - start][field] = value
+        return out
+
+    @property
+    def text(self) -> str:
+        end = self._offsets[-1] + self.meta.get("text_bytes", 0)
+        self._ensure(end)
+        return self._raw[self._offsets[-1]:end].decode("utf-8")
+
+    def to_result(self) -> Dict:
+        """The full result dict, as originally written."""
+        result = dict(self.meta.get("extra") or {})
+        result.update({
+            "text": self.text,
+            "segments": self.segments(),
+            "language": self.meta.get("language"),
+        })
+        return result
@@ -27,6 +27,10 @@ import tkinter as tk
 from tkinter import ttk
 from typing import List, Dict, Optional
 
+import media_index
+import transcode_service
+from segment_index import index_for
+
 logger = logging.getLogger(__name__)
 
 # Lazy import - don't break the app if pygame isn't installed
@@ -39,114 +43,27 @@ except ImportError:
                 "Install with: pip install pygame")
 
 
-def _get_ffmpeg_cmd() -> str:
-    """
-    Return the path to the ffmpeg executable.
-    Checks the bundled tools (via dependency_checker.find_ffmpeg) first,
-    then falls back to 'ffmpeg' on PATH so both the installed app and
-    the dev environment work correctly.
-    """
-    try:
-        from dependency_checker import find_ffmpeg
-        ok, path, _ = find_ffmpeg()
-        if ok and path:
-            candidate = os.path.join(path, 'ffmpeg.exe')
-            if os.path.isfile(candidate):
-                return candidate
-            candidate = os.path.join(path, 'ffmpeg')
-            if os.path.isfile(candidate):
-                return candidate
-    except Exception:
-        pass
-    return 'ffmpeg'  # fall back to PATH
-
-
-def _get_ffprobe_cmd() -> str:
-    """Return the path to the ffprobe executable (same directory as ffmpeg)."""
-    try:
-        from dependency_checker import find_ffmpeg
-        ok, path, _ = find_ffmpeg()
-        if ok and path:
-            candidate = os.path.join(path, 'ffprobe.exe')
-            if os.path.isfile(candidate):
-                return candidate
-            candidate = os.path.join(path, 'ffprobe')
-            if os.path.isfile(candidate):
-                return candidate
-    except Exception:
-        pass
-    return 'ffprobe'  # fall back to PATH
-
-
 def preconvert_for_player(audio_path: str) -> None:
     """
-    Pre-convert an audio file to a small MP3 in a background thread so
-    that pygame.mixer can load it almost instantly when the Thread Viewer
-    opens.
+    Queue a background conversion of an audio file to a small MP3 so that
+    pygame.mixer can load it almost instantly when the Thread Viewer opens.
 
-    The output is stored next to the source file with a '_playback.mp3'
-    suffix, e.g.:
-        C:/Ian/interviews/Paul.m4a  →  C:/Ian/interviews/Paul_playback.mp3
-
-    If the file already exists it is not re-created.  Safe to call
-    multiple times.  Errors are logged but never raised — if conversion
-    fails, pygame will fall back to loading the original file directly.
+    The conversion runs on the shared transcode pool (transcode_service) at
+    background priority and is stored in the playback cache, not beside the
+    source file.  Safe to call multiple times; errors are logged but never
+    raised - if conversion fails, pygame falls back to the original file.
 
     Call this immediately after a successful transcription so the
     converted file is ready by the time the user opens the Thread Viewer.
     """
     if not audio_path or not os.path.isfile(audio_path):
         return
-
-    playback_path = os.path.splitext(audio_path)[0] + '_playback.mp3'
-    if os.path.isfile(playback_path):
+    if transcode_service.find_playback_file(audio_path):
         return  # Already done
-
-    def _convert():
-        print(f"🎵 FFMPEG START: converting {os.path.basename(audio_path)} → {os.path.basename(playback_path)}", flush=True)
-        tmp_path = playback_path + '.tmp'
-        try:
-            import subprocess
-            result = subprocess.run(
-                [_get_ffmpeg_cmd(), '-y', '-i', audio_path,
-                 '-vn',                    # strip video if present
-                 '-acodec', 'libmp3lame',
-                 '-q:a', '4',             # decent quality, small file
-                 '-ar', '44100',          # standard sample rate for pygame
-                 '-f', 'mp3',             # explicit format so .tmp ext is ok
-                 tmp_path],               # write to .tmp first
-                capture_output=True, timeout=300
-            )
-            if result.returncode == 0 and os.path.isfile(tmp_path):
-                # Atomic rename: only visible to the rest of the app
-                # once fully written
-                os.replace(tmp_path, playback_path)
-                logger.info(
-                    f"Pre-converted for player: "
-                    f"{os.path.basename(audio_path)} → "
-                    f"{os.path.basename(playback_path)}"
-                )
-                print(f"🎵 FFMPEG DONE: {os.path.basename(playback_path)}", flush=True)
-            else:
-                logger.warning(
-                    f"Pre-conversion failed (rc={result.returncode}): "
-                    f"{result.stderr.decode(errors='replace')[:200]}"
-                )
-                # Clean up failed temp file
-                if os.path.isfile(tmp_path):
-                    os.remove(tmp_path)
-        except FileNotFoundError:
-            logger.debug("ffmpeg not found — skipping pre-conversion")
-        except Exception as e:
-            logger.warning(f"Pre-conversion error: {e}")
-            if os.path.isfile(tmp_path):
-                try:
-                    os.remove(tmp_path)
-                except Exception:
-                    pass
-
-    import threading
-    threading.Thread(target=_convert, daemon=True).start()
+    try:
+        transcode_service.submit(audio_path, transcode_service.PRIORITY_BACKGROUND)
+    except Exception as e:
+        logger.warning(f"Pre-conversion error: {e}")
 
 
 def is_player_available(audio_path: str, entries: Optional[List] = None) -> bool:
@@ -210,6 +127,16 @@ class TranscriptPlayer(ttk.Frame):
         self._update_job = None
         self._initialised = False
         self._slider_dragging = False
+        self._closed = False
+        # Conversion state (formats pygame can't load directly)
+        self._job = None              # transcode_service.TranscodeJob
+        self._partial = False         # Mixer holds only the head chunk
+        self._awaiting_full = False   # Played past the head chunk; waiting
+        # Seek index / waveform for the loaded file (see media_index)
+        self._playback_path = None
+        self._media_index = None
+        self._seek_stream = None      # Open slice of the file pygame is playing
+        self._wave_heights: List[float] = []
 
         # Estimate duration from entries
         if self.entries:
@@ -264,79 +191,31 @@ class TranscriptPlayer(ttk.Frame):
         ttk.Button(controls, text="\u23f9 Stop", width=7,
                    command=self.stop).pack(side=tk.LEFT)
 
+        # Waveform strip - packed once the file's peaks are available
+        self.wave_canvas = tk.Canvas(self, height=28, highlightthickness=0,
+                                     background='#f4f6f8', cursor='hand2')
+        self.wave_canvas.bind("<Configure>", lambda e: self._draw_waveform())
+        self.wave_canvas.bind("<Button-1>", self._on_waveform_click)
+
     # ------------------------------------------------------------------
     # Pygame Mixer
     # ------------------------------------------------------------------
 
-    # Video container extensions that need audio extraction before pygame can play them
-    _VIDEO_EXTS = {'.mp4', '.mkv', '.mov', '.avi', '.webm', '.flv', '.wmv'}
-
     def _extract_audio_for_playback(self, source_path: str) -> str:
         """
-        Return the best path for pygame to load.
-
-        Priority order:
-        1. A pre-converted '_playback.mp3' created by preconvert_for_player()
-           — exists for any format after a fresh transcription.  Loads in
-           under a second regardless of original file size.
-        2. A legacy '_audio.mp3' created by earlier on-demand extraction
-           (kept for backwards compatibility with files converted before
-           the pre-conversion feature was added).
-        3. For video containers (.mp4, .mkv etc.), extract on the fly now
-           using ffmpeg (first-open only; result cached as '_audio.mp3').
-        4. Original file unchanged (pygame tries directly; may be slow
-           for large .m4a/.wav files if no pre-converted file exists).
-        """
-        base = os.path.splitext(source_path)[0]
-
-        # Check for pre-converted playback MP3 first (fastest)
-        playback_path = base + '_playback.mp3'
-        if os.path.isfile(playback_path):
-            logger.info(f"Using pre-converted playback file: "
-                        f"{os.path.basename(playback_path)}")
-            return playback_path
-
-        # Legacy on-demand extraction cache
-        legacy_path = base + '_audio.mp3'
-        if os.path.isfile(legacy_path):
-            logger.info(f"Using cached audio extraction: "
-                        f"{os.path.basename(legacy_path)}")
-            return legacy_path
-
-        ext = os.path.splitext(source_path)[1].lower()
-        if ext not in self._VIDEO_EXTS:
-            return source_path  # Native audio — load directly
-
-        tmp_path = os.path.splitext(source_path)[0] + '_audio.mp3'
-        if os.path.isfile(tmp_path):
-            logger.info(f"Using cached audio extraction: {tmp_path}")
-            return tmp_path
-
-        # Try to extract with ffmpeg
-        try:
-            import subprocess
-            result = subprocess.run(
-                [_get_ffmpeg_cmd(), '-y', '-i', source_path,
-                 '-vn',            # no video
-                 '-acodec', 'libmp3lame',
-                 '-q:a', '2',      # good quality VBR
-                 tmp_path],
-                capture_output=True, timeout=120
-            )
-            if result.returncode == 0 and os.path.isfile(tmp_path):
-                logger.info(f"Audio extracted to {tmp_path}")
-                return tmp_path
-            else:
-                logger.warning(
-                    f"ffmpeg extraction failed (rc={result.returncode}): "
-                    f"{result.stderr.decode(errors='replace')[:200]}"
-                )
-        except FileNotFoundError:
-            logger.warning("ffmpeg not found — cannot extract audio from video file")
-        except Exception as e:
-            logger.warning(f"Audio extraction error: {e}")
+        Return the best path for pygame to load: a finished conversion from
+        the playback cache (or a '_playback.mp3' / '_audio.mp3' made beside
+        the source by older versions), otherwise the original file.
 
-        return source_path  # Fallback: try loading original (will likely fail)
+        Never runs ffmpeg itself - formats pygame can't load are converted by
+        the shared transcode pool via _start_conversion(), so neither the UI
+        nor the init thread blocks on a video extraction.
+        """
+        converted = transcode_service.find_playback_file(source_path)
+        if converted:
+            logger.info(f"Using converted playback file: {os.path.basename(converted)}")
+            return converted
+        return source_path
 
     def _set_status(self, msg: str) -> None:
         """Post msg to the main app status bar if a callback was supplied."""
@@ -346,32 +225,90 @@ class TranscriptPlayer(ttk.Frame):
             except Exception:
                 pass
 
-    def _poll_conversion(self, attempt: int = 0) -> None:
+    def _post(self, fn) -> None:
+        """Run fn on the Tk thread (safe from worker threads and after close)."""
+        if self._closed:
+            return
+        try:
+            self.after(0, fn)
+        except (RuntimeError, tk.TclError):
+            pass
+
+    def _start_conversion(self) -> None:
         """
-        Called every 2 seconds after a failed init to check whether the
-        background ffmpeg conversion has finished.  Once _playback.mp3
-        exists, reset _initialised and retry _init_mixer on the
-        background thread.
+        Queue this file on the transcode pool at interactive priority (ahead
+        of any background pre-conversions).  The head chunk is loaded as soon
+        as it exists so playback can start early; the full file replaces it
+        when the conversion finishes.
         """
-        playback_path = os.path.splitext(self.audio_path)[0] + '_playback.mp3'
-        if os.path.isfile(playback_path):
-            # Conversion done — reset state and try again
-            self._initialised = False
-            self._init_pending = True
-            self.play_btn.configure(text="Wait\u2026")
-            self._set_status(
-                f"✅ Audio prepared — loading player..."
-            )
-            import threading
-            threading.Thread(target=self._init_mixer, daemon=True).start()
-        elif attempt < 60:  # Give up after 2 minutes
-            self.after(2000, lambda: self._poll_conversion(attempt + 1))
+        fname = os.path.basename(self.audio_path)
+
+        def on_progress(fraction):
+            if not self._initialised:
+                self._post(lambda: self._set_status(
+                    f"🔄 Preparing audio player — converting {fname} "
+                    f"to MP3 for playback ({fraction:.0%})..."))
+
+        self._job = transcode_service.submit(
+            self.audio_path, transcode_service.PRIORITY_INTERACTIVE,
+            on_progress=on_progress,
+            on_chunk=lambda path: self._post(lambda: self._load_converted(path, complete=False)),
+            on_done=lambda path: self._post(lambda: self._on_conversion_done(path)),
+        )
+
+    def _load_converted(self, path: str, complete: bool) -> None:
+        """
+        Load a converted file (the head chunk or the full conversion) into
+        the mixer.  Runs on the Tk thread.  If the head chunk was playing,
+        playback continues from the same position in the full file.
+        """
+        if self._closed or (self._initialised and not self._partial):
+            return
+        resume_at = None
+        if self._awaiting_full:
+            resume_at = self._position
+        elif self._playing:
+            resume_at = self._get_current_position()
+            pygame.mixer.music.stop()
+            self._playing = False
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(frequency=44100, size=-16, channels=2,
+                                  buffer=2048)
+            pygame.mixer.music.load(path)
+            self._close_seek_stream()
+        except Exception as e:
+            logger.error(f"Failed to load converted audio: {e}")
+            if complete:
+                self.play_btn.configure(state=tk.DISABLED)
+            return
+
+        self._partial = not complete
+        self._awaiting_full = False
+        self._initialised = True
+        self._init_pending = False
+        duration = self._job.duration if self._job else 0.0
+        if duration > 0:
+            self._duration = duration
+            self.slider.configure(to=max(self._duration, 1))
+
+        self.play_btn.configure(text='\u25b6 Play', state=tk.NORMAL)
+        if complete:
+            self._request_media_index(path)
+            self._set_status('✅ Audio player ready — click Play or any segment to begin')
         else:
-            # Conversion never finished
-            self.play_btn.configure(
-                text="\u25b6 Play", state=tk.DISABLED)
-            logger.warning(
-                "Audio conversion did not complete within 2 minutes.")
+            self._set_status('✅ Audio player ready — the rest of the file is '
+                             'still converting in the background')
+        if resume_at is not None:
+            self.play(from_position=resume_at)
+
+    def _on_conversion_done(self, path: Optional[str]) -> None:
+        if path:
+            self._load_converted(path, complete=True)
+        elif not self._initialised:
+            self.play_btn.configure(text="\u25b6 Play", state=tk.DISABLED)
+            self._set_status(f"⚠️ Could not convert "
+                             f"{os.path.basename(self.audio_path)} for playback")
 
     def _get_duration_ffprobe(self, audio_path: str) -> float:
         """
@@ -379,23 +316,7 @@ class TranscriptPlayer(ttk.Frame):
         Returns duration in seconds, or 0.0 if ffprobe is unavailable
         or the query fails.  This is near-instant regardless of file size.
         """
-        try:
-            import subprocess, json
-            result = subprocess.run(
-                [_get_ffprobe_cmd(), '-v', 'quiet',
-                 '-print_format', 'json',
-                 '-show_format',
-                 audio_path],
-                capture_output=True, timeout=10
-            )
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                dur = float(data.get('format', {}).get('duration', 0))
-                if dur > 0:
-                    return dur
-        except Exception:
-            pass
-        return 0.0
+        return transcode_service.probe_duration(audio_path)
 
     # Formats pygame can always handle natively without conversion
     _PYGAME_SAFE_EXTS = {'.mp3', '.wav', '.ogg'}
@@ -405,44 +326,37 @@ class TranscriptPlayer(ttk.Frame):
         if self._initialised or not PYGAME_AVAILABLE:
             return
 
-        # ── Proactive pre-conversion check ───────────────────────────────
+        # ── Proactive conversion check ───────────────────────────────────
         # If the source format is not guaranteed safe for pygame AND no
-        # pre-converted _playback.mp3 exists yet, skip the doomed load and
-        # go straight to background conversion + polling.  This avoids the
-        # ModPlug_Load / codec error for .m4a, .aac, .wma, .mp4 etc.
+        # converted file exists yet, skip the doomed load and go straight to
+        # conversion.  This avoids the ModPlug_Load / codec error for .m4a,
+        # .aac, .wma, .mp4 etc.
         ext = os.path.splitext(self.audio_path)[1].lower()
-        playback_path = os.path.splitext(self.audio_path)[0] + '_playback.mp3'
-        if ext not in self._PYGAME_SAFE_EXTS and not os.path.isfile(playback_path):
-            print(f"🎵 PRE-CONVERT: {ext} not pygame-safe, no playback.mp3 found — starting ffmpeg conversion", flush=True)
+        playback_path = self._extract_audio_for_playback(self.audio_path)
+        if ext not in self._PYGAME_SAFE_EXTS and playback_path == self.audio_path:
             logger.info(
                 f"{ext} is not natively supported by pygame — "
-                "starting background conversion before loading."
+                "converting before loading."
             )
             self._init_pending = False
             try:
-                preconvert_for_player(self.audio_path)
+                self._start_conversion()
                 fname = os.path.basename(self.audio_path)
-                self.after(0, lambda: self.play_btn.configure(
+                self._post(lambda: self.play_btn.configure(
                     text="Wait\u2026", state=tk.DISABLED))
-                self.after(0, lambda: self._set_status(
+                self._post(lambda: self._set_status(
                     f"🔄 Preparing audio player — converting {fname} to MP3 "
-                    f"for playback (this takes 1-2 minutes for large files)..."
+                    f"for playback..."
                 ))
-                self.after(0, self._poll_conversion)
             except Exception as e:
-                print(f"🎵 PRE-CONVERT ERROR: {e}", flush=True)
-                logger.error(f"Could not start pre-conversion: {e}")
-                self.after(0, lambda: self.play_btn.configure(state=tk.DISABLED))
+                logger.error(f"Could not start conversion: {e}")
+                self._post(lambda: self.play_btn.configure(state=tk.DISABLED))
             return
-        print(f"🎵 INIT-MIXER: {ext} is pygame-safe or playback.mp3 exists — proceeding with direct load", flush=True)
         # ── End proactive check ───────────────────────────────────────────
 
         try:
             pygame.mixer.init(frequency=44100, size=-16, channels=2,
                               buffer=2048)
-
-            # Extract audio from video containers before loading into pygame
-            playback_path = self._extract_audio_for_playback(self.audio_path)
             pygame.mixer.music.load(playback_path)
 
             # Get duration via ffprobe (instant metadata read, no file loading)
@@ -453,36 +367,115 @@ class TranscriptPlayer(ttk.Frame):
 
             self._initialised = True
             self._init_pending = False
+            self._request_media_index(playback_path)
             logger.info(f"Transcript player initialised: "
                         f"{os.path.basename(self.audio_path)} "
                         f"({self._fmt_time(self._duration)})")
 
             # Update slider and confirm Play button on the main thread
-            self.after(0, lambda: self.slider.configure(
+            self._post(lambda: self.slider.configure(
                 to=max(self._duration, 1)))
-            self.after(0, lambda: self.play_btn.configure(
+            self._post(lambda: self.play_btn.configure(
                 text='\u25b6 Play', state=tk.NORMAL))
-            self.after(0, lambda: self._set_status(
+            self._post(lambda: self._set_status(
                 f'✅ Audio player ready — click Play or any segment to begin'))
 
         except Exception as e:
             logger.error(f"Failed to initialise audio: {e}")
             self._init_pending = False
 
-            # If loading failed and no pre-converted file exists yet,
-            # kick off background conversion and retry once it finishes.
-            playback_path = os.path.splitext(self.audio_path)[0] + '_playback.mp3'
-            if not os.path.isfile(playback_path):
+            # If loading the original failed, convert it and load the
+            # result when it arrives.
+            if playback_path == self.audio_path:
                 try:
-                    preconvert_for_player(self.audio_path)
-                    # Show "Converting..." and poll until the file appears
-                    self.after(0, lambda: self.play_btn.configure(
+                    self._start_conversion()
+                    self._post(lambda: self.play_btn.configure(
                         text="Converting\u2026", state=tk.DISABLED))
-                    self.after(0, self._poll_conversion)
                 except Exception:
-                    self.after(0, lambda: self.play_btn.configure(state=tk.DISABLED))
+                    self._post(lambda: self.play_btn.configure(state=tk.DISABLED))
             else:
-                self.after(0, lambda: self.play_btn.configure(state=tk.DISABLED))
+                self._post(lambda: self.play_btn.configure(state=tk.DISABLED))
+
+    # ------------------------------------------------------------------
+    # Seek Index & Waveform
+    # ------------------------------------------------------------------
+
+    def _request_media_index(self, path: str) -> None:
+        """Build/load the seek index and waveform for path in the background."""
+        self._playback_path = path
+        media_index.request(
+            path, lambda index: self._post(lambda: self._apply_media_index(index)))
+
+    def _apply_media_index(self, index) -> None:
+        if self._closed or index is None or index.path != self._playback_path:
+            return  # Stale: a different file has been loaded since
+        self._media_index = index
+        if index.peaks:
+            if not self.wave_canvas.winfo_ismapped():
+                self.wave_canvas.pack(fill=tk.X, pady=(4, 0))
+            self._draw_waveform()
+
+    def _play_indexed(self, position: float) -> bool:
+        """
+        Start playback at position by loading the file from the nearest
+        indexed frame, so pygame decodes at most SEEK_INTERVAL_S of audio.
+        Returns False if there is no usable index.
+        """
+        index = self._media_index
+        if index is None or not index.can_seek or self._partial:
+            return False
+        try:
+            stream, skip = index.open_at(position)
+        except OSError:
+            return False
+        try:
+            pygame.mixer.music.load(stream, "mp3")
+            if skip > 0.05:
+                pygame.mixer.music.play(start=skip)
+            else:
+                pygame.mixer.music.play()
+        except Exception as e:
+            logger.debug(f"Indexed seek failed, using decoder seek: {e}")
+            stream.close()
+            return False
+        self._close_seek_stream()
+        self._seek_stream = stream
+        return True
+
+    def _close_seek_stream(self) -> None:
+        if self._seek_stream is not None:
+            try:
+                self._seek_stream.close()
+            except Exception:
+                pass
+            self._seek_stream = None
+
+    def _draw_waveform(self) -> None:
+        """Draw the peaks as one vertical bar per pixel column."""
+        canvas = self.wave_canvas
+        index = self._media_index
+        canvas.delete("all")
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        if index is None or not index.peaks or width < 2:
+            return
+        self._wave_heights = index.peaks_for_width(width)
+        mid = height / 2
+        for x, level in enumerate(self._wave_heights):
+            half = max(0.5, level * (mid - 1))
+            canvas.create_line(x, mid - half, x, mid + half, fill='#9aa7b4')
+        canvas.create_line(0, 0, 0, height, fill='#d9534f', width=2, tags="playhead")
+        self._draw_playhead(self._get_current_position())
+
+    def _draw_playhead(self, position: float) -> None:
+        if not self._wave_heights or self._duration <= 0:
+            return
+        x = position / self._duration * self.wave_canvas.winfo_width()
+        self.wave_canvas.coords("playhead", x, 0, x, self.wave_canvas.winfo_height())
+
+    def _on_waveform_click(self, event) -> None:
+        width = self.wave_canvas.winfo_width()
+        if width > 0 and self._duration > 0:
+            self.seek_to(event.x / width * self._duration)
 
     # ------------------------------------------------------------------
     # Playback Controls
@@ -515,6 +508,8 @@ class TranscriptPlayer(ttk.Frame):
                 delay = from_position  # capture for lambda
                 self.after(500, lambda: self._retry_play(delay))
                 return
+            if self._job is not None and not self._job.finished:
+                return  # Still converting; the job's callbacks enable Play
             # Not pending and not initialised — try once synchronously
             # (covers the edge case where threading never started)
             self._init_mixer()
@@ -526,9 +521,15 @@ class TranscriptPlayer(ttk.Frame):
 
         print(f"🎵 PLAY from position={self._position:.1f}s", flush=True)
 
-        # Strategy: try play(start=) first, fall back to play() + set_pos()
-        seek_ok = False
-        if self._position > 0.5:
+        # Strategy: with a seek index, open the file at the nearest indexed
+        # frame (constant time).  Otherwise try play(start=) first, falling
+        # back to play() + set_pos().
+        seek_ok = self._play_indexed(self._position)
+        if not seek_ok and self._seek_stream is not None:
+            # A slice of the file is loaded - go back to the whole file
+            self._close_seek_stream()
+            pygame.mixer.music.load(self._playback_path)
+        if not seek_ok and self._position > 0.5:
             try:
                 pygame.mixer.music.play(start=self._position)
                 seek_ok = True
@@ -641,6 +642,15 @@ class TranscriptPlayer(ttk.Frame):
 
         pos = self._get_current_position()
 
+        # Ran off the end of the head chunk before the full conversion is in?
+        if self._partial and not pygame.mixer.music.get_busy():
+            self._position = pos
+            self._playing = False
+            self._awaiting_full = True
+            self.play_btn.configure(text="Wait\u2026", state=tk.DISABLED)
+            self._set_status("🔄 Loading the rest of the audio...")
+            return
+
         # End of audio?
         if pos >= self._duration - 0.5:
             # Also check if pygame has actually stopped
@@ -650,6 +660,7 @@ class TranscriptPlayer(ttk.Frame):
 
         if not self._slider_dragging:
             self.slider_var.set(pos)
+        self._draw_playhead(pos)
 
         self._update_time_display(pos)
         self._highlight_for_position(pos)
@@ -961,20 +972,12 @@ class TranscriptPlayer(ttk.Frame):
         self._apply_highlight(seg_idx)
 
     def _find_segment_for_position(self, position: float) -> int:
-        """Binary search for the segment containing the given position."""
+        """Bisect the start-time index for the segment containing the position."""
         segs = getattr(self, 'playback_segments', self.entries)
         if not segs:
             return -1
-        lo, hi = 0, len(segs) - 1
-        result = -1
-        while lo <= hi:
-            mid = (lo + hi) // 2
-            if segs[mid].get('start', 0) <= position:
-                result = mid
-                lo = mid + 1
-            else:
-                hi = mid - 1
-        return result
+        self._start_index = index_for(getattr(self, '_start_index', None), segs)
+        return self._start_index.segment_at(position)
 
     def _apply_highlight(self, seg_idx: int, auto_scroll: bool = True):
         tw = self.text_widget
@@ -1006,6 +1009,7 @@ class TranscriptPlayer(ttk.Frame):
 
     def cleanup(self):
         """Stop playback and release resources. Call on window close."""
+        self._closed = True
         self._cancel_update()
         try:
             if self._initialised:
@@ -1014,6 +1018,7 @@ class TranscriptPlayer(ttk.Frame):
                 self._initialised = False
         except Exception:
             pass
+        self._close_seek_stream()
 
     def destroy(self):
         self.cleanup()
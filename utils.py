@@ -163,15 +163,34 @@ def format_display_date(date_input) -> str:
 format_published_date = format_display_date
 
 
+_CHUNK_SEPARATORS = ['. ', '? ', '! ', '\n\n']
+
+
 def chunk_text(text: str, chunk_size: int, overlap: int = 200) -> list:
     """
     Split text into overlapping chunks
     Similar to how you might split large datasets in VBA
+
+    Breaks at the last sentence end (or blank line) within the final 200
+    characters of each chunk. Separator positions are found once up front
+    and bisected per boundary rather than rescanning the text.
     """
+    from bisect import bisect_right
+
     chunks = []
     start = 0
     text_length = len(text)
 
+    # End offsets (just past the separator) of every separator, per type
+    sep_ends = []
+    for separator in _CHUNK_SEPARATORS:
+        positions = []
+        pos = text.find(separator)
+        while pos != -1:
+            positions.append(pos + len(separator))
+            pos = text.find(separator, pos + 1)
+        sep_ends.append((separator, positions))
+
     while start < text_length:
         end = start + chunk_size
 
@@ -179,12 +198,11 @@ def chunk_text(text: str, chunk_size: int, overlap: int = 200) -> list:
         if end < text_length:
             # Look for period, question mark, or exclamation within last 200 chars
             search_start = max(start, end - 200)
-            search_text = text[search_start:end]
-
-            for separator in ['. ', '? ', '! ', '\n\n']:
-                last_sep = search_text.rfind(separator)
-                if last_sep != -1:
-                    end = search_start + last_sep + len(separator)
+            for separator, positions in sep_ends:
+                # Last separator lying wholly inside text[search_start:end]
+                k = bisect_right(positions, end) - 1
+                if k >= 0 and positions[k] - len(separator) >= search_start:
+                    end = positions[k]
                     break
 
         chunk = text[start:end].strip()
@@ -322,7 +340,164 @@ def sanitize_for_storage(text):
     return cleaned, changes
 
 
-def chunk_entries(entries: list, chunk_size: str) -> list:
+AUTO_CHUNK_OUTPUT_RESERVE = 8_192    # Tokens kept free for the model's reply
+AUTO_CHUNK_OVERHEAD = 500            # System message / formatting per call
+AUTO_CHUNK_BOUNDARY_FILL = 0.85      # Break early at a boundary past this fill
+AUTO_CHUNK_OVERHEAD_SAMPLE = 200     # Entries per window when measuring prefix overhead
+
+
+def _split_oversized_entries(entries: list, max_chars_for) -> list:
+    """
+    Split any entry longer than max_chars_for(entry) characters into
+    sentence-bounded parts (see chunk_text), labelled "(Part i/n)".
+    """
+    processed_entries = []
+    for entry in entries:
+        text = entry.get('text', '')
+        max_chars = max_chars_for(entry)
+
+        # If entry fits within chunk size, keep it as-is
+        if len(text) <= max_chars:
+            processed_entries.append(entry)
+            continue
+
+        # Entry is too large - split it into multiple entries
+        # Use the chunk_text function to intelligently split at sentence boundaries
+        text_chunks = chunk_text(text, max_chars, overlap=200)
+        for i, chunk_text_part in enumerate(text_chunks):
+            new_entry = entry.copy()
+            new_entry['text'] = chunk_text_part
+            # Update location to show it's a split piece
+            original_location = entry.get('location', 'Document')
+            new_entry['location'] = f"{original_location} (Part {i + 1}/{len(text_chunks)})"
+            processed_entries.append(new_entry)
+    return processed_entries
+
+
+def _is_chunk_boundary(prev: dict, entry: dict) -> bool:
+    """True if a chunk may break cleanly between prev and entry."""
+    if prev.get('speaker') != entry.get('speaker'):
+        return True
+    if prev.get('location') != entry.get('location'):
+        return True
+    return entry.get('text', '').lstrip().startswith('#')
+
+
+def auto_chunk_budget(provider: str, model: str, prompt_text: str = "") -> int:
+    """
+    Token budget for one chunk of document text with this provider/model:
+    the context window minus the reply reserve, prompt and per-call overhead,
+    capped at CHUNK_SIZES['auto']['max_tokens'].
+    """
+    from config import CHUNK_SIZES
+    from token_counter import get_context_window, count_tokens
+
+    preset = CHUNK_SIZES["auto"]
+    context = get_context_window(provider, model)
+    reserve = min(AUTO_CHUNK_OUTPUT_RESERVE, context // 4)
+    budget = int((context - reserve) * preset.get("fill", 0.9))
+    budget -= count_tokens(prompt_text, provider, model) + AUTO_CHUNK_OVERHEAD
+    return max(1_000, min(budget, preset.get("max_tokens", budget)))
+
+
+def _chunk_text(entries: list) -> str:
+    """The text a chunk of entries is sent as (speaker labels when present)."""
+    if any('speaker' in e for e in entries):
+        return entries_to_text_with_speakers(entries)
+    return entries_to_text(entries)
+
+
+def _entry_overhead(entries: list, provider: str, model: str) -> float:
+    """
+    Average tokens the formatted chunk text adds per entry (timestamps,
+    speaker labels, separators), measured on windows of AUTO_CHUNK_OVERHEAD_SAMPLE
+    entries from the start, middle and end of the document.
+    """
+    from token_counter import count_tokens
+
+    n = AUTO_CHUNK_OVERHEAD_SAMPLE
+    starts = sorted({0, max(0, len(entries) // 2 - n // 2), max(0, len(entries) - n)})
+    joined = texts = count = 0
+    for start in starts:
+        window = [e for e in entries[start:start + n] if e.get('text', '').strip()]
+        if not window:
+            continue
+        joined += count_tokens(_chunk_text(window), provider, model)
+        texts += sum(count_tokens(e['text'], provider, model) for e in window)
+        count += len(window)
+    return max(0.0, (joined - texts) / count) if count else 0.0
+
+
+def _pack_by_tokens(entries: list, budget: int, provider: str, model: str) -> list:
+    """
+    Greedily fill chunks up to budget tokens. When an entry doesn't fit and
+    the current chunk passed a speaker/section boundary after
+    AUTO_CHUNK_BOUNDARY_FILL of the budget, break there instead and carry
+    the tail into the next chunk.
+
+    Entry sizes add the per-entry overhead measured on the document's own
+    formatted text (_entry_overhead).  If a chunk's formatted text still
+    comes out over budget, everything is packed again to a target reduced
+    by the largest overshoot.
+    """
+    from token_counter import count_tokens
+
+    overhead = _entry_overhead(entries, provider, model)
+    sized = [(entry, count_tokens(entry.get('text', ''), provider, model) + overhead)
+             for entry in entries]
+
+    def last_boundary(items):
+        fill, found = 0, None
+        for k in range(1, len(items)):
+            fill += items[k - 1][1]
+            if _is_chunk_boundary(items[k - 1][0], items[k][0]):
+                found = (k, fill)
+        return found
+
+    def pack(limit):
+        chunks = []
+        current = []          # [(entry, tokens), ...]
+        current_size = 0
+        boundary = None       # (index into current, tokens before it)
+        min_fill = limit * AUTO_CHUNK_BOUNDARY_FILL
+
+        for entry, n in sized:
+            if current and current_size + n > limit:
+                if boundary and boundary[1] >= min_fill:
+                    k, fill = boundary
+                    chunks.append([e for e, _ in current[:k]])
+                    current = current[k:]
+                    current_size -= fill
+                    boundary = last_boundary(current)
+                else:
+                    chunks.append([e for e, _ in current])
+                    current, current_size, boundary = [], 0, None
+                if current and current_size + n > limit:
+                    chunks.append([e for e, _ in current])
+                    current, current_size, boundary = [], 0, None
+            if current and _is_chunk_boundary(current[-1][0], entry):
+                boundary = (len(current), current_size)
+            current.append((entry, n))
+            current_size += n
+
+        if current:
+            chunks.append([e for e, _ in current])
+        return chunks
+
+    limit = budget
+    for _ in range(3):
+        chunks = pack(limit)
+        largest = max((count_tokens(_chunk_text(c), provider, model)
+                       for c in chunks if len(c) > 1), default=0)
+        if largest <= budget:
+            break
+        # Repacking moves the breaks, so back off by twice the overshoot
+        limit = int(limit * budget / largest) - (largest - budget)
+    return chunks
+
+
+def chunk_entries(entries: list, chunk_size: str, provider: str = None,
+                  model: str = None, prompt_text: str = "") -> list:
     """
     Split entries into chunks based on size preset.
 
@@ -330,40 +505,32 @@ def chunk_entries(entries: list, chunk_size: str) -> list:
     it will be split into multiple smaller entries first.
     This prevents token limit errors for large documents.
 
+    The 'auto' preset packs chunks to the selected model's context window
+    (in tokens, see auto_chunk_budget), preferring to break at speaker or
+    section changes; without a provider/model it behaves like 'medium'.
+
     Args:
         entries: List of entry dicts with 'text' field
-        chunk_size: 'small', 'medium', or 'large'
+        chunk_size: 'tiny', 'small', 'medium', 'large' or 'auto'
+        provider / model: Selected AI model (used by 'auto')
+        prompt_text: Prompt sent with every chunk (counted against 'auto')
 
     Returns:
         List of entry lists (chunks)
     """
     from config import CHUNK_SIZES
 
+    if chunk_size not in CHUNK_SIZES:
+        chunk_size = "medium"
+    if CHUNK_SIZES[chunk_size].get("chars") is None:
+        if provider and model:
+            return _chunk_entries_auto(entries, provider, model, prompt_text)
+        chunk_size = "medium"
+
     max_chars = CHUNK_SIZES[chunk_size]["chars"]
 
     # Step 1: Split any oversized entries into smaller pieces
-    processed_entries = []
-
-    for entry in entries:
-        text = entry.get('text', '')
-        text_len = len(text)
-
-        # If entry fits within chunk size, keep it as-is
-        if text_len <= max_chars:
-            processed_entries.append(entry)
-        else:
-            # Entry is too large - split it into multiple entries
-            # Use the chunk_text function to intelligently split at sentence boundaries
-            text_chunks = chunk_text(text, max_chars, overlap=200)
-
-            # Create new entries from the splits
-            for i, chunk_text_part in enumerate(text_chunks):
-                new_entry = entry.copy()
-                new_entry['text'] = chunk_text_part
-                # Update location to show it's a split piece
-                original_location = entry.get('location', 'Document')
-                new_entry['location'] = f"{original_location} (Part {i + 1}/{len(text_chunks)})"
-                processed_entries.append(new_entry)
+    processed_entries = _split_oversized_entries(entries, lambda _e: max_chars)
 
     # Step 2: Group processed entries into chunks
     chunks = []
@@ -396,6 +563,25 @@ def chunk_entries(entries: list, chunk_size: str) -> list:
     return chunks
 
 
+def _chunk_entries_auto(entries: list, provider: str, model: str, prompt_text: str) -> list:
+    """chunk_entries() for the 'auto' preset."""
+    from token_counter import count_tokens
+
+    budget = auto_chunk_budget(provider, model, prompt_text)
+
+    def max_chars_for(entry):
+        text = entry.get('text', '')
+        tokens = count_tokens(text, provider, model)
+        if tokens <= budget:
+            return len(text)
+        # Characters per token of this text, with 5% headroom
+        return max(1_000, int(budget * len(text) / tokens * 0.95))
+
+    chunks = _pack_by_tokens(_split_oversized_entries(entries, max_chars_for),
+                             budget, provider, model)
+    return chunks or [[]]
+
+
 """
 PATCHED entries_to_text function for utils.py
 
@@ -568,38 +754,35 @@ def get_dir_size_bytes(dir_path: str) -> int:
 
 def get_total_cache_size() -> dict:
     """
-    Get combined cache size across OCR and audio caches.
-    Returns dict with 'ocr_bytes', 'audio_bytes', 'total_bytes', 'total_display'.
+    Get combined cache size across all registered caches (see cache_manager).
+    Returns dict with 'ocr_bytes', 'audio_bytes', 'total_bytes', 'total_display',
+    plus 'kinds': {kind: {'label', 'bytes', 'count', 'budget'}}.
+    Processed outputs are library data, not cache, and are not counted.
     """
-    from config import OCR_CACHE_DIR, AUDIO_CACHE_DIR
-    ocr = get_dir_size_bytes(OCR_CACHE_DIR)
-    audio = get_dir_size_bytes(AUDIO_CACHE_DIR)
-    total = ocr + audio
+    import cache_manager
+    cache_manager.rescan()
+    usage = cache_manager.get_usage()
+    kinds = {k: v for k, v in usage.items() if k not in ('total', 'outputs')}
+    total = sum(v['bytes'] for v in kinds.values())
     return {
-        'ocr_bytes': ocr,
-        'audio_bytes': audio,
+        'ocr_bytes': kinds.get('ocr', {}).get('bytes', 0),
+        'audio_bytes': kinds.get('audio', {}).get('bytes', 0),
         'total_bytes': total,
-        'total_display': format_size(total)
+        'total_display': format_size(total),
+        'kinds': kinds,
     }
 
 
 def clear_all_caches() -> tuple:
     """
-    Clear all cache directories (OCR + audio).
+    Clear the processing caches (OCR, transcriptions, PDF text, AI chunk
+    results, ...).  Podcast downloads, player conversions and audio kept
+    for the transcript player are left alone.
     Returns (success: bool, message: str).
     """
-    from config import OCR_CACHE_DIR, AUDIO_CACHE_DIR
-    count = 0
-    freed = 0
+    import cache_manager
     try:
-        for cache_dir in [OCR_CACHE_DIR, AUDIO_CACHE_DIR]:
-            if os.path.isdir(cache_dir):
-                for f in os.listdir(cache_dir):
-                    fp = os.path.join(cache_dir, f)
-                    if os.path.isfile(fp):
-                        freed += os.path.getsize(fp)
-                        os.remove(fp)
-                        count += 1
+        count, freed = cache_manager.clear()
         return True, f"Cleared {count} cached files, freed {format_size(freed)}"
     except Exception as e:
         return False, f"Error clearing cache: {e}"
@@ -51,7 +51,7 @@ class ViewerThreadMixin:
             current_thread=self.current_thread,
             thread_message_count=self.thread_message_count,
             provider=self.provider_var.get(),
-            model=self.model_var.get(),
+            model=self._model_id_from_var(),
             api_key=self.api_key_var.get(),
             config=self.config,
             ai_handler=get_ai(),
@@ -748,7 +748,10 @@ class ViewerThreadMixin:
                 chunk_size_setting = self.config.get("chunk_size", "medium")
                 
                 # Chunk the entries
-                chunks = chunk_entries(self.current_entries, chunk_size_setting)
+                chunks = chunk_entries(self.current_entries, chunk_size_setting,
+                                       provider=self.provider_var.get(),
+                                       model=self._model_id_from_var(),
+                                       prompt_text=prompt)
                 
                 # Get document title for cost tracking
                 doc_title = "Unknown Document"
@@ -790,7 +793,7 @@ class ViewerThreadMixin:
                     
                     success, result = get_ai().call_ai_provider(
                         provider=self.provider_var.get(),
-                        model=self.model_var.get(),
+                        model=self._model_id_from_var(),
                         messages=messages,
                         api_key=self.api_key_var.get(),
                         document_title=doc_title,
@@ -820,7 +823,7 @@ class ViewerThreadMixin:
                                     self.current_document_id,
                                     list(self.current_thread),
                                     {
-                                        "model": self.model_var.get(),
+                                        "model": self._model_id_from_var(),
                                         "provider": self.provider_var.get(),
                                         "last_updated": datetime.datetime.now().isoformat(),
                                         "message_count": self.thread_message_count
@@ -854,7 +857,7 @@ class ViewerThreadMixin:
                     
                     success, result = get_ai().call_ai_provider(
                         provider=self.provider_var.get(),
-                        model=self.model_var.get(),
+                        model=self._model_id_from_var(),
                         messages=messages,
                         api_key=self.api_key_var.get(),
                         document_title=f"{doc_title} (Chunk {i}/{len(chunks)})",
@@ -877,7 +880,31 @@ class ViewerThreadMixin:
                 # ============================================================
                 # CONSOLIDATE MULTIPLE CHUNKS
                 # ============================================================
-                combined_chunks = "\n\n---\n\n".join([f"Section {i + 1}:\n{r}" for i, r in enumerate(results)])
+                def _reduce_call(content, span):
+                    return get_ai().call_ai_provider(
+                        provider=self.provider_var.get(),
+                        model=self._model_id_from_var(),
+                        messages=[
+                            {"role": "system", "content": "You are a helpful AI assistant consolidating information from multiple document sections."},
+                            {"role": "user", "content": content}
+                        ],
+                        api_key=self.api_key_var.get(),
+                        document_title=f"{doc_title} ({span})",
+                        prompt_name=f"{prompt_name} - Reduce"
+                    )
+                
+                success, combined_chunks = get_ai().reduce_chunk_results(
+                    results, prompt,
+                    self.provider_var.get(), self._model_id_from_var(),
+                    call=_reduce_call,
+                    consolidation=self.config.get("consolidation_mode", "auto"),
+                    workers=self.config.get("reduce_workers", 4),
+                    status_callback=status_callback
+                )
+                if not success:
+                    complete_callback(False, f"Failed consolidating chunks: {combined_chunks}")
+                    return
+                
                 consolidation_prompt = f"{prompt}\n\nHere are the key points extracted from each section of the document:\n\n{combined_chunks}"
                 
                 status_callback("⚙️ Consolidating results...")
@@ -889,7 +916,7 @@ class ViewerThreadMixin:
                 
                 success, final_result = get_ai().call_ai_provider(
                     provider=self.provider_var.get(),
-                    model=self.model_var.get(),
+                    model=self._model_id_from_var(),
                     messages=messages,
                     api_key=self.api_key_var.get(),
                     document_title=f"{doc_title} (Consolidated)",
@@ -916,7 +943,7 @@ class ViewerThreadMixin:
                                 self.current_document_id,
                                 list(self.current_thread),
                                 {
-                                    "model": self.model_var.get(),
+                                    "model": self._model_id_from_var(),
                                     "provider": self.provider_var.get(),
                                     "last_updated": datetime.datetime.now().isoformat(),
                                     "message_count": self.thread_message_count
@@ -956,7 +983,7 @@ class ViewerThreadMixin:
 
         # Prepare metadata
         metadata = {
-            "model": self.model_var.get(),
+            "model": self._model_id_from_var(),
             "provider": self.provider_var.get(),
             "last_updated": datetime.datetime.now().isoformat(),
             "message_count": self.thread_message_count
@@ -0,0 +1,283 @@
+"""
+webdriver_pool.py - Warm, reusable headless browser sessions for Selenium.
+
+Starting a headless Chrome/Edge/Firefox takes several seconds - far longer
+than loading the page it is started for - and scraping used to launch one
+per post, so a batch of 20 Substack posts launched 20 browsers.  A pool
+keeps up to max_per_browser sessions per browser type alive between uses:
+
+  * acquire() hands out an idle session (after a quick liveness check) or
+    starts a new one; callers beyond the limit wait for a session to come
+    back rather than launching more browsers;
+  * release() parks the session on about:blank for the next caller; a
+    session the caller reports broken (WebDriverException, crashed tab) is
+    quit instead, so the next acquire() starts a fresh one;
+  * sessions are recycled after max_uses pages to cap browser memory
+    growth, and a reaper thread quits sessions idle for idle_timeout
+    seconds (the thread exits once the pool is empty);
+  * shutdown() - called on app exit and at interpreter exit - quits every
+    browser so no orphaned browser processes are left behind.
+
+The pool doesn't know how to start a browser; it is given a factory
+(browser_name or None) -> (driver, browser_name) or (None, None).  With
+no browser requested, the first session found by the factory fixes the
+pool's preferred browser so later sessions don't re-probe the others.
+
+Usage:
+    pool = webdriver_pool.get_pool("substack", factory)
+    with pool.session() as (driver, browser_name):
+        driver.get(url)
+
+Called by:
+    substack_utils.py   (Substack video transcripts)
+    export_utilities.py (shutdown on app close)
+"""
+
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+IDLE_TIMEOUT_S = 180           # quit sessions unused for this long
+MAX_PER_BROWSER = 2            # live sessions per browser type
+MAX_USES_PER_SESSION = 40      # pages before a session is recycled
+ACQUIRE_TIMEOUT_S = 300        # wait this long for a free session
+REAPER_INTERVAL_S = 15
+
+
+class NoBrowserError(RuntimeError):
+    """No browser could be started (none installed, or its driver failed)."""
+
+
+class _Session:
+    __slots__ = ("driver", "browser", "uses", "last_used")
+
+    def __init__(self, driver, browser: str):
+        self.driver = driver
+        self.browser = browser
+        self.uses = 0
+        self.last_used = time.monotonic()
+
+
+def _quit(session: _Session):
+    try:
+        session.driver.quit()
+    except Exception:
+        pass
+
+
+def _alive(session: _Session) -> bool:
+    """Cheap round-trip to the browser; False if it has crashed or gone."""
+    try:
+        session.driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+class WebDriverPool:
+    """Per-browser pools of warm Selenium sessions."""
+
+    def __init__(self, factory: Callable[[Optional[str]], Tuple], max_per_browser: int = MAX_PER_BROWSER,
+                 idle_timeout: float = IDLE_TIMEOUT_S, max_uses: int = MAX_USES_PER_SESSION):
+        self.factory = factory
+        self.max_per_browser = max(1, max_per_browser)
+        self.idle_timeout = idle_timeout
+        self.max_uses = max_uses
+        self.preferred: Optional[str] = None
+        self._idle: Dict[str, List[_Session]] = {}
+        self._live: Dict[str, int] = {}
+        self._cond = threading.Condition()
+        self._probe_lock = threading.Lock()   # one thread finds the first browser
+        self._reaper: Optional[threading.Thread] = None
+        self._closed = False
+
+    # ── Acquire / release ────────────────────────────────────────────────
+
+    def acquire(self, browser: Optional[str] = None,
+                timeout: float = ACQUIRE_TIMEOUT_S) -> _Session:
+        """
+        A session for browser (None = the preferred/first working one).
+        Raises NoBrowserError if no browser can be started, TimeoutError if
+        every session stays busy for timeout seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            session = None
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("browser pool has been shut down")
+                key = browser or self.preferred
+                if key is None:
+                    pass                                  # probe below
+                elif self._idle.get(key):
+                    session = self._idle[key].pop()
+                elif self._live.get(key, 0) < self.max_per_browser:
+                    self._live[key] = self._live.get(key, 0) + 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No {key} session became free in {timeout:.0f}s")
+                    self._cond.wait(min(remaining, 1.0))
+                    continue
+
+            if session is not None:
+                if _alive(session):
+                    return session
+                self._discard(session)                    # crashed while idle
+                continue
+            if key is None:
+                self._probe()
+                continue
+            return self._start(key)
+
+    def release(self, session: _Session, broken: bool = False):
+        """Return a session; broken=True (or an unhealthy browser) quits it."""
+        session.uses += 1
+        if broken or self._closed or session.uses >= self.max_uses:
+            self._discard(session)
+            return
+        try:
+            session.driver.get("about:blank")   # stop scripts/media of the last page
+        except Exception:
+            self._discard(session)
+            return
+        session.last_used = time.monotonic()
+        with self._cond:
+            self._idle.setdefault(session.browser, []).append(session)
+            self._cond.notify()
+        self._ensure_reaper()
+
+    @contextmanager
+    def session(self, browser: Optional[str] = None):
+        """with pool.session() as (driver, browser_name): ...  (see module docstring)"""
+        session = self.acquire(browser)
+        broken = False
+        try:
+            yield session.driver, session.browser
+        except Exception as e:
+            broken = is_browser_failure(e)
+            raise
+        finally:
+            self.release(session, broken=broken)
+
+    # ── Lifecycle ────────────────────────────────────────────────────────
+
+    def _start(self, key: str) -> _Session:
+        """Start a session for key; its live slot is already reserved."""
+        try:
+            driver, name = self.factory(key)
+        except Exception:
+            driver, name = None, None
+        if driver is None:
+            with self._cond:
+                self._live[key] -= 1
+                self._cond.notify()
+            raise NoBrowserError(f"Could not start {key}")
+        return _Session(driver, name or key)
+
+    def _probe(self):
+        """Find the first working browser and keep its session idle."""
+        with self._probe_lock:
+            if self.preferred is not None:
+                return                                   # another thread found it
+            driver, name = self.factory(None)
+            if driver is None:
+                raise NoBrowserError("No compatible browser found")
+            with self._cond:
+                self.preferred = name
+                self._live[name] = self._live.get(name, 0) + 1
+                self._idle.setdefault(name, []).append(_Session(driver, name))
+                self._cond.notify_all()
+        self._ensure_reaper()
+
+    def _discard(self, session: _Session):
+        _quit(session)
+        with self._cond:
+            self._live[session.browser] = max(0, self._live.get(session.browser, 1) - 1)
+            self._cond.notify()
+
+    def _ensure_reaper(self):
+        with self._cond:
+            if self._reaper is None or not self._reaper.is_alive():
+                self._reaper = threading.Thread(target=self._reap, name="webdriver-reaper", daemon=True)
+                self._reaper.start()
+
+    def _reap(self):
+        while True:
+            time.sleep(REAPER_INTERVAL_S)
+            expired = []
+            with self._cond:
+                cutoff = time.monotonic() - self.idle_timeout
+                for browser, idle in self._idle.items():
+                    expired += [s for s in idle if s.last_used < cutoff]
+                    idle[:] = [s for s in idle if s.last_used >= cutoff]
+            for session in expired:
+                self._discard(session)
+            with self._cond:
+                if self._closed or not any(self._live.values()):
+                    self._reaper = None
+                    return
+
+    def shutdown(self):
+        """Quit every idle session; sessions in use are quit when released."""
+        with self._cond:
+            self._closed = True
+            idle = [s for sessions in self._idle.values() for s in sessions]
+            self._idle.clear()
+            self._cond.notify_all()
+        for session in idle:
+            self._discard(session)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._cond:
+            return {b: {"live": self._live.get(b, 0), "idle": len(self._idle.get(b, []))}
+                    for b in set(self._live) | set(self._idle)}
+
+
+def is_browser_failure(error: Exception) -> bool:
+    """Errors that mean the session itself is unusable (not just a bad page)."""
+    if isinstance(error, (ConnectionError, OSError)):
+        return True
+    try:
+        from selenium.common.exceptions import (InvalidSessionIdException,
+                                                NoSuchWindowException, WebDriverException)
+    except ImportError:
+        return False
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return True
+    if isinstance(error, WebDriverException):
+        message = str(error).lower()
+        return any(s in message for s in ("session deleted", "disconnected", "crash",
+                                          "not reachable", "invalid session", "connection refused"))
+    return False
+
+
+# ============================================================
+# MODULE-LEVEL POOLS
+# ============================================================
+
+_pools: Dict[str, WebDriverPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str, factory: Callable[[Optional[str]], Tuple], **kwargs) -> WebDriverPool:
+    """The named shared pool, created with factory on first use."""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None or pool._closed:
+            pool = _pools[name] = WebDriverPool(factory, **kwargs)
+        return pool
+
+
+def shutdown():
+    """Quit every pooled browser (app close / interpreter exit)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown)
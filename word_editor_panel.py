@@ -56,6 +56,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
 from typing import List, Dict, Optional, Callable
 
+from segment_index import StartTimeIndex, index_for
+
 logger = logging.getLogger(__name__)
 
 # -- COM (pywin32) -------------------------------------------------------------
@@ -212,6 +214,8 @@ class WordEditorPanel:
         self._name_vars      : Dict[str, tk.StringVar] = {}
         self._word_positioned: bool          = False
         self._highlighted_ts : Optional[str] = None
+        self._start_index    : Optional[StartTimeIndex] = None
+        self._para_map       : Dict[str, int] = {}
 
         self._mp3_path        : Optional[str] = None
         self._duration        : float         = 0.0
@@ -1103,15 +1107,27 @@ class WordEditorPanel:
         m = re.match(r'^\[(\d+:\d{2}(?::\d{2})?)\]', para_text)
         if not m:
             return None
-        seconds   = _parse_ts(m.group(1))
-        best_idx  = None
-        best_diff = 2.5
-        for i, entry in enumerate(self._entries):
-            diff = abs(entry.get("start", 0.0) - seconds)
-            if diff < best_diff:
-                best_diff = diff
-                best_idx  = i
-        return best_idx
+        index = self._entry_index()
+        idx   = self._para_map.get(m.group(1))
+        if idx is None:
+            idx = index.nearest(_parse_ts(m.group(1)), 2.5)
+        return idx
+
+    def _entry_index(self) -> StartTimeIndex:
+        """
+        Start-time index over self._entries (rebuilt when the list is
+        replaced), plus the paragraph-timestamp -> entry map for every
+        timestamp the entries themselves produce.
+        """
+        index = index_for(self._start_index, self._entries)
+        if index is not self._start_index:
+            self._start_index = index
+            self._para_map = {}
+            for e in self._entries:
+                ts = _fmt_time(e.get("start", 0))
+                if ts not in self._para_map:
+                    self._para_map[ts] = index.nearest(_parse_ts(ts), 2.5)
+        return index
 
     # =========================================================================
     # Speaker assignment
@@ -1542,11 +1558,8 @@ class WordEditorPanel:
                     entry = ts_to_entry.get(ts_str)
                     if entry is None:
                         seconds = _parse_ts(ts_str)
-                        best, bd = None, 2.5
-                        for e in self._entries:
-                            d = abs(e.get("start", 0.0) - seconds)
-                            if d < bd:
-                                bd, best = d, dict(e)
+                        idx     = self._entry_index().nearest(seconds, 2.5)
+                        best    = dict(self._entries[idx]) if idx is not None else None
                         entry = best or {"start": seconds, "end": seconds + 30.0}
                     entry = dict(entry)
                     entry["speaker"] = speaker
@@ -1743,12 +1756,8 @@ class WordEditorPanel:
                 entry = ts_to_entry.get(ts_str)
                 if entry is None:
                     seconds   = _parse_ts(ts_str)
-                    best, bd  = None, 2.5
-                    for e in self._entries:
-                        d = abs(e.get("start", 0.0) - seconds)
-                        if d < bd:
-                            bd, best = d, dict(e)
-                    entry = best
+                    idx       = self._entry_index().nearest(seconds, 2.5)
+                    entry     = dict(self._entries[idx]) if idx is not None else None
                 if entry is None:
                     continue
                 entry             = dict(entry)